@@ -85,6 +85,29 @@ def resolve_cascade_anchor_s(
     return 0
 
 
+# ---------------------------------------------------------------------------
+# trading_slots — calendar-фільтр слотів діапазону
+# ---------------------------------------------------------------------------
+def trading_slots(
+    start_ms: int,
+    end_ms: int,
+    step_ms: int,
+    is_trading_fn: Optional[Callable[[int], bool]] = None,
+) -> List[int]:
+    """Trading-слоти range(start_ms, end_ms, step_ms).
+
+    is_trading_fn може бути компільованим календарем (callable з методом
+    trading_slots, runtime CompiledCalendar) — тоді запит по діапазону
+    без per-slot виклику. Інакше — фільтр is_trading_fn(t) по кожному слоту.
+    """
+    if is_trading_fn is None:
+        return list(range(start_ms, end_ms, step_ms))
+    fast = getattr(is_trading_fn, "trading_slots", None)
+    if fast is not None:
+        return fast(start_ms, end_ms, step_ms)
+    return [t for t in range(start_ms, end_ms, step_ms) if is_trading_fn(t)]
+
+
 # ---------------------------------------------------------------------------
 # GenericBuffer — параметричний буфер барів для будь-якого TF
 # ---------------------------------------------------------------------------
@@ -176,11 +199,9 @@ class GenericBuffer:
         is_trading_fn: Optional[Callable[[int], bool]] = None,
     ) -> bool:
         """Чи всі trading-слоти від start_ms до end_ms (end-excl) є в буфері."""
-        step = self._tf_ms
-        for t in range(start_ms, end_ms, step):
-            if is_trading_fn is not None and not is_trading_fn(t):
-                continue
-            if t not in self._by_open_ms:
+        by_open_ms = self._by_open_ms
+        for t in trading_slots(start_ms, end_ms, self._tf_ms, is_trading_fn):
+            if t not in by_open_ms:
                 return False
         return True
 
@@ -194,11 +215,8 @@ class GenericBuffer:
 
         Повертає порожній список якщо хоча б один trading-слот відсутній.
         """
-        step = self._tf_ms
         out: List[CandleBar] = []
-        for t in range(start_ms, end_ms, step):
-            if is_trading_fn is not None and not is_trading_fn(t):
-                continue
+        for t in trading_slots(start_ms, end_ms, self._tf_ms, is_trading_fn):
             b = self._by_open_ms.get(t)
             if b is None:
                 return []
@@ -212,12 +230,10 @@ class GenericBuffer:
         is_trading_fn: Optional[Callable[[int], bool]] = None,
     ) -> int:
         """Кількість відсутніх trading-слотів у діапазоні."""
-        step = self._tf_ms
+        by_open_ms = self._by_open_ms
         missing = 0
-        for t in range(start_ms, end_ms, step):
-            if is_trading_fn is not None and not is_trading_fn(t):
-                continue
-            if t not in self._by_open_ms:
+        for t in trading_slots(start_ms, end_ms, self._tf_ms, is_trading_fn):
+            if t not in by_open_ms:
                 missing += 1
         return missing
 
@@ -339,11 +355,8 @@ def _collect_boundary_tolerant(
     boundary_skips = 0
     mid_session_skips = 0
 
-    for t in range(start_ms, end_ms, step):
-        # Не торговий — пропускаємо (calendar pause / break)
-        if not is_trading_fn(t):
-            continue
-
+    # Не торгові слоти (calendar pause / break) пропускаються
+    for t in trading_slots(start_ms, end_ms, step, is_trading_fn):
         bar = source_buffer.get(t)
         if bar is not None:
             bars.append(bar)
@@ -457,10 +470,8 @@ def derive_bar(
     bars, mid_gaps = result_tol
 
     # Рахуємо expected trading slots для degraded metadata
-    step = source_buffer.tf_ms
-    expected_trading = sum(
-        1 for t in range(bucket_open_ms, bucket_close_ms, step)
-        if is_trading_fn(t)
+    expected_trading = len(
+        trading_slots(bucket_open_ms, bucket_close_ms, source_buffer.tf_ms, is_trading_fn)
     )
 
     result = aggregate_bars(
@@ -501,8 +512,12 @@ def _has_any_trading_in_range(
     """Чи є хоча б одна торгова хвилина в [start_ms, end_ms).
 
     Перевіряє кожну хвилину в діапазоні. Для M5-слоту це 5 хвилин,
-    для H1-слоту — 60 хвилин. Прийнятна вартість для trigger-контексту.
+    для H1-слоту — 60 хвилин. Компільований календар (any_trading) —
+    O(1) по prefix sums.
     """
+    fast = getattr(is_trading_fn, "any_trading", None)
+    if fast is not None:
+        return fast(start_ms, end_ms)
     _MINUTE_MS = 60_000
     for t in range(start_ms, end_ms, _MINUTE_MS):
         if is_trading_fn(t):
@@ -0,0 +1,163 @@
+"""
+core/smc/bar_window.py — Array-backed вікно барів для SMC детекторів.
+
+BarWindow: ring buffer на паралельних numpy масивах (int64 open_ms,
+float64 o/h/low/c/v, bool complete) + масив самих CandleBar для
+матеріалізації SmcSwing/SmcZone. Буфер подвійної ємності: вікно завжди
+суцільний зріз → views() без копій; компакція раз на maxlen appends.
+
+BarArrays: ті самі колонки для довільного списку CandleBar (adapter для
+CandleBar-API детекторів: detect_raw_swings, detect_fvg, compute_atr, ...).
+
+S0: pure logic, NO I/O.
+"""
+
+from __future__ import annotations
+
+from typing import List, NamedTuple, Sequence
+
+import numpy as np
+
+from core.model.bars import CandleBar
+
+
+class BarArrays(NamedTuple):
+    """Колонки вікна барів (views або копії) + самі бари."""
+
+    open_ms: np.ndarray  # int64
+    o: np.ndarray  # float64
+    h: np.ndarray
+    low: np.ndarray
+    c: np.ndarray
+    v: np.ndarray  # None → NaN
+    complete: np.ndarray  # bool
+    bars: Sequence[CandleBar]
+
+    @classmethod
+    def from_bars(cls, bars: Sequence[CandleBar]) -> "BarArrays":
+        n = len(bars)
+        return cls(
+            open_ms=np.fromiter((b.open_time_ms for b in bars), np.int64, n),
+            o=np.fromiter((b.o for b in bars), np.float64, n),
+            h=np.fromiter((b.h for b in bars), np.float64, n),
+            low=np.fromiter((b.low for b in bars), np.float64, n),
+            c=np.fromiter((b.c for b in bars), np.float64, n),
+            v=np.fromiter((_vol(b) for b in bars), np.float64, n),
+            complete=np.fromiter((bool(b.complete) for b in bars), np.bool_, n),
+            bars=bars,
+        )
+
+
+def _vol(bar: CandleBar) -> float:
+    v = getattr(bar, "v", None)
+    return float("nan") if v is None else float(v)
+
+
+class BarWindow:
+    """Ring buffer останніх maxlen барів (open_time_ms dedup останнього)."""
+
+    __slots__ = (
+        "_maxlen",
+        "_start",
+        "_end",
+        "_open_ms",
+        "_o",
+        "_h",
+        "_low",
+        "_c",
+        "_v",
+        "_complete",
+        "_objs",
+    )
+
+    def __init__(self, maxlen: int) -> None:
+        self._maxlen = max(1, int(maxlen))
+        cap = 2 * self._maxlen
+        self._open_ms = np.zeros(cap, np.int64)
+        self._o = np.zeros(cap, np.float64)
+        self._h = np.zeros(cap, np.float64)
+        self._low = np.zeros(cap, np.float64)
+        self._c = np.zeros(cap, np.float64)
+        self._v = np.zeros(cap, np.float64)
+        self._complete = np.zeros(cap, np.bool_)
+        self._objs = np.empty(cap, dtype=object)
+        self._start = 0
+        self._end = 0
+
+    @property
+    def maxlen(self) -> int:
+        return self._maxlen
+
+    def __len__(self) -> int:
+        return self._end - self._start
+
+    def last(self) -> CandleBar:
+        return self._objs[self._end - 1]
+
+    def reset(self, bars: Sequence[CandleBar]) -> None:
+        """Замінює вміст останніми maxlen барами (warmup / full recompute)."""
+        tail = list(bars)[-self._maxlen :]
+        self._objs[: self._end] = None
+        self._start = 0
+        self._end = 0
+        for bar in tail:
+            self._put(bar)
+
+    def append(self, bar: CandleBar) -> bool:
+        """Додає бар; той самий open_time_ms що й останній → заміна (True)."""
+        if self._end > self._start and self._open_ms[self._end - 1] == bar.open_time_ms:
+            self._write(self._end - 1, bar)
+            return True
+        self._put(bar)
+        return False
+
+    def _put(self, bar: CandleBar) -> None:
+        if self._end == len(self._objs):
+            # компакція: вікно (maxlen-1 останніх) на початок буфера
+            keep = self._end - self._start
+            for arr in (
+                self._open_ms,
+                self._o,
+                self._h,
+                self._low,
+                self._c,
+                self._v,
+                self._complete,
+                self._objs,
+            ):
+                arr[:keep] = arr[self._start : self._end]
+            self._objs[keep:] = None
+            self._start = 0
+            self._end = keep
+        self._write(self._end, bar)
+        self._end += 1
+        if self._end - self._start > self._maxlen:
+            self._objs[self._start] = None
+            self._start += 1
+
+    def _write(self, i: int, bar: CandleBar) -> None:
+        self._open_ms[i] = bar.open_time_ms
+        self._o[i] = bar.o
+        self._h[i] = bar.h
+        self._low[i] = bar.low
+        self._c[i] = bar.c
+        self._v[i] = _vol(bar)
+        self._complete[i] = bool(bar.complete)
+        self._objs[i] = bar
+
+    def bars_list(self) -> List[CandleBar]:
+        return self._objs[self._start : self._end].tolist()
+
+    def views(self) -> BarArrays:
+        """Views (без копій) на поточне вікно; валідні до наступного append."""
+        s, e = self._start, self._end
+        return BarArrays(
+            open_ms=self._open_ms[s:e],
+            o=self._o[s:e],
+            h=self._h[s:e],
+            low=self._low[s:e],
+            c=self._c[s:e],
+            v=self._v[s:e],
+            complete=self._complete[s:e],
+            bars=self._objs[s:e],
+        )
@@ -334,12 +334,20 @@ class SmcTdaConfig:
 class SmcPerformanceConfig:
     max_compute_ms: int = 10
     log_slow_threshold_ms: int = 5
+    # on_bar: детектори тримають стан і обробляють лише новий бар
+    # (core/smc/incremental.py); False → full recompute lookback-вікна
+    incremental: bool = False
+    # get_display_snapshot: мемоізація composite per (symbol, viewer_tf),
+    # інвалідація — версії snapshot-ів TF-джерел; False → rebuild на кожен виклик
+    display_cache: bool = True
 
     @classmethod
     def from_dict(cls, d: Dict[str, Any]) -> "SmcPerformanceConfig":
         return cls(
             max_compute_ms=int(d.get("max_compute_ms", 10)),
             log_slow_threshold_ms=int(d.get("log_slow_threshold_ms", 5)),
+            incremental=bool(d.get("incremental", False)),
+            display_cache=bool(d.get("display_cache", True)),
         )
 
 
@@ -14,30 +14,29 @@ Python 3.7 compatible.
 from __future__ import annotations
 
 import dataclasses
+import itertools
 import logging
 import time
 from collections import deque
 from typing import Deque, Dict, List, Optional, Tuple
 
 from core.model.bars import CandleBar
+from core.smc.bar_window import BarArrays, BarWindow
 from core.smc.confluence import score_zone_confluence
 from core.smc.config import SmcConfig, SmcDisplayConfig
 from core.smc.context_stack import collect_htf_zones, tag_local_zones
-from core.smc.fvg import detect_fvg
-from core.smc.inducement import detect_inducement
-from core.smc.key_levels import compute_key_levels, collect_htf_levels
-from core.smc.liquidity import detect_liquidity_levels
-from core.smc.order_blocks import detect_order_blocks
-from core.smc.premium_discount import compute_pd_state, detect_premium_discount
-from core.smc.structure import classify_swings, detect_structure_events
-from core.smc.momentum import detect_displacement, compute_momentum_score
-from core.smc.swings import detect_raw_swings, detect_fractals
+from core.smc.incremental import IncrementalDetectors, detect_all
+from core.smc.key_levels import collect_htf_levels
+from core.smc.premium_discount import compute_pd_state
+from core.smc.sessions import SessionTracker
+from core.smc.structure import classify_swings
+from core.smc.momentum import compute_momentum_score
+from core.smc.swings import atr_from_arrays, detect_raw_swings, rv_from_arrays
 from core.smc.types import (
     PdState,
     SmcDelta,
     SmcLevel,
     SmcSnapshot,
-    SmcSwing,
     SmcZone,
     SESSION_LEVEL_KINDS,
 )
@@ -247,6 +246,11 @@ def _perf_ms() -> float:
     return time.time() * 1000.0
 
 
+# Глобально монотонні версії snapshot-ів _TfState: reset() + повторне
+# створення стану не повторює вже видану версію (ключ display-кешу).
+_SNAPSHOT_VERSIONS = itertools.count(1)
+
+
 class _TfState:
     """Стан SMC для однієї пари (symbol, tf_s)."""
 
@@ -256,28 +260,40 @@ class _TfState:
         "_last_delta",
         "_lookback",
         "_active_zones",
+        "_inc",
+        "_version",
     )
 
     def __init__(self, lookback: int) -> None:
-        self._bars: Deque[CandleBar] = deque(maxlen=lookback)
+        # ring buffer на numpy колонках (детектори читають views без копій)
+        self._bars = BarWindow(lookback)
         self._last_snapshot: Optional[SmcSnapshot] = None
         self._last_delta: Optional[SmcDelta] = None
         self._lookback = lookback
         self._active_zones: Dict[str, SmcZone] = {}
+        # performance.incremental: стан детекторів (None → full recompute)
+        self._inc: Optional[IncrementalDetectors] = None
+        # версія last_snapshot (0 = ще не обчислено), див. _SNAPSHOT_VERSIONS
+        self._version = 0
 
-    def append(self, bar: CandleBar) -> None:
+    def append(self, bar: CandleBar) -> bool:
         """Додає бар, зберігаючи вікно lookback_bars.
 
         Dedup: якщо останній бар має той самий open_time_ms — замінює
         (final bar update від паралельних feed-шляхів).
+        Повертає True якщо бар замінив останній.
         """
-        if self._bars and self._bars[-1].open_time_ms == bar.open_time_ms:
-            self._bars[-1] = bar
-        else:
-            self._bars.append(bar)
+        return self._bars.append(bar)
 
     def bars_list(self) -> List[CandleBar]:
-        return list(self._bars)
+        return self._bars.bars_list()
+
+    def bar_count(self) -> int:
+        return len(self._bars)
+
+    def arrays(self) -> BarArrays:
+        """Numpy views поточного вікна (валідні до наступного append)."""
+        return self._bars.views()
 
     @property
     def last_snapshot(self) -> Optional[SmcSnapshot]:
@@ -286,6 +302,11 @@ class _TfState:
     @last_snapshot.setter
     def last_snapshot(self, v: Optional[SmcSnapshot]) -> None:
         self._last_snapshot = v
+        self._version = next(_SNAPSHOT_VERSIONS)
+
+    @property
+    def version(self) -> int:
+        return self._version
 
     @property
     def last_delta(self) -> Optional[SmcDelta]:
@@ -301,7 +322,8 @@ class SmcEngine:
 
     Lifecycle:
       1. update(symbol, tf_s, bars)  — full recompute (cold-start, warmup)
-      2. on_bar(bar)                 — incremental (append + recompute)
+      2. on_bar(bar)                 — incremental (append + recompute;
+                                       performance.incremental → лише новий бар)
       3. get_snapshot(symbol, tf_s)  — read current state
       4. get_htf_bias(symbol, tf_s)  — trend bias for cross-TF alignment
       5. reset(symbol, tf_s)         — скинути стан (symbol switch)
@@ -312,11 +334,18 @@ class SmcEngine:
 
     def __init__(self, config: SmcConfig) -> None:
         self._config = config
+        self._incremental = config.performance.incremental
         self._states: Dict[Tuple[str, int], _TfState] = {}
         self._zone_grades: Dict[Tuple[str, int], Dict[str, dict]] = {}  # ADR-0029
         # ADR-0035: session support
         self._session_windows = []  # type: list
         self._session_m1_bars: Dict[str, Deque[CandleBar]] = {}
+        # symbol → streaming session H/L (get_session_levels/states без проходу буфера)
+        self._session_trackers: Dict[str, SessionTracker] = {}
+        # symbol → лічильник змін M1 буфера сесій (ключ display-кешу)
+        self._session_versions: Dict[str, int] = {}
+        # performance.display_cache: (symbol, viewer_tf) → (версії джерел, composite)
+        self._display_cache: Dict[Tuple[str, int], Tuple[tuple, SmcSnapshot]] = {}
         self._init_sessions()
 
     # ── Public API ──────────────────────────────────────────────────
@@ -338,11 +367,15 @@ class SmcEngine:
             SmcSnapshot з усіма E1 зонами, свінгами, рівнями.
         """
         state = self._get_or_create(symbol, tf_s)
-        state._bars = deque(
-            bars[-self._config.lookback_bars :], maxlen=self._config.lookback_bars
-        )
+        state._bars.reset(bars)
         state._active_zones = {}  # N1: full recompute → reset lifecycle
-        snap = self._compute_snapshot(symbol, tf_s, state.bars_list(), state)
+        bars_window = state.bars_list()
+        state._inc = None
+        if self._incremental:
+            state._inc = IncrementalDetectors.build(
+                self._config.for_tf(tf_s), self._config.lookback_bars, bars_window
+            )
+        snap = self._compute_snapshot(symbol, tf_s, bars_window, state)
         state.last_snapshot = snap
         return snap
 
@@ -361,8 +394,10 @@ class SmcEngine:
             return _empty_delta(bar)
 
         prev_snap = state.last_snapshot
-        state.append(bar)
+        replaced = state.append(bar)
         bars = state.bars_list()
+        if self._incremental:
+            self._sync_incremental(state, bar, replaced, bars)
 
         new_snap = self._compute_snapshot(bar.symbol, bar.tf_s, bars, state)
         state.last_snapshot = new_snap
@@ -397,11 +432,10 @@ class SmcEngine:
     def get_atr(self, symbol: str, tf_s: int, period: int = 14) -> float:
         """ATR14 for (symbol, tf). Returns 1.0 fallback if no data."""
         state = self._states.get((symbol, tf_s))
-        if state is None or not state.bars_list():
+        if state is None or not state.bar_count():
             return 1.0
-        from core.smc.swings import compute_atr
-
-        return compute_atr(state.bars_list(), period=period)
+        arrays = state.arrays()
+        return atr_from_arrays(arrays.h, arrays.low, period=period)
 
     def get_rv(self, symbol: str, tf_s: int, period: int = 20) -> float:
         """RV(20) for (symbol, tf) — backend SSOT for relative volume.
@@ -412,11 +446,9 @@ class SmcEngine:
         shipped via ws_server `frame.rv`; CommandRail consumes as-is (X28).
         """
         state = self._states.get((symbol, tf_s))
-        if state is None or not state.bars_list():
+        if state is None or not state.bar_count():
             return 1.0
-        from core.smc.swings import compute_rv
-
-        return compute_rv(state.bars_list(), period=period)
+        return rv_from_arrays(state.arrays().v, period=period)
 
     def get_bars(self, symbol: str, tf_s: int) -> List[CandleBar]:
         """ADR-0053: public accessor for bar buffer. [] if (symbol, tf_s) not tracked."""
@@ -426,12 +458,11 @@ class SmcEngine:
     def get_momentum_score(self, symbol: str, tf_s: int) -> Tuple[int, int]:
         """Momentum score (bull_count, bear_count) for given (symbol, tf)."""
         state = self._states.get((symbol, tf_s))
-        if state is None or not state.bars_list():
+        if state is None or not state.bar_count():
             return (0, 0)
         bars = state.bars_list()
-        from core.smc.swings import compute_atr
-
-        atr = compute_atr(bars, period=14)
+        arrays = state.arrays()
+        atr = atr_from_arrays(arrays.h, arrays.low, period=14)
         mom = self._config.momentum
         return compute_momentum_score(
             bars,
@@ -445,11 +476,13 @@ class SmcEngine:
         """ADR-0041: P/D position for (symbol, tf). Returns None if no data."""
         base_tf = self._VIEWER_TO_BASE.get(tf_s, tf_s)
         state = self._states.get((symbol, base_tf))
-        if state is None or not state.bars_list():
+        if state is None or not state.bar_count():
             return None
         bars = state.bars_list()
         cfg = self._config.for_tf(tf_s)
-        raw_swings = detect_raw_swings(bars, period=cfg.swing_period)
+        raw_swings = detect_raw_swings(
+            bars, period=cfg.swing_period, arrays=state.arrays()
+        )
         classified = classify_swings(raw_swings)
         current_price = bars[-1].c
         return compute_pd_state(classified, current_price, cfg)
@@ -476,52 +509,55 @@ class SmcEngine:
         if sym not in self._session_m1_bars:
             self._session_m1_bars[sym] = deque(maxlen=2880)  # 48h × 60 min
         self._session_m1_bars[sym].append(bar)
+        tracker = self._session_tracker(sym)
+        if tracker is not None:
+            tracker.feed(bar)
+        self._session_versions[sym] = self._session_versions.get(sym, 0) + 1
 
     def feed_m1_bars_bulk(self, symbol: str, bars: List[CandleBar]) -> None:
         """Bulk feed M1 bars (warmup). S0: pure."""
         if symbol not in self._session_m1_bars:
             self._session_m1_bars[symbol] = deque(maxlen=2880)
         q = self._session_m1_bars[symbol]
+        tracker = self._session_tracker(symbol)
         for b in bars:
             if b.tf_s == 60 and b.complete:
                 q.append(b)
+                if tracker is not None:
+                    tracker.feed(b)
+        self._session_versions[symbol] = self._session_versions.get(symbol, 0) + 1
+
+    def _session_tracker(self, symbol: str) -> Optional[SessionTracker]:
+        if not self._session_windows:
+            return None
+        tracker = self._session_trackers.get(symbol)
+        if tracker is None:
+            tracker = SessionTracker(self._session_windows)
+            self._session_trackers[symbol] = tracker
+        return tracker
 
     def get_session_levels(self, symbol: str, current_time_ms: int) -> List[SmcLevel]:
-        """Обчислити session H/L levels. S0: pure, S2: deterministic."""
+        """Обчислити session H/L levels. S0: pure, S2: deterministic.
+
+        Streaming SessionTracker (O(сесії) на виклик); reference —
+        compute_session_levels над _session_m1_bars (parity у тестах).
+        """
         if not self._session_windows or not self._config.sessions.enabled:
             return []
-        m1_bars = self._session_m1_bars.get(symbol)
-        if not m1_bars:
+        tracker = self._session_trackers.get(symbol)
+        if tracker is None:
             return []
-        from core.smc.sessions import compute_session_levels
-
-        sorted_bars = sorted(list(m1_bars), key=lambda b: b.open_time_ms)
-        levels, _states = compute_session_levels(
-            sorted_bars,
-            self._session_windows,
-            current_time_ms,
-            symbol,
-            tf_s=86400,
-        )
+        levels, _states = tracker.snapshot(current_time_ms, symbol, tf_s=86400)
         return levels
 
     def get_session_states(self, symbol: str, current_time_ms: int):
         """Get session states for narrative. Returns list of SessionState."""
         if not self._session_windows or not self._config.sessions.enabled:
             return []
-        m1_bars = self._session_m1_bars.get(symbol)
-        if not m1_bars:
+        tracker = self._session_trackers.get(symbol)
+        if tracker is None:
             return []
-        from core.smc.sessions import compute_session_levels
-
-        sorted_bars = sorted(list(m1_bars), key=lambda b: b.open_time_ms)
-        _levels, states = compute_session_levels(
-            sorted_bars,
-            self._session_windows,
-            current_time_ms,
-            symbol,
-            tf_s=86400,
-        )
+        _levels, states = tracker.snapshot(current_time_ms, symbol, tf_s=86400)
         return states
 
     def get_snapshot_with_htf_levels(
@@ -751,9 +787,26 @@ class SmcEngine:
           - OB zones via Context Stack (existing L1/L2 mechanism)
           - HTF key levels (existing)
 
+        performance.display_cache: composite (і zone grades) мемоізується per
+        (symbol, viewer_tf) з ключем = версії snapshot-ів усіх TF ≥ base
+        (лише вони контрибутять) + версія M1 буфера сесій і хвилина, якщо
+        base показує session levels. Між закриттями барів — dict lookup.
+
         S0: pure — reads _states dict, no I/O.
         """
-        # 1. Map viewer → base computed TF
+        base_tf = self._display_base_tf(viewer_tf_s)
+        if not self._config.performance.display_cache:
+            return self._build_display_snapshot(symbol, viewer_tf_s, base_tf)
+        key = self._display_versions(symbol, base_tf)
+        cached = self._display_cache.get((symbol, viewer_tf_s))
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        snap = self._build_display_snapshot(symbol, viewer_tf_s, base_tf)
+        self._display_cache[(symbol, viewer_tf_s)] = (key, snap)
+        return snap
+
+    def _display_base_tf(self, viewer_tf_s: int) -> int:
+        """Map viewer → base computed TF."""
         compute_tfs = self._config.compute_tfs
         base_tf = self._VIEWER_TO_BASE.get(viewer_tf_s)
         if base_tf is None:
@@ -764,7 +817,30 @@ class SmcEngine:
                     break
             if base_tf is None:
                 base_tf = max(compute_tfs) if compute_tfs else viewer_tf_s
+        return base_tf
+
+    def _display_versions(self, symbol: str, base_tf: int) -> tuple:
+        """Ключ display-кешу: версії TF ≥ base_tf (+ сесії/хвилина для session levels)."""
+        versions = tuple(
+            sorted(
+                (tf, state.version)
+                for (sym, tf), state in list(self._states.items())
+                if sym == symbol and tf >= base_tf
+            )
+        )
+        if self._KEY_LEVEL_ALLOW.get(base_tf) and self._config.sessions.enabled:
+            # session H/L залежать від поточного часу (активна сесія), не лише від барів
+            minute = int(time.time()) // 60
+            return versions, self._session_versions.get(symbol, 0), minute
+        return versions, None, None
 
+    def _build_display_snapshot(
+        self,
+        symbol: str,
+        viewer_tf_s: int,
+        base_tf: int,
+    ) -> SmcSnapshot:
+        """Тіло get_display_snapshot (без кешу), кроки 2–7."""
         snap = self.get_snapshot(symbol, base_tf)
 
         # 2. Separate base swings: keep structure only if base is in STRUCTURE_TFS
@@ -941,10 +1017,34 @@ class SmcEngine:
         key = (symbol, tf_s)
         if key in self._states:
             del self._states[key]
+            self._display_cache = {
+                k: v for k, v in self._display_cache.items() if k[0] != symbol
+            }
             _log.info("SMC_RESET sym=%s tf=%d", symbol, tf_s)
 
     # ── Private ─────────────────────────────────────────────────────
 
+    def _sync_incremental(
+        self,
+        state: _TfState,
+        bar: CandleBar,
+        replaced: bool,
+        bars: List[CandleBar],
+    ) -> None:
+        """Подає бар у стан детекторів; replace/out-of-order → rebuild з вікна."""
+        inc = state._inc
+        if inc is not None and not replaced and inc.append(bar):
+            return
+        state._inc = IncrementalDetectors.build(
+            self._config.for_tf(bar.tf_s), self._config.lookback_bars, bars
+        )
+        if state._inc is None:
+            _log.debug(
+                "SMC_INCREMENTAL_FALLBACK sym=%s tf=%d reason=non_monotonic_window",
+                bar.symbol,
+                bar.tf_s,
+            )
+
     def _get_or_create(self, symbol: str, tf_s: int) -> _TfState:
         key = (symbol, tf_s)
         if key not in self._states:
@@ -973,33 +1073,28 @@ class SmcEngine:
         cfg = self._config.for_tf(tf_s)
 
         # ── F4: ATR once, pass to all detectors ──
-        from core.smc.swings import compute_atr
-
-        atr = compute_atr(bars, period=14)
-
-        # ── E1.1: Raw swings ──
-        raw_swings = detect_raw_swings(bars, period=cfg.swing_period)
-
-        # ── E1.2: Classify + Structure events ──
-        classified = classify_swings(raw_swings)
-        struct_events, trend_bias, last_bos_ms, last_choch_ms = detect_structure_events(
-            classified, bars, config=cfg.structure
-        )
+        # E1.1–E2.7 + fractals + displacement: incremental стан, якщо він
+        # синхронний з вікном, інакше full recompute (S2: результат однаковий)
+        inc = state._inc
+        if inc is not None and inc.bar_count == len(bars) and inc.last_bar is bars[-1]:
+            det = inc.detect()
+        else:
+            arrays = None  # type: Optional[BarArrays]
+            if state.bar_count() == len(bars) and state._bars.last() is bars[-1]:
+                arrays = state.arrays()
+            det = detect_all(bars, cfg, arrays=arrays)
+        atr = det.atr
+        classified = det.classified
+        struct_events = det.struct_events
+        trend_bias = det.trend_bias
+        last_bos_ms = det.last_bos_ms
+        last_choch_ms = det.last_choch_ms
 
         all_swings = classified + struct_events
         all_swings.sort(key=lambda s: s.time_ms)
 
-        # ── E1.3: Order Blocks ──
-        ob_zones = detect_order_blocks(bars, struct_events, cfg, atr=atr)
-
-        # ── E1.4: FVG ──
-        fvg_zones = detect_fvg(bars, cfg, atr=atr)
-
-        # ── E2.6: Premium/Discount Zones ──
-        pd_zones: List[SmcZone] = detect_premium_discount(classified, bars, cfg)
-
         # ── N1: Zone lifecycle (merge, FVG evict, mitigate, decay, cap) ──
-        fresh_zones: List[SmcZone] = ob_zones + fvg_zones + pd_zones
+        fresh_zones: List[SmcZone] = det.ob_zones + det.fvg_zones + det.pd_zones
         last_bar = bars[-1] if bars else None
         all_zones = _update_zone_lifecycle(
             fresh_zones,
@@ -1010,39 +1105,13 @@ class SmcEngine:
             struct_events=struct_events,
         )
 
-        # ── E2.5: Liquidity Levels (Equal Highs / Equal Lows) ──
-        # Передаємо classified (hh/hl/lh/ll) — вони містять confirmed info
-        levels: List[SmcLevel] = detect_liquidity_levels(classified, bars, cfg, atr=atr)
+        # ── E2.5 Liquidity (EQH/EQL) + ADR-0024b Key Levels ──
+        levels: List[SmcLevel] = det.liquidity + det.key_levels
 
-        # ── ADR-0024b: Key Levels per TF (PDH/PDL, H4H/L, H1H/L, ...) ──
-        key_lvls = compute_key_levels(bars)
-        levels = levels + key_lvls
-
-        # ── E2.7: Inducement (False Breakout Trap) ──
-        inducement_swings: List[SmcSwing] = detect_inducement(
-            bars, classified, cfg, atr=atr
-        )
-        if inducement_swings:
-            all_swings = all_swings + inducement_swings
-            all_swings.sort(key=lambda s: s.time_ms)
-
-        # ── Williams Fractals (display-only, separate from structure chain) ──
-        fractal_swings = detect_fractals(bars, period=cfg.fractal_period)
-        if fractal_swings:
-            all_swings = all_swings + fractal_swings
-            all_swings.sort(key=lambda s: s.time_ms)
-
-        # ── Displacement candles (momentum markers) ──
-        mom_cfg = cfg.momentum
-        if mom_cfg.enabled:
-            disp_swings = detect_displacement(
-                bars,
-                atr,
-                min_body_atr=mom_cfg.min_body_atr_mult,
-                max_wick_ratio=mom_cfg.max_wick_ratio,
-            )
-            if disp_swings:
-                all_swings = all_swings + disp_swings
+        # ── E2.7 Inducement, Williams Fractals, Displacement markers ──
+        for extra in (det.inducements, det.fractals, det.displacements):
+            if extra:
+                all_swings = all_swings + extra
                 all_swings.sort(key=lambda s: s.time_ms)
 
         snap = SmcSnapshot(
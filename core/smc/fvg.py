@@ -12,7 +12,10 @@ from __future__ import annotations
 import dataclasses
 from typing import List, Optional
 
+import numpy as np
+
 from core.model.bars import CandleBar
+from core.smc.bar_window import BarArrays
 from core.smc.config import SmcConfig
 from core.smc.swings import compute_atr
 from core.smc.types import SmcZone, make_zone_id
@@ -22,6 +25,7 @@ def detect_fvg(
     bars: List[CandleBar],
     config: SmcConfig,
     atr: float = 0.0,       # F4: caller-supplied ATR (0 → compute internally)
+    arrays: Optional[BarArrays] = None,  # колонки того ж вікна (BarWindow.views())
 ) -> List[SmcZone]:
     """Виявляє Fair Value Gaps (3-свічковий патерн, ADR §4.4).
 
@@ -41,6 +45,8 @@ def detect_fvg(
 
     if atr <= 0.0:
         atr = compute_atr(bars, period=14)
+    if arrays is None:
+        arrays = BarArrays.from_bars(bars)
 
     zones: List[SmcZone] = []
     seen_ids = set()  # type: set
@@ -48,11 +54,14 @@ def detect_fvg(
     # Detect ALL FVG candidates — NO gap-size or height filters.
     # FVG is a pure 3-candle pattern. Filtering is the caller's job.
     # Capped by max_active after lifecycle update.
-    for i in range(len(bars) - 2):
+    h, low = arrays.h, arrays.low
+    bull = h[:-2] < low[2:]
+    bear = ~bull & (low[:-2] > h[2:])
+    for i in np.flatnonzero(bull | bear).tolist():
         b0, b1, b2 = bars[i], bars[i + 1], bars[i + 2]
 
         # Bullish FVG: b0.high < b2.low
-        if b0.h < b2.low:
+        if bull[i]:
             gap_size = b2.low - b0.h
             zone_id = make_zone_id("fvg_bull", b1.symbol, b1.tf_s, b1.open_time_ms)
             if zone_id not in seen_ids:
@@ -73,7 +82,7 @@ def detect_fvg(
                 ))
 
         # Bearish FVG: b0.low > b2.high
-        elif b0.low > b2.h:
+        else:
             gap_size = b0.low - b2.h
             zone_id = make_zone_id("fvg_bear", b1.symbol, b1.tf_s, b1.open_time_ms)
             if zone_id not in seen_ids:
@@ -95,7 +104,9 @@ def detect_fvg(
 
     # Оновлюємо статус (fill check) + IFVG creation
     ifvg_enabled = config.tda.enabled and config.tda.ifvg_enabled
-    zones, new_ifvgs = _update_fvg_status(zones, bars, ifvg_enabled=ifvg_enabled)
+    zones, new_ifvgs = _update_fvg_status(
+        zones, bars, ifvg_enabled=ifvg_enabled, arrays=arrays
+    )
 
     # Cap: keep strongest non-filled, then include filled (for dimmed rendering)
     active = [z for z in zones if z.status != "filled"]
@@ -117,6 +128,7 @@ def _update_fvg_status(
     zones: List[SmcZone],
     bars: List[CandleBar],
     ifvg_enabled: bool = False,
+    arrays: Optional[BarArrays] = None,
 ):
     # type: (...) -> tuple
     """Оновлює lifecycle статус FVG зон. Повертає (updated_zones, new_ifvg_zones).
@@ -125,45 +137,30 @@ def _update_fvg_status(
     partially_filled → filled:  ціна ЗАКРИЛАСЬ за протилежну межу
     active → filled:            ціна одразу пробила повністю
 
+    Vectorized: матриця зони × бари (complete, після anchor) → перший fill,
+    наявність входу. Семантика = послідовний fvg_status_step по барах.
+
     ADR-0034 P0: якщо ifvg_enabled і FVG став filled → створює IFVG з тими ж межами,
     інвертованим kind та origin_zone_id що вказує на source FVG.
     """
+    if not zones:
+        return [], []
+    if arrays is None:
+        arrays = BarArrays.from_bars(bars)
+    fill_idx, entered = _fvg_fill_scan(zones, arrays)
+
     updated = []
     new_ifvgs = []  # type: List[SmcZone]
-    for zone in zones:
+    for k, zone in enumerate(zones):
         current_status = zone.status
         current_end_ms = zone.end_ms
         fill_bar_ms = None  # type: Optional[int]
-
-        for bar in bars:
-            if bar.open_time_ms <= zone.anchor_bar_ms:
-                continue
-            if not bar.complete:
-                continue
-
-            if zone.kind == "fvg_bull":
-                enters = bar.low <= zone.high and bar.h >= zone.low
-                fills  = bar.c <= zone.low   # close нижче нижньої межі = fill from below
-
-                if fills and current_status in ("active", "partially_filled"):
-                    current_status = "filled"
-                    current_end_ms = bar.open_time_ms
-                    fill_bar_ms = bar.open_time_ms
-                    break
-                elif enters and current_status == "active":
-                    current_status = "partially_filled"
-
-            else:  # fvg_bear
-                enters = bar.h >= zone.low and bar.low <= zone.high
-                fills  = bar.c >= zone.high  # close вище верхньої межі
-
-                if fills and current_status in ("active", "partially_filled"):
-                    current_status = "filled"
-                    current_end_ms = bar.open_time_ms
-                    fill_bar_ms = bar.open_time_ms
-                    break
-                elif enters and current_status == "active":
-                    current_status = "partially_filled"
+        if fill_idx[k] >= 0 and current_status in ("active", "partially_filled"):
+            current_status = "filled"
+            fill_bar_ms = int(arrays.open_ms[fill_idx[k]])
+            current_end_ms = fill_bar_ms
+        elif entered[k] and current_status == "active":
+            current_status = "partially_filled"
 
         updated.append(dataclasses.replace(
             zone, status=current_status, end_ms=current_end_ms,
@@ -191,3 +188,61 @@ def _update_fvg_status(
             ))
 
     return updated, new_ifvgs
+
+
+# Обмеження розміру матриці зони × бари (bool) на один chunk
+_SCAN_CELLS = 2_000_000
+
+
+def _fvg_fill_scan(zones: List[SmcZone], arrays: BarArrays):
+    # type: (...) -> Tuple[np.ndarray, np.ndarray]
+    """→ (fill_idx, entered): перший fill-бар (-1 якщо немає) і чи був вхід.
+
+    Бари рахуються лише complete і після anchor (як у fvg_status_step).
+    """
+    n_z = len(zones)
+    fill_idx = np.full(n_z, -1, np.intp)
+    entered = np.zeros(n_z, np.bool_)
+    n = len(arrays.open_ms)
+    if n == 0:
+        return fill_idx, entered
+
+    anchor = np.fromiter((z.anchor_bar_ms for z in zones), np.int64, n_z)
+    z_high = np.fromiter((z.high for z in zones), np.float64, n_z)
+    z_low = np.fromiter((z.low for z in zones), np.float64, n_z)
+    is_bull = np.fromiter((z.kind == "fvg_bull" for z in zones), np.bool_, n_z)
+
+    step = max(1, _SCAN_CELLS // n)
+    for a in range(0, n_z, step):
+        b = min(n_z, a + step)
+        after = (arrays.open_ms[None, :] > anchor[a:b, None]) & arrays.complete[None, :]
+        fills = np.where(
+            is_bull[a:b, None],
+            arrays.c[None, :] <= z_low[a:b, None],   # close нижче нижньої межі
+            arrays.c[None, :] >= z_high[a:b, None],  # close вище верхньої межі
+        ) & after
+        enters = (
+            (arrays.low[None, :] <= z_high[a:b, None])
+            & (arrays.h[None, :] >= z_low[a:b, None])
+            & after
+        )
+        has_fill = fills.any(axis=1)
+        fill_idx[a:b] = np.where(has_fill, fills.argmax(axis=1), -1)
+        entered[a:b] = enters.any(axis=1)
+    return fill_idx, entered
+
+
+def fvg_status_step(zone: SmcZone, status: str, bar: CandleBar) -> str:
+    """Один крок lifecycle FVG на complete барі після anchor → новий status."""
+    if zone.kind == "fvg_bull":
+        enters = bar.low <= zone.high and bar.h >= zone.low
+        fills = bar.c <= zone.low   # close нижче нижньої межі = fill from below
+    else:  # fvg_bear
+        enters = bar.h >= zone.low and bar.low <= zone.high
+        fills = bar.c >= zone.high  # close вище верхньої межі
+
+    if fills and status in ("active", "partially_filled"):
+        return "filled"
+    if enters and status == "active":
+        return "partially_filled"
+    return status
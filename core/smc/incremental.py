@@ -0,0 +1,760 @@
+"""
+core/smc/incremental.py — Інкрементальні детектори SMC для одного (symbol, tf).
+
+Повний шлях (detect_all) на кожен закритий бар перераховує ATR, swings,
+structure, OB, FVG, inducement, fractals, displacement над усім lookback-вікном.
+IncrementalDetectors тримає стан кожного детектора і обробляє лише новий бар:
+
+  - ATR: хвіст з period барів (той самий порядок сумування, що compute_atr);
+  - pivot-трекери (raw swings / fractals / minor swings): підтверджується
+    лише кандидат n-1-period; зсув вікна відкидає свінги з лівого краю;
+  - classify: HH/LH, LL/HL відносно попереднього свінга тієї ж сторони;
+    після зсуву перекласифікується тільки перший свінг сторони;
+  - structure: checkpoint стану автомата на кожен бар. Новий підтверджений
+    свінг → replay лише від його бару (period+1 барів). Зсув вікна → replay
+    від нового початку до збіжності з попередньою траєкторією;
+  - OB/FVG: статус (tested/mitigated, partially_filled/filled) дораховується
+    лише по нових барах; strength перераховується від поточного ATR;
+  - inducement: trap/reversal кожного minor swing дораховуються по нових барах.
+
+Контракт (S2): detect() == detect_all() над тим самим вікном — перевіряється
+tests/test_smc_incremental_parity.py. Бар не пізніше за останній (replace,
+out-of-order) → append() повертає False, caller робить rebuild/full recompute.
+
+S0: pure logic, NO I/O.
+Python 3.7 compatible.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+from bisect import bisect_left
+from typing import List, NamedTuple, Optional, Sequence, Tuple
+
+from core.model.bars import CandleBar
+from core.smc.bar_window import BarArrays
+from core.smc.config import SmcConfig
+from core.smc.fvg import detect_fvg, fvg_status_step
+from core.smc.inducement import _SEARCH_WINDOW, detect_inducement
+from core.smc.key_levels import compute_key_levels
+from core.smc.liquidity import detect_liquidity_levels
+from core.smc.momentum import detect_displacement
+from core.smc.order_blocks import (
+    detect_ob_candidates,
+    detect_order_blocks,
+    ob_status_step,
+)
+from core.smc.premium_discount import detect_premium_discount
+from core.smc.structure import (
+    STRUCTURE_INIT_STATE,
+    classify_swings,
+    detect_structure_events,
+    structure_step,
+)
+from core.smc.swings import (
+    atr_from_arrays,
+    compute_atr,
+    detect_fractals,
+    detect_raw_swings,
+)
+from core.smc.types import SmcLevel, SmcSwing, SmcZone, make_swing_id, make_zone_id
+
+_ATR_PERIOD = 14
+
+
+class Detections(NamedTuple):
+    """Виходи всіх E1/E2 детекторів над одним вікном барів."""
+
+    atr: float
+    classified: List[SmcSwing]
+    struct_events: List[SmcSwing]
+    trend_bias: Optional[str]
+    last_bos_ms: Optional[int]
+    last_choch_ms: Optional[int]
+    ob_zones: List[SmcZone]
+    fvg_zones: List[SmcZone]
+    pd_zones: List[SmcZone]
+    liquidity: List[SmcLevel]
+    key_levels: List[SmcLevel]
+    inducements: List[SmcSwing]
+    fractals: List[SmcSwing]
+    displacements: List[SmcSwing]
+
+
+def detect_all(
+    bars: List[CandleBar], cfg: SmcConfig, arrays: Optional[BarArrays] = None
+) -> Detections:
+    """Повний перерахунок усіх детекторів (reference для incremental).
+
+    arrays: колонки того ж вікна (BarWindow.views()); None → будуються з bars.
+    """
+    if arrays is None:
+        arrays = BarArrays.from_bars(bars)
+    atr = atr_from_arrays(arrays.h, arrays.low, period=_ATR_PERIOD)
+    raw_swings = detect_raw_swings(bars, period=cfg.swing_period, arrays=arrays)
+    classified = classify_swings(raw_swings)
+    struct_events, trend_bias, last_bos_ms, last_choch_ms = detect_structure_events(
+        classified, bars, config=cfg.structure
+    )
+    mom_cfg = cfg.momentum
+    if mom_cfg.enabled:
+        displacements = detect_displacement(
+            bars,
+            atr,
+            min_body_atr=mom_cfg.min_body_atr_mult,
+            max_wick_ratio=mom_cfg.max_wick_ratio,
+        )
+    else:
+        displacements = []
+    return Detections(
+        atr=atr,
+        classified=classified,
+        struct_events=struct_events,
+        trend_bias=trend_bias,
+        last_bos_ms=last_bos_ms,
+        last_choch_ms=last_choch_ms,
+        ob_zones=detect_order_blocks(bars, struct_events, cfg, atr=atr),
+        fvg_zones=detect_fvg(bars, cfg, atr=atr, arrays=arrays),
+        pd_zones=detect_premium_discount(classified, bars, cfg),
+        liquidity=detect_liquidity_levels(classified, bars, cfg, atr=atr),
+        key_levels=compute_key_levels(bars),
+        inducements=detect_inducement(bars, classified, cfg, atr=atr),
+        fractals=detect_fractals(bars, period=cfg.fractal_period, arrays=arrays),
+        displacements=displacements,
+    )
+
+
+# ── Pivot tracker ────────────────────────────────────────────────────
+
+
+class _PivotTracker:
+    """Fractal pivots (detect_raw_swings / detect_fractals) по одному бару."""
+
+    __slots__ = ("period", "_hi_prefix", "_lo_prefix", "_hi_kind", "_lo_kind", "swings")
+
+    def __init__(
+        self, period: int, hi_prefix: str, lo_prefix: str, hi_kind: str, lo_kind: str
+    ) -> None:
+        self.period = period
+        self._hi_prefix = hi_prefix
+        self._lo_prefix = lo_prefix
+        self._hi_kind = hi_kind
+        self._lo_kind = lo_kind
+        self.swings = []  # type: List[SmcSwing]
+
+    def on_append(self, bars: List[CandleBar]) -> Tuple[List[SmcSwing], List[SmcSwing]]:
+        """Оновлює свінги після append (і можливого зсуву) → (dropped, added)."""
+        p = self.period
+        n = len(bars)
+        swings = self.swings
+        dropped = []  # type: List[SmcSwing]
+        if swings and n > p:
+            # Після зсуву бар з індексом < period вже не може бути pivot
+            cut = bars[p].open_time_ms
+            k = 0
+            while k < len(swings) and swings[k].time_ms < cut:
+                k += 1
+            if k:
+                dropped = swings[:k]
+                del swings[:k]
+
+        added = []  # type: List[SmcSwing]
+        i = n - 1 - p
+        if i < p:
+            return dropped, added
+        b = bars[i]
+        left = bars[i - p : i]
+        right = bars[i + 1 : n]
+        if b.h > max(x.h for x in left) and b.h >= max(x.h for x in right):
+            added.append(
+                SmcSwing(
+                    id=make_swing_id(self._hi_prefix, b.symbol, b.tf_s, b.open_time_ms),
+                    symbol=b.symbol,
+                    tf_s=b.tf_s,
+                    kind=self._hi_kind,
+                    price=b.h,
+                    time_ms=b.open_time_ms,
+                    confirmed=True,
+                )
+            )
+        if b.low < min(x.low for x in left) and b.low <= min(x.low for x in right):
+            added.append(
+                SmcSwing(
+                    id=make_swing_id(self._lo_prefix, b.symbol, b.tf_s, b.open_time_ms),
+                    symbol=b.symbol,
+                    tf_s=b.tf_s,
+                    kind=self._lo_kind,
+                    price=b.low,
+                    time_ms=b.open_time_ms,
+                    confirmed=True,
+                )
+            )
+        swings.extend(added)
+        return dropped, added
+
+
+def _reclassify(s: SmcSwing, kind: str) -> SmcSwing:
+    # classify_swings завжди перебудовує id з нового kind (sh_/sl_ → hh_/ll_…)
+    swing_id = make_swing_id(kind, s.symbol, s.tf_s, s.time_ms)
+    if s.kind == kind and s.id == swing_id:
+        return s
+    return dataclasses.replace(
+        s, kind=kind, id=swing_id
+    )
+
+
+# ── Per-zone incremental records ─────────────────────────────────────
+
+
+class _FvgRec:
+    """FVG-кандидат (3-свічковий патерн) + його lifecycle статус."""
+
+    __slots__ = ("zone", "gap", "status", "end_ms", "fill_ms")
+
+    def __init__(self, zone: SmcZone, gap: float) -> None:
+        self.zone = zone  # status/strength тут не актуальні — див. _fvg_zones
+        self.gap = gap
+        self.status = "active"
+        self.end_ms = None  # type: Optional[int]
+        self.fill_ms = None  # type: Optional[int]
+
+
+class _ObStatus:
+    __slots__ = ("status", "end_ms", "next_seq")
+
+    def __init__(self, next_seq: int) -> None:
+        self.status = "active"
+        self.end_ms = None  # type: Optional[int]
+        self.next_seq = next_seq
+
+
+class _InducementRec:
+    """Minor swing: пошук trap candle + reversal після нього."""
+
+    __slots__ = ("swing", "seq", "next_seq", "trap", "trap_seq", "reversal")
+
+    def __init__(self, swing: SmcSwing, seq: int) -> None:
+        self.swing = swing
+        self.seq = seq
+        self.next_seq = seq + 1
+        self.trap = None  # type: Optional[CandleBar]
+        self.trap_seq = -1
+        self.reversal = 0.0
+
+
+class _WindowIndex:
+    """open_time_ms → позиція у вікні (Mapping.get для detect_ob_candidates)."""
+
+    __slots__ = ("_times",)
+
+    def __init__(self, times: List[int]) -> None:
+        self._times = times
+
+    def get(self, t: int, default: Optional[int] = None) -> Optional[int]:
+        i = bisect_left(self._times, t)
+        if i < len(self._times) and self._times[i] == t:
+            return i
+        return default
+
+
+# ── Incremental detectors ────────────────────────────────────────────
+
+
+class IncrementalDetectors:
+    """Стан усіх детекторів для одного вікна (symbol, tf_s)."""
+
+    def __init__(self, cfg: SmcConfig, maxlen: int) -> None:
+        self._cfg = cfg
+        self._maxlen = max(1, maxlen)
+        self._confirmation_bars = max(1, cfg.structure.confirmation_bars)
+        self._bars = []  # type: List[CandleBar]
+        self._times = []  # type: List[int]
+        self._base = 0  # абсолютний seq бару _bars[0]
+        self._last_complete_seq = -1
+
+        self._swings = _PivotTracker(cfg.swing_period, "sh", "sl", "hh", "ll")
+        self._fractals = _PivotTracker(
+            cfg.fractal_period, "fh", "fl", "fractal_high", "fractal_low"
+        )
+        self._minor = _PivotTracker(cfg.inducement.minor_period, "sh", "sl", "hh", "ll")
+
+        # classify: окремо highs/lows (як classify_swings), merged — lazy
+        self._cls_hi = []  # type: List[SmcSwing]
+        self._cls_lo = []  # type: List[SmcSwing]
+        self._cls_merged = None  # type: Optional[List[SmcSwing]]
+        self._hi_at = {}  # type: Dict[int, SmcSwing]
+        self._lo_at = {}  # type: Dict[int, SmcSwing]
+
+        # structure: стан автомата ПІСЛЯ бару k і подія на ньому
+        self._st = []  # type: List[tuple]
+        self._ev = []  # type: List[Optional[SmcSwing]]
+
+        self._fvg = []  # type: List[_FvgRec]
+        self._ob = {}  # type: Dict[tuple, _ObStatus]
+        self._ind = []  # type: List[_InducementRec]
+        self._disp = []  # type: List[Tuple[float, SmcSwing]]
+
+    # ── feed ──────────────────────────────────────────────────────────
+
+    @property
+    def bar_count(self) -> int:
+        return len(self._bars)
+
+    @property
+    def last_bar(self) -> Optional[CandleBar]:
+        return self._bars[-1] if self._bars else None
+
+    @classmethod
+    def build(
+        cls, cfg: SmcConfig, maxlen: int, bars: Sequence[CandleBar]
+    ) -> Optional["IncrementalDetectors"]:
+        """Стан з нуля по вікну барів; None якщо бари не строго зростають."""
+        inc = cls(cfg, maxlen)
+        for b in bars:
+            if not inc.append(b):
+                return None
+        return inc
+
+    def append(self, bar: CandleBar) -> bool:
+        """Додає бар (зсуваючи вікно). False → бар не пізніше за останній."""
+        if self._times and bar.open_time_ms <= self._times[-1]:
+            return False
+
+        slid = len(self._bars) >= self._maxlen
+        if slid:
+            del self._bars[0]
+            del self._times[0]
+            del self._st[0]
+            del self._ev[0]
+            self._base += 1
+        self._bars.append(bar)
+        self._times.append(bar.open_time_ms)
+        seq = self._base + len(self._bars) - 1
+        if bar.complete:
+            self._last_complete_seq = seq
+
+        front_ms, new_ms = self._update_swings()
+        self._fractals.on_append(self._bars)
+        self._update_structure(slid, front_ms, new_ms)
+        self._update_fvg(bar)
+        self._update_inducements()
+        self._update_displacement(bar)
+        if slid:
+            self._evict_front()
+        return True
+
+    def _update_swings(self) -> Tuple[Optional[int], Optional[int]]:
+        """Raw swings + classify → (front_ms, new_ms) змін входів structure."""
+        dropped, added = self._swings.on_append(self._bars)
+        front_ms = None  # type: Optional[int]
+        new_ms = None  # type: Optional[int]
+        if not dropped and not added:
+            return front_ms, new_ms
+        self._cls_merged = None
+
+        for s in dropped:
+            front_ms = s.time_ms if front_ms is None else max(front_ms, s.time_ms)
+            if s.kind == "hh":
+                self._hi_at.pop(self._cls_hi.pop(0).time_ms, None)
+            else:
+                self._lo_at.pop(self._cls_lo.pop(0).time_ms, None)
+        # Перший свінг сторони класифікується за замовчуванням (HH / LL)
+        if dropped:
+            for side, at, kind in (
+                (self._cls_hi, self._hi_at, "hh"),
+                (self._cls_lo, self._lo_at, "ll"),
+            ):
+                if side and side[0].kind != kind:
+                    side[0] = _reclassify(side[0], kind)
+                    at[side[0].time_ms] = side[0]
+                    front_ms = max(front_ms, side[0].time_ms)  # type: ignore[type-var]
+
+        for s in added:
+            new_ms = s.time_ms
+            if s.kind == "hh":
+                prev = self._cls_hi[-1] if self._cls_hi else None
+                kind = "hh" if prev is None or s.price > prev.price else "lh"
+                c = _reclassify(s, kind)
+                self._cls_hi.append(c)
+                self._hi_at[c.time_ms] = c
+            else:
+                prev = self._cls_lo[-1] if self._cls_lo else None
+                kind = "ll" if prev is None or s.price < prev.price else "hl"
+                c = _reclassify(s, kind)
+                self._cls_lo.append(c)
+                self._lo_at[c.time_ms] = c
+        return front_ms, new_ms
+
+    def _swing_at(self, t: int) -> Tuple[SmcSwing, ...]:
+        # detect_structure_events: {time_ms: s} — low перезаписує high того ж бару
+        s = self._lo_at.get(t) or self._hi_at.get(t)
+        return (s,) if s is not None else ()
+
+    def _update_structure(
+        self, slid: bool, front_ms: Optional[int], new_ms: Optional[int]
+    ) -> None:
+        bars = self._bars
+        n = len(bars)
+        conf = self._confirmation_bars
+        st = self._st
+        ev = self._ev
+        # r: перший бар, вхід якого змінився через новий підтверджений свінг
+        r = n - 1 if new_ms is None else bisect_left(self._times, new_ms)
+
+        if slid:
+            # st/ev — траєкторія від попереднього початку вікна (зсунута на 1).
+            # Replay від нового початку; як тільки стан збігся після останньої
+            # зміни входів на лівому краї — решта траєкторії ідентична.
+            new_st = []  # type: List[tuple]
+            new_ev = []  # type: List[Optional[SmcSwing]]
+            state = STRUCTURE_INIT_STATE
+            for k in range(r):
+                b = bars[k]
+                state, e = structure_step(
+                    state, b, self._swing_at(b.open_time_ms), conf
+                )
+                new_st.append(state)
+                new_ev.append(e)
+                if (front_ms is None or b.open_time_ms >= front_ms) and state == st[k]:
+                    new_st.extend(st[k + 1 : r])
+                    new_ev.extend(ev[k + 1 : r])
+                    break
+            st = new_st
+            ev = new_ev
+        else:
+            del st[r:]
+            del ev[r:]
+
+        state = st[r - 1] if r > 0 else STRUCTURE_INIT_STATE
+        for k in range(r, n):
+            b = bars[k]
+            state, e = structure_step(state, b, self._swing_at(b.open_time_ms), conf)
+            st.append(state)
+            ev.append(e)
+        self._st = st
+        self._ev = ev
+
+    def _update_fvg(self, bar: CandleBar) -> None:
+        bars = self._bars
+        if len(bars) >= 3:
+            b0, b1, b2 = bars[-3], bars[-2], bars[-1]
+            rec = None  # type: Optional[_FvgRec]
+            if b0.h < b2.low:
+                rec = _FvgRec(
+                    SmcZone(
+                        id=make_zone_id("fvg_bull", b1.symbol, b1.tf_s, b1.open_time_ms),
+                        symbol=b1.symbol,
+                        tf_s=b1.tf_s,
+                        kind="fvg_bull",
+                        start_ms=b0.open_time_ms,
+                        end_ms=None,
+                        high=b2.low,
+                        low=b0.h,
+                        status="active",
+                        strength=0.0,
+                        anchor_bar_ms=b1.open_time_ms,
+                    ),
+                    b2.low - b0.h,
+                )
+            elif b0.low > b2.h:
+                rec = _FvgRec(
+                    SmcZone(
+                        id=make_zone_id("fvg_bear", b1.symbol, b1.tf_s, b1.open_time_ms),
+                        symbol=b1.symbol,
+                        tf_s=b1.tf_s,
+                        kind="fvg_bear",
+                        start_ms=b0.open_time_ms,
+                        end_ms=None,
+                        high=b0.low,
+                        low=b2.h,
+                        status="active",
+                        strength=0.0,
+                        anchor_bar_ms=b1.open_time_ms,
+                    ),
+                    b0.low - b2.h,
+                )
+            if rec is not None:
+                self._fvg.append(rec)
+
+        if not bar.complete:
+            return
+        # Новий бар — пізніший за anchor кожного кандидата (b1 ≤ bars[-2])
+        for rec in self._fvg:
+            if rec.status == "filled":
+                continue
+            status = fvg_status_step(rec.zone, rec.status, bar)
+            if status == "filled":
+                rec.end_ms = bar.open_time_ms
+                rec.fill_ms = bar.open_time_ms
+            rec.status = status
+
+    def _update_inducements(self) -> None:
+        _dropped, added = self._minor.on_append(self._bars)
+        if self._ind and self._minor.swings:
+            first = self._minor.swings[0].time_ms
+            while self._ind and self._ind[0].swing.time_ms < first:
+                del self._ind[0]
+        elif not self._minor.swings:
+            self._ind = []
+        for s in added:
+            self._ind.append(_InducementRec(s, self._seq_of(s.time_ms)))
+
+        bars = self._bars
+        base = self._base
+        last_seq = base + len(bars) - 1
+        conf = self._cfg.inducement.confirmation_bars
+        for rec in self._ind:
+            is_high = rec.swing.kind == "hh"
+            price = rec.swing.price
+            while rec.next_seq <= last_seq:
+                seq = rec.next_seq
+                if rec.trap is None:
+                    if seq > rec.seq + _SEARCH_WINDOW:
+                        break  # trap не знайдено у вікні пошуку
+                    b = bars[seq - base]
+                    if is_high:
+                        hit = b.h > price and b.c < price
+                    else:
+                        hit = b.low < price and b.c > price
+                    if hit:
+                        rec.trap = b
+                        rec.trap_seq = seq
+                else:
+                    if seq > rec.trap_seq + conf:
+                        break  # reversal остаточний
+                    c = bars[seq - base].c
+                    move = price - c if is_high else c - price
+                    if move > rec.reversal:
+                        rec.reversal = move
+                rec.next_seq = seq + 1
+
+    def _update_displacement(self, bar: CandleBar) -> None:
+        body = abs(bar.c - bar.o)
+        rng = bar.h - bar.low
+        if rng <= 0:
+            return
+        if body / rng < (1.0 - self._cfg.momentum.max_wick_ratio):
+            return
+        is_bull = bar.c > bar.o
+        self._disp.append(
+            (
+                body,
+                SmcSwing(
+                    id=make_swing_id(
+                        "db" if is_bull else "ds", bar.symbol, bar.tf_s, bar.open_time_ms
+                    ),
+                    symbol=bar.symbol,
+                    tf_s=bar.tf_s,
+                    kind="displacement_bull" if is_bull else "displacement_bear",
+                    price=bar.c,
+                    time_ms=bar.open_time_ms,
+                    confirmed=True,
+                ),
+            )
+        )
+
+    def _evict_front(self) -> None:
+        """Прибирає стан, що посилається на бари лівіше нового початку вікна."""
+        front = self._times[0]
+        k = 0
+        while k < len(self._fvg) and self._fvg[k].zone.start_ms < front:
+            k += 1
+        if k:
+            del self._fvg[:k]
+        k = 0
+        while k < len(self._disp) and self._disp[k][1].time_ms < front:
+            k += 1
+        if k:
+            del self._disp[:k]
+        if self._ob:
+            stale = [key for key in self._ob if key[4] < front]
+            for key in stale:
+                del self._ob[key]
+
+    def _seq_of(self, t: int) -> int:
+        return self._base + bisect_left(self._times, t)
+
+    # ── outputs ───────────────────────────────────────────────────────
+
+    def classified(self) -> List[SmcSwing]:
+        if self._cls_merged is None:
+            merged = self._cls_hi + self._cls_lo
+            merged.sort(key=lambda s: s.time_ms)
+            self._cls_merged = merged
+        return self._cls_merged
+
+    def detect(self) -> Detections:
+        """Ті самі виходи, що detect_all(bars, cfg) над поточним вікном."""
+        cfg = self._cfg
+        bars = self._bars
+        atr = compute_atr(bars[-_ATR_PERIOD:], period=_ATR_PERIOD)
+        classified = list(self.classified())
+        if classified and bars:
+            struct_events = [e for e in self._ev if e is not None]
+            trend_bias, last_bos_ms, last_choch_ms = self._st[-1][:3]
+        else:
+            struct_events, trend_bias, last_bos_ms, last_choch_ms = [], None, None, None
+
+        mom_cfg = cfg.momentum
+        if mom_cfg.enabled and atr > 0 and bars:
+            min_body = mom_cfg.min_body_atr_mult * atr
+            displacements = [s for body, s in self._disp if not body < min_body]
+        else:
+            displacements = []
+
+        key_bars = []  # type: List[CandleBar]
+        if self._last_complete_seq >= self._base:
+            key_bars.append(bars[self._last_complete_seq - self._base])
+        if bars and (not key_bars or key_bars[-1] is not bars[-1]):
+            key_bars.append(bars[-1])
+
+        return Detections(
+            atr=atr,
+            classified=classified,
+            struct_events=struct_events,
+            trend_bias=trend_bias,
+            last_bos_ms=last_bos_ms,
+            last_choch_ms=last_choch_ms,
+            ob_zones=self._ob_zones(struct_events, atr),
+            fvg_zones=self._fvg_zones(atr),
+            pd_zones=detect_premium_discount(classified, bars, cfg),
+            liquidity=detect_liquidity_levels(classified, bars, cfg, atr=atr),
+            key_levels=compute_key_levels(key_bars),
+            inducements=self._inducements(atr),
+            fractals=list(self._fractals.swings),
+            displacements=displacements,
+        )
+
+    def _ob_zones(self, struct_events: List[SmcSwing], atr: float) -> List[SmcZone]:
+        bars = self._bars
+        zones, impulse_ends = detect_ob_candidates(
+            bars, struct_events, self._cfg, atr=atr, bar_index=_WindowIndex(self._times)
+        )
+        if not zones:
+            return []
+        base = self._base
+        last_seq = base + len(bars) - 1
+        out = []
+        for zone in zones:
+            skip_until = impulse_ends.get(zone.id, zone.anchor_bar_ms)
+            key = (zone.id, zone.kind, zone.high, zone.low, skip_until)
+            rec = self._ob.get(key)
+            if rec is None:
+                # Перший бар ПІСЛЯ імпульсу
+                rec = _ObStatus(base + bisect_left(self._times, skip_until + 1))
+                self._ob[key] = rec
+            while rec.status != "mitigated" and rec.next_seq <= last_seq:
+                bar = bars[rec.next_seq - base]
+                rec.next_seq += 1
+                if not bar.complete:
+                    continue
+                status = ob_status_step(zone, rec.status, bar)
+                if status == "mitigated":
+                    rec.end_ms = bar.open_time_ms
+                rec.status = status
+            out.append(dataclasses.replace(zone, status=rec.status, end_ms=rec.end_ms))
+        return out
+
+    def _fvg_zones(self, atr: float) -> List[SmcZone]:
+        cfg = self._cfg
+        fvg_cfg = cfg.fvg
+        if not fvg_cfg.enabled or len(self._bars) < 3:
+            return []
+        # Ранжуємо по числах; SmcZone матеріалізуються лише для тих,
+        # що пройшли cap (порядок/tie-break — як у detect_fvg)
+        active = []  # type: List[Tuple[float, _FvgRec]]
+        filled = []  # type: List[Tuple[float, _FvgRec]]
+        for rec in self._fvg:
+            strength = round(min(1.0, rec.gap / (atr * 2.0)) if atr > 0 else 0.5, 3)
+            if rec.status == "filled":
+                filled.append((strength, rec))
+            else:
+                active.append((strength, rec))
+        # fill_ms встановлено рівно для filled — IFVG у порядку кандидатів
+        ifvgs = [it for it in filled if it[1].fill_ms is not None]
+        active.sort(key=lambda it: -it[0])
+        filled.sort(key=lambda it: -it[1].zone.anchor_bar_ms)
+        out = [self._fvg_zone(st, rec) for st, rec in active[: fvg_cfg.max_active]]
+        out.extend(self._fvg_zone(st, rec) for st, rec in filled[:3])
+
+        if cfg.tda.enabled and cfg.tda.ifvg_enabled and ifvgs:
+            ifvgs.sort(key=lambda it: -(it[1].fill_ms or 0))
+            for strength, rec in ifvgs[: cfg.tda.ifvg_max_active]:
+                z = rec.zone
+                ifvg_kind = "ifvg_bear" if z.kind == "fvg_bull" else "ifvg_bull"
+                fill_ms = rec.fill_ms or 0
+                out.append(
+                    SmcZone(
+                        id=make_zone_id(ifvg_kind, z.symbol, z.tf_s, fill_ms),
+                        symbol=z.symbol,
+                        tf_s=z.tf_s,
+                        kind=ifvg_kind,
+                        start_ms=fill_ms,
+                        end_ms=None,
+                        high=z.high,
+                        low=z.low,
+                        status="active",
+                        strength=strength,
+                        anchor_bar_ms=fill_ms,
+                        origin_zone_id=z.id,
+                    )
+                )
+        return out
+
+    @staticmethod
+    def _fvg_zone(strength: float, rec: _FvgRec) -> SmcZone:
+        z = rec.zone
+        return SmcZone(
+            id=z.id,
+            symbol=z.symbol,
+            tf_s=z.tf_s,
+            kind=z.kind,
+            start_ms=z.start_ms,
+            end_ms=rec.end_ms,
+            high=z.high,
+            low=z.low,
+            status=rec.status,
+            strength=strength,
+            anchor_bar_ms=z.anchor_bar_ms,
+        )
+
+    def _inducements(self, atr: float) -> List[SmcSwing]:
+        cfg = self._cfg.inducement
+        if not cfg.enabled:
+            return []
+        if len(self._bars) < 2 * cfg.minor_period + cfg.confirmation_bars + 2:
+            return []
+        if not self._ind:
+            return []
+        reversal_thresh = cfg.reversal_atr_mult * atr
+        if reversal_thresh <= 0.0:
+            return []
+
+        results = []  # type: List[SmcSwing]
+        seen_ids = set()  # type: set
+        for kind, ind_kind in (("hh", "inducement_bear"), ("ll", "inducement_bull")):
+            for rec in self._ind:
+                if rec.swing.kind != kind or rec.trap is None:
+                    continue
+                if rec.reversal < reversal_thresh:
+                    continue
+                b = rec.trap
+                ind_id = make_swing_id(ind_kind, b.symbol, b.tf_s, b.open_time_ms)
+                if ind_id in seen_ids:
+                    continue
+                seen_ids.add(ind_id)
+                results.append(
+                    SmcSwing(
+                        id=ind_id,
+                        symbol=b.symbol,
+                        tf_s=b.tf_s,
+                        kind=ind_kind,
+                        price=rec.swing.price,
+                        time_ms=b.open_time_ms,
+                        confirmed=True,
+                    )
+                )
+        results.sort(key=lambda s: s.time_ms)
+        if len(results) > cfg.max_inducements:
+            results = results[-cfg.max_inducements :]
+        return results
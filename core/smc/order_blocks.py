@@ -9,7 +9,7 @@ S5: thresholds з SmcConfig.ob (не hardcoded).
 from __future__ import annotations
 
 import dataclasses
-from typing import List, Optional
+from typing import Dict, List, Mapping, Optional, Tuple
 
 from core.model.bars import CandleBar
 from core.smc.config import SmcConfig
@@ -43,19 +43,40 @@ def detect_order_blocks(
 
     Повертає список SmcZone, обмежений max_active_per_side.
     """
-    if not bars or not structure_swings:
+    zones, impulse_ends = detect_ob_candidates(bars, structure_swings, config, atr=atr)
+    if not zones:
         return []
+    # Оновлюємо статус зон (mitigation check) на всьому датасеті барів
+    return _update_ob_status(zones, bars, impulse_ends)
+
+
+def detect_ob_candidates(
+    bars: List[CandleBar],
+    structure_swings: List,
+    config: SmcConfig,
+    atr: float = 0.0,
+    bar_index: Optional[Mapping[int, int]] = None,
+) -> Tuple[List[SmcZone], Dict[str, int]]:
+    """OB-кандидати зі статусом "active" + impulse_ends (без mitigation check).
+
+    bar_index: open_time_ms → позиція у bars[]; None → будується тут.
+    Інкрементальний режим (core/smc/incremental.py) передає власний індекс
+    і дораховує статус лише по нових барах.
+    """
+    if not bars or not structure_swings:
+        return [], {}
 
     ob_cfg = config.ob
     if not ob_cfg.enabled:
-        return []
+        return [], {}
 
     if atr <= 0.0:
         atr = compute_atr(bars, ob_cfg.atr_period)
-    bar_index = {b.open_time_ms: i for i, b in enumerate(bars)}
+    if bar_index is None:
+        bar_index = {b.open_time_ms: i for i, b in enumerate(bars)}
 
     zones: List[SmcZone] = []
-    impulse_ends: dict = {}  # zone_id → impulse_end_bar_open_ms
+    impulse_ends: Dict[str, int] = {}  # zone_id → impulse_end_bar_open_ms
     bull_count = 0
     bear_count = 0
 
@@ -156,9 +177,7 @@ def detect_order_blocks(
         else:
             bear_count += 1
 
-    # Оновлюємо статус зон (mitigation check) на всьому датасеті барів
-    zones = _update_ob_status(zones, bars, impulse_ends)
-    return zones
+    return zones, impulse_ends
 
 
 def _update_ob_status(
@@ -192,30 +211,12 @@ def _update_ob_status(
                 continue
             if not bar.complete:
                 continue
-
-            if zone.kind.endswith("bull"):
-                # Bullish OB: ціна тестує знизу вгору
-                bar_enters_zone = bar.low <= zone.high and bar.h >= zone.low
-                bar_mitigates = bar.c < zone.low  # close нижче низу зони
-
-                if bar_mitigates and current_status in ("active", "tested"):
-                    current_status = "mitigated"
-                    current_end_ms = bar.open_time_ms
-                    break
-                elif bar_enters_zone and current_status == "active":
-                    current_status = "tested"
-
-            else:
-                # Bearish OB: ціна тестує зверху вниз
-                bar_enters_zone = bar.h >= zone.low and bar.low <= zone.high
-                bar_mitigates = bar.c > zone.high  # close вище верху зони
-
-                if bar_mitigates and current_status in ("active", "tested"):
-                    current_status = "mitigated"
-                    current_end_ms = bar.open_time_ms
-                    break
-                elif bar_enters_zone and current_status == "active":
-                    current_status = "tested"
+            new_status = ob_status_step(zone, current_status, bar)
+            if new_status == "mitigated" and current_status != "mitigated":
+                current_status = new_status
+                current_end_ms = bar.open_time_ms
+                break
+            current_status = new_status
 
         updated.append(
             dataclasses.replace(
@@ -226,3 +227,21 @@ def _update_ob_status(
         )
 
     return updated
+
+
+def ob_status_step(zone: SmcZone, status: str, bar: CandleBar) -> str:
+    """Один крок lifecycle OB на complete барі після імпульсу → новий status."""
+    if zone.kind.endswith("bull"):
+        # Bullish OB: ціна тестує знизу вгору
+        bar_enters_zone = bar.low <= zone.high and bar.h >= zone.low
+        bar_mitigates = bar.c < zone.low  # close нижче низу зони
+    else:
+        # Bearish OB: ціна тестує зверху вниз
+        bar_enters_zone = bar.h >= zone.low and bar.low <= zone.high
+        bar_mitigates = bar.c > zone.high  # close вище верху зони
+
+    if bar_mitigates and status in ("active", "tested"):
+        return "mitigated"
+    if bar_enters_zone and status == "active":
+        return "tested"
+    return status
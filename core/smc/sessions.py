@@ -147,6 +147,8 @@ def get_current_session(
 
 
 # ── Main computation ───────────────────────────────────────
+# compute_session_levels — reference (повний прохід M1 буфера);
+# SessionTracker нижче — streaming еквівалент для SmcEngine.
 
 
 def compute_session_levels(
@@ -194,7 +196,6 @@ def compute_session_levels(
         kinds = _SESSION_KIND_MAP.get(sw.name)
         if kinds is None:
             continue
-        act_h_kind, act_l_kind, prev_h_kind, prev_l_kind = kinds
 
         # Determine if session is currently active + killzone
         is_active = _bar_in_session(current_time_ms, sw)
@@ -235,69 +236,194 @@ def compute_session_levels(
                 if prev_start_ms is None:
                     prev_start_ms = bar.open_time_ms
 
-        # Generate SmcLevel for each H/L
-        # Current session levels: show as long as today's data exists
-        # (not only when active — completed session H/L still relevant)
-        if cur_high is not None and cur_low is not None:
-            levels.append(
-                SmcLevel(
-                    id=make_level_id(act_h_kind, symbol, tf_s, cur_high),
-                    symbol=symbol,
-                    tf_s=tf_s,
-                    kind=act_h_kind,
-                    price=cur_high,
-                    time_ms=cur_start_ms,
-                    touches=1,
-                )
+        _append_session_output(
+            levels,
+            states,
+            sw,
+            symbol,
+            tf_s,
+            is_active,
+            is_kz,
+            (cur_high, cur_low, cur_start_ms),
+            (prev_high, prev_low, prev_start_ms),
+        )
+
+    return levels, states
+
+
+def _append_session_output(
+    levels: List[SmcLevel],
+    states: List[SessionState],
+    sw: SessionWindow,
+    symbol: str,
+    tf_s: int,
+    is_active: bool,
+    is_kz: bool,
+    current: Tuple[Optional[float], Optional[float], Optional[int]],
+    previous: Tuple[Optional[float], Optional[float], Optional[int]],
+) -> None:
+    """(high, low, start_ms) поточної/попередньої сесії → SmcLevel-и + SessionState."""
+    act_h_kind, act_l_kind, prev_h_kind, prev_l_kind = _SESSION_KIND_MAP[sw.name]
+    cur_high, cur_low, cur_start_ms = current
+    prev_high, prev_low, prev_start_ms = previous
+
+    # Generate SmcLevel for each H/L
+    # Current session levels: show as long as today's data exists
+    # (not only when active — completed session H/L still relevant)
+    if cur_high is not None and cur_low is not None:
+        levels.append(
+            SmcLevel(
+                id=make_level_id(act_h_kind, symbol, tf_s, cur_high),
+                symbol=symbol,
+                tf_s=tf_s,
+                kind=act_h_kind,
+                price=cur_high,
+                time_ms=cur_start_ms,
+                touches=1,
             )
-            levels.append(
-                SmcLevel(
-                    id=make_level_id(act_l_kind, symbol, tf_s, cur_low),
-                    symbol=symbol,
-                    tf_s=tf_s,
-                    kind=act_l_kind,
-                    price=cur_low,
-                    time_ms=cur_start_ms,
-                    touches=1,
-                )
+        )
+        levels.append(
+            SmcLevel(
+                id=make_level_id(act_l_kind, symbol, tf_s, cur_low),
+                symbol=symbol,
+                tf_s=tf_s,
+                kind=act_l_kind,
+                price=cur_low,
+                time_ms=cur_start_ms,
+                touches=1,
             )
+        )
 
-        if prev_high is not None and prev_low is not None:
-            levels.append(
-                SmcLevel(
-                    id=make_level_id(prev_h_kind, symbol, tf_s, prev_high),
-                    symbol=symbol,
-                    tf_s=tf_s,
-                    kind=prev_h_kind,
-                    price=prev_high,
-                    time_ms=prev_start_ms,
-                    touches=1,
-                )
+    if prev_high is not None and prev_low is not None:
+        levels.append(
+            SmcLevel(
+                id=make_level_id(prev_h_kind, symbol, tf_s, prev_high),
+                symbol=symbol,
+                tf_s=tf_s,
+                kind=prev_h_kind,
+                price=prev_high,
+                time_ms=prev_start_ms,
+                touches=1,
             )
-            levels.append(
-                SmcLevel(
-                    id=make_level_id(prev_l_kind, symbol, tf_s, prev_low),
-                    symbol=symbol,
-                    tf_s=tf_s,
-                    kind=prev_l_kind,
-                    price=prev_low,
-                    time_ms=prev_start_ms,
-                    touches=1,
-                )
+        )
+        levels.append(
+            SmcLevel(
+                id=make_level_id(prev_l_kind, symbol, tf_s, prev_low),
+                symbol=symbol,
+                tf_s=tf_s,
+                kind=prev_l_kind,
+                price=prev_low,
+                time_ms=prev_start_ms,
+                touches=1,
             )
+        )
 
-        states.append(
-            SessionState(
-                name=sw.name,
-                active=is_active,
-                in_killzone=is_kz,
-                current_high=cur_high,
-                current_low=cur_low,
-                current_start_ms=cur_start_ms,
-                previous_high=prev_high,
-                previous_low=prev_low,
-                previous_start_ms=prev_start_ms,
-            )
+    states.append(
+        SessionState(
+            name=sw.name,
+            active=is_active,
+            in_killzone=is_kz,
+            current_high=cur_high,
+            current_low=cur_low,
+            current_start_ms=cur_start_ms,
+            previous_high=prev_high,
+            previous_low=prev_low,
+            previous_start_ms=prev_start_ms,
         )
+    )
 
-    return levels, states
+
+
+# ── Streaming tracker ──────────────────────────────────────
+
+# Скільки UTC днів тримати per session: поточний + попередній + запас
+# на запит у новому дні до першого бару (тоді «вчора» = останній день з барами).
+_TRACKER_KEEP_DAYS = 3
+
+
+class SessionTracker:
+    """Running session H/L per (session, UTC day) одного символу.
+
+    feed() — O(кількість сесій) на M1 бар; snapshot() — O(сесії × днів),
+    без копіювання і сортування M1 буфера. Rollover: бар нового UTC дня
+    відкриває новий bucket, bucket-и старші за _TRACKER_KEEP_DAYS днів
+    відкидаються. Результат snapshot(t) == compute_session_levels(bars, ..., t)
+    для тих самих complete барів (min/max/first-open не залежать від порядку).
+    """
+
+    __slots__ = ("_sessions", "_days", "_last_day", "_bar_count")
+
+    def __init__(self, sessions: List[SessionWindow]) -> None:
+        self._sessions = [sw for sw in sessions if sw.name in _SESSION_KIND_MAP]
+        # session name → day_start_ms → [high, low, start_ms]
+        self._days: Dict[str, Dict[int, List[Any]]] = {
+            sw.name: {} for sw in self._sessions
+        }
+        self._last_day: Optional[int] = None
+        self._bar_count = 0
+
+    def feed(self, bar: CandleBar) -> None:
+        if not bar.complete:
+            return
+        self._bar_count += 1
+        day = _ms_to_day_start(bar.open_time_ms)
+        if self._last_day is None or day > self._last_day:
+            self._last_day = day
+            self._prune(day)
+        for sw in self._sessions:
+            if not _bar_in_session(bar.open_time_ms, sw):
+                continue
+            by_day = self._days[sw.name]
+            bucket = by_day.get(day)
+            if bucket is None:
+                by_day[day] = [bar.h, bar.low, bar.open_time_ms]
+                continue
+            if bar.h > bucket[0]:
+                bucket[0] = bar.h
+            if bar.low < bucket[1]:
+                bucket[1] = bar.low
+            if bar.open_time_ms < bucket[2]:
+                bucket[2] = bar.open_time_ms
+
+    def _prune(self, day: int) -> None:
+        horizon = day - (_TRACKER_KEEP_DAYS - 1) * 86400_000
+        for by_day in self._days.values():
+            for old in [d for d in by_day if d < horizon]:
+                del by_day[old]
+
+    def snapshot(
+        self, current_time_ms: int, symbol: str, tf_s: int = 86400
+    ) -> Tuple[List[SmcLevel], List[SessionState]]:
+        """Як compute_session_levels: (levels, states) на момент current_time_ms."""
+        if not self._bar_count or not self._sessions:
+            return [], []
+        current_day_start = _ms_to_day_start(current_time_ms)
+        prev_day_start = current_day_start - 86400_000
+        levels: List[SmcLevel] = []
+        states: List[SessionState] = []
+        for sw in self._sessions:
+            is_active = _bar_in_session(current_time_ms, sw)
+            is_kz = _bar_in_killzone(current_time_ms, sw) if is_active else False
+            current: List[Any] = [None, None, None]
+            for day, (high, low, start_ms) in self._days[sw.name].items():
+                if day < current_day_start:
+                    continue
+                if current[0] is None or high > current[0]:
+                    current[0] = high
+                if current[1] is None or low < current[1]:
+                    current[1] = low
+                if current[2] is None or start_ms < current[2]:
+                    current[2] = start_ms
+            prev = self._days[sw.name].get(prev_day_start)
+            _append_session_output(
+                levels,
+                states,
+                sw,
+                symbol,
+                tf_s,
+                is_active,
+                is_kz,
+                (current[0], current[1], current[2]),
+                (prev[0], prev[1], prev[2]) if prev else (None, None, None),
+            )
+        return levels, states
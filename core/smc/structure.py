@@ -13,7 +13,7 @@ V2 (ADR-0047): Canonical ICT BOS/CHoCH.
 from __future__ import annotations
 
 import dataclasses
-from typing import List, Optional, Tuple
+from typing import List, Optional, Sequence, Tuple
 
 from core.model.bars import CandleBar
 from core.smc.config import SmcStructureConfig
@@ -120,155 +120,205 @@ def detect_structure_events(
     if config is not None:
         confirmation_bars = max(1, config.confirmation_bars)
 
-    events: List[SmcSwing] = []
-    trend_bias: Optional[str] = None
-    last_bos_ms: Optional[int] = None
-    last_choch_ms: Optional[int] = None
-
-    # Track all 4 swing types
-    last_hh: Optional[SmcSwing] = None
-    last_hl: Optional[SmcSwing] = None
-    last_ll: Optional[SmcSwing] = None
-    last_lh: Optional[SmcSwing] = None
-
     swing_map = {s.time_ms: s for s in classified_swings}
     swing_times = sorted(swing_map.keys())
     swing_idx = 0
 
-    # For multi-bar confirmation: count consecutive bars beyond level
-    confirm_kind: Optional[str] = None
-    confirm_count: int = 0
-    confirm_level: Optional[SmcSwing] = None
-    confirm_bar: Optional[CandleBar] = None
+    events: List[SmcSwing] = []
+    state = STRUCTURE_INIT_STATE
+    for bar in bars:
+        # Update swing tracking from confirmed swings up to this bar
+        applied = []
+        while (
+            swing_idx < len(swing_times) and swing_times[swing_idx] <= bar.open_time_ms
+        ):
+            applied.append(swing_map[swing_times[swing_idx]])
+            swing_idx += 1
+        state, event = structure_step(state, bar, applied, confirmation_bars)
+        if event is not None:
+            events.append(event)
 
-    def _emit(kind: str, level: SmcSwing, bar_: CandleBar) -> None:
-        nonlocal trend_bias, last_bos_ms, last_choch_ms
-        nonlocal last_hh, last_hl, last_ll, last_lh
+    trend_bias, last_bos_ms, last_choch_ms = state[0], state[1], state[2]
+    return events, trend_bias, last_bos_ms, last_choch_ms
 
-        if kind.startswith("bos_"):
-            last_bos_ms = bar_.open_time_ms
-        else:
-            last_choch_ms = bar_.open_time_ms
 
-        if kind.endswith("_bull"):
-            trend_bias = "bullish"
+# Стан автомата BOS/CHoCH між барами. Tuple — щоб checkpoint/порівняння
+# (інкрементальний replay, core/smc/incremental.py) були дешевими:
+#   (trend_bias, last_bos_ms, last_choch_ms,
+#    last_hh, last_hl, last_ll, last_lh,
+#    confirm_kind, confirm_count, confirm_level, confirm_bar)
+STRUCTURE_INIT_STATE = (None, None, None, None, None, None, None, None, 0, None, None)
+
+
+def structure_step(
+    state: tuple,
+    bar: CandleBar,
+    swings: Sequence[SmcSwing],
+    confirmation_bars: int,
+) -> Tuple[tuple, Optional[SmcSwing]]:
+    """Один бар автомата BOS/CHoCH → (новий стан, подія або None).
+
+    swings: підтверджені свінги, що стають відомими на цьому барі (по часу).
+    """
+    (
+        trend_bias,
+        last_bos_ms,
+        last_choch_ms,
+        last_hh,
+        last_hl,
+        last_ll,
+        last_lh,
+        confirm_kind,
+        confirm_count,
+        confirm_level,
+        confirm_bar,
+    ) = state
+
+    for s in swings:
+        if s.kind == "hh":
+            last_hh = s
+        elif s.kind == "hl":
+            last_hl = s
+        elif s.kind == "ll":
+            last_ll = s
+        elif s.kind == "lh":
+            last_lh = s
+
+    if not bar.complete:
+        return (
+            trend_bias,
+            last_bos_ms,
+            last_choch_ms,
+            last_hh,
+            last_hl,
+            last_ll,
+            last_lh,
+            confirm_kind,
+            confirm_count,
+            confirm_level,
+            confirm_bar,
+        ), None
+
+    # Detect break candidates with temporal guard
+    candidate_kind: Optional[str] = None
+    candidate_level: Optional[SmcSwing] = None
+
+    if trend_bias == "bullish" or trend_bias is None:
+        # BOS_BULL: break above last HH → continuation
+        if (
+            last_hh is not None
+            and bar.c > last_hh.price
+            and bar.open_time_ms > last_hh.time_ms
+        ):
+            candidate_kind = "bos_bull"
+            candidate_level = last_hh
+
+        # CHoCH_BEAR: break below last HL → reversal (only if trend established)
+        elif (
+            trend_bias == "bullish"
+            and last_hl is not None
+            and bar.c < last_hl.price
+            and bar.open_time_ms > last_hl.time_ms
+        ):
+            candidate_kind = "choch_bear"
+            candidate_level = last_hl
+
+    if candidate_kind is None and (trend_bias == "bearish" or trend_bias is None):
+        # BOS_BEAR: break below last LL → continuation
+        if (
+            last_ll is not None
+            and bar.c < last_ll.price
+            and bar.open_time_ms > last_ll.time_ms
+        ):
+            candidate_kind = "bos_bear"
+            candidate_level = last_ll
+
+        # CHoCH_BULL: break above last LH → reversal (only if trend established)
+        elif (
+            trend_bias == "bearish"
+            and last_lh is not None
+            and bar.c > last_lh.price
+            and bar.open_time_ms > last_lh.time_ms
+        ):
+            candidate_kind = "choch_bull"
+            candidate_level = last_lh
+
+    event: Optional[SmcSwing] = None
+
+    # Multi-bar confirmation
+    if candidate_kind is not None and candidate_level is not None:
+        if (
+            confirm_kind == candidate_kind
+            and confirm_level is not None
+            and confirm_level.time_ms == candidate_level.time_ms
+        ):
+            confirm_count += 1
         else:
-            trend_bias = "bearish"
+            confirm_kind = candidate_kind
+            confirm_level = candidate_level
+            confirm_count = 1
+            confirm_bar = bar
+
+        if (
+            confirm_count >= confirmation_bars
+            and confirm_kind is not None
+            and confirm_level is not None
+            and confirm_bar is not None
+        ):
+            kind = confirm_kind
+            if kind.startswith("bos_"):
+                last_bos_ms = confirm_bar.open_time_ms
+            else:
+                last_choch_ms = confirm_bar.open_time_ms
 
-        events.append(
-            SmcSwing(
-                id=make_swing_id(kind, bar_.symbol, bar_.tf_s, bar_.open_time_ms),
-                symbol=bar_.symbol,
-                tf_s=bar_.tf_s,
+            if kind.endswith("_bull"):
+                trend_bias = "bullish"
+            else:
+                trend_bias = "bearish"
+
+            event = SmcSwing(
+                id=make_swing_id(
+                    kind, confirm_bar.symbol, confirm_bar.tf_s, confirm_bar.open_time_ms
+                ),
+                symbol=confirm_bar.symbol,
+                tf_s=confirm_bar.tf_s,
                 kind=kind,
-                price=level.price,
-                time_ms=bar_.open_time_ms,
+                price=confirm_level.price,
+                time_ms=confirm_bar.open_time_ms,
                 confirmed=True,
             )
-        )
 
-        # Consume the broken level so we don't re-trigger
-        if kind == "bos_bull":
-            last_hh = None
-        elif kind == "choch_bear":
-            last_hl = None
-        elif kind == "bos_bear":
-            last_ll = None
-        elif kind == "choch_bull":
-            last_lh = None
+            # Consume the broken level so we don't re-trigger
+            if kind == "bos_bull":
+                last_hh = None
+            elif kind == "choch_bear":
+                last_hl = None
+            elif kind == "bos_bear":
+                last_ll = None
+            elif kind == "choch_bull":
+                last_lh = None
 
-    for bar in bars:
-        # Update swing tracking from confirmed swings up to this bar
-        while (
-            swing_idx < len(swing_times) and swing_times[swing_idx] <= bar.open_time_ms
-        ):
-            s = swing_map[swing_times[swing_idx]]
-            if s.kind == "hh":
-                last_hh = s
-            elif s.kind == "hl":
-                last_hl = s
-            elif s.kind == "ll":
-                last_ll = s
-            elif s.kind == "lh":
-                last_lh = s
-            swing_idx += 1
-
-        if not bar.complete:
-            continue
-
-        # Detect break candidates with temporal guard
-        candidate_kind: Optional[str] = None
-        candidate_level: Optional[SmcSwing] = None
-
-        if trend_bias == "bullish" or trend_bias is None:
-            # BOS_BULL: break above last HH → continuation
-            if (
-                last_hh is not None
-                and bar.c > last_hh.price
-                and bar.open_time_ms > last_hh.time_ms
-            ):
-                candidate_kind = "bos_bull"
-                candidate_level = last_hh
-
-            # CHoCH_BEAR: break below last HL → reversal (only if trend established)
-            elif (
-                trend_bias == "bullish"
-                and last_hl is not None
-                and bar.c < last_hl.price
-                and bar.open_time_ms > last_hl.time_ms
-            ):
-                candidate_kind = "choch_bear"
-                candidate_level = last_hl
-
-        if candidate_kind is None and (trend_bias == "bearish" or trend_bias is None):
-            # BOS_BEAR: break below last LL → continuation
-            if (
-                last_ll is not None
-                and bar.c < last_ll.price
-                and bar.open_time_ms > last_ll.time_ms
-            ):
-                candidate_kind = "bos_bear"
-                candidate_level = last_ll
-
-            # CHoCH_BULL: break above last LH → reversal (only if trend established)
-            elif (
-                trend_bias == "bearish"
-                and last_lh is not None
-                and bar.c > last_lh.price
-                and bar.open_time_ms > last_lh.time_ms
-            ):
-                candidate_kind = "choch_bull"
-                candidate_level = last_lh
-
-        # Multi-bar confirmation
-        if candidate_kind is not None and candidate_level is not None:
-            if (
-                confirm_kind == candidate_kind
-                and confirm_level is not None
-                and confirm_level.time_ms == candidate_level.time_ms
-            ):
-                confirm_count += 1
-            else:
-                confirm_kind = candidate_kind
-                confirm_level = candidate_level
-                confirm_count = 1
-                confirm_bar = bar
-
-            if (
-                confirm_count >= confirmation_bars
-                and confirm_level is not None
-                and confirm_bar is not None
-            ):
-                _emit(confirm_kind, confirm_level, confirm_bar)
-                confirm_kind = None
-                confirm_count = 0
-                confirm_level = None
-                confirm_bar = None
-        else:
-            # Reset confirmation if no candidate this bar
             confirm_kind = None
             confirm_count = 0
             confirm_level = None
             confirm_bar = None
-
-    return events, trend_bias, last_bos_ms, last_choch_ms
+    else:
+        # Reset confirmation if no candidate this bar
+        confirm_kind = None
+        confirm_count = 0
+        confirm_level = None
+        confirm_bar = None
+
+    return (
+        trend_bias,
+        last_bos_ms,
+        last_choch_ms,
+        last_hh,
+        last_hl,
+        last_ll,
+        last_lh,
+        confirm_kind,
+        confirm_count,
+        confirm_level,
+        confirm_bar,
+    ), event
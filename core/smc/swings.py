@@ -3,53 +3,103 @@ core/smc/swings.py — Fractal pivot swing detection (ADR-0024 §4.1).
 
 S0: pure logic, NO I/O.
 S2: deterministic — same bars → same swings.
+
+Детектори працюють над numpy-колонками (BarArrays); CandleBar-API —
+тонкий adapter (див. core/smc/bar_window.py).
 """
 from __future__ import annotations
 
-from typing import List
+from typing import List, Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
 
 from core.model.bars import CandleBar
+from core.smc.bar_window import BarArrays
 from core.smc.types import SmcSwing, make_swing_id
 
 
+def swing_pivots(
+    h: np.ndarray,
+    low: np.ndarray,
+    period: int,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Vectorized fractal pivots → (high_idx, low_idx), індекси у вікні.
+
+    High: h[i] > max(h[i-p:i]) AND h[i] >= max(h[i+1:i+p+1]); Low — дзеркально.
+    Тільки підтверджені: i ∈ [period, n-period).
+    """
+    n = len(h)
+    if n < 2 * period + 1:
+        empty = np.empty(0, np.intp)
+        return empty, empty
+    m = n - 2 * period
+    win_h = sliding_window_view(h, period)
+    win_l = sliding_window_view(low, period)
+    max_h = win_h.max(axis=1)
+    min_l = win_l.min(axis=1)
+    mid_h = h[period : n - period]
+    mid_l = low[period : n - period]
+    hi = (mid_h > max_h[:m]) & (mid_h >= max_h[period + 1 : period + 1 + m])
+    lo = (mid_l < min_l[:m]) & (mid_l <= min_l[period + 1 : period + 1 + m])
+    return np.flatnonzero(hi) + period, np.flatnonzero(lo) + period
+
+
+def pivots_to_swings(
+    arrays: BarArrays,
+    period: int,
+    hi_prefix: str,
+    lo_prefix: str,
+    hi_kind: str,
+    lo_kind: str,
+) -> List[SmcSwing]:
+    """swing_pivots → SmcSwing (high перед low того ж бару, sort by time)."""
+    hi_idx, lo_idx = swing_pivots(arrays.h, arrays.low, period)
+    if not len(hi_idx) and not len(lo_idx):
+        return []
+    bars = arrays.bars
+    marks = sorted([(int(i), 0) for i in hi_idx] + [(int(i), 1) for i in lo_idx])
+    swings = []  # type: List[SmcSwing]
+    for i, side in marks:
+        b = bars[i]
+        if side == 0:
+            swings.append(SmcSwing(
+                id=make_swing_id(hi_prefix, b.symbol, b.tf_s, b.open_time_ms),
+                symbol=b.symbol, tf_s=b.tf_s, kind=hi_kind,
+                price=b.h, time_ms=b.open_time_ms, confirmed=True,
+            ))
+        else:
+            swings.append(SmcSwing(
+                id=make_swing_id(lo_prefix, b.symbol, b.tf_s, b.open_time_ms),
+                symbol=b.symbol, tf_s=b.tf_s, kind=lo_kind,
+                price=b.low, time_ms=b.open_time_ms, confirmed=True,
+            ))
+    swings.sort(key=lambda s: s.time_ms)
+    return swings
+
+
 def detect_fractals(
     bars: List[CandleBar],
     period: int = 2,
+    arrays: Optional[BarArrays] = None,
 ) -> List[SmcSwing]:
     """Williams Fractal detection (display-only markers).
 
     Same algorithm as detect_raw_swings but with kind='fractal_high'/'fractal_low'.
     Separate from structure swings to avoid polluting BOS/CHoCH chain.
+    arrays: готові колонки того ж вікна (BarWindow.views()) — без конвертації.
     """
-    n = len(bars)
-    if n < 2 * period + 1:
+    if len(bars) < 2 * period + 1:
         return []
-    result = []  # type: List[SmcSwing]
-    for i in range(period, n - period):
-        b = bars[i]
-        left_h = [bars[j].h for j in range(i - period, i)]
-        right_h = [bars[j].h for j in range(i + 1, i + period + 1)]
-        if b.h > max(left_h) and b.h >= max(right_h):
-            result.append(SmcSwing(
-                id=make_swing_id("fh", b.symbol, b.tf_s, b.open_time_ms),
-                symbol=b.symbol, tf_s=b.tf_s, kind="fractal_high",
-                price=b.h, time_ms=b.open_time_ms, confirmed=True,
-            ))
-        left_l = [bars[j].low for j in range(i - period, i)]
-        right_l = [bars[j].low for j in range(i + 1, i + period + 1)]
-        if b.low < min(left_l) and b.low <= min(right_l):
-            result.append(SmcSwing(
-                id=make_swing_id("fl", b.symbol, b.tf_s, b.open_time_ms),
-                symbol=b.symbol, tf_s=b.tf_s, kind="fractal_low",
-                price=b.low, time_ms=b.open_time_ms, confirmed=True,
-            ))
-    result.sort(key=lambda s: s.time_ms)
-    return result
+    if arrays is None:
+        arrays = BarArrays.from_bars(bars)
+    return pivots_to_swings(arrays, period, "fh", "fl", "fractal_high", "fractal_low")
 
 
 def detect_raw_swings(
     bars: List[CandleBar],
     period: int = 5,
+    arrays: Optional[BarArrays] = None,
 ) -> List[SmcSwing]:
     """Fractal pivot detection (E1 foundation, ADR §4.1).
 
@@ -58,59 +108,56 @@ def detect_raw_swings(
 
     Повертає тільки підтверджені свінги (потрібно 2*period+1 барів).
     Останні `period` барів — unconfirmed (майбутнє ще не відоме).
+    kind "hh"/"ll" — буде переписано в structure.py на HH/LH, LL/HL.
+    arrays: готові колонки того ж вікна (BarWindow.views()) — без конвертації.
     """
-    n = len(bars)
-    if n < 2 * period + 1:
+    if len(bars) < 2 * period + 1:
         return []
+    if arrays is None:
+        arrays = BarArrays.from_bars(bars)
+    return pivots_to_swings(arrays, period, "sh", "sl", "hh", "ll")
 
-    swings: List[SmcSwing] = []
-    # Confirmed range: period .. n-period-1 (включно)
-    for i in range(period, n - period):
-        b = bars[i]
-
-        left_h  = [bars[j].h   for j in range(i - period, i)]
-        right_h = [bars[j].h   for j in range(i + 1, i + period + 1)]
-        if b.h > max(left_h) and b.h >= max(right_h):
-            swings.append(SmcSwing(
-                id=make_swing_id("sh", b.symbol, b.tf_s, b.open_time_ms),
-                symbol=b.symbol,
-                tf_s=b.tf_s,
-                kind="hh",       # буде переписано в structure.py на HH/LH
-                price=b.h,
-                time_ms=b.open_time_ms,
-                confirmed=True,
-            ))
 
-        left_l  = [bars[j].low for j in range(i - period, i)]
-        right_l = [bars[j].low for j in range(i + 1, i + period + 1)]
-        if b.low < min(left_l) and b.low <= min(right_l):
-            swings.append(SmcSwing(
-                id=make_swing_id("sl", b.symbol, b.tf_s, b.open_time_ms),
-                symbol=b.symbol,
-                tf_s=b.tf_s,
-                kind="ll",       # буде переписано в structure.py на LL/HL
-                price=b.low,
-                time_ms=b.open_time_ms,
-                confirmed=True,
-            ))
+def atr_from_arrays(h: np.ndarray, low: np.ndarray, period: int = 14) -> float:
+    """ATR над колонками h/low (simplified TR = h - low, як compute_atr).
 
-    # Сортуємо за часом (S2: deterministic order)
-    swings.sort(key=lambda s: s.time_ms)
-    return swings
+    Сума — послідовно від останнього бару (cumsum), щоб результат був
+    біт-у-біт тим самим, що й у CandleBar-версії.
+    """
+    n = min(len(h), period)
+    if n <= 0:
+        return 1.0  # fallback, ніколи не вернути 0
+    tr = h[-n:] - low[-n:]
+    atr = float(np.cumsum(tr[::-1])[-1]) / n
+    return atr if atr > 0.0 else 1.0  # rail: atr > 0
 
 
 def compute_atr(bars: List[CandleBar], period: int = 14) -> float:
     """Average True Range — helper для OB/FVG strength (S5: period з config)."""
     if not bars:
         return 1.0  # fallback, ніколи не вернути 0
-    n = min(len(bars), period)
-    total = 0.0
-    for i in range(1, n + 1):
-        b = bars[-i]
-        tr = b.h - b.low  # simplified TR (no prior close — достатньо для M1+)
-        total += tr
-    atr = total / n
-    return atr if atr > 0.0 else 1.0  # rail: atr > 0
+    tail = bars[-period:] if period > 0 else []
+    n = len(tail)
+    h = np.fromiter((b.h for b in tail), np.float64, n)
+    low = np.fromiter((b.low for b in tail), np.float64, n)
+    return atr_from_arrays(h, low, period)
+
+
+def rv_from_arrays(v: np.ndarray, period: int = 20) -> float:
+    """RV над колонкою обсягів (None/preview → NaN). Семантика — compute_rv."""
+    if len(v) < period + 1:
+        return 1.0
+    last_v = v[-1]
+    if not last_v > 0:  # NaN / null / zero
+        return 1.0
+    prior = v[-(period + 1) : -1]
+    valid = prior[prior > 0]
+    if len(valid) < period // 2 or not len(valid):
+        return 1.0
+    sma = float(np.cumsum(valid)[-1]) / len(valid)
+    if sma <= 0:
+        return 1.0
+    return float(last_v) / sma
 
 
 def compute_rv(bars: List[CandleBar], period: int = 20) -> float:
@@ -129,23 +176,14 @@ def compute_rv(bars: List[CandleBar], period: int = 20) -> float:
     """
     if not bars or len(bars) < period + 1:
         return 1.0
-    last = bars[-1]
-    last_v = getattr(last, "v", None)
-    if last_v is None or last_v <= 0:
-        return 1.0
-    # Prior window = `period` bars BEFORE the last one.
-    prior = bars[-(period + 1):-1]
-    valid: List[float] = []
-    for b in prior:
-        v = getattr(b, "v", None)
-        if v is not None and v > 0:
-            valid.append(float(v))
-    if len(valid) < period // 2:
-        return 1.0
-    sma = sum(valid) / len(valid)
-    if sma <= 0:
-        return 1.0
-    return float(last_v) / sma
+    tail = bars[-(period + 1):]
+    v = np.fromiter((_volume(b) for b in tail), np.float64, len(tail))
+    return rv_from_arrays(v, period)
+
+
+def _volume(bar: CandleBar) -> float:
+    v = getattr(bar, "v", None)
+    return float("nan") if v is None else float(v)
 
 
 def find_impulse_start(
@@ -8,13 +8,34 @@ never silently blocks legitimate traffic (I7 degraded-but-loud).
 Returns ``(allowed, retry_after_s)``:
     allowed=True  → caller proceeds; ``retry_after_s=-1`` signals degraded path
     allowed=False → HTTP 429; ``retry_after_s`` = seconds until the next window
+
+``LocalRateLimiter`` — the same fixed window, pre-aggregated in-process:
+hits are counted locally and pushed to Redis as one INCRBY+EXPIRE pipeline
+per ``sync_interval_s`` (or once ``sync_batch`` hits are pending). The
+decision uses the last global count Redis returned plus local pending
+hits, so other workers' traffic is visible with at most one interval of
+lag. ``sync_interval_s=0`` syncs every call — identical to
+``check_and_consume``. A failed sync keeps the pending hits for the next
+attempt and fails open with the same warning until Redis answers again.
+Local state is bounded: past windows are dropped as soon as the window
+advances (pending hits included, even while degraded) and at most
+``max_keys`` identity windows are kept (oldest evicted first).
 """
 from __future__ import annotations
 
 import logging
+import threading
 import time
 from dataclasses import dataclass
-from typing import Any, Mapping, Protocol
+from typing import Any, Dict, List, Mapping, Optional, Protocol
+
+from runtime.store.redis_pool import (
+    RedisSteps,
+    adrive,
+    async_twin,
+    drive,
+    note_round_trips,
+)
 
 _log = logging.getLogger(__name__)
 
@@ -30,6 +51,10 @@ class RateLimitConfig:
     requests_per_minute: int = 10
     window_seconds: int = 60
     key_prefix: str = "ratelimit:"
+    # LocalRateLimiter: batch sync cadence (0 → every call) / pending cap
+    sync_interval_s: float = 0.0
+    sync_batch: int = 20
+    max_keys: int = 4096
 
     @classmethod
     def from_mapping(cls, m: Mapping[str, Any]) -> "RateLimitConfig":
@@ -38,6 +63,9 @@ class RateLimitConfig:
             requests_per_minute=int(m.get("requests_per_minute", 10)),
             window_seconds=int(m.get("window_seconds", 60)),
             key_prefix=str(m.get("key_prefix", "ratelimit:")),
+            sync_interval_s=max(0.0, float(m.get("sync_interval_s", 0.0))),
+            sync_batch=max(1, int(m.get("sync_batch", 20))),
+            max_keys=max(1, int(m.get("max_keys", 4096))),
         )
 
 
@@ -58,13 +86,36 @@ def check_and_consume(
     if redis_client is None:
         _log.warning("RATE_LIMIT_DEGRADED: redis unavailable identity=%s", identity)
         return (True, -1)
+    return drive(redis_client, _consume_steps(identity, cfg, now_s))
+
+
+async def check_and_consume_async(
+    redis_client: Any,
+    identity: str,
+    cfg: RateLimitConfig,
+    now_s: float | None = None,
+) -> tuple[bool, int]:
+    """``check_and_consume`` awaited on the event loop (redis.asyncio).
+
+    Same fail-open contract. Clients without a connection pool (fakes)
+    run the sync INCR/EXPIRE inline.
+    """
+    client = async_twin(redis_client) if cfg.enabled else None
+    if client is None:
+        return check_and_consume(redis_client, identity, cfg, now_s)
+    return await adrive(client, _consume_steps(identity, cfg, now_s))
+
+
+def _consume_steps(
+    identity: str, cfg: RateLimitConfig, now_s: float | None
+) -> RedisSteps:
     ts = now_s if now_s is not None else time.time()
     window = int(ts // cfg.window_seconds)
     key = f"{cfg.key_prefix}{identity}:{window}"
     try:
-        count = int(redis_client.incr(key))
+        count = int((yield ("incr", (key,), {})))
         if count == 1:
-            redis_client.expire(key, cfg.window_seconds)
+            yield ("expire", (key, cfg.window_seconds), {})
     except Exception as exc:
         _log.warning(
             "RATE_LIMIT_DEGRADED: redis error identity=%s err=%s", identity, exc
@@ -75,3 +126,155 @@ def check_and_consume(
         retry_after = max(1, int(next_window_start - ts))
         return (False, retry_after)
     return (True, 0)
+
+
+class LocalRateLimiter:
+    """Fixed-window limiter with local pre-aggregation and batched Redis sync.
+
+    Thread-safe. One instance per process; ``check_and_consume`` has the
+    same ``(allowed, retry_after_s)`` contract as the module function,
+    ``check_and_consume_async`` pushes the batch via redis.asyncio. The
+    lock is never held across the Redis round trip.
+    """
+
+    def __init__(self, redis_client: Any, cfg: RateLimitConfig) -> None:
+        self._redis = redis_client
+        self._cfg = cfg
+        self._lock = threading.Lock()
+        # redis key → [window, global_count, pending]
+        self._windows: Dict[str, List[int]] = {}
+        self._window = -1
+        self._pending_total = 0
+        self._last_sync_ts: Optional[float] = None
+        self._degraded = False
+
+    def check_and_consume(
+        self, identity: str, now_s: float | None = None
+    ) -> tuple[bool, int]:
+        if not self._active(identity):
+            return (True, -1)
+        ts = now_s if now_s is not None else time.time()
+        key, batch = self._record(identity, ts)
+        if batch:
+            try:
+                replies = self._pipeline(self._redis, batch).execute()
+            except Exception as exc:
+                self._settle(batch, None, identity, exc)
+            else:
+                self._settle(batch, replies, identity, None)
+        return self._decide(key, ts)
+
+    async def check_and_consume_async(
+        self, identity: str, now_s: float | None = None
+    ) -> tuple[bool, int]:
+        """``check_and_consume`` with the sync pipeline awaited (redis.asyncio).
+
+        Clients without a connection pool (fakes) run the pipeline inline.
+        """
+        if not self._active(identity):
+            return (True, -1)
+        ts = now_s if now_s is not None else time.time()
+        key, batch = self._record(identity, ts)
+        if batch:
+            client = async_twin(self._redis)
+            try:
+                if client is None:
+                    replies = self._pipeline(self._redis, batch).execute()
+                else:
+                    replies = await self._pipeline(client, batch).execute()
+            except Exception as exc:
+                self._settle(batch, None, identity, exc)
+            else:
+                self._settle(batch, replies, identity, None)
+        return self._decide(key, ts)
+
+    def _active(self, identity: str) -> bool:
+        if not self._cfg.enabled:
+            return False
+        if self._redis is None:
+            _log.warning("RATE_LIMIT_DEGRADED: redis unavailable identity=%s", identity)
+            return False
+        return True
+
+    def _record(
+        self, identity: str, ts: float
+    ) -> tuple[str, List[tuple[str, List[int], int]]]:
+        """Count one hit; returns (key, batch to push) — batch empty if not due."""
+        cfg = self._cfg
+        window = int(ts // cfg.window_seconds)
+        key = f"{cfg.key_prefix}{identity}:{window}"
+        with self._lock:
+            if window > self._window:
+                # Past windows can no longer affect a decision — drop them
+                # together with their pending hits (degraded or not).
+                self._window = window
+                for old in [k for k, e in self._windows.items() if e[0] < window]:
+                    self._pending_total -= self._windows.pop(old)[2]
+            entry = self._windows.get(key)
+            if entry is None:
+                if len(self._windows) >= cfg.max_keys:
+                    oldest = next(iter(self._windows))
+                    self._pending_total -= self._windows.pop(oldest)[2]
+                    _log.debug("RATE_LIMIT_KEY_EVICT key=%s max_keys=%d", oldest, cfg.max_keys)
+                entry = self._windows[key] = [window, 0, 0]
+            entry[2] += 1
+            self._pending_total += 1
+            if not (
+                self._degraded
+                or self._last_sync_ts is None
+                or ts - self._last_sync_ts >= cfg.sync_interval_s
+                or self._pending_total >= cfg.sync_batch
+            ):
+                return key, []
+            self._last_sync_ts = ts
+            batch = [(k, e, e[2]) for k, e in self._windows.items() if e[2] > 0]
+            for _k, e, n in batch:
+                e[2] = 0
+            self._pending_total = 0
+            return key, batch
+
+    def _pipeline(self, client: Any, batch: List[tuple[str, List[int], int]]) -> Any:
+        """INCRBY pending per key + EXPIRE, one pipeline."""
+        pipe = client.pipeline(transaction=False)
+        for key, _entry, n in batch:
+            pipe.incrby(key, n)
+            pipe.expire(key, self._cfg.window_seconds)
+        return pipe
+
+    def _settle(
+        self,
+        batch: List[tuple[str, List[int], int]],
+        replies: Optional[List[Any]],
+        identity: str,
+        exc: Optional[BaseException],
+    ) -> None:
+        if replies is not None:
+            note_round_trips("api.rate_limit", commands=2 * len(batch), round_trips=1)
+        with self._lock:
+            if exc is not None:
+                _log.warning(
+                    "RATE_LIMIT_DEGRADED: redis error identity=%s err=%s", identity, exc
+                )
+                self._degraded = True
+                # Unsent hits go back to pending unless their window was pruned.
+                for key, entry, n in batch:
+                    if self._windows.get(key) is entry:
+                        entry[2] += n
+                        self._pending_total += n
+                return
+            self._degraded = False
+            for (_key, entry, _n), count in zip(batch, replies[::2]):
+                entry[1] = int(count)
+
+    def _decide(self, key: str, ts: float) -> tuple[bool, int]:
+        cfg = self._cfg
+        with self._lock:
+            if self._degraded:
+                return (True, -1)
+            entry = self._windows.get(key)
+            count = entry[1] + entry[2] if entry is not None else 0
+        if count > cfg.requests_per_minute:
+            next_window_start = (int(ts // cfg.window_seconds) + 1) * cfg.window_seconds
+            retry_after = max(1, int(next_window_start - ts))
+            return (False, retry_after)
+        return (True, 0)
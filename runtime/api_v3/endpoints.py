@@ -20,9 +20,13 @@ Architectural choices:
   any front door.
 * Every response is wrapped in the ADR-0058 §3.2.1 envelope so external
   consumers can disambiguate `kind` and version-bump on `schema_version`.
+* Optional per-consumer rate limit (`api_v3.rate_limit`, ADR-0076 F6) runs
+  right after token auth via `runtime/api/rate_limit.LocalRateLimiter`;
+  over the limit → 429 + `Retry-After`, Redis down → fail-open + warning.
 
 Invariants:
-  I1 — read-only. Only Redis GET on token store + filesystem reads.
+  I1 — read-only. Only Redis GET on token store + filesystem reads (plus
+       INCRBY/EXPIRE on rate-limit counters when enabled).
   I5 — degraded-but-loud. Auth/Redis errors → structured 503 envelope, never
        silent allow.
   X28 — emit canonical backend shapes verbatim (no re-derivation here either).
@@ -47,7 +51,10 @@ from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
 from aiohttp import web
 from redis.exceptions import RedisError
 
+from runtime.api.rate_limit import LocalRateLimiter
+from runtime.api_v3.response_cache import CacheLookup, ResponseCache
 from runtime.api_v3.token_store import TokenStore
+from runtime.smc.journal_store import JournalStore
 
 log = logging.getLogger("api_v3.endpoints")
 
@@ -68,6 +75,9 @@ DISCLAIMER = (
 APP_TOKEN_STORE = web.AppKey("api_v3_token_store", TokenStore)
 APP_SIGNALS_DIR = web.AppKey("api_v3_signals_dir", str)
 APP_AUDIT_DIR = web.AppKey("api_v3_audit_dir", str)
+APP_RESPONSE_CACHE = web.AppKey("api_v3_response_cache", ResponseCache)
+APP_JOURNAL_STORE = web.AppKey("api_v3_journal_store", JournalStore)
+APP_RATE_LIMITER = web.AppKey("api_v3_rate_limiter", LocalRateLimiter)
 
 # F-S3-002 (slice 058.5): per-day rotating audit JSONL with hashed IP.
 # 90d retention enforced by a startup cleanup pass in register_routes().
@@ -141,11 +151,13 @@ def _error_response(
 # ────────────────────────────────────────────────────────────
 
 
-def _validate_token(request: web.Request) -> Optional[web.Response]:
+async def _validate_token(request: web.Request) -> Optional[web.Response]:
     """Return None if request is authorised, else an error response.
 
     Resolves the consumer name and stashes it on the request so handlers /
-    access logs can pick it up via `request["api_consumer"]`.
+    access logs can pick it up via `request["api_consumer"]`. The lookup is
+    awaited via `TokenStore.lookup_async` (redis.asyncio) when the store has
+    it; stores with only a sync `lookup()` are called directly.
     """
     store: Optional[TokenStore] = request.app.get(APP_TOKEN_STORE)
     if store is None:
@@ -161,8 +173,12 @@ def _validate_token(request: web.Request) -> Optional[web.Response]:
             "X-API-Key header is required",
             status=401,
         )
+    lookup_async = getattr(store, "lookup_async", None)
     try:
-        record = store.lookup(token)
+        if lookup_async is not None:
+            record = await lookup_async(token)
+        else:
+            record = store.lookup(token)
     except RedisError as exc:
         log.warning("api_v3_auth_redis_fail err=%s", exc)
         return _error_response(
@@ -179,6 +195,23 @@ def _validate_token(request: web.Request) -> Optional[web.Response]:
         )
     request["api_consumer"] = record.consumer
     request["api_scope"] = record.scope
+    limiter: Optional[LocalRateLimiter] = request.app.get(APP_RATE_LIMITER)
+    if limiter is not None:
+        allowed, retry_after = await limiter.check_and_consume_async(record.consumer)
+        if not allowed:
+            log.info(
+                "api_v3_rate_limited consumer=%s retry_after_s=%d",
+                record.consumer,
+                retry_after,
+            )
+            resp = _error_response(
+                "rate_limited",
+                "Too many requests for this API key",
+                status=429,
+                retry_after_s=retry_after,
+            )
+            resp.headers["Retry-After"] = str(retry_after)
+            return resp
     return None
 
 
@@ -275,49 +308,12 @@ def _resolve_symbol(request: web.Request, default_symbol: str) -> str:
 # ────────────────────────────────────────────────────────────
 
 
-def _journal_path(base_dir: str, date_str: str) -> str:
-    return os.path.join(base_dir, f"journal-{date_str}.jsonl")
-
-
-def _read_journal_file(path: str) -> List[Dict[str, Any]]:
-    """Load all valid JSON records from one journal file (chronological)."""
-    if not os.path.isfile(path):
-        return []
-    rows: List[Dict[str, Any]] = []
-    try:
-        with open(path, "r", encoding="utf-8") as fh:
-            for raw_line in fh:
-                line = raw_line.strip()
-                if not line:
-                    continue
-                try:
-                    rows.append(json.loads(line))
-                except json.JSONDecodeError:
-                    # I5: surface in logs but skip the malformed row so a
-                    # single bad write does not poison the whole response.
-                    log.warning("api_v3_journal_skip_malformed path=%s", path)
-                    continue
-    except OSError as exc:
-        log.warning("api_v3_journal_read_err path=%s err=%s", path, exc)
-    return rows
-
-
-def _filter_records(
-    rows: Iterable[Dict[str, Any]],
-    *,
-    source: str,
-    symbol: Optional[str] = None,
-) -> List[Dict[str, Any]]:
-    out: List[Dict[str, Any]] = []
-    for rec in rows:
-        if source != "all" and rec.get("source", "smc_narrative") != source:
-            # Records without an explicit `source` field come from the
-            # narrative pipeline (pre-TDA), so default them to smc_narrative.
-            continue
-        if symbol and rec.get("symbol") != symbol:
-            continue
-        out.append(rec)
-    return out
+def _journal_store(request: web.Request) -> JournalStore:
+    """Process-level indexed journal reader for APP_SIGNALS_DIR."""
+    store = request.app.get(APP_JOURNAL_STORE)
+    if store is None:
+        store = JournalStore(request.app[APP_SIGNALS_DIR])
+    return store
 
 
 def _classify_record_kind(rec: Dict[str, Any]) -> str:
@@ -331,7 +327,7 @@ def _classify_record_kind(rec: Dict[str, Any]) -> str:
 
 
 async def _handle_signals_latest(request: web.Request) -> web.Response:
-    err = _validate_token(request)
+    err = await _validate_token(request)
     if err is not None:
         return err
     limit, err = _parse_limit(request)
@@ -340,26 +336,13 @@ async def _handle_signals_latest(request: web.Request) -> web.Response:
     source, err = _parse_source(request)
     if err is not None:
         return err
-    base_dir = request.app[APP_SIGNALS_DIR]
+    store = _journal_store(request)
     assert limit is not None and source is not None
 
     def _collect() -> List[Dict[str, Any]]:
-        # Walk back day-by-day until we have `limit` matching records or
-        # exhaust the 90-day horizon. New entries are rare (~2/day) so
-        # typically only today's file is opened.
-        today = datetime.now(timezone.utc)
-        gathered: List[Dict[str, Any]] = []
-        for offset in range(MAX_DATE_BACK_DAYS):
-            dt = today - timedelta(days=offset)
-            rows = _read_journal_file(_journal_path(base_dir, dt.strftime("%Y-%m-%d")))
-            if not rows:
-                continue
-            filtered = _filter_records(rows, source=source)
-            # Newest first within the file.
-            gathered.extend(reversed(filtered))
-            if len(gathered) >= limit:
-                break
-        return gathered[:limit]
+        # Walk back day-by-day (newest first) until `limit` matching records
+        # or the 90-day horizon; only the selected lines are decoded.
+        return store.latest(limit, source=source, max_days=MAX_DATE_BACK_DAYS)
 
     records = await asyncio.to_thread(_collect)
     items = [{"kind": _classify_record_kind(r), "data": r} for r in records]
@@ -367,7 +350,7 @@ async def _handle_signals_latest(request: web.Request) -> web.Response:
 
 
 async def _handle_signals_journal(request: web.Request) -> web.Response:
-    err = _validate_token(request)
+    err = await _validate_token(request)
     if err is not None:
         return err
     date_str, err = _parse_date(request)
@@ -376,13 +359,12 @@ async def _handle_signals_journal(request: web.Request) -> web.Response:
     source, err = _parse_source(request)
     if err is not None:
         return err
-    base_dir = request.app[APP_SIGNALS_DIR]
+    store = _journal_store(request)
     assert date_str is not None and source is not None
     symbol_filter = (request.query.get("symbol") or "").strip() or None
 
     def _read() -> List[Dict[str, Any]]:
-        rows = _read_journal_file(_journal_path(base_dir, date_str))
-        return _filter_records(rows, source=source, symbol=symbol_filter)
+        return store.query(date_str, source=source, symbol=symbol_filter)
 
     records = await asyncio.to_thread(_read)
     items = [{"kind": _classify_record_kind(r), "data": r} for r in records]
@@ -390,7 +372,7 @@ async def _handle_signals_journal(request: web.Request) -> web.Response:
 
 
 async def _handle_bias_latest(request: web.Request) -> web.Response:
-    err = _validate_token(request)
+    err = await _validate_token(request)
     if err is not None:
         return err
     runner = _resolve_smc_runner(request)
@@ -407,7 +389,7 @@ async def _handle_bias_latest(request: web.Request) -> web.Response:
 
 
 async def _handle_narrative_snapshot(request: web.Request) -> web.Response:
-    err = _validate_token(request)
+    err = await _validate_token(request)
     if err is not None:
         return err
     runner = _resolve_smc_runner(request)
@@ -429,6 +411,17 @@ async def _handle_narrative_snapshot(request: web.Request) -> web.Response:
             "No price data for this symbol yet (warmup or market closed)",
             status=503,
         )
+    # Narrative = f(SMC state, price, market minute/session) — same inputs,
+    # same block, so the journal already holds it and a hit skips recompute.
+    state = _smc_state_version(runner, symbol)
+    lookup = _response_cache_lookup(
+        request,
+        "narrative_snapshot",
+        (symbol, tf_s),
+        None if state is None else (state, price, _minute_bucket()),
+    )
+    if lookup.response is not None:
+        return lookup.response
     block = runner.get_narrative(symbol, tf_s, price, 0.0)
     if block is None:
         return _error_response(
@@ -436,21 +429,23 @@ async def _handle_narrative_snapshot(request: web.Request) -> web.Response:
             "Narrative engine disabled or warmup not finished",
             status=503,
         )
-    return web.json_response(
-        _envelope_data(
-            "narrative_block",
-            {
-                "symbol": symbol,
-                "tf_s": tf_s,
-                "current_price": price,
-                "block": block.to_wire(),
-            },
+    return lookup.store(
+        web.json_response(
+            _envelope_data(
+                "narrative_block",
+                {
+                    "symbol": symbol,
+                    "tf_s": tf_s,
+                    "current_price": price,
+                    "block": block.to_wire(),
+                },
+            )
         )
     )
 
 
 async def _handle_macro_context(request: web.Request) -> web.Response:
-    err = _validate_token(request)
+    err = await _validate_token(request)
     if err is not None:
         return err
     base_dir = request.app[APP_SIGNALS_DIR]
@@ -545,6 +540,89 @@ def _enforce_payload_cap(
     return raw, None
 
 
+# ────────────────────────────────────────────────────────────
+# Response cache (ETag / If-None-Match → 304)
+# ────────────────────────────────────────────────────────────
+
+
+def _response_cache_lookup(
+    request: web.Request,
+    route: str,
+    params: tuple,
+    version: Optional[tuple],
+) -> CacheLookup:
+    """Lookup in the app-level response cache; no cache → plain pass-through.
+
+    `params` are the normalized query params, `version` the data version the
+    body depends on (None → bypass). `lookup.response` is the ready 304/hit;
+    otherwise the handler builds the body and returns `lookup.store(resp)`.
+    """
+    cache = request.app.get(APP_RESPONSE_CACHE)
+    if cache is None:
+        return CacheLookup(None, route, params, None, None)
+    return cache.lookup(request, route, params, version)
+
+
+def _updates_version(uds: Any, symbol: str, tf_list: Iterable[int]) -> Optional[tuple]:
+    """Updates-bus cursors (one MGET) for `tf_list`; None if any is unknown."""
+    getter = getattr(uds, "updates_cursors", None)
+    if getter is None:
+        return None
+    tfs = sorted(set(int(tf) for tf in tf_list))
+    try:
+        cursors = getter([(symbol, tf) for tf in tfs])
+    except Exception:
+        log.debug("api_v3_cache_cursor_failed symbol=%s", symbol, exc_info=True)
+        return None
+    return _cursor_version(cursors, tfs)
+
+
+async def _updates_version_async(
+    uds: Any, symbol: str, tf_list: Iterable[int]
+) -> Optional[tuple]:
+    """`_updates_version` awaited on the loop (redis.asyncio MGET).
+
+    UDS without `updates_cursors_async` → sync variant in a worker thread.
+    """
+    getter = getattr(uds, "updates_cursors_async", None)
+    if getter is None:
+        return await asyncio.to_thread(_updates_version, uds, symbol, tf_list)
+    tfs = sorted(set(int(tf) for tf in tf_list))
+    try:
+        cursors = await getter([(symbol, tf) for tf in tfs])
+    except Exception:
+        log.debug("api_v3_cache_cursor_failed symbol=%s", symbol, exc_info=True)
+        return None
+    return _cursor_version(cursors, tfs)
+
+
+def _cursor_version(cursors: Any, tfs: list) -> Optional[tuple]:
+    if not isinstance(cursors, (list, tuple)) or len(cursors) != len(tfs):
+        return None
+    if not all(isinstance(c, int) for c in cursors):
+        return None
+    return tuple(cursors)
+
+
+def _smc_state_version(runner: Any, symbol: str) -> Optional[int]:
+    """SmcRunner.state_version(symbol) or None for runners without it."""
+    getter = getattr(runner, "state_version", None)
+    if getter is None:
+        return None
+    try:
+        version = getter(symbol)
+    except Exception as exc:
+        # без версії відповідь будується повністю (без ETag/304) — не помилка API
+        log.debug("api_v3_state_version_err symbol=%s err=%s", symbol, exc)
+        return None
+    return version if isinstance(version, int) else None
+
+
+def _minute_bucket() -> int:
+    """Wall-clock minute — version part for time-dependent fields (sessions)."""
+    return int(time.time() // 60)
+
+
 def _bars_window_resolve_uds(request: web.Request) -> Any:
     """Return UDS instance from app or a 503 envelope response if missing."""
     from runtime.ws.app_keys import APP_UDS  # SSOT, avoids __main__ import drift
@@ -687,32 +765,41 @@ def _lwc_to_wire_bar(b: Dict[str, Any]) -> Optional[Dict[str, Any]]:
     }
 
 
+def _lwc_to_wire_final(b: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """`_lwc_to_wire_bar` лише для complete рядків (I3 — final-only)."""
+    if not bool(b.get("complete", True)):
+        return None
+    return _lwc_to_wire_bar(b)
+
+
 def _read_bars_window_atomic(
     uds: Any,
     symbol: str,
-    tf_s_list: List[int],
-    count: int,
-) -> Dict[int, List[Dict[str, Any]]]:
+    tf_limits: List[tuple[int, int]],
+) -> Dict[int, Any]:
     """Synchronously read N TFs in one batch (atomic snapshot — no yield).
 
     All `read_window` calls happen inside one `to_thread` invocation by the
     caller, so no other coroutine can interleave preview/final state between
     the per-TF reads. Satisfies ADR-0059 §3.1.1 atomic invariant.
+
+    Reads go through the process-level window cache (one updates-bus cursor
+    MGET for all TFs); returns tf_s → `CachedWindow` (shared, read-only).
     """
     from runtime.store.uds import ReadPolicy, WindowSpec
+    from runtime.store.window_cache import read_windows
 
     policy = ReadPolicy(disk_policy="explicit", prefer_redis=True)
-    out: Dict[int, List[Dict[str, Any]]] = {}
-    for tf_s in tf_s_list:
-        spec = WindowSpec(symbol=symbol, tf_s=tf_s, limit=count, cold_load=True)
-        result = uds.read_window(spec, policy)
-        bars_lwc = getattr(result, "bars_lwc", None) or []
-        out[tf_s] = list(bars_lwc)
-    return out
+    specs = [
+        WindowSpec(symbol=symbol, tf_s=tf_s, limit=limit, cold_load=True)
+        for tf_s, limit in tf_limits
+    ]
+    windows = read_windows(uds, specs, policy)
+    return {tf_s: w for (tf_s, _limit), w in zip(tf_limits, windows)}
 
 
 async def _handle_bars_window(request: web.Request) -> web.Response:
-    err = _validate_token(request)
+    err = await _validate_token(request)
     if err is not None:
         return err
     symbol, err = _validate_bars_window_symbol(request)
@@ -738,9 +825,6 @@ async def _handle_bars_window(request: web.Request) -> web.Response:
     # for it, so the price is atomic with the rest of the snapshot.
     requested_tf_s = [BARS_WINDOW_TF_LABEL_TO_S[lbl] for lbl in tf_labels]
     m15_tf_s = BARS_WINDOW_TF_LABEL_TO_S["M15"]
-    read_tf_s_list = list(requested_tf_s)
-    if m15_tf_s not in read_tf_s_list:
-        read_tf_s_list.append(m15_tf_s)
     # Read M15 with at least 1 bar even if not in requested set.
     # We piggy-back on the per-TF count when M15 is in the request, else
     # use a tiny limit just to fetch the last complete bar for price.
@@ -756,29 +840,32 @@ async def _handle_bars_window(request: web.Request) -> web.Response:
             warnings.append("since_ms_too_old_full_window_returned")
             effective_since_ms = None
 
-    def _read_all() -> Dict[int, List[Dict[str, Any]]]:
-        # M15 piggy-back uses count=1 only when the consumer didn't ask for it.
-        if not m15_only_for_price:
-            return _read_bars_window_atomic(uds, symbol, read_tf_s_list, count)
-        # Mixed limits — read requested TFs at `count`, M15 at min size.
-        from runtime.store.uds import ReadPolicy, WindowSpec
+    # Version = updates-bus cursors of every TF read, taken BEFORE the read:
+    # a commit in between only makes the cached body newer than its key.
+    version = await _updates_version_async(
+        uds, symbol, set(requested_tf_s) | {m15_tf_s}
+    )
+    lookup = _response_cache_lookup(
+        request,
+        "bars_window",
+        (symbol, tuple(tf_labels), count, since_ms, effective_since_ms is None),
+        version,
+    )
+    if lookup.response is not None:
+        return lookup.response
 
-        policy = ReadPolicy(disk_policy="explicit", prefer_redis=True)
-        out: Dict[int, List[Dict[str, Any]]] = {}
-        for tf_s in requested_tf_s:
-            spec = WindowSpec(symbol=symbol, tf_s=tf_s, limit=count, cold_load=True)
-            res = uds.read_window(spec, policy)
-            out[tf_s] = list(getattr(res, "bars_lwc", None) or [])
-        m15_spec = WindowSpec(symbol=symbol, tf_s=m15_tf_s, limit=1, cold_load=True)
-        m15_res = uds.read_window(m15_spec, policy)
-        out[m15_tf_s] = list(getattr(m15_res, "bars_lwc", None) or [])
-        return out
+    def _read_all() -> Dict[int, Any]:
+        # M15 piggy-back uses count=1 only when the consumer didn't ask for it.
+        tf_limits = [(tf_s, count) for tf_s in requested_tf_s]
+        if m15_only_for_price:
+            tf_limits.append((m15_tf_s, 1))
+        return _read_bars_window_atomic(uds, symbol, tf_limits)
 
-    raw_by_tf = await asyncio.to_thread(_read_all)
+    windows_by_tf = await asyncio.to_thread(_read_all)
 
     # Compute current_price from M15 last complete bar (always available
-    # in raw_by_tf because we forced M15 above).
-    m15_rows = raw_by_tf.get(m15_tf_s, [])
+    # in windows_by_tf because we forced M15 above).
+    m15_rows = windows_by_tf[m15_tf_s].rows
     m15_complete = [r for r in m15_rows if bool(r.get("complete", True))]
     if not m15_complete:
         return _error_response(
@@ -793,17 +880,10 @@ async def _handle_bars_window(request: web.Request) -> web.Response:
     latest_open_ms: Dict[str, int] = {}
     for lbl in tf_labels:
         tf_s = BARS_WINDOW_TF_LABEL_TO_S[lbl]
-        rows = raw_by_tf.get(tf_s, [])
-        wire_rows: List[Dict[str, Any]] = []
-        for r in rows:
-            if not bool(r.get("complete", True)):
-                continue  # I3 — final-only on the public surface
-            wire = _lwc_to_wire_bar(r)
-            if wire is None:
-                continue
-            if effective_since_ms is not None and wire["open_ms"] <= effective_since_ms:
-                continue
-            wire_rows.append(wire)
+        # I3 — final-only on the public surface; wire decode shared per commit
+        wire_rows = windows_by_tf[tf_s].decoded("wire_final", _lwc_to_wire_final)
+        if effective_since_ms is not None:
+            wire_rows = [w for w in wire_rows if w["open_ms"] > effective_since_ms]
         # Deduplicate by open_ms while preserving order (defensive — UDS
         # already dedupes, but this makes the contract self-evident).
         seen_open: set[int] = set()
@@ -842,10 +922,12 @@ async def _handle_bars_window(request: web.Request) -> web.Response:
     if cap_err is not None:
         return cap_err
     assert raw_bytes is not None
-    return web.Response(
-        body=raw_bytes,
-        status=200,
-        content_type="application/json",
+    return lookup.store(
+        web.Response(
+            body=raw_bytes,
+            status=200,
+            content_type="application/json",
+        )
     )
 
 
@@ -1267,7 +1349,7 @@ async def _handle_smc_zones(request: web.Request) -> web.Response:
         compatibility, ADR-0059 §3.1.2). Ignored when `?cursor` present.
     Response always carries `next_cursor` (null on last page).
     """
-    err = _validate_token(request)
+    err = await _validate_token(request)
     if err is not None:
         return err
 
@@ -1318,16 +1400,29 @@ async def _handle_smc_zones(request: web.Request) -> web.Response:
     tf_s = SMC_ZONES_TF_LABEL_TO_S[tf_label]
     m15_tf_s = SMC_ZONES_TF_LABEL_TO_S["M15"]
 
+    # Version = SMC state (complete bars) + M15 cursor (current_price source).
+    def _version() -> Optional[tuple]:
+        state = _smc_state_version(runner, symbol)
+        cursors = _updates_version(uds, symbol, [m15_tf_s])
+        if state is None or cursors is None:
+            return None
+        return (state,) + cursors
+
+    lookup = _response_cache_lookup(
+        request,
+        "smc_zones",
+        (symbol, tf_label, limit, offset, kind_filter, status_filter,
+         include_internal, cursor_raw),
+        await asyncio.to_thread(_version),
+    )
+    if lookup.response is not None:
+        return lookup.response
+
     def _read_all() -> Dict[str, Any]:
         # Atomic snapshot — all SMC reads + UDS price read in one to_thread.
         # ADR-0059 §3.1 cross-endpoint rule: current_price = M15.close from
         # UDS (NOT runner.get_last_price which is a live tick aggregate).
-        from runtime.store.uds import ReadPolicy, WindowSpec
-
-        policy = ReadPolicy(disk_policy="explicit", prefer_redis=True)
-        m15_spec = WindowSpec(symbol=symbol, tf_s=m15_tf_s, limit=1, cold_load=True)
-        m15_res = uds.read_window(m15_spec, policy)
-        m15_rows = list(getattr(m15_res, "bars_lwc", None) or [])
+        m15_rows = _read_bars_window_atomic(uds, symbol, [(m15_tf_s, 1)])[m15_tf_s].rows
         snap = runner.get_snapshot(symbol, tf_s)
         grades = runner.get_zone_grades(symbol, tf_s) or {}
         atr = float(runner.get_atr(symbol, tf_s) or 0.0)
@@ -1440,10 +1535,12 @@ async def _handle_smc_zones(request: web.Request) -> web.Response:
     if cap_err is not None:
         return cap_err
     assert raw_bytes is not None
-    return web.Response(
-        body=raw_bytes,
-        status=200,
-        content_type="application/json",
+    return lookup.store(
+        web.Response(
+            body=raw_bytes,
+            status=200,
+            content_type="application/json",
+        )
     )
 
 
@@ -1556,7 +1653,7 @@ async def _handle_smc_levels(request: web.Request) -> web.Response:
         APP_UDS,
     )  # SSOT, avoids __main__ drift
 
-    auth_err = _validate_token(request)
+    auth_err = await _validate_token(request)
     if auth_err is not None:
         return auth_err
 
@@ -1586,27 +1683,42 @@ async def _handle_smc_levels(request: web.Request) -> web.Response:
     sessions_def = load_session_windows(sessions_cfg) if sessions_cfg else []
     current_time_ms = int(_time.time() * 1000)
 
+    # Version = SMC state + M15/D1 cursors + wall-clock minute (session
+    # `complete` flips on minute-aligned boundaries).
+    def _version() -> Optional[tuple]:
+        state = _smc_state_version(runner, symbol)
+        cursors = _updates_version(uds, symbol, [900, 86400])
+        if state is None or cursors is None:
+            return None
+        return (state,) + cursors + (current_time_ms // 60_000,)
+
+    lookup = _response_cache_lookup(
+        request, "smc_levels", (symbol,), await asyncio.to_thread(_version)
+    )
+    if lookup.response is not None:
+        return lookup.response
+
     # ── Atomic snapshot: M15 1 bar + D1 N bars + session_states in one to_thread
     def _read_all() -> tuple[List[Dict[str, Any]], List[Dict[str, Any]], List[Any]]:
         from runtime.store.uds import ReadPolicy, WindowSpec
-
-        # Cross-endpoint atomic price (ADR §3.1)
-        m15_spec = WindowSpec(
-            symbol=symbol,
-            tf_s=900,
-            limit=1,
+        from runtime.store.window_cache import read_windows
+
+        # Cross-endpoint atomic price (ADR §3.1) + D1 lookback for
+        # previous_day + previous_week — one cached batch read.
+        m15_win, d1_win = read_windows(
+            uds,
+            [
+                WindowSpec(symbol=symbol, tf_s=900, limit=1),
+                WindowSpec(
+                    symbol=symbol,
+                    tf_s=86400,
+                    limit=SMC_LEVELS_PREV_DAY_LOOKBACK + 1,
+                ),
+            ],
+            ReadPolicy(),
         )
-        m15_res = uds.read_window(m15_spec, ReadPolicy())
-        m15_bars = list(getattr(m15_res, "bars_lwc", []) or [])
-
-        # D1 lookback for previous_day + previous_week
-        d1_spec = WindowSpec(
-            symbol=symbol,
-            tf_s=86400,
-            limit=SMC_LEVELS_PREV_DAY_LOOKBACK + 1,
-        )
-        d1_res = uds.read_window(d1_spec, ReadPolicy())
-        d1_bars = list(getattr(d1_res, "bars_lwc", []) or [])
+        m15_bars = m15_win.rows
+        d1_bars = d1_win.rows
 
         states = runner.get_session_states(symbol, current_time_ms)
         return m15_bars, d1_bars, states
@@ -1673,10 +1785,12 @@ async def _handle_smc_levels(request: web.Request) -> web.Response:
     if cap_err is not None:
         return cap_err
     assert raw_bytes is not None
-    return web.Response(
-        body=raw_bytes,
-        status=200,
-        content_type="application/json",
+    return lookup.store(
+        web.Response(
+            body=raw_bytes,
+            status=200,
+            content_type="application/json",
+        )
     )
 
 
@@ -1845,6 +1959,8 @@ def register_routes(
     token_store: TokenStore,
     signals_dir: str = "data_v3/_signals",
     audit_dir: Optional[str] = "data_v3/_audit",
+    response_cache: Optional[ResponseCache] = None,
+    rate_limiter: Optional[LocalRateLimiter] = None,
 ) -> None:
     """Mount the five `/api/v3/*` endpoints on `app`.
 
@@ -1853,9 +1969,20 @@ def register_routes(
 
     `audit_dir` controls F-S3-002 audit JSONL output; pass `None` to disable
     (e.g. for unit tests that don't care about the audit trail).
+
+    `response_cache` enables ETag/304 + pre-encoded bodies for bars/window,
+    smc/zones, smc/levels and narrative/snapshot; `None` → always rebuild.
+
+    `rate_limiter` caps requests per consumer after token auth; `None` → no
+    app-level limit (nginx `limit_req` only).
     """
     app[APP_TOKEN_STORE] = token_store
     app[APP_SIGNALS_DIR] = signals_dir
+    app[APP_JOURNAL_STORE] = JournalStore(signals_dir)
+    if response_cache is not None:
+        app[APP_RESPONSE_CACHE] = response_cache
+    if rate_limiter is not None:
+        app[APP_RATE_LIMITER] = rate_limiter
     if audit_dir:
         app[APP_AUDIT_DIR] = audit_dir
         # Best-effort retention sweep at startup. Failures are logged inside.
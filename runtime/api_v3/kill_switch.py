@@ -34,6 +34,15 @@ The fail-open path is loud:
     * Counter `api_v3_kill_switch_check_failed_total` (placeholder log
       until a Prometheus client is wired; alert on >10/min in slice 059.7)
 
+Local cache (`cache_ttl_s > 0`)
+-------------------------------
+The runtime flag is re-read at most once per `cache_ttl_s`; in between the
+last successful EXISTS answer is served from memory. The toggle CLI also
+publishes on `{ns}:api_v3:invalidate` (runtime/api_v3/local_cache.py) so a
+subscribed server drops the cached answer immediately. Failed checks are
+never cached — every request during an outage re-tries and fails open
+loudly, exactly as without the cache.
+
 Path matching
 -------------
 The middleware fires only for requests whose path starts with one of
@@ -51,6 +60,8 @@ from typing import Any, Awaitable, Callable, Optional
 from aiohttp import web
 from redis.exceptions import RedisError
 
+from runtime.store.redis_pool import RedisSteps, adrive, async_twin, drive
+
 log = logging.getLogger("api_v3.kill_switch")
 
 # Path prefixes that the kill switch governs. Signals/bias/narrative/macro
@@ -110,7 +121,9 @@ class KillSwitch:
 
     Stateless wrt requests — all state lives in config (immutable after
     boot) and Redis (shared with the toggle CLI). Thread-safe: each
-    `is_killed()` call performs a single Redis EXISTS, no internal cache.
+    `is_killed()` call performs at most a single Redis EXISTS; with
+    `cache_ttl_s > 0` the answer is reused until it expires or
+    `invalidate()` is called.
     """
 
     def __init__(
@@ -119,10 +132,14 @@ class KillSwitch:
         redis_client: Any,
         namespace: str,
         analysis_enabled: bool,
+        cache_ttl_s: float = 0.0,
     ) -> None:
         self._redis = redis_client
         self._namespace = namespace
         self._analysis_enabled = bool(analysis_enabled)
+        self._cache_ttl_s = max(0.0, float(cache_ttl_s))
+        # (expires_monotonic, flag_present) of the last successful EXISTS
+        self._cached: Optional[tuple[float, bool]] = None
         # Counter (placeholder for Prometheus — wired in slice 059.7).
         self.fail_open_count = 0
 
@@ -134,6 +151,10 @@ class KillSwitch:
     def redis_key(self) -> str:
         return kill_flag_redis_key(self._namespace)
 
+    def invalidate(self) -> None:
+        """Forget the cached runtime flag; the next check hits Redis."""
+        self._cached = None
+
     def is_killed(self) -> tuple[bool, Optional[str]]:
         """Return (killed?, reason_code). reason_code is the error envelope code.
 
@@ -142,10 +163,38 @@ class KillSwitch:
         - (False, None)                       → serve normally
         - Redis outage                        → (False, None) + warning + counter
         """
+        cached = self._cached_verdict()
+        if cached is not None:
+            return cached
+        return drive(self._redis, self._is_killed_steps())
+
+    async def is_killed_async(self) -> tuple[bool, Optional[str]]:
+        """Same contract as `is_killed()`, awaited on the event loop.
+
+        Uses a redis.asyncio twin of the sync client; clients without a
+        connection pool (test fakes) fall back to the sync check.
+        """
+        cached = self._cached_verdict()
+        if cached is not None:
+            return cached
+        client = async_twin(self._redis)
+        if client is None:
+            return self.is_killed()
+        return await adrive(client, self._is_killed_steps())
+
+    def _cached_verdict(self) -> Optional[tuple[bool, Optional[str]]]:
+        if not self._analysis_enabled:
+            return True, "analysis_disabled_config"
+        cached = self._cached
+        if cached is None or cached[0] <= time.monotonic():
+            return None
+        return (True, "analysis_disabled_runtime") if cached[1] else (False, None)
+
+    def _is_killed_steps(self) -> RedisSteps:
         if not self._analysis_enabled:
             return True, "analysis_disabled_config"
         try:
-            present = bool(self._redis.exists(self.redis_key))
+            present = bool((yield ("exists", (self.redis_key,), {})))
         except RedisError as exc:
             self.fail_open_count += 1
             log.warning(
@@ -156,6 +205,8 @@ class KillSwitch:
                 self.fail_open_count,
             )
             return False, None
+        if self._cache_ttl_s > 0:
+            self._cached = (time.monotonic() + self._cache_ttl_s, present)
         if present:
             return True, "analysis_disabled_runtime"
         return False, None
@@ -192,7 +243,7 @@ async def _analysis_kill_middleware(
             path,
         )
         return await handler(request)
-    killed, reason = switch.is_killed()
+    killed, reason = await switch.is_killed_async()
     if killed and reason is not None:
         log.info("api_v3_analysis_blocked path=%s reason=%s", path, reason)
         return _build_kill_response(
@@ -209,6 +260,7 @@ def register_kill_switch(
     redis_client: Any,
     namespace: str,
     analysis_enabled: bool,
+    cache_ttl_s: float = 0.0,
 ) -> KillSwitch:
     """Mount the kill switch on `app` and return the live KillSwitch instance.
 
@@ -221,6 +273,8 @@ def register_kill_switch(
         namespace: Redis namespace prefix (e.g. "v3_local").
         analysis_enabled: Boot-time config layer (config.json:api_v3
             .analysis_enabled). False → analysis blocked until restart.
+        cache_ttl_s: Reuse the runtime flag answer for this long
+            (config.json:api_v3.local_cache.kill_ttl_s); 0 → EXISTS per request.
 
     Returns:
         The KillSwitch instance (also stashed at app[APP_KILL_SWITCH]).
@@ -229,6 +283,7 @@ def register_kill_switch(
         redis_client=redis_client,
         namespace=namespace,
         analysis_enabled=analysis_enabled,
+        cache_ttl_s=cache_ttl_s,
     )
     app[APP_KILL_SWITCH] = switch
     app.middlewares.append(_analysis_kill_middleware)
@@ -0,0 +1,209 @@
+"""Локальні кеші auth / kill switch для /api/v3 + pub/sub інвалідація.
+
+TokenStore (`cache_ttl_s`) тримає валідовані TokenRecord, KillSwitch
+(`cache_ttl_s`) — останню відповідь EXISTS по runtime-прапору. Polling
+клієнт, що б'є zones/levels кожні кілька секунд, не платить Redis GET +
+json.loads + EXISTS на кожен запит.
+
+Канал `{ns}:api_v3:invalidate` (SSOT — invalidation_channel):
+    "token:<token>" — revoke / extend (tools/api_v3/revoke_token, extend_token)
+    "kill"          — toggle_analysis --on/--off
+    "*"             — скинути обидва кеші
+
+Listener — asyncio task у ws_server (redis.asyncio pubsub). Після кожної
+(пере)підписки кеші скидаються: повідомлення, пропущені поки підписки не
+було (Redis down / reconnect), не лишають відкликаний токен чи старий
+kill-прапор у пам'яті. TTL обмежує застарілість, якщо listener не працює
+зовсім (нема redis.asyncio).
+
+Семантика збережена: помилки Redis і негативні відповіді не кешуються —
+промах кешу при недоступному Redis дає 503 (auth, fail-closed) або
+обслуговування з warning (kill switch, fail-open).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+from aiohttp import web
+
+from runtime.api_v3.kill_switch import KillSwitch
+from runtime.api_v3.token_store import TokenStore
+from runtime.store.redis_pool import async_twin
+
+log = logging.getLogger("api_v3.local_cache")
+
+KILL_MESSAGE = "kill"
+FLUSH_MESSAGE = "*"
+TOKEN_MESSAGE_PREFIX = "token:"
+_LISTENER_RETRY_S = 5.0
+_GET_MESSAGE_TIMEOUT_S = 1.0
+
+
+def invalidation_channel(namespace: str) -> str:
+    """Pub/sub канал інвалідації локальних кешів (CLI і сервер — один builder)."""
+    return f"{namespace}:api_v3:invalidate"
+
+
+@dataclass(frozen=True)
+class LocalCacheConfig:
+    """config.json:api_v3.local_cache (немає секції → кеші вимкнені)."""
+
+    enabled: bool = False
+    token_ttl_s: float = 30.0
+    token_max_entries: int = 1024
+    kill_ttl_s: float = 2.0
+
+    @classmethod
+    def from_config(cls, cfg: Dict[str, Any]) -> "LocalCacheConfig":
+        api_cfg = cfg.get("api_v3")
+        raw = api_cfg.get("local_cache") if isinstance(api_cfg, dict) else None
+        section = raw if isinstance(raw, dict) else {}
+        return cls(
+            enabled=bool(section.get("enabled", False)),
+            token_ttl_s=max(0.0, float(section.get("token_ttl_s", cls.token_ttl_s))),
+            token_max_entries=max(
+                1, int(section.get("token_max_entries", cls.token_max_entries))
+            ),
+            kill_ttl_s=max(0.0, float(section.get("kill_ttl_s", cls.kill_ttl_s))),
+        )
+
+    @property
+    def token_cache_ttl_s(self) -> float:
+        return self.token_ttl_s if self.enabled else 0.0
+
+    @property
+    def kill_cache_ttl_s(self) -> float:
+        return self.kill_ttl_s if self.enabled else 0.0
+
+
+def publish_invalidation(client: Any, namespace: str, message: str) -> int:
+    """PUBLISH у канал інвалідації; кількість підписників або -1 при помилці.
+
+    Best-effort для CLI: Redis-зміна (DEL / SET) вже відбулась, TTL
+    локального кешу обмежує застарілість і без повідомлення.
+    """
+    try:
+        return int(client.publish(invalidation_channel(namespace), message))
+    except Exception as exc:
+        log.warning("api_v3_invalidation_publish_failed msg=%s err=%s", message[:14], exc)
+        return -1
+
+
+def apply_invalidation(
+    message: Any,
+    *,
+    token_store: Optional[TokenStore],
+    kill_switch: Optional[KillSwitch],
+) -> None:
+    """Застосовує одне повідомлення каналу до локальних кешів."""
+    if isinstance(message, (bytes, bytearray)):
+        message = bytes(message).decode("utf-8", "replace")
+    if not isinstance(message, str):
+        return
+    if message.startswith(TOKEN_MESSAGE_PREFIX):
+        if token_store is not None:
+            token_store.invalidate(message[len(TOKEN_MESSAGE_PREFIX) :])
+    elif message == KILL_MESSAGE:
+        if kill_switch is not None:
+            kill_switch.invalidate()
+    elif message == FLUSH_MESSAGE:
+        _flush(token_store, kill_switch)
+    else:
+        log.debug("api_v3_invalidation_unknown msg=%r", message[:32])
+
+
+def _flush(token_store: Optional[TokenStore], kill_switch: Optional[KillSwitch]) -> None:
+    if token_store is not None:
+        token_store.invalidate()
+    if kill_switch is not None:
+        kill_switch.invalidate()
+
+
+async def run_invalidation_listener(
+    redis_client: Any,
+    namespace: str,
+    *,
+    token_store: Optional[TokenStore],
+    kill_switch: Optional[KillSwitch],
+    retry_s: float = _LISTENER_RETRY_S,
+) -> None:
+    """Підписка на канал інвалідації до cancel; reconnect з паузою retry_s."""
+    client = async_twin(redis_client)
+    if client is None:
+        log.warning(
+            "API_V3_INVALIDATION_OFF: redis.asyncio unavailable — local caches "
+            "rely on TTL only"
+        )
+        return
+    channel = invalidation_channel(namespace)
+    while True:
+        pubsub = client.pubsub(ignore_subscribe_messages=True)
+        try:
+            await pubsub.subscribe(channel)
+            _flush(token_store, kill_switch)
+            log.info("API_V3_INVALIDATION_SUBSCRIBED channel=%s", channel)
+            while True:
+                msg = await pubsub.get_message(timeout=_GET_MESSAGE_TIMEOUT_S)
+                if msg is not None and msg.get("type") == "message":
+                    apply_invalidation(
+                        msg.get("data"), token_store=token_store, kill_switch=kill_switch
+                    )
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            _flush(token_store, kill_switch)
+            log.warning(
+                "API_V3_INVALIDATION_LISTENER_ERR err=%s retry_s=%.1f "
+                "(local caches flushed)",
+                exc,
+                retry_s,
+            )
+        finally:
+            try:
+                await pubsub.aclose()
+            except Exception as exc:
+                log.debug("api_v3_invalidation_pubsub_close_err err=%s", exc)
+        await asyncio.sleep(retry_s)
+
+
+def register_invalidation_listener(
+    app: web.Application,
+    *,
+    redis_client: Any,
+    namespace: str,
+    token_store: Optional[TokenStore],
+    kill_switch: Optional[KillSwitch],
+) -> None:
+    """on_startup → listener task; on_cleanup → cancel."""
+
+    async def _start(app_: web.Application) -> None:
+        app_[APP_INVALIDATION_TASK] = asyncio.create_task(
+            run_invalidation_listener(
+                redis_client,
+                namespace,
+                token_store=token_store,
+                kill_switch=kill_switch,
+            )
+        )
+
+    async def _stop(app_: web.Application) -> None:
+        task = app_.get(APP_INVALIDATION_TASK)
+        if task is None:
+            return
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:  # bare_except: allow  # очікуваний результат cancel()
+            pass
+        except Exception as exc:
+            log.debug("api_v3_invalidation_listener_stop_err err=%s", exc)
+
+    app.on_startup.append(_start)
+    app.on_cleanup.append(_stop)
+
+
+APP_INVALIDATION_TASK = web.AppKey("api_v3_invalidation_task", asyncio.Task)
@@ -0,0 +1,202 @@
+"""Response-level кеш /api/v3 read endpoints + ETag / If-None-Match → 304.
+
+Відповідь залежить лише від нормалізованих параметрів запиту і версії даних
+(курсори updates bus, SmcRunner.state_version, хвилинний бакет для
+time-dependent полів). Тож між bar commit-ами polling клієнт отримує
+готові байти (hit) або 304 без тіла — без фільтрації, сортування,
+snapshot_id і json.dumps.
+
+Один запис на (route, params): новий version заміщує старий, тож кеш не
+накопичує застарілі версії; LRU обмежує кількість наборів параметрів.
+ETag = sha1(route, params, version). 304 лише проти свіжого запису кешу:
+max_age_s обмежує життя навіть за незмінного version (prime/rebuild без
+updates events), після чого тіло будується заново.
+
+version=None (немає курсора / runner без state_version) → bypass: відповідь
+будується як раніше, без ETag. Кешуються лише 200.
+
+Hit ratio per route — stats() і рядок API_V3_CACHE_STATS раз на 60 с.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+from aiohttp import web
+
+log = logging.getLogger("api_v3.response_cache")
+
+DEFAULT_MAX_ENTRIES = 1024
+DEFAULT_MAX_AGE_S = 30.0
+# Клієнт може тримати копію, але має ревалідувати (If-None-Match) щоразу
+CACHE_CONTROL = "private, no-cache"
+_STATS_EMIT_INTERVAL_S = 60.0
+_OUTCOMES = ("hit", "not_modified", "miss", "bypass")
+
+_Key = Tuple[str, Hashable]
+
+
+def etag_matches(header: Optional[str], etag: str) -> bool:
+    """If-None-Match: список ETag через кому, `*`, weak-порівняння (RFC 9110 §13.1.2)."""
+    if not header:
+        return False
+    for part in header.split(","):
+        tag = part.strip()
+        if tag == "*":
+            return True
+        if tag.startswith("W/"):
+            tag = tag[2:]
+        if tag == etag:
+            return True
+    return False
+
+
+class CacheLookup:
+    """Результат lookup: готова відповідь (304/hit) або контекст для store()."""
+
+    __slots__ = ("response", "_cache", "_route", "_params", "_version", "etag")
+
+    def __init__(
+        self,
+        cache: Optional["ResponseCache"],
+        route: str,
+        params: Hashable,
+        version: Optional[Hashable],
+        etag: Optional[str],
+        response: Optional[web.Response] = None,
+    ) -> None:
+        self._cache = cache
+        self._route = route
+        self._params = params
+        self._version = version
+        self.etag = etag
+        self.response = response
+
+    def store(self, response: web.Response) -> web.Response:
+        """Зберегти 200-відповідь (pre-encoded body) і додати ETag."""
+        if self._cache is None or self.etag is None or response.status != 200:
+            return response
+        body = response.body
+        if not isinstance(body, (bytes, bytearray)):
+            return response
+        self._cache.put(self._route, self._params, self._version, self.etag, bytes(body))
+        response.headers["ETag"] = self.etag
+        response.headers["Cache-Control"] = CACHE_CONTROL
+        return response
+
+
+class ResponseCache:
+    """LRU pre-encoded тіл відповідей per (route, params) з версією даних."""
+
+    @classmethod
+    def from_config(cls, cfg: Dict[str, Any]) -> Optional["ResponseCache"]:
+        """config.json:api_v3.response_cache → ResponseCache або None (enabled=false)."""
+        api_cfg = cfg.get("api_v3")
+        raw = api_cfg.get("response_cache") if isinstance(api_cfg, dict) else None
+        section = raw if isinstance(raw, dict) else {}
+        if not bool(section.get("enabled", True)):
+            return None
+        return cls(
+            max_entries=int(section.get("max_entries", DEFAULT_MAX_ENTRIES)),
+            max_age_s=float(section.get("max_age_s", DEFAULT_MAX_AGE_S)),
+        )
+
+    def __init__(
+        self,
+        *,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_age_s: float = DEFAULT_MAX_AGE_S,
+    ) -> None:
+        self._max_entries = max(1, int(max_entries))
+        self._max_age_s = max(0.0, float(max_age_s))
+        self._lock = threading.Lock()
+        # (route, params) → (version, etag, body, stored_ts)
+        self._entries: "OrderedDict[_Key, Tuple[Hashable, str, bytes, float]]" = OrderedDict()
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._stats_last_emit_ts = time.monotonic()
+
+    @staticmethod
+    def etag(route: str, params: Hashable, version: Hashable) -> str:
+        raw = repr((route, params, version)).encode("utf-8")
+        return '"' + hashlib.sha1(raw).hexdigest()[:24] + '"'
+
+    def lookup(
+        self,
+        request: web.Request,
+        route: str,
+        params: Hashable,
+        version: Optional[Hashable],
+    ) -> CacheLookup:
+        if version is None:
+            self._note(route, "bypass")
+            return CacheLookup(None, route, params, None, None)
+        etag = self.etag(route, params, version)
+        headers = {"ETag": etag, "Cache-Control": CACHE_CONTROL}
+        now = time.monotonic()
+        body: Optional[bytes] = None
+        with self._lock:
+            entry = self._entries.get((route, params))
+            if (
+                entry is not None
+                and entry[0] == version
+                and now - entry[3] <= self._max_age_s
+            ):
+                self._entries.move_to_end((route, params))
+                body = entry[2]
+        if body is not None and etag_matches(request.headers.get("If-None-Match"), etag):
+            self._note(route, "not_modified")
+            return CacheLookup(
+                None, route, params, version, etag, web.Response(status=304, headers=headers)
+            )
+        if body is not None:
+            self._note(route, "hit")
+            return CacheLookup(
+                None,
+                route,
+                params,
+                version,
+                etag,
+                web.Response(
+                    body=body, status=200, content_type="application/json", headers=headers
+                ),
+            )
+        self._note(route, "miss")
+        return CacheLookup(self, route, params, version, etag)
+
+    def put(
+        self, route: str, params: Hashable, version: Hashable, etag: str, body: bytes
+    ) -> None:
+        with self._lock:
+            self._entries[(route, params)] = (version, etag, body, time.monotonic())
+            self._entries.move_to_end((route, params))
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """route → лічильники outcome + hit_ratio ((hit + 304) / усі)."""
+        with self._lock:
+            counts = {route: dict(c) for route, c in self._counts.items()}
+        out: Dict[str, Dict[str, Any]] = {}
+        for route, c in sorted(counts.items()):
+            total = sum(c.values())
+            served = c.get("hit", 0) + c.get("not_modified", 0)
+            row: Dict[str, Any] = {k: c.get(k, 0) for k in _OUTCOMES}
+            row["hit_ratio"] = round(served / total, 4) if total else 0.0
+            out[route] = row
+        return out
+
+    def _note(self, route: str, outcome: str) -> None:
+        with self._lock:
+            c = self._counts.setdefault(route, {})
+            c[outcome] = c.get(outcome, 0) + 1
+        now = time.monotonic()
+        if now - self._stats_last_emit_ts < _STATS_EMIT_INTERVAL_S:
+            return
+        self._stats_last_emit_ts = now
+        log.info("API_V3_CACHE_STATS %s", json.dumps(self.stats(), sort_keys=True))
@@ -13,6 +13,14 @@ Scope semantics (F-S1-007):
     "read:no-narrative") are reserved — `lookup()` returns None for them
     (fail-closed). Extension requires ADR amendment.
 
+Local cache (`cache_ttl_s > 0`):
+    Validated records are kept in-process for up to `cache_ttl_s` (bounded
+    LRU). Revocation is pushed via the `{namespace}:api_v3:invalidate`
+    pub/sub channel (runtime/api_v3/local_cache.py) → `invalidate(token)`;
+    the TTL bounds staleness if a message is missed. Negative results and
+    Redis errors are never cached, so an unknown token still costs a GET
+    and an outage on a cache miss still fails closed.
+
 This module is layer-runtime (allowed Redis I/O) but contains no FastAPI
 imports — kept thin for unit testing without an HTTP harness.
 """
@@ -21,11 +29,16 @@ from __future__ import annotations
 
 import json
 import logging
+import threading
+import time
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Optional, cast
 
 import redis as redis_lib
 
+from runtime.store.redis_pool import RedisSteps, adrive, async_twin, drive
+
 log = logging.getLogger("api_v3.token_store")
 
 TOKEN_PREFIX = "tk_"
@@ -71,14 +84,73 @@ def is_well_formed(token: Optional[str]) -> bool:
 class TokenStore:
     """Redis-backed token validator. Caller MUST handle RedisError fail-closed.
 
-    No in-memory cache: revocation (`DEL` in Redis) takes effect on the next
-    request. This trades a per-request Redis GET (~0.1ms local) for instant
-    revocation — acceptable since /api/v3/* is rate-limited at 60 req/min.
+    Default (`cache_ttl_s=0`): no in-memory cache — revocation (`DEL` in
+    Redis) takes effect on the next request. With `cache_ttl_s > 0` a
+    validated record is served from memory for up to that long; revocation
+    is instant only while the invalidation listener is subscribed.
     """
 
-    def __init__(self, client: redis_lib.Redis, namespace: str) -> None:
+    def __init__(
+        self,
+        client: redis_lib.Redis,
+        namespace: str,
+        *,
+        cache_ttl_s: float = 0.0,
+        cache_max_entries: int = 1024,
+    ) -> None:
         self._redis = client
         self._namespace = namespace
+        self._cache_ttl_s = max(0.0, float(cache_ttl_s))
+        self._cache_max_entries = max(1, int(cache_max_entries))
+        # token → (expires_monotonic, record); LRU order
+        self._cache: "OrderedDict[str, tuple[float, TokenRecord]]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+        # bumped by invalidate(): a GET that started before a revoke
+        # message must not re-populate the cache with the revoked record
+        self._cache_gen = 0
+        self.cache_hits = 0
+        self.cache_misses = 0
+
+    @property
+    def namespace(self) -> str:
+        return self._namespace
+
+    def invalidate(self, token: Optional[str] = None) -> None:
+        """Drop one cached token, or the whole cache when `token` is None."""
+        with self._cache_lock:
+            self._cache_gen += 1
+            if token is None:
+                self._cache.clear()
+            else:
+                self._cache.pop(token, None)
+
+    def _cache_get(self, token: Optional[str]) -> Optional[TokenRecord]:
+        if self._cache_ttl_s <= 0 or token is None:
+            return None
+        now = time.monotonic()
+        with self._cache_lock:
+            entry = self._cache.get(token)
+            if entry is None or entry[0] <= now:
+                if entry is not None:
+                    del self._cache[token]
+                self.cache_misses += 1
+                return None
+            self._cache.move_to_end(token)
+            self.cache_hits += 1
+            return entry[1]
+
+    def _cache_put(
+        self, token: Optional[str], record: Optional[TokenRecord], gen: int
+    ) -> None:
+        if self._cache_ttl_s <= 0 or token is None or record is None:
+            return
+        with self._cache_lock:
+            if gen != self._cache_gen:
+                return
+            self._cache[token] = (time.monotonic() + self._cache_ttl_s, record)
+            self._cache.move_to_end(token)
+            while len(self._cache) > self._cache_max_entries:
+                self._cache.popitem(last=False)
 
     def lookup(self, token: Optional[str]) -> Optional[TokenRecord]:
         """Return TokenRecord if token is valid+active+known-scope, else None.
@@ -91,11 +163,40 @@ class TokenStore:
                 fail-closed (HTTP 503). Never let a Redis outage silently
                 allow requests through.
         """
+        cached = self._cache_get(token)
+        if cached is not None:
+            return cached
+        gen = self._cache_gen
+        record = drive(self._redis, self._lookup_steps(token))
+        self._cache_put(token, record, gen)
+        return record
+
+    async def lookup_async(self, token: Optional[str]) -> Optional[TokenRecord]:
+        """Same contract as `lookup()`, awaited on the event loop.
+
+        Uses a redis.asyncio twin of the sync client (same connection
+        params). Clients without a connection pool (test fakes) fall back
+        to the sync `lookup()`.
+        """
+        cached = self._cache_get(token)
+        if cached is not None:
+            return cached
+        gen = self._cache_gen
+        client = async_twin(self._redis)
+        if client is None:
+            record = drive(self._redis, self._lookup_steps(token))
+        else:
+            record = await adrive(client, self._lookup_steps(token))
+        self._cache_put(token, record, gen)
+        return record
+
+    def _lookup_steps(self, token: Optional[str]) -> RedisSteps:
+        """Lookup as a command generator: one GET, then parse the payload."""
         if not is_well_formed(token):
             return None
         # `token` is non-None after is_well_formed passes (asserted by shape check)
         assert token is not None
-        raw = self._redis.get(token_redis_key(self._namespace, token))
+        raw = yield ("get", (token_redis_key(self._namespace, token),), {})
         if raw is None:
             return None
         # decode_responses=True on the client guarantees str, but redis-py's
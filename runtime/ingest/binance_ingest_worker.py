@@ -330,6 +330,11 @@ def build_binance_ingest_worker(
         derive_warmup_bars_by_tf=derive_warmup,
         cascade_catchup_m1_bars=cascade_catchup,
         initial_backfill_m1_bars=initial_backfill_bars,
+        segment_seal_cfg=(
+            cfg.get("ssot_segments")
+            if isinstance(cfg.get("ssot_segments"), dict)
+            else None
+        ),
     )
     return runner, crawl_context
 
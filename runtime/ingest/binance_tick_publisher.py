@@ -22,6 +22,7 @@ from core.config_loader import pick_config_path, load_system_config
 from env_profile import load_env_secrets
 from runtime.ingest.tick_common import pick_tick_channel
 from runtime.store.redis_keys import symbol_key
+from runtime.store.redis_pool import pooled_client
 from runtime.store.redis_spec import resolve_redis_spec
 
 try:
@@ -232,13 +233,7 @@ def main() -> int:
         logger.error("BINANCE_TICK_PUBLISHER_REDIS_DISABLED")
         return 1
 
-    redis_cli = redis_lib.Redis(
-        host=spec.host,
-        port=spec.port,
-        db=spec.db,
-        socket_timeout=30,
-        socket_connect_timeout=5,
-    )
+    redis_cli = pooled_client(spec, socket_timeout=30, socket_connect_timeout=5)
 
     min_interval_ms = int(cfg.get("preview_tick_publish_min_interval_ms", 250))
     last_tick_ttl_s = int(cfg.get("tick_stream_last_tick_ttl_s", 30))
@@ -27,9 +27,13 @@ Redis queues (namespace з config.json):
 
 Command contract v1:
   {"v": 1, "cmd": "fetch_m1", "symbol": "XAU/USD", "n_bars": 5, "date_to_ms": 1741392060000}
+  {"v": 1, "cmd": "fetch_m1_batch",
+   "items": [{"symbol": "XAU/USD", "n_bars": 5, "date_to_ms": 1741392060000}, ...]}
 
 Response contract v1:
     {"v": 1, "req_id": "...", "symbol": "XAU/USD", "bars": [{...}, ...], "error": null}
+    fetch_m1_batch (items обробляються в одному циклі, одна відповідь):
+    {"v": 1, "req_id": "...", "results": [{"symbol", "bars", "error"}, ...], "error": null}
 """
 
 from __future__ import annotations
@@ -74,6 +78,7 @@ _DEFAULT_IPC_REPLY_TTL_S = 120  # config.json:broker_ipc_reply_ttl_s
 _ipc_reply_ttl_s = _DEFAULT_IPC_REPLY_TTL_S  # overridden in main() from config
 _RECONNECT_COOLDOWN_S = 30
 _MAX_BARS_PER_CMD = 200  # guard against huge requests
+_MAX_BATCH_ITEMS = 64  # guard for fetch_m1_batch items
 _CONTRACT_VERSION = 1
 
 _running = True
@@ -140,15 +145,89 @@ def _handle_command(provider, cmd_raw, redis_cli, bars_key):
     action = cmd.get("cmd", "")
     req_id = str(cmd.get("req_id", "") or "")
     reply_to = str(cmd.get("reply_to", "") or "")
-    symbol = cmd.get("symbol", "")
-    n_bars = min(int(cmd.get("n_bars", 5)), _MAX_BARS_PER_CMD)
-    date_to_ms = cmd.get("date_to_ms")
     target_key = reply_to or bars_key
 
+    if action == "fetch_m1_batch":
+        return _handle_batch(provider, cmd, req_id, reply_to, redis_cli, target_key)
+
+    symbol = cmd.get("symbol", "")
     if action != "fetch_m1" or not symbol:
         logging.warning("BROKER_SIDECAR_CMD_UNKNOWN cmd=%s symbol=%s", action, symbol)
         return False
 
+    bar_dicts, error, needs_reconnect = _fetch_item(
+        provider, symbol, cmd.get("n_bars", 5), cmd.get("date_to_ms")
+    )
+    resp = json.dumps(
+        {
+            "v": _CONTRACT_VERSION,
+            "req_id": req_id,
+            "symbol": symbol,
+            "bars": bar_dicts,
+            "error": error,
+        }
+    )
+    _push_reply(redis_cli, target_key, reply_to, resp)
+    return needs_reconnect
+
+
+def _handle_batch(provider, cmd, req_id, reply_to, redis_cli, target_key):
+    """fetch_m1_batch: усі items в одному циклі, одна відповідь одним pipeline.
+
+    Reply: {"v", "req_id", "results": [{"symbol", "bars", "error"}, ...]}
+    у порядку items. Returns True if FXCM session needs reconnection.
+    """
+    items = cmd.get("items")
+    if not isinstance(items, list) or not items:
+        logging.warning("BROKER_SIDECAR_CMD_UNKNOWN cmd=fetch_m1_batch items=%r", items)
+        return False
+    if len(items) > _MAX_BATCH_ITEMS:
+        # Відповідь без results → worker логує BATCH_SHAPE і повертає [] усім
+        logging.warning(
+            "BROKER_SIDECAR_BATCH_TOO_LARGE items=%d max=%d", len(items), _MAX_BATCH_ITEMS
+        )
+        resp = json.dumps(
+            {
+                "v": _CONTRACT_VERSION,
+                "req_id": req_id,
+                "results": None,
+                "error": "batch_too_large",
+            }
+        )
+        _push_reply(redis_cli, target_key, reply_to, resp)
+        return False
+
+    results = []
+    needs_reconnect = False
+    for item in items:
+        symbol = item.get("symbol", "") if isinstance(item, dict) else ""
+        if not symbol:
+            results.append({"symbol": symbol, "bars": [], "error": "bad_item"})
+            continue
+        bar_dicts, error, item_reconnect = _fetch_item(
+            provider, symbol, item.get("n_bars", 5), item.get("date_to_ms")
+        )
+        results.append({"symbol": symbol, "bars": bar_dicts, "error": error})
+        needs_reconnect = needs_reconnect or item_reconnect
+
+    resp = json.dumps(
+        {"v": _CONTRACT_VERSION, "req_id": req_id, "results": results, "error": None}
+    )
+    pipe = redis_cli.pipeline(transaction=False)
+    _push_reply(pipe, target_key, reply_to, resp)
+    pipe.execute()
+    logging.info(
+        "BROKER_SIDECAR_BATCH items=%d errors=%d",
+        len(results),
+        sum(1 for r in results if r["error"]),
+    )
+    return needs_reconnect
+
+
+def _fetch_item(provider, symbol, n_bars, date_to_ms):
+    """Один fetch_last_n_m1 → (bar_dicts, error, needs_reconnect)."""
+    n_bars = min(int(n_bars), _MAX_BARS_PER_CMD)
+
     # Convert date_to_ms → datetime (provider expects tz-aware UTC)
     date_to_utc = None
     if date_to_ms is not None:
@@ -158,22 +237,8 @@ def _handle_command(provider, cmd_raw, redis_cli, bars_key):
         bars = provider.fetch_last_n_m1(symbol, n=n_bars, date_to_utc=date_to_utc)
     except Exception as exc:
         # Повертаємо error response, worker вирішить що робити
-        error_resp = json.dumps(
-            {
-                "v": _CONTRACT_VERSION,
-                "req_id": req_id,
-                "symbol": symbol,
-                "bars": [],
-                "error": str(exc),
-            }
-        )
-        redis_cli.rpush(target_key, error_resp)
-        if reply_to:
-            redis_cli.expire(target_key, _ipc_reply_ttl_s)
-        else:
-            redis_cli.ltrim(target_key, -_MAX_LIST_LEN, -1)
         logging.warning("BROKER_SIDECAR_FETCH_ERROR symbol=%s err=%s", symbol, exc)
-        return True  # needs reconnect
+        return [], str(exc), True  # needs reconnect
 
     # Check for silent provider errors (SDK exceptions swallowed internally)
     last_err = provider.consume_last_error()
@@ -189,20 +254,6 @@ def _handle_command(provider, cmd_raw, redis_cli, bars_key):
 
     # Серіалізація: batch response
     bar_dicts = [b.to_dict() for b in bars] if bars else []
-    resp = json.dumps(
-        {
-            "v": _CONTRACT_VERSION,
-            "req_id": req_id,
-            "symbol": symbol,
-            "bars": bar_dicts,
-            "error": None,
-        }
-    )
-    redis_cli.rpush(target_key, resp)
-    if reply_to:
-        redis_cli.expire(target_key, _ipc_reply_ttl_s)
-    else:
-        redis_cli.ltrim(target_key, -_MAX_LIST_LEN, -1)
 
     if bars:
         logging.info(
@@ -219,7 +270,16 @@ def _handle_command(provider, cmd_raw, redis_cli, bars_key):
             date_to_ms,
         )
 
-    return needs_reconnect
+    return bar_dicts, None, needs_reconnect
+
+
+def _push_reply(redis_cli, target_key, reply_to, resp):
+    """RPUSH відповіді: per-request ключ з TTL або legacy shared list з LTRIM."""
+    redis_cli.rpush(target_key, resp)
+    if reply_to:
+        redis_cli.expire(target_key, _ipc_reply_ttl_s)
+    else:
+        redis_cli.ltrim(target_key, -_MAX_LIST_LEN, -1)
 
 
 # ---------------------------------------------------------------------------
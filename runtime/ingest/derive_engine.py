@@ -26,7 +26,7 @@ from __future__ import annotations
 import logging
 import threading
 import time
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 from core.derive import (
     DERIVE_CHAIN,
@@ -63,6 +63,16 @@ _BUFFER_MAX_KEEP: Dict[int, int] = {
 DEFAULT_COMMIT_TFS_S: Set[int] = set(DERIVE_ORDER)  # {180,300,900,1800,3600,14400}
 
 
+def _trading_fn(cal: Any) -> Optional[Callable[[int], bool]]:
+    """Calendar → is_trading_fn: компільований (bitmap) якщо доступний."""
+    if cal is None:
+        return None
+    compiled = getattr(cal, "compiled", None)
+    if compiled is not None:
+        return compiled()
+    return cal.is_trading_minute
+
+
 class DeriveEngine:
     """Каскадна деривація OHLCV з I/O commit через UDS.
 
@@ -255,7 +265,7 @@ class DeriveEngine:
         """
         committed: List[CandleBar] = []
         cal = self._calendars.get(symbol)
-        is_trading_fn = cal.is_trading_minute if cal is not None else None
+        is_trading_fn = _trading_fn(cal)
         uds = self._uds_by_symbol.get(symbol)
         if uds is None:
             return committed
@@ -358,7 +368,7 @@ class DeriveEngine:
 
         # 2. Calendar filter для символу (потрібен і для triggers, і для derive)
         cal = self._calendars.get(symbol)
-        is_trading_fn = cal.is_trading_minute if cal is not None else None
+        is_trading_fn = _trading_fn(cal)
 
         # 3. Triggers (calendar-aware: знаходить останній TRADING source
         #    слот у bucket, а не номінальний — фіксить H4 19:00 тощо)
@@ -13,8 +13,9 @@ from __future__ import annotations
 
 import json
 import logging
+import time
 import uuid
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from core.config_loader import pick_config_path, load_system_config
 from core.model.bars import CandleBar
@@ -27,6 +28,7 @@ from runtime.ingest.polling.m1_poller import (
     set_flat_bar_max_volume,
 )
 from runtime.ingest.tick_common import symbols_from_cfg, calendar_from_group
+from runtime.store.redis_pool import pooled_client
 from runtime.store.redis_spec import resolve_redis_spec
 from runtime.store.uds import build_uds_from_config
 
@@ -43,13 +45,17 @@ _CMD_QUEUE_SUFFIX = "broker:m1:cmd"
 _BARS_QUEUE_SUFFIX = "broker:m1:bars"
 _CONTRACT_VERSION = 1
 _BLPOP_TIMEOUT_S = 15  # timeout for response from sidecar
+_BATCH_ITEM_TIMEOUT_S = 5  # + на кожен додатковий symbol у fetch_m1_batch
+_BATCH_MAX_ITEMS = 64  # = broker_sidecar._MAX_BATCH_ITEMS (більше → batch_too_large)
+_BATCH_WAIT_BUDGET_S = 45  # сумарне очікування fetch_m1_batch < 60 s M1 cadence
 
 
 class BrokerRedisProxy:
     """Виконує fetch_last_n_m1 через Redis queue (замість прямого FXCM API).
 
     Надсилає команду fetch в broker_sidecar (Py 3.7),
-    отримує серіалізовані бари у відповідь.
+    отримує серіалізовані бари у відповідь. fetch_m1_batch — усі символи
+    одним round trip на чанк ≤ _BATCH_MAX_ITEMS (M1PollerRunner batch_fetch).
     """
 
     def __init__(self, redis_cli: Any, namespace: str) -> None:
@@ -74,12 +80,7 @@ class BrokerRedisProxy:
         """Fetch M1 bars через broker_sidecar Redis queue."""
         req_id = uuid.uuid4().hex
         reply_key = "%s:%s" % (self._bars_key, req_id)
-        date_to_ms = None
-        if date_to_utc is not None:
-            if hasattr(date_to_utc, "timestamp"):
-                date_to_ms = int(date_to_utc.timestamp() * 1000)
-            else:
-                date_to_ms = int(date_to_utc)
+        date_to_ms = _date_to_ms(date_to_utc)
 
         cmd = json.dumps(
             {
@@ -143,28 +144,159 @@ class BrokerRedisProxy:
             )
             return []
 
-        bars: List[CandleBar] = []
-        for d in resp.get("bars", []):
-            try:
-                bars.append(
-                    CandleBar(
-                        symbol=d["symbol"],
-                        tf_s=d["tf_s"],
-                        open_time_ms=d["open_time_ms"],
-                        close_time_ms=d["close_time_ms"],
-                        o=d["o"],
-                        h=d["h"],
-                        low=d["low"],
-                        c=d["c"],
-                        v=d["v"],
-                        complete=d.get("complete", True),
-                        src=d.get("src", "history"),
-                        extensions=d.get("extensions", {}),
-                    )
+        return _bars_from_dicts(resp.get("bars", []))
+
+    def fetch_m1_batch(
+        self,
+        requests: Sequence[Tuple[str, int, Any]],
+    ) -> List[List[CandleBar]]:
+        """Fetch M1 для кількох символів: один RPUSH + один BLPOP на чанк.
+
+        requests: [(symbol, n, date_to_utc)]. Результат — список барів на кожен
+        запит у тому ж порядку; помилка / timeout → [] (як fetch_last_n_m1).
+        Потребує broker_sidecar з підтримкою cmd=fetch_m1_batch.
+
+        Чанки по _BATCH_MAX_ITEMS (ліміт sidecar) ставляться в чергу одразу,
+        відповіді чекаються по порядку зі спільним дедлайном
+        _BATCH_WAIT_BUDGET_S — poll цикл не вилазить за хвилину.
+        """
+        if not requests:
+            return []
+        items = [
+            {"symbol": sym, "n_bars": n, "date_to_ms": _date_to_ms(date_to_utc)}
+            for sym, n, date_to_utc in requests
+        ]
+        pending: List[Tuple[str, str, List[Dict[str, Any]]]] = []
+        for i in range(0, len(items), _BATCH_MAX_ITEMS):
+            chunk = items[i : i + _BATCH_MAX_ITEMS]
+            req_id = uuid.uuid4().hex
+            reply_key = "%s:%s" % (self._bars_key, req_id)
+            cmd = json.dumps(
+                {
+                    "v": _CONTRACT_VERSION,
+                    "cmd": "fetch_m1_batch",
+                    "req_id": req_id,
+                    "reply_to": reply_key,
+                    "items": chunk,
+                }
+            )
+            self._redis.rpush(self._cmd_key, cmd)
+            pending.append((req_id, reply_key, chunk))
+
+        deadline = time.monotonic() + _BATCH_WAIT_BUDGET_S
+        out: List[List[CandleBar]] = []
+        for req_id, reply_key, chunk in pending:
+            out.extend(self._await_batch_reply(req_id, reply_key, chunk, deadline))
+        return out
+
+    def _await_batch_reply(
+        self,
+        req_id: str,
+        reply_key: str,
+        items: List[Dict[str, Any]],
+        deadline: float,
+    ) -> List[List[CandleBar]]:
+        # Sidecar фетчить items послідовно → timeout росте з розміром чанку,
+        # але не довше за залишок спільного бюджету
+        timeout_s = min(
+            _BLPOP_TIMEOUT_S + _BATCH_ITEM_TIMEOUT_S * (len(items) - 1),
+            int(deadline - time.monotonic()),
+        )
+        empty: List[List[CandleBar]] = [[] for _ in items]
+        # timeout=0 у BLPOP — блок назавжди; бюджет вичерпано → timeout одразу
+        result = self._redis.blpop(reply_key, timeout=timeout_s) if timeout_s >= 1 else None
+        if result is None:
+            logging.warning(
+                "BROKER_PROXY_TIMEOUT batch=%d timeout=%ds req_id=%s",
+                len(items),
+                max(0, timeout_s),
+                req_id,
+            )
+            self._redis.delete(reply_key)
+            return empty
+
+        _key, raw = result
+        self._redis.delete(reply_key)
+        try:
+            resp = json.loads(raw)
+        except (json.JSONDecodeError, TypeError) as exc:
+            logging.warning("BROKER_PROXY_PARSE_ERROR err=%s", exc)
+            return empty
+
+        if resp.get("req_id") != req_id:
+            logging.warning(
+                "BROKER_PROXY_REQ_MISMATCH batch=%d expected_req=%s got_req=%s",
+                len(items),
+                req_id,
+                resp.get("req_id"),
+            )
+            return empty
+
+        results = resp.get("results")
+        if not isinstance(results, list) or len(results) != len(items):
+            logging.warning(
+                "BROKER_PROXY_BATCH_SHAPE expected=%d got=%s req_id=%s error=%s",
+                len(items),
+                len(results) if isinstance(results, list) else None,
+                req_id,
+                resp.get("error"),
+            )
+            return empty
+
+        out: List[List[CandleBar]] = []
+        for item, res in zip(items, results):
+            symbol = item["symbol"]
+            if not isinstance(res, dict) or res.get("symbol") != symbol:
+                logging.warning(
+                    "BROKER_PROXY_SYMBOL_MISMATCH expected=%s got=%s req_id=%s",
+                    symbol,
+                    res.get("symbol") if isinstance(res, dict) else None,
+                    req_id,
                 )
-            except (KeyError, TypeError, ValueError) as exc:
-                logging.warning("BROKER_PROXY_BAR_PARSE err=%s bar=%s", exc, d)
-        return bars
+                out.append([])
+            elif res.get("error"):
+                logging.warning(
+                    "BROKER_PROXY_FETCH_ERROR symbol=%s err=%s",
+                    symbol,
+                    res["error"],
+                )
+                out.append([])
+            else:
+                out.append(_bars_from_dicts(res.get("bars", [])))
+        return out
+
+
+def _date_to_ms(date_to_utc: Any) -> Optional[int]:
+    if date_to_utc is None:
+        return None
+    if hasattr(date_to_utc, "timestamp"):
+        return int(date_to_utc.timestamp() * 1000)
+    return int(date_to_utc)
+
+
+def _bars_from_dicts(raw_bars: Any) -> List[CandleBar]:
+    bars: List[CandleBar] = []
+    for d in raw_bars:
+        try:
+            bars.append(
+                CandleBar(
+                    symbol=d["symbol"],
+                    tf_s=d["tf_s"],
+                    open_time_ms=d["open_time_ms"],
+                    close_time_ms=d["close_time_ms"],
+                    o=d["o"],
+                    h=d["h"],
+                    low=d["low"],
+                    c=d["c"],
+                    v=d["v"],
+                    complete=d.get("complete", True),
+                    src=d.get("src", "history"),
+                    extensions=d.get("extensions", {}),
+                )
+            )
+        except (KeyError, TypeError, ValueError) as exc:
+            logging.warning("BROKER_PROXY_BAR_PARSE err=%s bar=%s", exc, d)
+    return bars
 
 
 # ---------------------------------------------------------------------------
@@ -213,12 +345,11 @@ def build_ingestion_worker(config_path: str) -> Optional[M1PollerRunner]:
         logging.error("M1_INGESTION_WORKER_REDIS_DISABLED")
         return None
 
-    redis_cli = redis_lib.Redis(
-        host=spec.host,
-        port=spec.port,
-        db=spec.db,
+    # socket_timeout > найдовшого BLPOP fetch_m1_batch (інакше TimeoutError)
+    redis_cli = pooled_client(
+        spec,
         decode_responses=True,
-        socket_timeout=30,
+        socket_timeout=max(30, _BATCH_WAIT_BUDGET_S + 15),
         socket_connect_timeout=5,
     )
 
@@ -238,6 +369,7 @@ def build_ingestion_worker(config_path: str) -> Optional[M1PollerRunner]:
     lr_max_consecutive_empty = int(m1_cfg.get("live_recover_max_consecutive_empty", 5))
     lr_timeout = int(m1_cfg.get("live_recover_timeout_s", 600))
     stale_s = int(m1_cfg.get("stale_s", 720))
+    batch_fetch = bool(m1_cfg.get("batch_fetch", False))
 
     # Flat bar max volume (SSOT)
     flat_vol_raw = cfg.get("flat_bar_max_volume")
@@ -361,9 +493,10 @@ def build_ingestion_worker(config_path: str) -> Optional[M1PollerRunner]:
                 pass
 
     logging.info(
-        "M1_INGESTION_WORKER_BUILD symbols=%d tfs=%s mode=broker_proxy",
+        "M1_INGESTION_WORKER_BUILD symbols=%d tfs=%s mode=broker_proxy batch_fetch=%s",
         len(symbols),
         sorted(redis_tail_n.keys()),
+        batch_fetch,
     )
 
     return M1PollerRunner(
@@ -376,6 +509,12 @@ def build_ingestion_worker(config_path: str) -> Optional[M1PollerRunner]:
         derive_engine=derive_engine,
         derive_warmup_bars_by_tf=_derive_warmup_cfg,
         cascade_catchup_m1_bars=_cascade_catchup_m1_n,
+        batch_fetch=batch_fetch,
+        segment_seal_cfg=(
+            cfg.get("ssot_segments")
+            if isinstance(cfg.get("ssot_segments"), dict)
+            else None
+        ),
     )
 
 
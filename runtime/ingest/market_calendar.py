@@ -1,14 +1,25 @@
+"""MarketCalendar — торгові хвилини символу (daily breaks + weekend).
+
+CompiledCalendar: розклад, розгорнутий у bitmap хвилин тижня (10080 біт)
++ prefix sums → O(1) is_trading_minute і запити по діапазону (trading
+слоти / кількість / any) без per-slot datetime і parse_hm.
+
+Python 3.7 compatible, без numpy (імпортується broker-стороною, .venv37).
+"""
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 import logging
 from typing import List, Optional, Tuple
 
-from core.model.bars import ms_to_utc_dt
-
-
 logger = logging.getLogger("market_calendar")
 
+_MINUTE_MS = 60_000
+_DAY_MIN = 1440
+_WEEK_MIN = 7 * _DAY_MIN
+# 1970-01-01 (epoch) — четвер: weekday()=3 → зсув хвилини тижня (Пн=0)
+_EPOCH_WEEK_OFFSET_MIN = 3 * _DAY_MIN
+
 
 def parse_hm(hm: str) -> Optional[Tuple[int, int]]:
     if not hm:
@@ -49,6 +60,10 @@ class MarketCalendar:
     daily_break_enabled: bool
     # Список додаткових daily break інтервалів: [("HH:MM","HH:MM"), ...]
     daily_breaks: Tuple[Tuple[str, str], ...] = ()
+    # Лінивий кеш compiled() (не бере участі в eq/hash/repr)
+    _compiled: Optional["CompiledCalendar"] = field(
+        default=None, init=False, repr=False, compare=False
+    )
 
     def _all_break_intervals(self):
         # type: () -> List[Tuple[int, int]]
@@ -68,15 +83,25 @@ class MarketCalendar:
                 intervals.append((s[0] * 60 + s[1], e[0] * 60 + e[1]))
         return intervals
 
+    def compiled(self):
+        # type: () -> CompiledCalendar
+        """Скомпільований календар (кешується на інстансі)."""
+        c = self._compiled
+        if c is None:
+            c = CompiledCalendar(self)
+            object.__setattr__(self, "_compiled", c)
+        return c
+
     def is_trading_minute(self, now_ms: int) -> bool:
         if not self.enabled:
             return True
-        dt_now = ms_to_utc_dt(now_ms)
-        dow = dt_now.weekday()
-        cur_min = dt_now.hour * 60 + dt_now.minute
+        return self.compiled()(now_ms)
 
+    def _is_trading_week_minute(self, dow, cur_min, intervals):
+        # type: (int, int, List[Tuple[int, int]]) -> bool
+        """Правила розкладу для хвилини тижня (reference для bitmap)."""
         # --- daily breaks ---
-        for start_min, end_min in self._all_break_intervals():
+        for start_min, end_min in intervals:
             if _is_in_break(cur_min, start_min, end_min):
                 return False
 
@@ -94,3 +119,90 @@ class MarketCalendar:
                 if cur_week_min >= close_min or cur_week_min < open_min:
                     return False
         return True
+
+
+class CompiledCalendar:
+    """MarketCalendar, розгорнутий у bitmap хвилин тижня.
+
+    Callable (t_ms → bool) — drop-in для is_trading_fn у core.derive;
+    trading_slots / trading_count / any_trading — запити по діапазону
+    (core.derive підхоплює їх duck-typing, без per-slot виклику).
+    Слот t відповідає хвилині floor(t / 60s), як у is_trading_minute.
+    """
+
+    __slots__ = ("_bits", "_prefix", "_week_total")
+
+    def __init__(self, cal):
+        # type: (MarketCalendar) -> None
+        if cal.enabled:
+            intervals = cal._all_break_intervals()
+            bits = bytearray(
+                1 if cal._is_trading_week_minute(m // _DAY_MIN, m % _DAY_MIN, intervals) else 0
+                for m in range(_WEEK_MIN)
+            )
+        else:
+            bits = bytearray(b"\x01" * _WEEK_MIN)
+        prefix = [0] * (_WEEK_MIN + 1)
+        acc = 0
+        for i, b in enumerate(bits):
+            acc += b
+            prefix[i + 1] = acc
+        self._bits = bytes(bits)
+        self._prefix = prefix
+        self._week_total = acc
+
+    def __call__(self, t_ms):
+        # type: (int) -> bool
+        return self._bits[(t_ms // _MINUTE_MS + _EPOCH_WEEK_OFFSET_MIN) % _WEEK_MIN] == 1
+
+    def _count_minutes(self, m0, n):
+        # type: (int, int) -> int
+        """Кількість торгових хвилин у [m0, m0+n) (m0 — epoch-хвилина)."""
+        if n <= 0:
+            return 0
+        weeks, rest = divmod(n, _WEEK_MIN)
+        total = weeks * self._week_total
+        if rest:
+            a = (m0 + _EPOCH_WEEK_OFFSET_MIN) % _WEEK_MIN
+            b = a + rest
+            prefix = self._prefix
+            if b <= _WEEK_MIN:
+                total += prefix[b] - prefix[a]
+            else:
+                total += prefix[_WEEK_MIN] - prefix[a] + prefix[b - _WEEK_MIN]
+        return total
+
+    def any_trading(self, start_ms, end_ms):
+        # type: (int, int) -> bool
+        """Чи є торгова хвилина серед t = start, start+1m, ... < end."""
+        n = -(-(end_ms - start_ms) // _MINUTE_MS)
+        return self._count_minutes(start_ms // _MINUTE_MS, n) > 0
+
+    def trading_slots(self, start_ms, end_ms, step_ms):
+        # type: (int, int, int) -> List[int]
+        """Trading-слоти range(start_ms, end_ms, step_ms) (перевірка open слоту)."""
+        if end_ms <= start_ms:
+            return []
+        if step_ms % _MINUTE_MS == 0:
+            n_slots = -(-(end_ms - start_ms) // step_ms)
+            m0 = start_ms // _MINUTE_MS
+            span = (n_slots - 1) * (step_ms // _MINUTE_MS) + 1
+            covered = self._count_minutes(m0, span)
+            if covered == span:
+                return list(range(start_ms, end_ms, step_ms))  # весь діапазон торговий
+            if covered == 0:
+                return []
+        bits = self._bits
+        return [
+            t
+            for t in range(start_ms, end_ms, step_ms)
+            if bits[(t // _MINUTE_MS + _EPOCH_WEEK_OFFSET_MIN) % _WEEK_MIN]
+        ]
+
+    def trading_count(self, start_ms, end_ms, step_ms):
+        # type: (int, int, int) -> int
+        """Кількість trading-слотів range(start_ms, end_ms, step_ms)."""
+        if step_ms == _MINUTE_MS:
+            n = -(-(end_ms - start_ms) // _MINUTE_MS)
+            return self._count_minutes(start_ms // _MINUTE_MS, n)
+        return len(self.trading_slots(start_ms, end_ms, step_ms))
@@ -18,8 +18,10 @@ import logging
 import os
 import time
 import uuid
+from dataclasses import dataclass
+from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
 from core.config_loader import pick_config_path, load_system_config
 from core.model.bars import CandleBar, ms_to_utc_dt
@@ -112,6 +114,16 @@ def _expected_closed_m1_calendar(
     return lt
 
 
+@dataclass(frozen=True)
+class M1PollPlan:
+    """Запит одного poll циклу: fetch_last_n_m1(symbol, n=fetch_n, date_to_utc=date_to)."""
+
+    symbol: str
+    fetch_n: int
+    date_to: Optional[datetime]
+    expected: int
+
+
 # ---------------------------------------------------------------------------
 # Per-symbol poller
 # ---------------------------------------------------------------------------
@@ -255,15 +267,25 @@ class M1SymbolPoller:
 
     # -- Ingest bar (calendar-aware) ------------------------------------
 
-    def _ingest_bar(self, bar: CandleBar) -> bool:
+    def _ingest_bars(self, bars: List[CandleBar]) -> int:
         """Calendar-aware ingest: маркує flat бари під час паузи.
 
-        Повертає True якщо бар committed.
+        Один UDS.commit_final_bars на весь (відсортований) список; derive
+        cascade — по кожному committed бару в порядку входу. Повертає
+        кількість committed барів.
         """
+        prepared = [p for p in (self._prepare_bar(b) for b in bars) if p is not None]
+        if not prepared:
+            return 0
+        results = self._uds.commit_final_bars(prepared)
+        return sum(1 for b, r in zip(prepared, results) if self._after_commit(b, r))
+
+    def _prepare_bar(self, bar: CandleBar) -> Optional[CandleBar]:
+        """Calendar-aware класифікація; None → бар не комітиться."""
         if not isinstance(bar, CandleBar):
-            return False
+            return None
         if bar.tf_s != 60 or not bar.complete:
-            return False
+            return None
 
         # Calendar-aware flat bar classification
         trading = self._is_market_open(bar.open_time_ms)
@@ -289,7 +311,7 @@ class M1SymbolPoller:
         if not trading:
             if flat:
                 # Flat під час паузи → скіпаємо (шум від брокера)
-                return False
+                return None
             else:
                 # Non-flat під час паузи → аномалія, але приймаємо
                 bar = CandleBar(
@@ -320,7 +342,10 @@ class M1SymbolPoller:
                     bar.v,
                 )
 
-        result = self._uds.commit_final_bar(bar)
+        return bar
+
+    def _after_commit(self, bar: CandleBar, result: Any) -> bool:
+        """Watermark / stats / derive cascade після commit; True → committed."""
         if result.ok:
             self._committed_m1 += 1
             # Оновлюємо watermark
@@ -359,7 +384,26 @@ class M1SymbolPoller:
                 expected + caught-up check. Останній бар перед паузою завжди фетчиться.
         """
         now_ms = _utc_now_ms()
+        plan = self.plan_poll(now_ms)
+        if plan is None:
+            return
+        bars: Optional[List[CandleBar]] = None
+        try:
+            bars = self._provider.fetch_last_n_m1(
+                self._symbol,
+                n=plan.fetch_n,
+                date_to_utc=plan.date_to,
+            )
+        except Exception as exc:
+            self._note_fetch_error(exc)
+        self.complete_poll(now_ms, plan, bars)
+
+    def plan_poll(self, now_ms: int) -> Optional[M1PollPlan]:
+        """Перша половина poll_once: що фетчити (None — fetch не потрібен).
 
+        Batch режим M1PollerRunner збирає plan усіх символів в один запит
+        до провайдера і віддає результат кожному через complete_poll.
+        """
         # Calendar state logging (без блокування poll)
         self._check_calendar_state(now_ms)
 
@@ -368,12 +412,12 @@ class M1SymbolPoller:
         if expected <= 0:
             # Немає торгових хвилин (довгий weekend / gap) — skip
             self._calendar_skips += 1
-            return
+            return None
 
         # Check if caught up (watermark >= expected last trading M1)
         if self._watermark_ms is not None and self._watermark_ms >= expected:
             self._already_caught_up += 1
-            return
+            return None
 
         # Adaptive fetch count
         fetch_n = self._compute_fetch_n(now_ms)
@@ -381,23 +425,22 @@ class M1SymbolPoller:
         # Єдиний шлях: history M1 → фільтр закритих → sort → commit у UDS.
         # Fetch: date_to = cutoff + 1 M1 (щоб точно включити cutoff бар)
         date_to = ms_to_utc_dt(expected + _M1_MS) if expected > 0 else None
-        bars: List[CandleBar] = []
-        try:
-            bars = self._provider.fetch_last_n_m1(
-                self._symbol,
-                n=fetch_n,
-                date_to_utc=date_to,
-            )
-        except Exception as exc:
-            self._errors += 1
-            if self._errors <= 3 or self._errors % 60 == 0:
-                logging.warning(
-                    "M1_POLL_FETCH_ERROR symbol=%s err=%s total_errors=%d",
-                    self._symbol,
-                    exc,
-                    self._errors,
-                )
-        else:
+        return M1PollPlan(
+            symbol=self._symbol, fetch_n=fetch_n, date_to=date_to, expected=expected
+        )
+
+    def complete_poll(
+        self,
+        now_ms: int,
+        plan: M1PollPlan,
+        bars: Optional[List[CandleBar]],
+    ) -> None:
+        """Друга половина poll_once: ingest + live recover + stale.
+
+        bars=None — fetch завершився помилкою (вже врахованою в _errors).
+        """
+        if bars is not None:
+            expected = plan.expected
             # FXCM може повертати бари у зворотному порядку.
             # Фільтр: тільки бари після watermark і до expected cutoff.
             # Watermark pre-filter запобігає stale spam в UDS.
@@ -407,9 +450,7 @@ class M1SymbolPoller:
                 bars = [b for b in bars if b.open_time_ms > self._watermark_ms]
             bars.sort(key=lambda b: b.open_time_ms)
 
-            # Ingest кожен бар
-            for bar in bars:
-                self._ingest_bar(bar)
+            self._ingest_bars(bars)
 
         # P0.2: live recover після звичайного poll
         self._live_recover_check()
@@ -417,6 +458,16 @@ class M1SymbolPoller:
         # P0.3: stale detection
         self._stale_check(now_ms)
 
+    def _note_fetch_error(self, exc: Exception) -> None:
+        self._errors += 1
+        if self._errors <= 3 or self._errors % 60 == 0:
+            logging.warning(
+                "M1_POLL_FETCH_ERROR symbol=%s err=%s total_errors=%d",
+                self._symbol,
+                exc,
+                self._errors,
+            )
+
     # -- Live recover (P0.2: ADR-0002) ----------------------------------
 
     def _live_recover_check(self) -> None:
@@ -533,9 +584,7 @@ class M1SymbolPoller:
                 if b.open_time_ms > self._watermark_ms and b.open_time_ms <= cutoff
             ]
             bars.sort(key=lambda b: b.open_time_ms)
-            for bar in bars:
-                if self._ingest_bar(bar):
-                    self._recover_total_written += 1
+            self._recover_total_written += self._ingest_bars(bars)
 
         # --- Оновити gap_state ---
         remaining_gap = int((cutoff - (self._watermark_ms or 0)) // _M1_MS)
@@ -692,10 +741,7 @@ class M1SymbolPoller:
             }
 
         bars.sort(key=lambda b: b.open_time_ms)
-        written = 0
-        for bar in bars:
-            if self._ingest_bar(bar):
-                written += 1
+        written = self._ingest_bars(bars)
 
         if written < max_bars:
             logging.warning(
@@ -801,10 +847,7 @@ class M1SymbolPoller:
         ]
         bars.sort(key=lambda b: b.open_time_ms)
 
-        written = 0
-        for bar in bars:
-            if self._ingest_bar(bar):
-                written += 1
+        written = self._ingest_bars(bars)
 
         # Очистити gap_state якщо все заповнено
         final_gap = 0
@@ -877,9 +920,20 @@ class M1PollerRunner:
         derive_warmup_bars_by_tf: Optional[Dict[int, int]] = None,
         cascade_catchup_m1_bars: int = 1440,
         initial_backfill_m1_bars: int = 1440,
+        segment_seal_cfg: Optional[Dict[str, Any]] = None,
+        batch_fetch: bool = False,
     ) -> None:
         self._pollers = pollers
         self._provider = provider
+        # Один fetch_m1_batch на хвилину для всіх символів (config.json:m1_poller.batch_fetch)
+        self._batch_fetch = bool(batch_fetch) and callable(
+            getattr(provider, "fetch_m1_batch", None)
+        )
+        if batch_fetch and not self._batch_fetch:
+            logging.warning(
+                "M1_POLLER_BATCH_UNSUPPORTED provider=%s — per-symbol fetch",
+                type(provider).__name__,
+            )
         self._uds = uds
         self._redis_tail_n = redis_tail_n  # {tf_s: tail_n} для priming
         self._safety_delay_s = safety_delay_s
@@ -895,6 +949,13 @@ class M1PollerRunner:
         )
         self._cascade_catchup_m1_bars = max(0, cascade_catchup_m1_bars)
         self._initial_backfill_m1_bars = max(0, initial_backfill_m1_bars)
+        # Компакція завершених днів у колонкові сегменти (config.json:ssot_segments)
+        seal_cfg = segment_seal_cfg or {}
+        self._segment_seal_enabled = bool(seal_cfg.get("enabled", False))
+        self._segment_seal_interval_s = max(60, int(seal_cfg.get("seal_interval_s", 3600)))
+        self._segment_seal_grace_days = max(0, int(seal_cfg.get("grace_days", 1)))
+        self._segment_seal_max_parts = max(1, int(seal_cfg.get("max_parts_per_run", 200)))
+        self._last_segment_seal_ts = 0.0
         # Graceful shutdown: stop_event дозволяє перервати sleep між циклами
         import threading as _threading
 
@@ -949,8 +1010,8 @@ class M1PollerRunner:
         bootstrap_degraded = []
 
         # 1. Redis priming для M1→H4 (всі TF, якими керує m1_poller)
-        #    Критично: заповнює self._tails у redis_snapshot, без чого
-        #    put_bar() створює порожні deque і перезаписує Redis tail.
+        #    Критично: замінює Redis tail_list вікном з диску, без чого
+        #    put_bar() дописує лише нові бари до порожнього/застарілого tail.
         try:
             primed_total = 0
             for sym in symbols:
@@ -1193,9 +1254,10 @@ class M1PollerRunner:
 
     def run_forever(self) -> None:
         logging.info(
-            "M1_POLLER_START symbols=%d safety_delay_s=%d",
+            "M1_POLLER_START symbols=%d safety_delay_s=%d batch_fetch=%s",
             len(self._pollers),
             self._safety_delay_s,
+            self._batch_fetch,
         )
         self._bootstrap_warmup()
         self._publish_prime_ready()
@@ -1207,12 +1269,15 @@ class M1PollerRunner:
         last_prime_refresh_ts = time.time()
         while not self._stop_event.is_set():
             self._sleep_to_next_minute()
-            cycle_errors = 0
-            for p in self._pollers:
-                err_before = p.stats["errors"]
-                p.poll_once()
-                if p.stats["errors"] > err_before:
-                    cycle_errors += 1
+            if self._batch_fetch:
+                cycle_errors = self._poll_cycle_batched()
+            else:
+                cycle_errors = 0
+                for p in self._pollers:
+                    err_before = p.stats["errors"]
+                    p.poll_once()
+                    if p.stats["errors"] > err_before:
+                        cycle_errors += 1
             # Timer-based overdue bucket check (safety net для cascade)
             now_ts = time.time()
             if (
@@ -1236,9 +1301,59 @@ class M1PollerRunner:
             if now_ts - last_prime_refresh_ts >= prime_refresh_interval_s:
                 self._publish_prime_ready()
                 last_prime_refresh_ts = now_ts
+            self._maybe_seal_segments(now_ts)
             self._maybe_log_stats()
             self._maybe_reconnect(cycle_errors)
 
+    def _poll_cycle_batched(self) -> int:
+        """Poll цикл одним fetch_m1_batch замість N послідовних fetch_last_n_m1.
+
+        plan_poll / complete_poll ті самі, що в poll_once: caught-up / calendar
+        skip, фільтр закритих, live recover і stale — без змін. Помилка всього
+        батчу рахується кожному символу, що фетчив (reconnect як раніше).
+        Повертає кількість символів з помилкою в циклі.
+        """
+        now_ms = _utc_now_ms()
+        planned: List[Tuple[M1SymbolPoller, M1PollPlan]] = []
+        for p in self._pollers:
+            plan = p.plan_poll(now_ms)
+            if plan is not None:
+                planned.append((p, plan))
+        results: Sequence[Optional[List[CandleBar]]] = [None] * len(planned)
+        if planned:
+            try:
+                results = self._provider.fetch_m1_batch(
+                    [(plan.symbol, plan.fetch_n, plan.date_to) for _, plan in planned]
+                )
+                if len(results) != len(planned):
+                    raise ValueError(
+                        "batch reply items=%d expected=%d" % (len(results), len(planned))
+                    )
+            except Exception as exc:
+                results = [None] * len(planned)
+                for p, _ in planned:
+                    p._note_fetch_error(exc)  # noqa: SLF001
+        cycle_errors = sum(1 for bars in results if bars is None)
+        for (p, plan), bars in zip(planned, results):
+            p.complete_poll(now_ms, plan, bars)
+        return cycle_errors
+
+    def _maybe_seal_segments(self, now_ts: float) -> None:
+        """Бюджетована компакція завершених днів (не блокує minute-poll надовго)."""
+        if not self._segment_seal_enabled:
+            return
+        if now_ts - self._last_segment_seal_ts < self._segment_seal_interval_s:
+            return
+        self._last_segment_seal_ts = now_ts
+        try:
+            self._uds.seal_finished_days(
+                int(now_ts * 1000),
+                grace_days=self._segment_seal_grace_days,
+                max_parts=self._segment_seal_max_parts,
+            )
+        except Exception as exc:
+            logging.warning("SSOT_SEGMENT_SEAL_ERR err=%s", exc)
+
     def _sleep_to_next_minute(self) -> None:
         now = time.time()
         next_min = (int(now // 60) + 1) * 60
@@ -1503,6 +1618,11 @@ def build_m1_poller(config_path: str) -> Optional[M1PollerRunner]:
         derive_engine=derive_engine,
         derive_warmup_bars_by_tf=_derive_warmup_cfg,
         cascade_catchup_m1_bars=_cascade_catchup_m1_n,
+        segment_seal_cfg=(
+            cfg.get("ssot_segments")
+            if isinstance(cfg.get("ssot_segments"), dict)
+            else None
+        ),
     )
 
 
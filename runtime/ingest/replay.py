@@ -15,6 +15,8 @@ Dependency Rule: runtime/ імпортує core/, не навпаки.
   --speed 1    — real-time (1 бар/хвилину)
   --speed 10   — 10× швидкість (6 сек = 1 хвилина ринку)
   --speed 60   — 60× (1 сек = 1 хвилина ринку)
+  --offline    — instant in-process DeriveEngine+SmcEngine без Redis/sleep
+                 (runtime/ingest/replay_offline.py; --diff порівнює з data_v3)
 
 ADR: ADR-0017 (Replay-Mode з data_v3/ для Offline Demo).
 """
@@ -250,19 +252,6 @@ def run_replay(
             uds._wm_by_key[(sym, tf_s)] = 0  # noqa: SLF001
     log.info("REPLAY_WATERMARKS_RESET symbols=%d tfs=%d", len(symbols), len(tf_all))
 
-    # Performance: зменшуємо Redis tail size для replay.
-    # Production tail M1=10080 → кожен commit серіалізує ~1MB JSON.
-    # Replay: tail=500 → ~50KB per write → ~20x speedup.
-    _REPLAY_TAIL_MAX = 500
-    writer = getattr(uds, "_redis_writer", None)
-    if writer is not None:
-        tail_cfg = getattr(writer, "_tail_n_by_tf_s", None)
-        if isinstance(tail_cfg, dict):
-            for tf_key in list(tail_cfg.keys()):
-                old_val = tail_cfg[tf_key]
-                tail_cfg[tf_key] = min(_REPLAY_TAIL_MAX, int(old_val))
-            log.info("REPLAY_TAIL_REDUCED max=%d (was up to 10080)", _REPLAY_TAIL_MAX)
-
     # --- DeriveEngine ---
     anchor_offset_s = int(cfg.get("day_anchor_offset_s", 0))
     d1_anchor_offset_s = int(cfg.get("day_anchor_offset_s_d1", 0))
@@ -434,6 +423,24 @@ def run_replay(
 # ---------------------------------------------------------------------------
 
 
+def _parse_date_ms(value: Optional[str]) -> Optional[int]:
+    """YYYY-MM-DD → epoch ms; None/"" → None. Невалідна дата → SystemExit(1)."""
+    if not value:
+        return None
+    try:
+        import datetime
+
+        dt = datetime.datetime.strptime(value, "%Y-%m-%d")
+        return (
+            int(dt.timestamp() * 1000)
+            if hasattr(dt, "timestamp")
+            else int((dt - datetime.datetime(1970, 1, 1)).total_seconds() * 1000)
+        )
+    except ValueError:
+        log.error("REPLAY_INVALID_START_DATE format=%s expected=YYYY-MM-DD", value)
+        raise SystemExit(1)
+
+
 def _parse_replay_args() -> Dict[str, Any]:
     """Парсить аргументи для replay mode."""
     import argparse
@@ -455,6 +462,31 @@ def _parse_replay_args() -> Dict[str, Any]:
         default=None,
         help="Start date YYYY-MM-DD (skip data before). Ex: --start 2026-02-01",
     )
+    ap.add_argument(
+        "--end",
+        default=None,
+        help="End date YYYY-MM-DD (тільки --offline, включно до 00:00 UTC)",
+    )
+    ap.add_argument(
+        "--offline",
+        action="store_true",
+        help="Instant offline replay: DeriveEngine+SmcEngine in-process, без Redis/sleep",
+    )
+    ap.add_argument(
+        "--diff",
+        action="store_true",
+        help="(--offline) порівняти derived TFs з data_v3 на диску",
+    )
+    ap.add_argument(
+        "--no-smc",
+        action="store_true",
+        help="(--offline) не годувати SmcEngine",
+    )
+    ap.add_argument(
+        "--report",
+        default=None,
+        help="(--offline) записати JSON звіт у файл",
+    )
     ap.add_argument(
         "--skip-disk-write",
         action="store_true",
@@ -463,28 +495,19 @@ def _parse_replay_args() -> Dict[str, Any]:
     )
     args = ap.parse_args()
 
-    start_ms = None
-    if args.start:
-        try:
-            import datetime
-
-            dt = datetime.datetime.strptime(args.start, "%Y-%m-%d")
-            start_ms = (
-                int(dt.timestamp() * 1000)
-                if hasattr(dt, "timestamp")
-                else int((dt - datetime.datetime(1970, 1, 1)).total_seconds() * 1000)
-            )
-        except ValueError:
-            log.error(
-                "REPLAY_INVALID_START_DATE format=%s expected=YYYY-MM-DD", args.start
-            )
-            raise SystemExit(1)
+    start_ms = _parse_date_ms(args.start)
+    end_ms = _parse_date_ms(args.end)
 
     return {
         "symbols": [s.strip() for s in args.symbols.split(",") if s.strip()],
         "speed": args.speed,
         "skip_disk_write": args.skip_disk_write,
         "start_ms": start_ms,
+        "end_ms": end_ms,
+        "offline": args.offline,
+        "diff": args.diff,
+        "with_smc": not args.no_smc,
+        "report_path": args.report,
     }
 
 
@@ -506,6 +529,27 @@ def main() -> int:
     skip_disk = parsed["skip_disk_write"]
     start_ms = parsed.get("start_ms")
 
+    if parsed["offline"]:
+        from runtime.ingest.replay_offline import run_offline_replay
+
+        log.info(
+            "REPLAY_INIT mode=offline symbols=%s start_ms=%s end_ms=%s diff=%s smc=%s",
+            symbols,
+            start_ms,
+            parsed["end_ms"],
+            parsed["diff"],
+            parsed["with_smc"],
+        )
+        return run_offline_replay(
+            config_path=config_path,
+            symbols=symbols,
+            start_ms=start_ms,
+            end_ms=parsed["end_ms"],
+            with_smc=parsed["with_smc"],
+            diff=parsed["diff"],
+            report_path=parsed["report_path"],
+        )
+
     log.info(
         "REPLAY_INIT symbols=%s speed=%s skip_disk=%s start_ms=%s",
         symbols,
@@ -0,0 +1,458 @@
+"""Offline replay — детермінований fast-path без Redis/sleep (instant mode).
+
+Архітектурний шар: runtime/ingest (Layer 2).
+Dependency Rule: runtime/ імпортує core/, не навпаки.
+
+На відміну від run_replay (ADR-0017), який штовхає кожен M1 через writer UDS
+з реальними Redis-записами, flush namespace і паузами speed, цей режим:
+  data_v3/{symbol}/tf_60/part-*.jsonl
+    → CandleBar (src/extensions як на диску, calendar_pause_flat зберігається)
+    → DeriveEngine.on_bar(M1) → каскад M3→…→H4+D1 у in-process sink
+    → SmcEngine.feed_m1_bar / on_bar (compute_tfs)
+    → diff derived vs data_v3/{symbol}/tf_*/ (опційно)
+
+Без Redis, без updates bus, без sleep, без запису на диск.
+Один символ — один DeriveEngine (per-symbol anchors як у rebuild_from_m1),
+тому результат залежить лише від барів на диску (same input → same output).
+
+Звіт: per-stage timing (load / derive / smc / diff) + bars/s, derived_by_tf,
+fingerprint per (symbol, tf) і diff counts із прикладами open_ms.
+
+Запуск:
+    python -m runtime.ingest.replay --offline [--diff] [--symbols XAU/USD]
+"""
+
+from __future__ import annotations
+
+import glob
+import hashlib
+import json
+import logging
+import math
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from core.config_loader import load_system_config
+from core.derive import DERIVE_ORDER, resolve_cascade_anchor_s
+from core.model.bars import CandleBar
+from core.smc.config import SmcConfig
+from core.smc.engine import SmcEngine
+from runtime.ingest.derive_engine import DeriveEngine
+from runtime.ingest.tick_common import calendar_from_group
+from runtime.store.uds import CommitResult
+
+log = logging.getLogger("replay")
+
+_STAGES = ("load", "derive", "smc", "diff")
+_DIFF_FIELDS = ("o", "h", "low", "c", "v")
+_DIFF_SAMPLE_N = 5
+_DIFF_ABS_TOL_DEFAULT = 1e-6
+_SMC_COMPUTE_TFS_DEFAULT = (900, 3600, 14400, 86400)
+
+
+# ---------------------------------------------------------------------------
+# Disk reader
+# ---------------------------------------------------------------------------
+
+
+def _iter_disk_bars(
+    data_root: str,
+    symbol: str,
+    tf_s: int,
+    start_ms: Optional[int] = None,
+    end_ms: Optional[int] = None,
+) -> Iterable[CandleBar]:
+    """Читає complete бари (symbol, tf_s) з part-*.jsonl у порядку файлів.
+
+    На відміну від replay._dict_to_candle зберігає src і extensions —
+    derive фільтрує calendar_pause_flat, тож без них derived розходиться з диском.
+    """
+    sym_dir = symbol.replace("/", "_")
+    pattern = os.path.join(data_root, sym_dir, f"tf_{tf_s}", "part-*.jsonl")
+    tf_ms = tf_s * 1000
+    for path in sorted(glob.glob(pattern)):
+        try:
+            with open(path, encoding="utf-8") as f:
+                for line in f:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        obj = json.loads(line)
+                    except Exception:
+                        log.debug("REPLAY_JSON_DECODE_FAIL path=%s", path)
+                        continue
+                    if obj.get("tf_s", tf_s) != tf_s or not obj.get("complete", True):
+                        continue
+                    open_ms = obj.get("open_time_ms")
+                    if not isinstance(open_ms, int):
+                        continue
+                    if start_ms is not None and open_ms < start_ms:
+                        continue
+                    if end_ms is not None and open_ms > end_ms:
+                        continue
+                    try:
+                        o = float(obj["o"])
+                        h = float(obj["h"])
+                        low = float(obj.get("low", obj.get("l")))
+                        c = float(obj["c"])
+                        v = float(obj.get("v", 0.0))
+                    except (KeyError, ValueError, TypeError) as exc:
+                        log.warning("REPLAY_BAR_PARSE_ERROR err=%s path=%s", exc, path)
+                        continue
+                    ext = obj.get("extensions")
+                    yield CandleBar(
+                        symbol=symbol,
+                        tf_s=tf_s,
+                        open_time_ms=open_ms,
+                        close_time_ms=open_ms + tf_ms,
+                        o=o,
+                        h=h,
+                        low=low,
+                        c=c,
+                        v=v,
+                        complete=True,
+                        src=str(obj.get("src", "history")),
+                        extensions=ext if isinstance(ext, dict) else {},
+                    )
+        except FileNotFoundError:
+            log.debug("REPLAY_FILE_GONE path=%s", path)
+
+
+def _load_sorted(
+    data_root: str,
+    symbol: str,
+    tf_s: int,
+    start_ms: Optional[int] = None,
+    end_ms: Optional[int] = None,
+) -> List[CandleBar]:
+    """Бари з диску, дедуплікація по open_time_ms (last wins), sorted asc."""
+    by_open: Dict[int, CandleBar] = {}
+    for bar in _iter_disk_bars(data_root, symbol, tf_s, start_ms, end_ms):
+        by_open[bar.open_time_ms] = bar
+    return [by_open[k] for k in sorted(by_open)]
+
+
+# ---------------------------------------------------------------------------
+# In-process sink (замість writer UDS)
+# ---------------------------------------------------------------------------
+
+
+class _OfflineSink:
+    """Duck-typed UDS для DeriveEngine: тримає derived бари в пам'яті.
+
+    Watermark-семантика як у UDS.commit_final_bar (stale/duplicate),
+    щоб каскад поводився так само, як у live — але без SSOT/Redis/bus.
+    """
+
+    __slots__ = ("bars", "_wm")
+
+    def __init__(self) -> None:
+        self.bars: Dict[int, List[CandleBar]] = {}
+        self._wm: Dict[int, int] = {}
+
+    def commit_final_bar(self, bar: CandleBar) -> CommitResult:
+        wm = self._wm.get(bar.tf_s)
+        if wm is not None and bar.open_time_ms <= wm:
+            reason = "duplicate" if bar.open_time_ms == wm else "stale"
+            return CommitResult(False, reason, False, False, False, [])
+        self._wm[bar.tf_s] = bar.open_time_ms
+        self.bars.setdefault(bar.tf_s, []).append(bar)
+        return CommitResult(True, None, False, False, False, [])
+
+
+# ---------------------------------------------------------------------------
+# Helpers
+# ---------------------------------------------------------------------------
+
+
+def symbol_anchors(cfg: Dict[str, Any], symbol: str) -> Tuple[int, int]:
+    """(anchor_offset_s, d1_anchor_offset_s): Binance — свої, решта — глобальні."""
+    binance = cfg.get("binance", {})
+    if isinstance(binance, dict) and symbol in set(binance.get("symbols", [])):
+        return (
+            int(binance.get("day_anchor_offset_s", 0)),
+            int(binance.get("d1_anchor_offset_s", 0)),
+        )
+    return (
+        int(cfg.get("day_anchor_offset_s", 0)),
+        int(cfg.get("day_anchor_offset_s_d1", 0)),
+    )
+
+
+def _symbol_calendar(cfg: Dict[str, Any], symbol: str) -> Any:
+    group = cfg.get("market_calendar_symbol_groups", {}).get(symbol)
+    group_cfg = cfg.get("market_calendar_by_group", {}).get(group) if group else None
+    if not isinstance(group_cfg, dict):
+        return None
+    return calendar_from_group(group_cfg)
+
+
+def _fingerprint(bars: List[CandleBar]) -> str:
+    """sha1 від (open_ms, OHLCV) — для порівняння прогонів між собою."""
+    h = hashlib.sha1()
+    for b in bars:
+        h.update(
+            f"{b.open_time_ms}|{b.o!r}|{b.h!r}|{b.low!r}|{b.c!r}|{b.v!r}\n".encode()
+        )
+    return h.hexdigest()
+
+
+def _same_ohlcv(a: CandleBar, b: CandleBar, abs_tol: float) -> bool:
+    return all(
+        math.isclose(getattr(a, f), getattr(b, f), rel_tol=0.0, abs_tol=abs_tol)
+        for f in _DIFF_FIELDS
+    )
+
+
+def _diff_tf(
+    replayed: List[CandleBar],
+    disk: List[CandleBar],
+    lo_ms: int,
+    hi_close_ms: int,
+    abs_tol: float,
+) -> Dict[str, Any]:
+    """Порівняння derived vs диск у повністю покритому M1 вікні.
+
+    Бакети, що стартують до першого M1 або закриваються після останнього,
+    не порівнюються (replay бачив лише їх частину).
+    """
+
+    def _in_window(b: CandleBar) -> bool:
+        return b.open_time_ms >= lo_ms and b.close_time_ms <= hi_close_ms
+
+    ours = {b.open_time_ms: b for b in replayed if _in_window(b)}
+    theirs = {b.open_time_ms: b for b in disk if _in_window(b)}
+    only_replay = sorted(set(ours) - set(theirs))
+    only_disk = sorted(set(theirs) - set(ours))
+    mismatch = sorted(
+        k for k in set(ours) & set(theirs) if not _same_ohlcv(ours[k], theirs[k], abs_tol)
+    )
+    return {
+        "replayed": len(ours),
+        "disk": len(theirs),
+        "matched": len(ours) - len(only_replay) - len(mismatch),
+        "only_replay": len(only_replay),
+        "only_disk": len(only_disk),
+        "mismatch": len(mismatch),
+        "samples": {
+            "only_replay": only_replay[:_DIFF_SAMPLE_N],
+            "only_disk": only_disk[:_DIFF_SAMPLE_N],
+            "mismatch": mismatch[:_DIFF_SAMPLE_N],
+        },
+    }
+
+
+class _StageClock:
+    """Акумулятор per-stage elapsed + кількості барів."""
+
+    __slots__ = ("elapsed_s", "bars")
+
+    def __init__(self) -> None:
+        self.elapsed_s: Dict[str, float] = {s: 0.0 for s in _STAGES}
+        self.bars: Dict[str, int] = {s: 0 for s in _STAGES}
+
+    def add(self, stage: str, elapsed_s: float, bars: int) -> None:
+        self.elapsed_s[stage] += elapsed_s
+        self.bars[stage] += bars
+
+    def report(self) -> Dict[str, Dict[str, Any]]:
+        out: Dict[str, Dict[str, Any]] = {}
+        for stage in _STAGES:
+            el = self.elapsed_s[stage]
+            n = self.bars[stage]
+            out[stage] = {
+                "bars": n,
+                "elapsed_ms": round(el * 1000.0, 3),
+                "bars_per_s": round(n / el, 1) if el > 0 else None,
+            }
+        return out
+
+
+# ---------------------------------------------------------------------------
+# Driver
+# ---------------------------------------------------------------------------
+
+
+def replay_offline(
+    cfg: Dict[str, Any],
+    symbols: List[str],
+    *,
+    data_root: Optional[str] = None,
+    start_ms: Optional[int] = None,
+    end_ms: Optional[int] = None,
+    with_smc: bool = True,
+    diff: bool = False,
+    diff_abs_tol: float = _DIFF_ABS_TOL_DEFAULT,
+) -> Dict[str, Any]:
+    """Прогнати M1 з диску через DeriveEngine (+SmcEngine) in-process.
+
+    Args:
+        cfg: вже завантажений config.json (dict).
+        symbols: символи для replay.
+        data_root: корінь SSOT (default: cfg["data_root"]).
+        start_ms / end_ms: фільтр M1 по open_time_ms (включно).
+        with_smc: годувати SmcEngine (feed_m1_bar + on_bar для compute_tfs).
+        diff: порівняти derived з tf_*/ на диску.
+        diff_abs_tol: абсолютний допуск на OHLCV при diff.
+
+    Returns:
+        Звіт (dict): stages, derived_by_tf, fingerprints, smc, diff.
+    """
+    root = str(data_root or cfg.get("data_root", "./data_v3"))
+    smc_cfg = cfg.get("smc", {}) if isinstance(cfg.get("smc"), dict) else {}
+    compute_tfs = set(
+        int(x) for x in smc_cfg.get("compute_tfs", _SMC_COMPUTE_TFS_DEFAULT)
+    )
+    smc = SmcEngine(SmcConfig.from_dict(smc_cfg)) if with_smc else None
+    clock = _StageClock()
+    derived_by_tf: Dict[int, int] = {}
+    fingerprints: Dict[str, Dict[str, str]] = {}
+    smc_stats = {"on_bar": 0, "deltas_with_changes": 0}
+    diff_report: Dict[str, Dict[str, Any]] = {}
+    m1_total = 0
+
+    for sym in symbols:
+        t0 = time.perf_counter()
+        m1_bars = _load_sorted(root, sym, 60, start_ms, end_ms)
+        clock.add("load", time.perf_counter() - t0, len(m1_bars))
+        if not m1_bars:
+            log.warning("REPLAY_OFFLINE_NO_BARS symbol=%s data_root=%s", sym, root)
+            continue
+        m1_total += len(m1_bars)
+
+        anchor_s, d1_anchor_s = symbol_anchors(cfg, sym)
+        cal = _symbol_calendar(cfg, sym)
+        engine = DeriveEngine(
+            symbols=[sym],
+            anchor_offset_s=anchor_s,
+            d1_anchor_offset_s=d1_anchor_s,
+            calendars={sym: cal} if cal is not None else {},
+            commit_tfs_s=set(DERIVE_ORDER),
+        )
+        sink = _OfflineSink()
+        engine.register_symbol_uds(sym, sink)  # type: ignore[arg-type]
+
+        derive_s = 0.0
+        smc_s = 0.0
+        smc_bars = 0
+        for bar in m1_bars:
+            t0 = time.perf_counter()
+            derived = engine.on_bar(bar)
+            derive_s += time.perf_counter() - t0
+            if smc is None:
+                continue
+            t0 = time.perf_counter()
+            smc.feed_m1_bar(bar)
+            for b in ([bar] if 60 in compute_tfs else []) + derived:
+                if b.tf_s not in compute_tfs:
+                    continue
+                delta = smc.on_bar(b)
+                smc_bars += 1
+                if delta.has_changes:
+                    smc_stats["deltas_with_changes"] += 1
+            smc_s += time.perf_counter() - t0
+        clock.add("derive", derive_s, len(m1_bars))
+        clock.add("smc", smc_s, smc_bars)
+        smc_stats["on_bar"] += smc_bars
+
+        fingerprints[sym] = {}
+        for tf_s in sorted(sink.bars):
+            bars = sink.bars[tf_s]
+            derived_by_tf[tf_s] = derived_by_tf.get(tf_s, 0) + len(bars)
+            fingerprints[sym][str(tf_s)] = _fingerprint(bars)
+
+        if not diff:
+            continue
+        t0 = time.perf_counter()
+        lo_ms = m1_bars[0].open_time_ms
+        hi_close_ms = m1_bars[-1].close_time_ms
+        per_tf: Dict[str, Any] = {}
+        compared = 0
+        for tf_s in DERIVE_ORDER:
+            disk = _load_sorted(root, sym, tf_s, lo_ms, hi_close_ms)
+            res = _diff_tf(sink.bars.get(tf_s, []), disk, lo_ms, hi_close_ms, diff_abs_tol)
+            per_tf[str(tf_s)] = res
+            compared += res["replayed"] + res["only_disk"]
+            if res["only_replay"] or res["only_disk"] or res["mismatch"]:
+                log.warning(
+                    "REPLAY_OFFLINE_DIFF symbol=%s tf_s=%d anchor=%d "
+                    "replayed=%d disk=%d only_replay=%d only_disk=%d mismatch=%d",
+                    sym,
+                    tf_s,
+                    resolve_cascade_anchor_s(tf_s, anchor_s, d1_anchor_s),
+                    res["replayed"],
+                    res["disk"],
+                    res["only_replay"],
+                    res["only_disk"],
+                    res["mismatch"],
+                )
+        clock.add("diff", time.perf_counter() - t0, compared)
+        diff_report[sym] = per_tf
+
+    report: Dict[str, Any] = {
+        "symbols": list(symbols),
+        "m1_bars": m1_total,
+        "derived_by_tf": {str(k): derived_by_tf[k] for k in sorted(derived_by_tf)},
+        "stages": clock.report(),
+        "fingerprints": fingerprints,
+        "smc": smc_stats if smc is not None else None,
+        "diff": diff_report if diff else None,
+    }
+    for stage, row in report["stages"].items():
+        log.info(
+            "REPLAY_OFFLINE_STAGE stage=%s bars=%d elapsed_ms=%.1f bars_per_s=%s",
+            stage,
+            row["bars"],
+            row["elapsed_ms"],
+            row["bars_per_s"],
+        )
+    return report
+
+
+def run_offline_replay(
+    *,
+    config_path: str,
+    symbols: List[str],
+    start_ms: Optional[int] = None,
+    end_ms: Optional[int] = None,
+    with_smc: bool = True,
+    diff: bool = False,
+    report_path: Optional[str] = None,
+) -> int:
+    """CLI-обгортка: config → replay_offline → лог/JSON звіт.
+
+    Returns:
+        0 = success (diff без розбіжностей або без diff), 1 = немає барів,
+        2 = diff знайшов розбіжності.
+    """
+    cfg = load_system_config(config_path)
+    report = replay_offline(
+        cfg,
+        symbols,
+        start_ms=start_ms,
+        end_ms=end_ms,
+        with_smc=with_smc,
+        diff=diff,
+    )
+    if report_path:
+        with open(report_path, "w", encoding="utf-8") as f:
+            json.dump(report, f, ensure_ascii=False, indent=2, sort_keys=True)
+        log.info("REPLAY_OFFLINE_REPORT path=%s", report_path)
+    log.info(
+        "REPLAY_OFFLINE_DONE symbols=%s m1=%d derived=%s",
+        symbols,
+        report["m1_bars"],
+        report["derived_by_tf"],
+    )
+    if not report["m1_bars"]:
+        return 1
+    if diff:
+        dirty = any(
+            row["only_replay"] or row["only_disk"] or row["mismatch"]
+            for per_tf in report["diff"].values()
+            for row in per_tf.values()
+        )
+        return 2 if dirty else 0
+    return 0
@@ -7,29 +7,50 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Any, Dict, Iterable, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
 
 from core.buckets import bucket_start_ms, tf_to_ms
 from core.model.bars import CandleBar
 
 
-@dataclass
 class _BucketState:
-    open_ms: int
-    close_ms: int
-    open_tick_ts_ms: int
-    last_tick_ts_ms: int
-    o: float
-    h: float
-    low: float
-    c: float
-    v: float
-    ticks_n: int
+    """Мутабельний стан бакету — водночас view для caller-а (update_state).
+
+    Атрибути bar-сумісні (open_time_ms/o/h/low/c/v), тож view можна
+    передавати у M3/HTF деривацію без CandleBar. Після rollover агрегатор
+    створює новий стан, а попередній більше не мутується.
+    """
+
+    __slots__ = (
+        "open_time_ms",
+        "close_time_ms",
+        "open_tick_ts_ms",
+        "last_tick_ts_ms",
+        "o",
+        "h",
+        "low",
+        "c",
+        "v",
+        "ticks_n",
+    )
+
+    def __init__(self, open_time_ms: int, close_time_ms: int, tick_ts_ms: int, price: float):
+        self.open_time_ms = open_time_ms
+        self.close_time_ms = close_time_ms
+        self.open_tick_ts_ms = tick_ts_ms
+        self.last_tick_ts_ms = tick_ts_ms
+        self.o = price
+        self.h = price
+        self.low = price
+        self.c = price
+        self.v = 0.0
+        self.ticks_n = 1
 
 
 # Результат update: (promoted_bar | None, preview_bar | None)
 UpdateResult = Tuple[Optional[CandleBar], Optional[CandleBar]]
+# Результат update_state: (promoted_bar | None, live view поточного бакету | None)
+StateResult = Tuple[Optional[CandleBar], Optional[_BucketState]]
 
 
 class TickAggregator:
@@ -80,47 +101,113 @@ class TickAggregator:
         preview_bar: поточний бакет (complete=False).
         Кожен може бути None.
         """
+        promoted, state = self.update_state(symbol, tf_s, tick_ts_ms, price)
+        if state is None:
+            return (promoted, None)
+        return (promoted, self.to_bar(symbol, tf_s, state))
+
+    def update_state(
+        self,
+        symbol: str,
+        tf_s: int,
+        tick_ts_ms: int,
+        price: float,
+    ) -> StateResult:
+        """Як update(), але без алокації preview-бару на кожен тик.
+
+        Повертає live view стану бакету: caller матеріалізує CandleBar через
+        to_bar() лише коли реально публікує (throttled тики нічого не будують).
+        View мутується наступними тиками того ж бакету — не зберігати як snapshot.
+        """
+        applied = self._apply(symbol, tf_s, tick_ts_ms, price)
+        if applied is None:
+            return (None, None)
+        prev, state = applied
+        return (self._promote(symbol, tf_s, prev), state)
+
+    def update_many(
+        self,
+        symbol: str,
+        tf_s: int,
+        ticks: Sequence[Tuple[int, float]],
+    ) -> List[UpdateResult]:
+        """Коалесований update для батчу тиків одного (symbol, tf_s).
+
+        Стан і stats — ті самі, що після послідовних update(); але preview-бар
+        будується лише один раз на бакет: фінальний стан кожного бакету,
+        якого торкнувся батч (зазвичай 1, при rollover — 2+).
+
+        Returns:
+            [(promoted_bar | None, preview_bar)] у хронологічному порядку;
+            promoted належить бакету, що закрився перед preview_bar.
+        """
+        out: List[UpdateResult] = []
+        pending_promoted: Optional[CandleBar] = None
+        touched: Optional[_BucketState] = None
+        for tick_ts_ms, price in ticks:
+            applied = self._apply(symbol, tf_s, tick_ts_ms, price)
+            if applied is None:
+                continue
+            prev, state = applied
+            if prev is not None:
+                # Rollover: фіксуємо фінальний стан бакету, якого торкнувся батч
+                if touched is not None:
+                    out.append((pending_promoted, self.to_bar(symbol, tf_s, touched)))
+                pending_promoted = self._promote(symbol, tf_s, prev)
+            touched = state
+        if touched is not None:
+            out.append((pending_promoted, self.to_bar(symbol, tf_s, touched)))
+        return out
+
+    def _promote(
+        self, symbol: str, tf_s: int, prev: Optional[_BucketState]
+    ) -> Optional[CandleBar]:
+        if prev is None or not self._auto_promote:
+            return None
+        self._stats["promoted_total"] += 1
+        return self._to_promoted(symbol, tf_s, prev)
+
+    def _apply(
+        self,
+        symbol: str,
+        tf_s: int,
+        tick_ts_ms: int,
+        price: float,
+    ) -> Optional[Tuple[Optional[_BucketState], _BucketState]]:
+        """Застосувати тик до стану бакету.
+
+        Returns:
+            None — тик відкинуто (TF/late/out-of-order, див. stats);
+            (prev_state | None, state) — prev заданий лише при rollover.
+        """
         self._stats["ticks_total"] += 1
         if tf_s not in self._tf_allowlist:
             self._stats["ticks_rejected_tf"] += 1
-            return (None, None)
+            return None
 
         tf_ms = tf_to_ms(int(tf_s))
         open_ms = bucket_start_ms(int(tick_ts_ms), tf_ms, self._anchor_offset_ms)
-        close_ms = int(open_ms + tf_ms)
         key = (str(symbol), int(tf_s))
         state = self._state.get(key)
 
-        if state is not None and open_ms < state.open_ms:
+        if state is not None and open_ms < state.open_time_ms:
             self._stats["ticks_dropped_late_bucket"] += 1
-            return (None, None)
-        if state is None or state.open_ms != open_ms:
+            return None
+        if state is None or state.open_time_ms != open_ms:
             # Rollover: новий бакет
-            promoted: Optional[CandleBar] = None
-            if state is not None and self._auto_promote:
-                promoted = self._to_promoted(symbol, tf_s, state)
-                self._stats["promoted_total"] += 1
+            prev = state
             state = _BucketState(
-                open_ms=open_ms,
-                close_ms=close_ms,
-                open_tick_ts_ms=int(tick_ts_ms),
-                last_tick_ts_ms=int(tick_ts_ms),
-                o=float(price),
-                h=float(price),
-                low=float(price),
-                c=float(price),
-                v=0.0,
-                ticks_n=1,
+                int(open_ms), int(open_ms + tf_ms), int(tick_ts_ms), float(price)
             )
             self._state[key] = state
-            return (promoted, self._to_bar(symbol, tf_s, state))
+            return (prev, state)
 
         if tick_ts_ms < state.open_tick_ts_ms:
             self._stats["ticks_dropped_before_open"] += 1
-            return (None, None)
+            return None
         if tick_ts_ms < state.last_tick_ts_ms:
             self._stats["ticks_dropped_out_of_order"] += 1
-            return (None, None)
+            return None
 
         state.last_tick_ts_ms = int(tick_ts_ms)
         state.c = float(price)
@@ -129,15 +216,16 @@ class TickAggregator:
             state.h = float(price)
         if price < state.low:
             state.low = float(price)
-        return (None, self._to_bar(symbol, tf_s, state))
+        return (None, state)
 
-    def _to_bar(self, symbol: str, tf_s: int, state: _BucketState) -> CandleBar:
+    def to_bar(self, symbol: str, tf_s: int, state: _BucketState) -> CandleBar:
+        """Матеріалізувати preview-бар (complete=False) зі стану/view бакету."""
         extensions: Dict[str, Any] = {"ticks_n": state.ticks_n}
         return CandleBar(
             symbol=str(symbol),
             tf_s=int(tf_s),
-            open_time_ms=int(state.open_ms),
-            close_time_ms=int(state.close_ms),
+            open_time_ms=int(state.open_time_ms),
+            close_time_ms=int(state.close_time_ms),
             o=float(state.o),
             h=float(state.h),
             low=float(state.low),
@@ -157,8 +245,8 @@ class TickAggregator:
         return CandleBar(
             symbol=str(symbol),
             tf_s=int(tf_s),
-            open_time_ms=int(state.open_ms),
-            close_time_ms=int(state.close_ms),
+            open_time_ms=int(state.open_time_ms),
+            close_time_ms=int(state.close_time_ms),
             o=float(state.o),
             h=float(state.h),
             low=float(state.low),
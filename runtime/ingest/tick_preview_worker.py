@@ -4,7 +4,7 @@ import json
 import logging
 import time
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
 from env_profile import load_env_secrets
 from core.config_loader import pick_config_path, load_system_config
@@ -19,6 +19,7 @@ from runtime.ingest.tick_common import (
     calendar_from_group,
 )
 from core.model.bars import CandleBar
+from runtime.store.redis_pool import pooled_client
 from runtime.store.redis_spec import resolve_redis_spec
 from runtime.store.uds import build_uds_from_config
 
@@ -195,6 +196,9 @@ class PreviewConfig:
     curr_ttl_s: Optional[int]
     symbols: list[str]
     channel: str
+    batch_enabled: bool = False
+    batch_max: int = 500
+    batch_window_ms: int = 20
 
 
 def _setup_logging(verbose: bool = False) -> None:
@@ -235,6 +239,9 @@ def _parse_preview_cfg(cfg: dict[str, Any]) -> PreviewConfig:
         curr_ttl_s=curr_ttl_s,
         symbols=symbols,
         channel=channel or "",
+        batch_enabled=bool(cfg.get("preview_tick_batch_enabled", False)),
+        batch_max=max(1, int(cfg.get("preview_tick_batch_max", 500))),
+        batch_window_ms=max(0, int(cfg.get("preview_tick_batch_window_ms", 20))),
     )
 
 
@@ -262,6 +269,18 @@ def _pick_price(payload: dict[str, Any]) -> Optional[float]:
         return None
 
 
+def _summary(values: List[float]) -> Dict[str, float]:
+    """p50/p95/max (nearest-rank) для stats payload."""
+    ordered = sorted(values)
+    n = len(ordered)
+    return {
+        "n": n,
+        "p50": round(ordered[(n - 1) // 2], 1),
+        "p95": round(ordered[min(n - 1, (n * 95 + 99) // 100 - 1)], 1),
+        "max": round(ordered[-1], 1),
+    }
+
+
 class TickPreviewWorker:
     # tick_v1 required fields (from core/contracts/public/marketdata_v1/tick_v1.json)
     _TICK_REQUIRED = ("v", "symbol", "tick_ts_ms", "src", "seq")
@@ -283,6 +302,9 @@ class TickPreviewWorker:
         anchor_offset_ms: int = 0,
         htf_preview_tfs: list[int] | None = None,
         htf_anchor_offsets_ms: Dict[int, int] | None = None,
+        batch_enabled: bool = False,
+        batch_max: int = 500,
+        batch_window_ms: int = 20,
     ) -> None:
         self._uds = uds
         self._tfs = [int(x) for x in tfs if int(x) > 0]
@@ -336,10 +358,57 @@ class TickPreviewWorker:
         self._idle_check_ts: float = 0.0
         self._redis_client: Any = None  # set in run_forever()
         self._redis_ns: str = ""  # set in run_forever()
+        # Batched ingestion: drain pub/sub → один update/publish на (symbol, tf)
+        self._batch_enabled = bool(batch_enabled)
+        self._batch_max = max(1, int(batch_max))
+        self._batch_window_s = max(0, int(batch_window_ms)) / 1000.0
+        self._batch_sizes: List[int] = []
+        self._batch_depth_max = 0
+        self._batch_capped = 0
+        self._batch_hold_ms: List[float] = []
+        self._latency_ms: List[float] = []
 
     def _inc(self, key: str, val: int = 1) -> None:
         self._stats[key] = self._stats.get(key, 0) + int(val)
 
+    _LATENCY_SAMPLES_MAX = 4096
+
+    def _note_latency(self, tick_ts_ms: int) -> None:
+        """tick_ts (брокер) → preview publish (wall), мс; семпли до emit."""
+        if len(self._latency_ms) < self._LATENCY_SAMPLES_MAX:
+            self._latency_ms.append(time.time() * 1000.0 - tick_ts_ms)
+
+    def _note_batch(self, size: int, rx_ts: Optional[float], queue_depth: int) -> None:
+        if len(self._batch_sizes) < self._LATENCY_SAMPLES_MAX:
+            self._batch_sizes.append(size)
+            if rx_ts is not None:
+                self._batch_hold_ms.append((time.time() - rx_ts) * 1000.0)
+        if queue_depth > self._batch_depth_max:
+            self._batch_depth_max = queue_depth
+        if size >= self._batch_max:
+            self._batch_capped += 1
+
+    def _drain_batch_stats(self) -> Dict[str, Any]:
+        """Агрегати батчів/латентності за інтервал emit (скидаються)."""
+        out: Dict[str, Any] = {}
+        if self._latency_ms:
+            out["tick_to_preview_ms"] = _summary(self._latency_ms)
+        if self._batch_sizes:
+            out["batch"] = {
+                "batches": len(self._batch_sizes),
+                "size_avg": round(sum(self._batch_sizes) / len(self._batch_sizes), 1),
+                "size_max": max(self._batch_sizes),
+                "capped": self._batch_capped,
+                "queue_depth_max": self._batch_depth_max,
+                "hold_ms": _summary(self._batch_hold_ms) if self._batch_hold_ms else None,
+            }
+        self._latency_ms = []
+        self._batch_sizes = []
+        self._batch_hold_ms = []
+        self._batch_depth_max = 0
+        self._batch_capped = 0
+        return out
+
     def _maybe_emit_stats(self) -> None:
         now = time.time()
         if now - self._stats_last_emit_ts < 60:
@@ -364,6 +433,7 @@ class TickPreviewWorker:
         # S2: merge tick_agg stats + degraded-but-loud при зростанні drops
         agg_stats = self._agg.stats()
         payload["tick_agg_stats"] = agg_stats
+        payload.update(self._drain_batch_stats())
         drops_total = (
             agg_stats.get("ticks_dropped_late_bucket", 0)
             + agg_stats.get("ticks_dropped_before_open", 0)
@@ -421,7 +491,10 @@ class TickPreviewWorker:
             return f"extra_fields:{','.join(sorted(extra))}"
         return None
 
-    def on_tick(self, payload: dict[str, Any]) -> None:
+    def _accept_tick(
+        self, payload: dict[str, Any]
+    ) -> Optional[Tuple[str, int, float]]:
+        """Schema/version/symbol/ts/order/price/calendar gates → (symbol, ts, price)."""
         self._inc("ticks_in_total")
         self._last_tick_rx_ts = time.time()
         self._zero_ticks_warned = False
@@ -430,7 +503,7 @@ class TickPreviewWorker:
         if schema_err is not None:
             self._inc("ticks_dropped_schema")
             self._inc(f"ticks_schema_err:{schema_err}")
-            return
+            return None
         version = payload.get("v")
         if version is not None:
             try:
@@ -442,14 +515,14 @@ class TickPreviewWorker:
                 version = -1
             if version != 1:
                 self._inc("ticks_dropped_version")
-                return
+                return None
         symbol = self._normalize_symbol(payload.get("symbol"))
         if symbol is None:
             self._inc("ticks_dropped_symbol")
-            return
+            return None
         if self._symbol_allowlist and symbol not in self._symbol_allowlist:
             self._inc("ticks_dropped_symbol")
-            return
+            return None
         tick_ts_ms = to_ms(payload.get("tick_ts"))
         if tick_ts_ms is None:
             tick_ts_ms = to_ms(payload.get("tick_ts_ms"))
@@ -457,16 +530,16 @@ class TickPreviewWorker:
             tick_ts_ms = to_ms(payload.get("snap_ts"))
         if tick_ts_ms is None:
             self._inc("ticks_dropped_ts")
-            return
+            return None
         last_ts = self._last_tick_ts_ms.get(symbol)
         if last_ts is not None and tick_ts_ms < last_ts:
             self._inc("ticks_dropped_out_of_order")
-            return
+            return None
         self._last_tick_ts_ms[symbol] = tick_ts_ms
         price = _pick_price(payload)
         if price is None:
             self._inc("ticks_dropped_price")
-            return
+            return None
 
         # Calendar gate: drop ticks during calendar pause
         cal = self._calendars.get(symbol)
@@ -484,13 +557,21 @@ class TickPreviewWorker:
                         self._cal_drop_total,
                         m1_open_ms,
                     )
-                return
+                return None
 
+        return symbol, tick_ts_ms, price
+
+    def on_tick(self, payload: dict[str, Any]) -> None:
+        accepted = self._accept_tick(payload)
+        if accepted is None:
+            return
+        symbol, tick_ts_ms, price = accepted
         for tf_s in self._tfs:
             # M3 деривація: пропускаємо M3 у TickAggregator, виводимо з M1
             if tf_s == 180 and self._derive_m3:
                 continue
-            promoted, bar = self._agg.update(symbol, tf_s, tick_ts_ms, price)
+            # Live view стану бакету: CandleBar будується лише при publish
+            promoted, bar = self._agg.update_state(symbol, tf_s, tick_ts_ms, price)
 
             # Auto-promote: публікуємо завершений бар попередньої хвилини
             if promoted is not None:
@@ -500,7 +581,7 @@ class TickPreviewWorker:
                 continue
             self._publish_bar(bar, symbol, tf_s)
 
-            # M1→M3 деривація: після кожного M1 оновлення будуємо M3
+            # M1→M3 деривація: після кожного M1 оновлення будуємо M3 (view bar-сумісний)
             if tf_s == 60 and self._m3_buffer is not None:
                 m3_bar = self._m3_buffer.update(symbol, bar)
                 if m3_bar is not None:
@@ -511,6 +592,46 @@ class TickPreviewWorker:
                 htf_bars = self._htf_acc.update(symbol, bar)
                 for htf_bar in htf_bars:
                     self._publish_bar(htf_bar, symbol, htf_bar.tf_s)
+        self._note_latency(tick_ts_ms)
+        self._maybe_emit_stats()
+
+    def on_ticks(
+        self,
+        payloads: List[dict[str, Any]],
+        rx_ts: Optional[float] = None,
+        queue_depth: int = 0,
+    ) -> None:
+        """Батч тиків: ті самі gates, але один агрегований update/publish на (symbol, tf).
+
+        Тики коалесуються per symbol (порядок надходження зберігається) і
+        йдуть у TickAggregator.update_many: preview публікується для фінального
+        стану кожного бакету, якого торкнувся батч, а не на кожен тик.
+        """
+        by_symbol: Dict[str, List[Tuple[int, float]]] = {}
+        for payload in payloads:
+            accepted = self._accept_tick(payload)
+            if accepted is not None:
+                symbol, tick_ts_ms, price = accepted
+                by_symbol.setdefault(symbol, []).append((tick_ts_ms, price))
+        for symbol, ticks in by_symbol.items():
+            for tf_s in self._tfs:
+                if tf_s == 180 and self._derive_m3:
+                    continue
+                for promoted, bar in self._agg.update_many(symbol, tf_s, ticks):
+                    if promoted is not None:
+                        self._publish_promoted(promoted, symbol, tf_s)
+                    if bar is None:
+                        continue
+                    self._publish_bar(bar, symbol, tf_s)
+                    if tf_s == 60 and self._m3_buffer is not None:
+                        m3_bar = self._m3_buffer.update(symbol, bar)
+                        if m3_bar is not None:
+                            self._publish_bar(m3_bar, symbol, 180)
+                    if tf_s == 60 and self._htf_acc is not None:
+                        for htf_bar in self._htf_acc.update(symbol, bar):
+                            self._publish_bar(htf_bar, symbol, htf_bar.tf_s)
+            self._note_latency(ticks[-1][0])
+        self._note_batch(len(payloads), rx_ts, queue_depth)
         self._maybe_emit_stats()
 
     def _seed_htf_from_uds(self):
@@ -581,8 +702,12 @@ class TickPreviewWorker:
             )
 
     def _publish_bar(self, bar, symbol, tf_s):
-        # type: (CandleBar, str, int) -> None
-        """Публікація preview бару з forward-gap detection та throttling."""
+        # type: (Any, str, int) -> None
+        """Публікація preview бару з forward-gap detection та throttling.
+
+        bar: CandleBar або live view TickAggregator (update_state) — view
+        матеріалізується у CandleBar лише якщо publish не throttled.
+        """
         self._check_idle_mode()
         key = (symbol, tf_s)
         last_open = self._last_open_ms.get(key)
@@ -626,6 +751,8 @@ class TickPreviewWorker:
         if not allow_publish:
             self._inc("preview_publish_throttled_total")
             return
+        if not isinstance(bar, CandleBar):
+            bar = self._agg.to_bar(symbol, tf_s, bar)
         try:
             self._uds.publish_preview_bar(bar, ttl_s=self._curr_ttl_s)
             self._last_pub_ms[key] = now_ms
@@ -640,6 +767,67 @@ class TickPreviewWorker:
             )
             self._inc("preview_publish_errors_total")
 
+    def _decode_message(self, msg: Any) -> Optional[dict[str, Any]]:
+        if not isinstance(msg, dict):
+            return None
+        data = msg.get("data")
+        if data is None:
+            return None
+        if isinstance(data, bytes):
+            raw = data.decode("utf-8", errors="ignore")
+        else:
+            raw = str(data)
+        try:
+            payload = json.loads(raw)
+        except Exception:
+            self._inc("ticks_dropped_json")
+            return None
+        return payload if isinstance(payload, dict) else None
+
+    # Блокуюче очікування першого повідомлення батчу (stats/idle не "зависають")
+    _BATCH_IDLE_WAIT_S = 1.0
+
+    def _next_batch(self, pubsub: Any) -> Tuple[List[dict[str, Any]], float, int]:
+        """Зібрати батч: перше повідомлення (blocking) + backlog + вікно.
+
+        Returns:
+            (payloads, rx_ts першого повідомлення, queue_depth) — queue_depth =
+            скільки повідомлень уже чекало в сокеті на момент першого.
+        """
+        payloads: List[dict[str, Any]] = []
+        first = pubsub.get_message(timeout=self._BATCH_IDLE_WAIT_S)
+        rx_ts = time.time()
+        if first is None:
+            return payloads, rx_ts, 0
+        payload = self._decode_message(first)
+        if payload is not None:
+            payloads.append(payload)
+        received = 1
+        # 1) backlog: все, що вже буферизовано, без очікування
+        while received < self._batch_max:
+            msg = pubsub.get_message(timeout=0.0)
+            if msg is None:
+                break
+            received += 1
+            payload = self._decode_message(msg)
+            if payload is not None:
+                payloads.append(payload)
+        queue_depth = received - 1
+        # 2) вікно коалесингу: добираємо до batch_window_ms від першого тику
+        deadline = rx_ts + self._batch_window_s
+        while received < self._batch_max:
+            remaining = deadline - time.time()
+            if remaining <= 0:
+                break
+            msg = pubsub.get_message(timeout=remaining)
+            if msg is None:
+                continue
+            received += 1
+            payload = self._decode_message(msg)
+            if payload is not None:
+                payloads.append(payload)
+        return payloads, rx_ts, queue_depth
+
     def run_forever(self, redis_client: Any, redis_ns: str = "v3_local") -> None:
         # O3-sleep: store redis for idle mode checks
         self._redis_client = redis_client
@@ -649,23 +837,21 @@ class TickPreviewWorker:
             try:
                 pubsub = redis_client.pubsub(ignore_subscribe_messages=True)
                 pubsub.subscribe(self._channel)
-                logging.info("TickPreview: підписка на канал %s", self._channel)
+                logging.info(
+                    "TickPreview: підписка на канал %s batch=%s",
+                    self._channel,
+                    self._batch_enabled,
+                )
+                if self._batch_enabled:
+                    while True:
+                        payloads, rx_ts, depth = self._next_batch(pubsub)
+                        if payloads:
+                            self.on_ticks(payloads, rx_ts=rx_ts, queue_depth=depth)
+                        else:
+                            self._maybe_emit_stats()
                 for msg in pubsub.listen():
-                    if not isinstance(msg, dict):
-                        continue
-                    data = msg.get("data")
-                    if data is None:
-                        continue
-                    if isinstance(data, bytes):
-                        raw = data.decode("utf-8", errors="ignore")
-                    else:
-                        raw = str(data)
-                    try:
-                        payload = json.loads(raw)
-                    except Exception:
-                        self._inc("ticks_dropped_json")
-                        continue
-                    if isinstance(payload, dict):
+                    payload = self._decode_message(msg)
+                    if payload is not None:
                         self.on_tick(payload)
             except Exception as exc:
                 logging.warning("TickPreview: помилка pubsub err=%s", exc)
@@ -772,23 +958,23 @@ def main() -> int:
         anchor_offset_ms=anchor_offset_s * 1000,
         htf_preview_tfs=htf_preview_tfs,
         htf_anchor_offsets_ms=htf_anchor_offsets_ms,
+        batch_enabled=preview_cfg.batch_enabled,
+        batch_max=preview_cfg.batch_max,
+        batch_window_ms=preview_cfg.batch_window_ms,
     )
     logging.info(
-        "TickPreview: tfs=%s derive_m3=%s auto_promote_m1=%s symbols=%d",
+        "TickPreview: tfs=%s derive_m3=%s auto_promote_m1=%s symbols=%d "
+        "batch=%s batch_max=%d batch_window_ms=%d",
         preview_cfg.tfs,
         worker._derive_m3,
         auto_promote_m1,
         len(all_symbols),
+        preview_cfg.batch_enabled,
+        preview_cfg.batch_max,
+        preview_cfg.batch_window_ms,
     )
 
-    client = redis_lib.Redis(
-        host=spec.host,
-        port=spec.port,
-        db=spec.db,
-        decode_responses=False,
-        socket_timeout=None,
-        socket_connect_timeout=1.0,
-    )
+    client = pooled_client(spec, socket_timeout=None, socket_connect_timeout=1.0)
     worker.run_forever(client, redis_ns=spec.namespace)
     return 0
 
@@ -15,6 +15,7 @@ class Obs60s:
         self._uds_geom_fix: Dict[Tuple[str, int], int] = {}
         self._redis_hits: Dict[int, int] = {}
         self._redis_total: Dict[int, int] = {}
+        self._redis_round_trips: Dict[str, Tuple[int, int]] = {}
 
     def inc_writer_drop(self, reason: str, tf_s: int) -> None:
         key = (str(reason), int(tf_s))
@@ -33,6 +34,11 @@ class Obs60s:
             self._redis_hits[tf] = self._redis_hits.get(tf, 0) + 1
         self._tick()
 
+    def inc_redis_round_trips(self, path: str, round_trips: int, commands: int) -> None:
+        rt, cmds = self._redis_round_trips.get(str(path), (0, 0))
+        self._redis_round_trips[str(path)] = (rt + int(round_trips), cmds + int(commands))
+        self._tick()
+
     def _tick(self) -> None:
         now = time.time()
         if now - self._last_emit_ts < self._interval_s:
@@ -46,6 +52,7 @@ class Obs60s:
         self._uds_geom_fix.clear()
         self._redis_hits.clear()
         self._redis_total.clear()
+        self._redis_round_trips.clear()
 
     def _build_payload(self) -> Dict[str, object]:
         data: Dict[str, object] = {"label": self._label}
@@ -66,6 +73,11 @@ class Obs60s:
                 ratio = hits / total if total > 0 else 0.0
                 ratios[str(tf_s)] = round(ratio, 6)
             data["redis_hit_ratio"] = ratios
+        if self._redis_round_trips:
+            data["redis_round_trips"] = {
+                path: {"rt": rt, "cmds": cmds}
+                for path, (rt, cmds) in sorted(self._redis_round_trips.items())
+            }
         if len(data) == 1:
             return {}
         return data
@@ -0,0 +1,473 @@
+"""Індексований signal journal: journal-YYYY-MM-DD.jsonl + sidecar journal-YYYY-MM-DD.idx.
+
+JSONL лишається SSOT і human-readable експортом; .idx — append-only індекс
+рядків з полями для фільтрації без json.loads усього дня:
+(offset, nbytes, wall_ms, tf_s, flags, symbol, source, event). Запити за
+symbol / source / часовим діапазоном / «latest N» обирають записи з індексу
+і декодують лише відповідні байтові діапазони.
+
+Layout (little-endian):
+  [0:8)   magic b"V3JIX001"
+  [8:16)  reserved
+  records <qIqiB32s16s32s> × N
+
+Інваріанти (перевіряються при load, інакше індекс перебудовується з JSONL):
+  - записи суміжні: offset_0 == 0, offset_i == end_{i-1} (кожен повний
+    рядок має запис, битий/не-dict — з прапором _FLAG_BAD);
+  - end_last <= розмір JSONL; рядки після end_last («хвіст») сканує читач.
+Writer дописує запис у .idx після рядка JSONL; розбіжність (інший процес,
+ручна правка, лінива перебудова читачем) → перебудова з JSONL.
+Поля, що не вміщаються у фіксовану ширину (або tf_s не int), → _FLAG_UNKNOWN:
+такий запис завжди декодується і фільтрується по самому JSON.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import struct
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+_log = logging.getLogger(__name__)
+
+INDEX_MAGIC = b"V3JIX001"
+INDEX_SUFFIX = ".idx"
+DEFAULT_SOURCE = "smc_narrative"  # записи без `source` — narrative pipeline (pre-TDA)
+_HEADER = struct.Struct("<8sQ")
+_RECORD = struct.Struct("<qIqiB32s16s32s")
+_FLAG_BAD = 1
+_FLAG_UNKNOWN = 2
+_TF_UNKNOWN = -1
+
+
+def journal_path(base_dir: str, date_str: str) -> str:
+    return os.path.join(base_dir, f"journal-{date_str}.jsonl")
+
+
+def index_path_for(jsonl_path: str) -> str:
+    """journal-YYYY-MM-DD.jsonl → journal-YYYY-MM-DD.idx (той самий каталог)."""
+    if jsonl_path.endswith(".jsonl"):
+        return jsonl_path[: -len(".jsonl")] + INDEX_SUFFIX
+    return jsonl_path + INDEX_SUFFIX
+
+
+class JournalIndexEntry(NamedTuple):
+    offset: int
+    nbytes: int
+    wall_ms: int
+    tf_s: int
+    flags: int
+    symbol: str
+    source: str
+    event: str
+
+    @property
+    def end(self) -> int:
+        return self.offset + self.nbytes
+
+    @property
+    def bad(self) -> bool:
+        """Порожній/битий/не-dict рядок — у запити не потрапляє."""
+        return bool(self.flags & _FLAG_BAD)
+
+    @property
+    def unknown(self) -> bool:
+        """Поле не вмістилось в індекс — фільтр лише по декодованому JSON."""
+        return bool(self.flags & _FLAG_UNKNOWN)
+
+    def matches(
+        self,
+        source: str = "all",
+        symbol: Optional[str] = None,
+        since_ms: Optional[int] = None,
+        until_ms: Optional[int] = None,
+    ) -> bool:
+        """Попередній фільтр за індексом; UNKNOWN → кандидат (перевірка по JSON)."""
+        if self.bad:
+            return False
+        if self.unknown:
+            return True
+        return _record_matches(
+            self.source or DEFAULT_SOURCE, self.symbol, self.wall_ms,
+            source, symbol, since_ms, until_ms,
+        )
+
+
+def _record_matches(
+    rec_source: Any,
+    rec_symbol: Any,
+    rec_wall_ms: Any,
+    source: str,
+    symbol: Optional[str],
+    since_ms: Optional[int],
+    until_ms: Optional[int],
+) -> bool:
+    if source != "all" and rec_source != source:
+        return False
+    if symbol and rec_symbol != symbol:
+        return False
+    if since_ms is not None or until_ms is not None:
+        wall_ms = rec_wall_ms if isinstance(rec_wall_ms, int) else 0
+        if since_ms is not None and wall_ms < since_ms:
+            return False
+        if until_ms is not None and wall_ms > until_ms:
+            return False
+    return True
+
+
+def record_matches(
+    rec: Dict[str, Any],
+    *,
+    source: str = "all",
+    symbol: Optional[str] = None,
+    since_ms: Optional[int] = None,
+    until_ms: Optional[int] = None,
+) -> bool:
+    """Фільтр по декодованому запису (та сама семантика, що й індекс)."""
+    return _record_matches(
+        rec.get("source", DEFAULT_SOURCE), rec.get("symbol"), rec.get("wall_ms"),
+        source, symbol, since_ms, until_ms,
+    )
+
+
+def _fit(value: Any, width: int) -> Optional[bytes]:
+    raw = str(value or "").encode("utf-8")
+    return raw if len(raw) <= width else None
+
+
+def _entry_for(offset: int, nbytes: int, rec: Any) -> JournalIndexEntry:
+    """Запис індексу для рядка [offset, offset + nbytes)."""
+    if not isinstance(rec, dict):
+        return JournalIndexEntry(offset, nbytes, 0, _TF_UNKNOWN, _FLAG_BAD, "", "", "")
+    flags = 0
+    fields = []
+    for key, width in (("symbol", 32), ("source", 16), ("event", 32)):
+        raw = _fit(rec.get(key), width)
+        if raw is None:
+            flags |= _FLAG_UNKNOWN
+            raw = b""
+        fields.append(raw.decode("utf-8"))
+    wall_ms = rec.get("wall_ms", 0)
+    if not isinstance(wall_ms, int):
+        flags |= _FLAG_UNKNOWN
+        wall_ms = 0
+    tf_s = rec.get("tf_s", 0)
+    if not isinstance(tf_s, int) or not -(1 << 31) < tf_s < (1 << 31):
+        flags |= _FLAG_UNKNOWN
+        tf_s = _TF_UNKNOWN
+    return JournalIndexEntry(offset, nbytes, wall_ms, tf_s, flags, *fields)
+
+
+def _pack(entry: JournalIndexEntry) -> bytes:
+    return _RECORD.pack(
+        entry.offset, entry.nbytes, entry.wall_ms, entry.tf_s, entry.flags,
+        entry.symbol.encode("utf-8"), entry.source.encode("utf-8"),
+        entry.event.encode("utf-8"),
+    )
+
+
+def _unpack(raw: Tuple[Any, ...]) -> JournalIndexEntry:
+    offset, nbytes, wall_ms, tf_s, flags, sym, src, event = raw
+    return JournalIndexEntry(
+        offset, nbytes, wall_ms, tf_s, flags,
+        sym.rstrip(b"\0").decode("utf-8", "replace"),
+        src.rstrip(b"\0").decode("utf-8", "replace"),
+        event.rstrip(b"\0").decode("utf-8", "replace"),
+    )
+
+
+def _parse_line(raw: bytes) -> Any:
+    try:
+        return json.loads(raw.decode("utf-8"))
+    except (UnicodeDecodeError, json.JSONDecodeError):  # bare_except: allow  # caller логує
+        return None
+
+
+def scan_entries(path: str, start: int, end: Optional[int] = None) -> List[JournalIndexEntry]:
+    """Записи індексу для повних рядків JSONL з offset `start` до `end`/EOF."""
+    out: List[JournalIndexEntry] = []
+    offset = start
+    with open(path, "rb") as f:
+        f.seek(start)
+        for raw in f:
+            if end is not None and offset + len(raw) > end:
+                break
+            if not raw.endswith(b"\n"):
+                break  # напівзаписаний рядок writer-а — не індексуємо
+            rec = _parse_line(raw) if raw.strip() else None
+            entry = _entry_for(offset, len(raw), rec)
+            if entry.bad and raw.strip():
+                # I5: лог, але битий рядок не отруює запити по всьому дню
+                _log.warning("SIGNAL_JOURNAL_SKIP_MALFORMED path=%s offset=%d", path, offset)
+            out.append(entry)
+            offset += len(raw)
+    return out
+
+
+def read_index(idx_path: str, jsonl_size: int) -> Optional[List[JournalIndexEntry]]:
+    """Записи .idx або None якщо індекс відсутній/невалідний."""
+    try:
+        with open(idx_path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:  # bare_except: allow  # індексу ще немає → build
+        return None
+    except OSError as exc:
+        _log.warning("SIGNAL_JOURNAL_INDEX_READ_ERR path=%s err=%s", idx_path, exc)
+        return None
+    if len(data) < _HEADER.size:
+        return _index_invalid(idx_path, "short_header")
+    magic, _reserved = _HEADER.unpack_from(data, 0)
+    if magic != INDEX_MAGIC:
+        return _index_invalid(idx_path, "bad_magic")
+    body = data[_HEADER.size :]
+    # Обрізаний останній запис (crash посеред write) — ігноруємо його.
+    n = len(body) // _RECORD.size
+    entries = [_unpack(r) for r in _RECORD.iter_unpack(body[: n * _RECORD.size])]
+    prev_end = 0
+    for entry in entries:
+        if entry.offset != prev_end or entry.nbytes <= 0:
+            return _index_invalid(idx_path, "non_contiguous")
+        prev_end = entry.end
+    if prev_end > jsonl_size:
+        return _index_invalid(idx_path, "beyond_jsonl")
+    return entries
+
+
+def _index_invalid(idx_path: str, reason: str) -> None:
+    _log.warning("SIGNAL_JOURNAL_INDEX_INVALID path=%s reason=%s (full scan)", idx_path, reason)
+    return None
+
+
+def _write_index_file(idx_path: str, entries: Iterable[JournalIndexEntry]) -> None:
+    tmp_path = idx_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(INDEX_MAGIC, 0))
+        for entry in entries:
+            f.write(_pack(entry))
+    os.replace(tmp_path, idx_path)
+
+
+def build_index(jsonl_path: str, *, persist: bool = True) -> List[JournalIndexEntry]:
+    """Повна (лінива) перебудова індексу з JSONL; persist → atomic write."""
+    try:
+        entries = scan_entries(jsonl_path, 0)
+    except FileNotFoundError:  # bare_except: allow  # журналу за день немає
+        return []
+    if persist and entries:
+        try:
+            _write_index_file(index_path_for(jsonl_path), entries)
+        except OSError as exc:
+            _log.warning("SIGNAL_JOURNAL_INDEX_WRITE_ERR path=%s err=%s", jsonl_path, exc)
+    return entries
+
+
+def append_record(base_dir: str, record: Dict[str, Any], date_str: str) -> None:
+    """Дописує запис у journal-<date>.jsonl і його рядок індексу.
+
+    OSError запису JSONL пробрасується (caller логує); збій індексу — warning,
+    читач перебудує .idx з JSONL.
+    """
+    path = journal_path(base_dir, date_str)
+    line = (json.dumps(record, ensure_ascii=False) + "\n").encode("utf-8")
+    with open(path, "ab") as f:
+        f.seek(0, os.SEEK_END)
+        offset = f.tell()
+        f.write(line)
+    entry = _entry_for(offset, len(line), record)
+    idx_path = index_path_for(path)
+    try:
+        with open(idx_path, "a+b") as f:
+            f.seek(0, os.SEEK_END)
+            idx_size = f.tell()
+            body = idx_size - _HEADER.size
+            if idx_size == 0:
+                f.write(_HEADER.pack(INDEX_MAGIC, 0))
+                expected = 0
+            elif body < 0 or body % _RECORD.size:
+                expected = -1
+            elif body == 0:
+                expected = 0
+            else:
+                f.seek(idx_size - _RECORD.size)
+                expected = _unpack(_RECORD.unpack(f.read(_RECORD.size))).end
+            if expected == offset:
+                f.seek(0, os.SEEK_END)
+                f.write(_pack(entry))
+                return
+    except OSError as exc:
+        _log.warning("SIGNAL_JOURNAL_INDEX_WRITE_ERR path=%s err=%s", idx_path, exc)
+        return
+    # .idx розійшовся з JSONL (інший writer, ручна правка) — перебудувати
+    _log.info("SIGNAL_JOURNAL_INDEX_REBUILD path=%s reason=desync", path)
+    build_index(path)
+
+
+class _IndexStale(Exception):
+    """Байтовий діапазон з .idx не є JSON-рядком (файл переписано)."""
+
+
+class JournalStore:
+    """Читач індексованого журналу (process-level, thread-safe).
+
+    Індекс дня кешується за (size, mtime_ns) JSONL: поки файл не змінився,
+    запит не читає ні .idx, ні JSONL поза обраними рядками.
+    """
+
+    def __init__(self, base_dir: str) -> None:
+        self._base_dir = base_dir
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Tuple[Tuple[int, int], List[JournalIndexEntry]]] = {}
+
+    def index(self, date_str: str) -> List[JournalIndexEntry]:
+        """Записи індексу дня (хронологічно); [] якщо файлу немає."""
+        return self._load(journal_path(self._base_dir, date_str))
+
+    def records(self, date_str: str, entries: Iterable[JournalIndexEntry]) -> List[Dict[str, Any]]:
+        """Декодовані записи для `entries` (порядок збережено, битий рядок — пропуск)."""
+        path = journal_path(self._base_dir, date_str)
+        try:
+            return self._decode(path, list(entries))
+        except _IndexStale:
+            self._invalidate(path, rebuild=True)
+            return []
+
+    def query(
+        self,
+        date_str: str,
+        *,
+        source: str = "all",
+        symbol: Optional[str] = None,
+        since_ms: Optional[int] = None,
+        until_ms: Optional[int] = None,
+        limit: Optional[int] = None,
+        newest_first: bool = False,
+    ) -> List[Dict[str, Any]]:
+        """Записи дня за фільтрами (хронологічно або newest-first, ≤ limit)."""
+        path = journal_path(self._base_dir, date_str)
+        for attempt in (0, 1):
+            entries = self._load(path)
+            try:
+                return self._select(
+                    path, entries, source, symbol, since_ms, until_ms, limit, newest_first
+                )
+            except _IndexStale:
+                if attempt:
+                    _log.warning("SIGNAL_JOURNAL_INDEX_STALE_AFTER_REBUILD path=%s", path)
+                    break
+                self._invalidate(path, rebuild=True)
+        return []
+
+    def latest(
+        self,
+        limit: int,
+        *,
+        source: str = "all",
+        symbol: Optional[str] = None,
+        max_days: int = 90,
+        now: Optional[datetime] = None,
+    ) -> List[Dict[str, Any]]:
+        """Останні `limit` записів (newest first), день за днем назад ≤ max_days."""
+        today = now or datetime.now(timezone.utc)
+        gathered: List[Dict[str, Any]] = []
+        for offset in range(max_days):
+            if len(gathered) >= limit:
+                break
+            date_str = (today - timedelta(days=offset)).strftime("%Y-%m-%d")
+            gathered.extend(
+                self.query(
+                    date_str,
+                    source=source,
+                    symbol=symbol,
+                    limit=limit - len(gathered),
+                    newest_first=True,
+                )
+            )
+        return gathered[:limit]
+
+    # ── internals ───────────────────────────────────────────
+
+    def _select(
+        self,
+        path: str,
+        entries: List[JournalIndexEntry],
+        source: str,
+        symbol: Optional[str],
+        since_ms: Optional[int],
+        until_ms: Optional[int],
+        limit: Optional[int],
+        newest_first: bool,
+    ) -> List[Dict[str, Any]]:
+        ordered = reversed(entries) if newest_first else iter(entries)
+        candidates = [e for e in ordered if e.matches(source, symbol, since_ms, until_ms)]
+        out: List[Dict[str, Any]] = []
+        # Пачками до limit: UNKNOWN-кандидати можуть не пройти перевірку по JSON
+        start = 0
+        while start < len(candidates) and (limit is None or len(out) < limit):
+            step = len(candidates) if limit is None else max(limit - len(out), 1)
+            batch = candidates[start : start + step]
+            start += len(batch)
+            for rec in self._decode(path, batch):
+                if record_matches(
+                    rec, source=source, symbol=symbol, since_ms=since_ms, until_ms=until_ms
+                ):
+                    out.append(rec)
+        return out if limit is None else out[:limit]
+
+    def _decode(self, path: str, entries: List[JournalIndexEntry]) -> List[Dict[str, Any]]:
+        if not entries:
+            return []
+        out: List[Dict[str, Any]] = []
+        try:
+            with open(path, "rb") as f:
+                for entry in entries:
+                    f.seek(entry.offset)
+                    raw = f.read(entry.nbytes)
+                    if not raw.endswith(b"\n"):
+                        raise _IndexStale(path)
+                    rec = _parse_line(raw)
+                    if not isinstance(rec, dict):
+                        raise _IndexStale(path)
+                    out.append(rec)
+        except FileNotFoundError:  # bare_except: allow  # день прибрано retention-ом
+            return []
+        return out
+
+    def _load(self, path: str) -> List[JournalIndexEntry]:
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            with self._lock:
+                self._cache.pop(path, None)
+            return []
+        except OSError as exc:
+            _log.warning("SIGNAL_JOURNAL_READ_ERR path=%s err=%s", path, exc)
+            return []
+        stamp = (st.st_size, st.st_mtime_ns)
+        with self._lock:
+            cached = self._cache.get(path)
+        if cached is not None and cached[0] == stamp:
+            return cached[1]
+        try:
+            entries = read_index(index_path_for(path), st.st_size)
+            if entries is None:
+                _log.info("SIGNAL_JOURNAL_INDEX_REBUILD path=%s reason=missing_or_invalid", path)
+                entries = build_index(path)
+            else:
+                tail_start = entries[-1].end if entries else 0
+                entries = entries + scan_entries(path, tail_start, st.st_size)
+        except OSError as exc:
+            _log.warning("SIGNAL_JOURNAL_READ_ERR path=%s err=%s", path, exc)
+            return []
+        with self._lock:
+            self._cache[path] = (stamp, entries)
+        return entries
+
+    def _invalidate(self, path: str, *, rebuild: bool) -> None:
+        with self._lock:
+            self._cache.pop(path, None)
+        if rebuild:
+            _log.warning("SIGNAL_JOURNAL_INDEX_REBUILD path=%s reason=stale", path)
+            build_index(path)
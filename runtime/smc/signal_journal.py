@@ -9,7 +9,7 @@ runtime/smc/signal_journal.py — Автоматичний журнал сигн
 При закритті сигналу емітує summary з повним lifecycle:
   duration_s, entry_price, exit_price, mfe, mae, reached_target, bias.
 
-Storage: data_v3/_signals/journal-YYYY-MM-DD.jsonl
+Storage: data_v3/_signals/journal-YYYY-MM-DD.jsonl (+ .idx, див. journal_store)
 Config:  config.json → smc.signal_journal.enabled
 
 Не пише в UDS, не змінює SSOT — суто діагностичний журнал для offline review.
@@ -17,16 +17,21 @@ Config:  config.json → smc.signal_journal.enabled
 
 from __future__ import annotations
 
-import json
 import logging
 import os
 import re
 import threading
 import time
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
 from core.smc.types import NarrativeBlock
+from runtime.smc.journal_store import (
+    JournalIndexEntry,
+    JournalStore,
+    append_record,
+    journal_path,
+)
 
 _log = logging.getLogger(__name__)
 
@@ -132,57 +137,51 @@ class SignalJournal:
             _log.info("SIGNAL_JOURNAL_INIT path=%s", self._base_dir)
 
     def _recover_state_from_journal(self) -> None:
-        """Відновлює _last_state та _active з сьогоднішнього журналу після рестарту."""
+        """Відновлює _last_state та _active з сьогоднішнього журналу після рестарту.
+
+        Через індекс дня декодуються лише потрібні рядки: останній запис per
+        (symbol, tf_s) і останній trade_entered/trade_exited per ключ.
+        """
         today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
-        filepath = os.path.join(self._base_dir, f"journal-{today}.jsonl")
-        if not os.path.isfile(filepath):
+        store = JournalStore(self._base_dir)
+        for _attempt in (0, 1):
+            picked = self._pick_recovery_entries(store.index(today))
+            records = store.records(today, picked)
+            if len(records) == len(picked):
+                break
+        else:
             return
 
-        try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        rec = json.loads(line)
-                    except json.JSONDecodeError:
-                        continue
-
-                    sym = rec.get("symbol", "")
-                    tf_s = rec.get("tf_s", 0)
-                    if not sym or not tf_s:
-                        continue
-
-                    key = (sym, tf_s)
-                    event = rec.get("event", "")
-                    mode = rec.get("mode", "")
-                    zone_id = rec.get("zone_id", "")
-                    trigger = rec.get("trigger", "")
-
-                    self._last_state[key] = (mode, zone_id, trigger)
-
-                    if event == "trade_entered":
-                        self._active[key] = _ActiveSignal(
-                            started_ms=rec.get("wall_ms", 0),
-                            entry_price=rec.get("price", 0.0),
-                            direction=rec.get("direction", ""),
-                            zone_id=zone_id,
-                            target_price=_parse_price_from_desc(
-                                rec.get("target_desc", "")
-                            ),
-                            invalidation_price=_parse_price_from_desc(
-                                rec.get("invalidation", "")
-                            ),
-                            bias_snapshot=rec.get("bias", {}),
-                            sub_mode=rec.get("sub_mode", ""),
-                            session_at_entry=rec.get("session", ""),
-                        )
-                    elif event == "trade_exited":
-                        self._active.pop(key, None)
-        except OSError as exc:
-            _log.warning("SIGNAL_JOURNAL_RECOVER_ERR path=%s err=%s", filepath, exc)
-            return
+        for rec in records:
+            sym = rec.get("symbol", "")
+            tf_s = rec.get("tf_s", 0)
+            if not sym or not tf_s:
+                continue
+
+            key = (sym, tf_s)
+            event = rec.get("event", "")
+            mode = rec.get("mode", "")
+            zone_id = rec.get("zone_id", "")
+            trigger = rec.get("trigger", "")
+
+            self._last_state[key] = (mode, zone_id, trigger)
+
+            if event == "trade_entered":
+                self._active[key] = _ActiveSignal(
+                    started_ms=rec.get("wall_ms", 0),
+                    entry_price=rec.get("price", 0.0),
+                    direction=rec.get("direction", ""),
+                    zone_id=zone_id,
+                    target_price=_parse_price_from_desc(rec.get("target_desc", "")),
+                    invalidation_price=_parse_price_from_desc(
+                        rec.get("invalidation", "")
+                    ),
+                    bias_snapshot=rec.get("bias", {}),
+                    sub_mode=rec.get("sub_mode", ""),
+                    session_at_entry=rec.get("session", ""),
+                )
+            elif event == "trade_exited":
+                self._active.pop(key, None)
 
         if self._last_state:
             _log.info(
@@ -191,6 +190,34 @@ class SignalJournal:
                 len(self._active),
             )
 
+    @staticmethod
+    def _pick_recovery_entries(
+        entries: List[JournalIndexEntry],
+    ) -> List[JournalIndexEntry]:
+        """Підмножина рядків, що визначає фінальний стан recovery (порядок файлу).
+
+        Записи з полями поза індексом (UNKNOWN) беруться завжди.
+        """
+        last: Dict[Tuple[str, int], JournalIndexEntry] = {}
+        last_lifecycle: Dict[Tuple[str, int], JournalIndexEntry] = {}
+        always: List[JournalIndexEntry] = []
+        for entry in entries:
+            if entry.bad:
+                continue
+            if entry.unknown:
+                always.append(entry)
+                continue
+            if not entry.symbol or not entry.tf_s:
+                continue
+            key = (entry.symbol, entry.tf_s)
+            last[key] = entry
+            if entry.event in ("trade_entered", "trade_exited"):
+                last_lifecycle[key] = entry
+        picked = {e.offset: e for e in always}
+        for entry in list(last.values()) + list(last_lifecycle.values()):
+            picked[entry.offset] = entry
+        return [picked[k] for k in sorted(picked)]
+
     def record(
         self,
         symbol: str,
@@ -387,13 +414,15 @@ class SignalJournal:
                 "zone_id": summary.zone_id,
             }
 
-        filename = f"journal-{now.strftime('%Y-%m-%d')}.jsonl"
-        filepath = os.path.join(self._base_dir, filename)
+        date_str = now.strftime("%Y-%m-%d")
         try:
-            with open(filepath, "a", encoding="utf-8") as f:
-                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            append_record(self._base_dir, entry, date_str)
         except OSError as exc:
-            _log.warning("SIGNAL_JOURNAL_WRITE_ERR path=%s err=%s", filepath, exc)
+            _log.warning(
+                "SIGNAL_JOURNAL_WRITE_ERR path=%s err=%s",
+                journal_path(self._base_dir, date_str),
+                exc,
+            )
 
     @staticmethod
     def _check_target_reached(sig: _ActiveSignal) -> bool:
@@ -453,10 +482,12 @@ class SignalJournal:
             entry["trade_partial_closed"] = signal.trade.partial_closed
             entry["trade_max_favorable_pts"] = round(signal.trade.max_favorable, 2)
 
-        filename = f"journal-{now.strftime('%Y-%m-%d')}.jsonl"
-        filepath = os.path.join(self._base_dir, filename)
+        date_str = now.strftime("%Y-%m-%d")
         try:
-            with open(filepath, "a", encoding="utf-8") as f:
-                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            append_record(self._base_dir, entry, date_str)
         except OSError as exc:
-            _log.warning("SIGNAL_JOURNAL_TDA_WRITE_ERR path=%s err=%s", filepath, exc)
+            _log.warning(
+                "SIGNAL_JOURNAL_TDA_WRITE_ERR path=%s err=%s",
+                journal_path(self._base_dir, date_str),
+                exc,
+            )
@@ -45,6 +45,7 @@ from core.smc.shell_composer import compose_shell_payload
 from runtime.ingest.market_calendar import MarketCalendar
 from runtime.ingest.tick_common import calendar_from_group
 from runtime.smc.signal_journal import SignalJournal
+from runtime.smc.snapshot_shm import SharedSnapshotWriter
 from runtime.relay.signal_relay import fire_signal, fire_bias
 
 _log = logging.getLogger(__name__)
@@ -151,6 +152,8 @@ class SmcRunner:
         compute_raw = smc_cfg.get("compute_tfs", [900, 3600, 14400, 86400])
         self._compute_tfs: Set[int] = set(int(x) for x in compute_raw)
         self._lock = threading.Lock()
+        # symbol → лічильник змін стану (state_version, кеш /api/v3 відповідей)
+        self._state_versions: Dict[str, int] = {}
         # (symbol, tf_s) → last SmcDelta after on_bar_dict()
         self._last_deltas: Dict[Tuple[str, int], Optional[SmcDelta]] = {}
         # ADR-040 errata A2 / GAP #9 (changelog 20260418-009):
@@ -173,6 +176,10 @@ class SmcRunner:
         )
         self._signal_state_path = os.path.join(sig_base, "signal_state.json")
         self._load_prev_signals()
+        # Shared-memory snapshot для інших процесів (None = вимкнено)
+        self._shm_writer: Optional[SharedSnapshotWriter] = (
+            SharedSnapshotWriter.from_config(full_cfg)
+        )
         # Market calendar per symbol — for narrative market-hours guard
         self._calendars: Dict[str, MarketCalendar] = {}
         cal_groups = full_cfg.get("market_calendar_by_group", {})
@@ -352,6 +359,9 @@ class SmcRunner:
                 _log.warning("SMC_WARMUP_M1_ERR sym=%s err=%s", symbol, exc)
 
         self._warmup_done = True
+        for symbol in self._symbols:
+            self._bump_state_version(symbol)
+            self._publish_shared(symbol, max(self._compute_tfs, default=0))
 
         # ADR-0040: TDA warmup (load persisted signals)
         self._uds_reader = uds_reader
@@ -434,6 +444,21 @@ class SmcRunner:
         if cb is not None:
             self._engine.feed_m1_bar(cb)
             self._last_prices[symbol] = cb.c
+            if cb.complete:
+                self._bump_state_version(symbol)
+
+    def _bump_state_version(self, symbol: str) -> None:
+        with self._lock:
+            self._state_versions[symbol] = self._state_versions.get(symbol, 0) + 1
+
+    def state_version(self, symbol: str) -> int:
+        """Лічильник змін SMC стану символу (complete бари, warmup).
+
+        Ключ версії для кешу відповідей /api/v3 (zones/levels/narrative):
+        незмінний version → ті самі snapshot, grades, session H/L.
+        """
+        with self._lock:
+            return self._state_versions.get(symbol, 0)
 
     def on_bar_dict(
         self,
@@ -452,7 +477,36 @@ class SmcRunner:
         if cb is None:
             _log.debug("SMC_BAR_SKIP sym=%s tf=%s reason=bad_dict", symbol, tf_s)
             return None
+        try:
+            return self._apply_bar(symbol, tf_s, cb)
+        finally:
+            # Після мутації стану: кеш відповідей /api/v3 бачить новий version
+            if cb.complete:
+                self._bump_state_version(symbol)
+                if tf_s in self._compute_tfs and self._warmup_done:
+                    self._publish_shared(symbol, tf_s)
+
+    def _publish_shared(self, symbol: str, tf_s: int) -> None:
+        """Публікує display snapshot + grades compute TF ≤ tf_s у shared memory.
+
+        Закритий бар tf_s змінює і його snapshot, і HTF-ін'єкції нижчих TF.
+        """
+        if self._shm_writer is None:
+            return
+        for view_tf in sorted(t for t in self._compute_tfs if t <= tf_s):
+            try:
+                snap = self.get_snapshot(symbol, view_tf)
+                if snap is not None:
+                    self._shm_writer.publish(
+                        snap, self.get_zone_grades(symbol, view_tf), tf_s=view_tf
+                    )
+            except Exception as exc:
+                _log.warning(
+                    "SMC_SHM_PUBLISH_ERR sym=%s tf=%s err=%s", symbol, view_tf, exc
+                )
 
+    def _apply_bar(self, symbol: str, tf_s: int, cb: CandleBar) -> Optional[SmcDelta]:
+        """Тіло on_bar_dict для вже сконвертованого бару."""
         # ADR-0075: buffer closed-bar events for WakeEngine candle_close.
         # Broker "finale" (cb.complete) IS the closed bar (I3 Final>Preview) —
         # no open_ms inference needed. Mirrors the structure-events buffer.
@@ -0,0 +1,540 @@
+"""Shared-memory публікація SMC snapshot для інших процесів (MCP, aione_top, workers).
+
+SmcRunner (writer) після кожного complete бару публікує SmcSnapshot + zone
+grades per (symbol, tf) у mmap-регіон файлу smc-<symbol>-<tf>.shm; читачі
+(SharedSnapshotReader) мапають той самий файл і читають останній snapshot
+без HTTP і без власного прогріву SmcEngine. Файл у page cache = спільна
+пам'ять між процесами; dir на tmpfs (/dev/shm/...) прибирає і writeback.
+
+Регіон (little-endian):
+  [0:8)   magic b"V3SMC001"
+  [8:16)  generation uint64 — номер останньої повної публікації (0 = порожньо,
+          MOVED = файл замінено більшим, читач має перевідкрити)
+  [16:20) slot_capacity uint32
+  [20:32) reserved
+  2 слоти × (slot_gen uint64, payload_len uint32, reserved uint32, payload)
+Публікація gen пише слот gen % 2: slot_gen=0 → payload → slot_gen=gen →
+generation=gen. Читач бере слот generation % 2, декодує прямо з mmap
+(memoryview, без копії payload) і після декоду перевіряє, що slot_gen не
+змінився — інакше writer перезаписав слот і читання повторюється.
+
+Payload (compact binary, версія _PAYLOAD_VERSION):
+  head _HEAD, таблиця рядків (uint32 offsets + UTF-8 blob: symbol, id, kind,
+  status, ...), записи зон/свінгів/рівнів фіксованої ширини з індексами в
+  таблицю, наприкінці ext JSON {grades, range_exhaustion} — вкладені
+  структури довільної форми, як ext у ssot_segment.
+
+Invariants:
+  S1 — writer лише читає стан SmcRunner; читачі — read-only mmap.
+  Помилка публікації не зупиняє SMC (degraded-but-loud: SMC_SHM_*).
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import json
+import logging
+import mmap
+import os
+import re
+import struct
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+from core.smc.types import (
+    RangeExhaustionSnapshot,
+    RangeExhaustionState,
+    SmcLevel,
+    SmcSnapshot,
+    SmcSwing,
+    SmcZone,
+)
+
+_log = logging.getLogger(__name__)
+
+REGION_MAGIC = b"V3SMC001"
+REGION_SUFFIX = ".shm"
+DEFAULT_DIR = "data_v3/_smc_shm"
+DEFAULT_SLOT_CAPACITY = 256 * 1024
+_MOVED = (1 << 64) - 1
+_REGION_HEAD = struct.Struct("<8sQI12x")
+_SLOT_HEAD = struct.Struct("<QI4x")
+_GEN = struct.Struct("<Q")
+
+_PAYLOAD_VERSION = 1
+# version, tf_s, symbol_idx, trend_bias_idx, bar_count, computed_at_ms,
+# published_ms, last_bos_ms, last_choch_ms, n_strings, strings_len,
+# n_zones, n_swings, n_levels, ext_len
+_HEAD = struct.Struct("<HxxiiiiqqqqIIIIII")
+# id, kind, status, context_layer, origin_zone_id (string idx, -1 = None),
+# start_ms, end_ms, anchor_bar_ms, high, low, strength
+_ZONE = struct.Struct("<iiiiiqqqddd")
+# id, kind, confirmed, time_ms, price
+_SWING = struct.Struct("<iiiqd")
+# id, kind, touches, time_ms, price
+_LEVEL = struct.Struct("<iiiqd")
+_NONE_MS = -(1 << 63)
+_READ_ATTEMPTS = 3
+
+
+def region_path(base_dir: str, symbol: str, tf_s: int) -> str:
+    """smc-<symbol>-<tf>.shm; символи поза [A-Za-z0-9] → '_' (XAU/USD → XAU_USD)."""
+    safe = re.sub(r"[^A-Za-z0-9]+", "_", symbol)
+    return os.path.join(base_dir, f"smc-{safe}-{int(tf_s)}{REGION_SUFFIX}")
+
+
+def _opt_ms(value: Optional[int]) -> int:
+    return _NONE_MS if value is None else int(value)
+
+
+def _ms_or_none(value: int) -> Optional[int]:
+    return None if value == _NONE_MS else value
+
+
+# ── Encoding ────────────────────────────────────────────────
+
+
+class _Strings:
+    def __init__(self) -> None:
+        self.index: Dict[str, int] = {}
+        self.items: List[bytes] = []
+
+    def add(self, value: Optional[str]) -> int:
+        if value is None:
+            return -1
+        idx = self.index.get(value)
+        if idx is None:
+            idx = len(self.items)
+            self.index[value] = idx
+            self.items.append(value.encode("utf-8"))
+        return idx
+
+
+def encode_snapshot(
+    snap: SmcSnapshot, grades: Optional[Dict[str, Any]] = None, published_ms: int = 0
+) -> bytes:
+    """SmcSnapshot + zone grades → compact payload (див. модуль)."""
+    strings = _Strings()
+    symbol_idx = strings.add(snap.symbol)
+    bias_idx = strings.add(snap.trend_bias)
+    zones = b"".join(
+        _ZONE.pack(
+            strings.add(z.id), strings.add(z.kind), strings.add(z.status),
+            strings.add(z.context_layer), strings.add(z.origin_zone_id),
+            int(z.start_ms), _opt_ms(z.end_ms), int(z.anchor_bar_ms),
+            float(z.high), float(z.low), float(z.strength),
+        )
+        for z in snap.zones
+    )
+    swings = b"".join(
+        _SWING.pack(
+            strings.add(s.id), strings.add(s.kind), 1 if s.confirmed else 0,
+            int(s.time_ms), float(s.price),
+        )
+        for s in snap.swings
+    )
+    levels = b"".join(
+        _LEVEL.pack(
+            strings.add(lv.id), strings.add(lv.kind), int(lv.touches),
+            _opt_ms(lv.time_ms), float(lv.price),
+        )
+        for lv in snap.levels
+    )
+    ext: Dict[str, Any] = {}
+    if grades:
+        ext["grades"] = grades
+    if snap.range_exhaustion is not None:
+        ext["range_exhaustion"] = dataclasses.asdict(snap.range_exhaustion)
+    ext_raw = json.dumps(ext, separators=(",", ":"), default=str).encode("utf-8") if ext else b""
+
+    offsets = [0]
+    for item in strings.items:
+        offsets.append(offsets[-1] + len(item))
+    blob = b"".join(strings.items)
+    head = _HEAD.pack(
+        _PAYLOAD_VERSION, int(snap.tf_s), symbol_idx, bias_idx, int(snap.bar_count),
+        int(snap.computed_at_ms), int(published_ms),
+        _opt_ms(snap.last_bos_ms), _opt_ms(snap.last_choch_ms),
+        len(strings.items), len(blob), len(snap.zones), len(snap.swings),
+        len(snap.levels), len(ext_raw),
+    )
+    return b"".join(
+        (head, struct.pack(f"<{len(offsets)}I", *offsets), blob, zones, swings, levels, ext_raw)
+    )
+
+
+class SharedSnapshot:
+    """Zero-copy view на payload одного слоту; декод — лише на вимогу.
+
+    Скаляри head читаються при створенні; zones()/swings()/levels()/
+    zone_grades()/to_snapshot() матеріалізують з mmap. Після кожного декоду
+    викликайте valid(): False → слот перезаписано, результат відкинути.
+    """
+
+    def __init__(self, region: "_Region", slot_off: int, generation: int, payload: memoryview) -> None:
+        self._region = region
+        self._slot_off = slot_off
+        self.generation = generation
+        self._buf = payload
+        (
+            version, self.tf_s, symbol_idx, bias_idx, self.bar_count,
+            self.computed_at_ms, self.published_ms, last_bos, last_choch,
+            n_strings, strings_len, self._n_zones, self._n_swings,
+            self._n_levels, self._ext_len,
+        ) = _HEAD.unpack_from(payload, 0)
+        if version != _PAYLOAD_VERSION:
+            raise ValueError("SMC_SHM_BAD_PAYLOAD_VERSION version=%s" % version)
+        self.last_bos_ms = _ms_or_none(last_bos)
+        self.last_choch_ms = _ms_or_none(last_choch)
+        off = _HEAD.size
+        self._offsets = payload[off : off + 4 * (n_strings + 1)].cast("I")
+        off += 4 * (n_strings + 1)
+        self._blob_off = off
+        off += strings_len
+        self._zones_off = off
+        self._swings_off = off + _ZONE.size * self._n_zones
+        self._levels_off = self._swings_off + _SWING.size * self._n_swings
+        self._ext_off = self._levels_off + _LEVEL.size * self._n_levels
+        self._ext: Optional[Dict[str, Any]] = None
+        self.symbol = self._str(symbol_idx) or ""
+        self.trend_bias = self._str(bias_idx)
+
+    def valid(self) -> bool:
+        """Слот ще містить цю публікацію (writer не почав наступну в нього)."""
+        return self._region.slot_generation(self._slot_off) == self.generation
+
+    def _str(self, idx: int) -> Optional[str]:
+        if idx < 0:
+            return None
+        start = self._blob_off + self._offsets[idx]
+        end = self._blob_off + self._offsets[idx + 1]
+        return bytes(self._buf[start:end]).decode("utf-8")
+
+    def zones(self) -> List[SmcZone]:
+        out: List[SmcZone] = []
+        for rec in _ZONE.iter_unpack(self._buf[self._zones_off : self._swings_off]):
+            zid, kind, status, ctx, origin, start_ms, end_ms, anchor, high, low, strength = rec
+            out.append(
+                SmcZone(
+                    id=self._str(zid) or "", symbol=self.symbol, tf_s=self.tf_s,
+                    kind=self._str(kind) or "", start_ms=start_ms,
+                    end_ms=_ms_or_none(end_ms), high=high, low=low,
+                    status=self._str(status) or "", strength=strength,
+                    anchor_bar_ms=anchor, context_layer=self._str(ctx),
+                    origin_zone_id=self._str(origin),
+                )
+            )
+        return out
+
+    def swings(self) -> List[SmcSwing]:
+        return [
+            SmcSwing(
+                id=self._str(sid) or "", symbol=self.symbol, tf_s=self.tf_s,
+                kind=self._str(kind) or "", price=price, time_ms=time_ms,
+                confirmed=bool(confirmed),
+            )
+            for sid, kind, confirmed, time_ms, price in _SWING.iter_unpack(
+                self._buf[self._swings_off : self._levels_off]
+            )
+        ]
+
+    def levels(self) -> List[SmcLevel]:
+        return [
+            SmcLevel(
+                id=self._str(lid) or "", symbol=self.symbol, tf_s=self.tf_s,
+                kind=self._str(kind) or "", price=price,
+                time_ms=_ms_or_none(time_ms), touches=touches,
+            )
+            for lid, kind, touches, time_ms, price in _LEVEL.iter_unpack(
+                self._buf[self._levels_off : self._ext_off]
+            )
+        ]
+
+    def _ext_dict(self) -> Dict[str, Any]:
+        if self._ext is None:
+            raw = bytes(self._buf[self._ext_off : self._ext_off + self._ext_len])
+            self._ext = json.loads(raw.decode("utf-8")) if raw else {}
+        return self._ext
+
+    def zone_grades(self) -> Dict[str, Any]:
+        return dict(self._ext_dict().get("grades") or {})
+
+    def range_exhaustion(self) -> Optional[RangeExhaustionSnapshot]:
+        raw = self._ext_dict().get("range_exhaustion")
+        if not raw:
+            return None
+        return RangeExhaustionSnapshot(
+            symbol=raw["symbol"],
+            primary=RangeExhaustionState(**raw["primary"]),
+            by_anchor={k: RangeExhaustionState(**v) for k, v in raw["by_anchor"].items()},
+            computed_at_ms=raw["computed_at_ms"],
+        )
+
+    def to_snapshot(self) -> SmcSnapshot:
+        return SmcSnapshot(
+            symbol=self.symbol, tf_s=self.tf_s, zones=self.zones(),
+            swings=self.swings(), levels=self.levels(), trend_bias=self.trend_bias,
+            last_bos_ms=self.last_bos_ms, last_choch_ms=self.last_choch_ms,
+            computed_at_ms=self.computed_at_ms, bar_count=self.bar_count,
+            range_exhaustion=self.range_exhaustion(),
+        )
+
+
+# ── Region (mmap) ───────────────────────────────────────────
+
+
+class _Region:
+    """mmap одного файлу smc-<symbol>-<tf>.shm (writer — RW, reader — RO)."""
+
+    def __init__(self, path: str, mm: mmap.mmap, capacity: int) -> None:
+        self.path = path
+        self.mm = mm
+        self.capacity = capacity
+        self._view = memoryview(mm)
+
+    @classmethod
+    def create(cls, path: str, capacity: int) -> "_Region":
+        size = _REGION_HEAD.size + 2 * (_SLOT_HEAD.size + capacity)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(_REGION_HEAD.pack(REGION_MAGIC, 0, capacity))
+            f.truncate(size)
+        os.replace(tmp_path, path)
+        return cls.open(path, writable=True)
+
+    @classmethod
+    def open(cls, path: str, *, writable: bool = False) -> "_Region":
+        with open(path, "r+b" if writable else "rb") as f:
+            access = mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ
+            mm = mmap.mmap(f.fileno(), 0, access=access)
+        try:
+            magic, _gen, capacity = _REGION_HEAD.unpack_from(mm, 0)
+            if magic != REGION_MAGIC:
+                raise ValueError("SMC_SHM_BAD_MAGIC path=%s" % path)
+            if len(mm) < _REGION_HEAD.size + 2 * (_SLOT_HEAD.size + capacity):
+                raise ValueError("SMC_SHM_SIZE_MISMATCH path=%s" % path)
+        except Exception:
+            mm.close()
+            raise
+        return cls(path, mm, capacity)
+
+    def close(self) -> None:
+        self._view.release()
+        try:
+            self.mm.close()
+        except BufferError:
+            pass  # живі SharedSnapshot view тримають mmap; закриється з GC
+
+    def generation(self) -> int:
+        return _GEN.unpack_from(self.mm, 8)[0]
+
+    def slot_offset(self, generation: int) -> int:
+        return _REGION_HEAD.size + (generation % 2) * (_SLOT_HEAD.size + self.capacity)
+
+    def slot_generation(self, slot_off: int) -> int:
+        return _GEN.unpack_from(self.mm, slot_off)[0]
+
+    def write(self, generation: int, payload: bytes) -> None:
+        off = self.slot_offset(generation)
+        mm = self.mm
+        _GEN.pack_into(mm, off, 0)  # слот «у записі» — читачі цього слоту повторять
+        data_off = off + _SLOT_HEAD.size
+        mm[data_off : data_off + len(payload)] = payload
+        _SLOT_HEAD.pack_into(mm, off, generation, len(payload))
+        _GEN.pack_into(mm, 8, generation)
+
+    def mark_moved(self) -> None:
+        _GEN.pack_into(self.mm, 8, _MOVED)
+
+    def read(self) -> Optional[SharedSnapshot]:
+        """Останній snapshot або None (порожньо / перезапис під час читання)."""
+        for _ in range(_READ_ATTEMPTS):
+            generation = self.generation()
+            if generation == 0 or generation == _MOVED:
+                return None
+            off = self.slot_offset(generation)
+            slot_gen, length = _SLOT_HEAD.unpack_from(self.mm, off)
+            if slot_gen != generation or length > self.capacity:
+                continue
+            data_off = off + _SLOT_HEAD.size
+            try:
+                snap = SharedSnapshot(
+                    self, off, generation, self._view[data_off : data_off + length]
+                )
+            except (struct.error, ValueError, UnicodeDecodeError):  # bare_except: allow  # torn read → retry
+                continue  # торн-рід — slot перезаписується
+            if snap.valid():
+                return snap
+        _log.warning(
+            "SMC_SHM_READ_RETRIES_EXHAUSTED path=%s attempts=%d", self.path, _READ_ATTEMPTS
+        )
+        return None
+
+
+class SharedSnapshotWriter:
+    """Публікує snapshot-и per (symbol, tf) у mmap-регіони base_dir (thread-safe)."""
+
+    def __init__(self, base_dir: str, slot_capacity: int = DEFAULT_SLOT_CAPACITY) -> None:
+        self._base_dir = base_dir
+        self._capacity = max(4096, int(slot_capacity))
+        self._lock = threading.Lock()
+        self._regions: Dict[Tuple[str, int], _Region] = {}
+        os.makedirs(base_dir, exist_ok=True)
+
+    @classmethod
+    def from_config(cls, full_cfg: Dict[str, Any]) -> Optional["SharedSnapshotWriter"]:
+        """config.json:smc.shared_snapshot → writer або None (disabled / init fail)."""
+        section = (full_cfg.get("smc") or {}).get("shared_snapshot") or {}
+        if not bool(section.get("enabled", False)):
+            return None
+        base_dir = str(section.get("dir", DEFAULT_DIR))
+        try:
+            return cls(base_dir, int(section.get("slot_capacity_kb", 256)) * 1024)
+        except OSError as exc:
+            _log.warning("SMC_SHM_INIT_FAIL dir=%s err=%s", base_dir, exc)
+            return None
+
+    def publish(
+        self,
+        snap: SmcSnapshot,
+        grades: Optional[Dict[str, Any]] = None,
+        tf_s: Optional[int] = None,
+    ) -> int:
+        """Записує snapshot під (symbol, tf_s or snap.tf_s) → номер публікації.
+
+        tf_s — viewer TF, якщо display snapshot побудовано з іншого base TF.
+        """
+        payload = encode_snapshot(snap, grades, published_ms=int(time.time() * 1000))
+        key = (snap.symbol, int(snap.tf_s if tf_s is None else tf_s))
+        with self._lock:
+            region = self._regions.get(key)
+            if region is None or len(payload) > region.capacity:
+                region = self._replace_region(key, region, len(payload))
+            generation = region.generation()
+            generation = 1 if generation in (0, _MOVED) else generation + 1
+            region.write(generation, payload)
+            return generation
+
+    def _replace_region(
+        self, key: Tuple[str, int], old: Optional[_Region], need: int
+    ) -> _Region:
+        path = region_path(self._base_dir, *key)
+        capacity = self._capacity
+        while capacity < need:
+            capacity *= 2
+        start_gen = 0
+        if old is None:
+            try:
+                existing = _Region.open(path, writable=True)
+            except (OSError, ValueError):  # bare_except: allow  # немає/битий регіон → create
+                existing = None
+            if existing is not None and existing.capacity >= need:
+                self._regions[key] = existing
+                return existing
+            old = existing
+        if old is not None:
+            start_gen = old.generation()
+            if capacity < old.capacity:
+                capacity = old.capacity
+            while capacity < need:
+                capacity *= 2
+        region = _Region.create(path, capacity)
+        if start_gen not in (0, _MOVED):
+            # Нумерація поколінь монотонна через заміну файлу
+            _GEN.pack_into(region.mm, 8, start_gen)
+        if old is not None:
+            old.mark_moved()  # читачі старого inode перевідкриють файл
+            old.close()
+            _log.info("SMC_SHM_REGION_GROWN path=%s capacity=%d", path, capacity)
+        self._regions[key] = region
+        return region
+
+    def close(self) -> None:
+        with self._lock:
+            for region in self._regions.values():
+                region.close()
+            self._regions.clear()
+
+
+class SharedSnapshotReader:
+    """Читач для інших процесів: attach до регіонів base_dir, останній snapshot per (symbol, tf)."""
+
+    def __init__(self, base_dir: str = DEFAULT_DIR) -> None:
+        self._base_dir = base_dir
+        self._lock = threading.Lock()
+        self._regions: Dict[Tuple[str, int], _Region] = {}
+
+    def read(self, symbol: str, tf_s: int) -> Optional[SharedSnapshot]:
+        """Zero-copy view останньої публікації або None (ще не публікувалось)."""
+        key = (symbol, int(tf_s))
+        for _ in range(2):
+            region = self._region(key)
+            if region is None:
+                return None
+            if region.generation() == _MOVED:
+                self._drop(key)  # writer виріс у новий файл — перевідкрити
+                continue
+            return region.read()
+        return None
+
+    def get_snapshot(self, symbol: str, tf_s: int) -> Optional[SmcSnapshot]:
+        return self._decode(symbol, tf_s, lambda s: s.to_snapshot())
+
+    def get_zone_grades(self, symbol: str, tf_s: int) -> Dict[str, Any]:
+        return self._decode(symbol, tf_s, lambda s: s.zone_grades()) or {}
+
+    def generation(self, symbol: str, tf_s: int) -> int:
+        """Номер останньої публікації (0 = немає) — дешевий poll на зміни."""
+        region = self._region((symbol, int(tf_s)))
+        if region is None:
+            return 0
+        generation = region.generation()
+        return 0 if generation == _MOVED else generation
+
+    def close(self) -> None:
+        with self._lock:
+            for region in self._regions.values():
+                region.close()
+            self._regions.clear()
+
+    def _decode(self, symbol: str, tf_s: int, fn: Any) -> Any:
+        for _ in range(_READ_ATTEMPTS):
+            shared = self.read(symbol, tf_s)
+            if shared is None:
+                return None
+            try:
+                result = fn(shared)
+            except (struct.error, ValueError, KeyError, TypeError, UnicodeDecodeError):  # bare_except: allow  # torn read → retry
+                result = None
+            if shared.valid() and result is not None:
+                return result
+        _log.warning(
+            "SMC_SHM_DECODE_RETRIES_EXHAUSTED symbol=%s tf_s=%s attempts=%d",
+            symbol,
+            tf_s,
+            _READ_ATTEMPTS,
+        )
+        return None
+
+    def _region(self, key: Tuple[str, int]) -> Optional[_Region]:
+        with self._lock:
+            region = self._regions.get(key)
+            if region is not None:
+                return region
+            path = region_path(self._base_dir, *key)
+            try:
+                region = _Region.open(path)
+            except FileNotFoundError:  # bare_except: allow  # writer ще не публікував
+                return None
+            except (OSError, ValueError) as exc:
+                _log.warning("SMC_SHM_ATTACH_FAIL path=%s err=%s", path, exc)
+                return None
+            self._regions[key] = region
+            return region
+
+    def _drop(self, key: Tuple[str, int]) -> None:
+        with self._lock:
+            region = self._regions.pop(key, None)
+        if region is not None:
+            region.close()
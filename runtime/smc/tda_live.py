@@ -255,21 +255,20 @@ class TdaLiveRunner:
         tf_s: int,
         limit: int,
     ) -> List[CandleBar]:
-        """Read bars from UDS. S1: read-only."""
+        """Read bars from UDS. S1: read-only.
+
+        Через process-level window cache: вікно й CandleBar-декод спільні з
+        API endpoints (bars/window, smc/*) до наступного commit ключа.
+        """
         from runtime.store.uds import WindowSpec, ReadPolicy
+        from runtime.store.window_cache import read_windows
 
         spec = WindowSpec(symbol=symbol, tf_s=tf_s, limit=limit, cold_load=True)
         policy = ReadPolicy(disk_policy="explicit", prefer_redis=True)
-        result = uds_reader.read_window(spec, policy)
-        if result is None:
-            return []
-
-        bars_lwc = getattr(result, "bars_lwc", [])
-        bars: List[CandleBar] = []
-        for d in bars_lwc:
-            cb = _bar_dict_to_cb(d, symbol, tf_s)
-            if cb is not None:
-                bars.append(cb)
+        window = read_windows(uds_reader, [spec], policy)[0]
+        bars: List[CandleBar] = window.decoded(
+            "candle_bar", lambda d: _bar_dict_to_cb(d, symbol, tf_s)
+        )
         bars.sort(key=lambda b: b.open_time_ms)
         return bars
 
@@ -3,11 +3,19 @@ from __future__ import annotations
 import json
 import logging
 import os
-from collections import deque
+import threading
+from collections import OrderedDict, deque
 from collections.abc import Set as AbstractSet
-from typing import Any, Iterable, Optional
+from typing import Any, Callable, Iterable, Iterator, Optional
 
 from core.model.bars import FINAL_SOURCES
+from runtime.store.ssot_index import (
+    PartIndex,
+    build_part_index,
+    index_path_for,
+    load_part_index,
+)
+from runtime.store.ssot_segment import SsotSegment, segment_path_for
 
 logger = logging.getLogger("disk_layer")
 
@@ -36,6 +44,100 @@ def _iter_lines_reverse(path: str) -> Iterable[bytes]:
         return
 
 
+# (path, since_open_ms, to_open_ms, reverse) → рядки part-файлу у порядку файлу
+# (або зворотному). Джерело може пропустити рядки поза (since, to] — читач
+# однаково їх відфільтрував би; порядок і дублі решти мусять зберігатися.
+PartRows = Callable[[str, Optional[int], Optional[int], bool], Iterable[dict[str, Any]]]
+
+
+def _iter_jsonl_objects(path: str) -> Iterator[dict[str, Any]]:
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                obj = json.loads(line)
+            except Exception:
+                logger.debug("DISK_JSON_DECODE_FAIL path=%s", path)
+                continue
+            yield obj
+
+
+def _jsonl_part_rows(
+    path: str,
+    _since_open_ms: Optional[int],
+    _to_open_ms: Optional[int],
+    reverse: bool,
+) -> Iterable[dict[str, Any]]:
+    if reverse:
+        return _iter_jsonl_objects_reverse(path)
+    return _iter_jsonl_objects(path)
+
+
+class _IndexMismatch(Exception):
+    """Байтовий діапазон з .idx не збігається з межами рядків JSONL."""
+
+
+def _read_indexed_ranges(
+    path: str, ranges: list[tuple[int, Optional[int]]]
+) -> list[bytes]:
+    chunks: list[bytes] = []
+    with open(path, "rb") as f:
+        for start, end in ranges:
+            if start > 0:
+                f.seek(start - 1)
+                if f.read(1) != b"\n":
+                    raise _IndexMismatch(start)
+            else:
+                f.seek(0)
+            data = f.read() if end is None else f.read(end - start)
+            if end is not None and (len(data) != end - start or not data.endswith(b"\n")):
+                raise _IndexMismatch(end)
+            chunks.append(data)
+    return chunks
+
+
+def _iter_indexed_objects(
+    path: str,
+    idx: PartIndex,
+    since_open_ms: Optional[int],
+    to_open_ms: Optional[int],
+    reverse: bool,
+) -> Iterator[dict[str, Any]]:
+    """Рядки лише з блоків індексу, що перетинають (since, to].
+
+    Reverse-читач (tail) має early-return на першому рядку <= since, тому для
+    нього відсікаємо блоки лише по to_open_ms — інакше змінилася б семантика.
+    """
+    ranges = idx.select(None if reverse else since_open_ms, to_open_ms)
+    try:
+        chunks = _read_indexed_ranges(path, ranges)
+    except _IndexMismatch:
+        logger.warning("DISK_INDEX_MISMATCH path=%s (fallback full scan)", path)
+        yield from _jsonl_part_rows(path, since_open_ms, to_open_ms, reverse)
+        return
+    except FileNotFoundError:
+        logger.debug("DISK_FILE_GONE path=%s", path)
+        return
+    if reverse:
+        chunks.reverse()
+    for chunk in chunks:
+        lines = chunk.splitlines()
+        if reverse:
+            lines.reverse()
+        for raw in lines:
+            raw = raw.strip()
+            if not raw:
+                continue
+            try:
+                obj = json.loads(raw.decode("utf-8"))
+            except Exception:
+                logger.debug("DISK_JSON_DECODE_FAIL path=%s", path)
+                continue
+            yield obj
+
+
 def _read_jsonl_filtered(
     paths: list[str],
     since_open_ms: Optional[int],
@@ -45,39 +147,30 @@ def _read_jsonl_filtered(
     final_only: bool,
     skip_preview: bool,
     final_sources: Optional[AbstractSet[str]],
+    part_rows: PartRows = _jsonl_part_rows,
 ) -> list[dict[str, Any]]:
     buf: deque[dict[str, Any]] = deque(maxlen=max(1, limit))
     for p in paths:
         try:
-            with open(p, encoding="utf-8") as f:
-                for line in f:
-                    line = line.strip()
-                    if not line:
-                        continue
-                    try:
-                        obj = json.loads(line)
-                    except Exception:
-                        logger.debug("DISK_JSON_DECODE_FAIL path=%s", p)
-                        continue
-
-                    open_ms = obj.get("open_time_ms")
-                    if not isinstance(open_ms, int):
-                        continue
-
-                    if since_open_ms is not None and open_ms <= since_open_ms:
-                        continue
-                    if to_open_ms is not None and open_ms > to_open_ms:
-                        continue
-
-                    if not _bar_passes_filters(
-                        obj,
-                        final_only=final_only,
-                        skip_preview=skip_preview,
-                        final_sources=final_sources,
-                    ):
-                        continue
-
-                    buf.append(obj)
+            for obj in part_rows(p, since_open_ms, to_open_ms, False):
+                open_ms = obj.get("open_time_ms")
+                if not isinstance(open_ms, int):
+                    continue
+
+                if since_open_ms is not None and open_ms <= since_open_ms:
+                    continue
+                if to_open_ms is not None and open_ms > to_open_ms:
+                    continue
+
+                if not _bar_passes_filters(
+                    obj,
+                    final_only=final_only,
+                    skip_preview=skip_preview,
+                    final_sources=final_sources,
+                ):
+                    continue
+
+                buf.append(obj)
         except FileNotFoundError:
             logger.debug("DISK_FILE_GONE path=%s", p)
             continue
@@ -226,6 +319,24 @@ def _dedup_open_ms(bars: list[dict[str, Any]]) -> tuple[list[dict[str, Any]], in
     return result, dropped
 
 
+def _iter_jsonl_objects_reverse(path: str) -> Iterator[dict[str, Any]]:
+    for raw in _iter_lines_reverse(path):
+        raw = raw.strip()
+        if not raw:
+            continue
+        try:
+            obj = json.loads(raw.decode("utf-8"))
+        except Exception:
+            logging.debug(
+                "DISK_LAYER_TAIL_JSON_DECODE_FAILED path=%s raw=%r",
+                path,
+                raw,
+                exc_info=True,
+            )
+            continue
+        yield obj
+
+
 def _read_jsonl_tail_filtered_with_geom(
     paths: list[str],
     since_open_ms: Optional[int],
@@ -235,27 +346,15 @@ def _read_jsonl_tail_filtered_with_geom(
     final_only: bool,
     skip_preview: bool,
     final_sources: Optional[AbstractSet[str]],
+    part_rows: PartRows = _jsonl_part_rows,
 ) -> tuple[list[dict[str, Any]], Optional[dict[str, Any]]]:
     if limit <= 0:
         return [], None
     out: list[dict[str, Any]] = []
     for p in reversed(paths):
-        for raw in _iter_lines_reverse(p):
+        for obj in part_rows(p, since_open_ms, to_open_ms, True):
             if len(out) >= limit:
                 break
-            raw = raw.strip()
-            if not raw:
-                continue
-            try:
-                obj = json.loads(raw.decode("utf-8"))
-            except Exception:
-                logging.debug(
-                    "DISK_LAYER_TAIL_JSON_DECODE_FAILED path=%s raw=%r",
-                    p,
-                    raw,
-                    exc_info=True,
-                )
-                continue
             open_ms = obj.get("open_time_ms")
             if not isinstance(open_ms, int):
                 continue
@@ -341,11 +440,39 @@ def _read_last_jsonl(path: str) -> Optional[dict[str, Any]]:
     return last_obj
 
 
+def _bounds_overlap(
+    bounds: tuple[int, int],
+    since_open_ms: Optional[int],
+    to_open_ms: Optional[int],
+) -> bool:
+    lo, hi = bounds
+    if since_open_ms is not None and hi <= since_open_ms:
+        return False
+    if to_open_ms is not None and lo > to_open_ms:
+        return False
+    return True
+
+
 class DiskLayer:
-    """Дисковий шар: читання JSONL SSOT."""
+    """Дисковий шар: читання JSONL SSOT (+ колонкові сегменти запечатаних днів)."""
+
+    _MAX_OPEN_SEGMENTS = 64  # LRU-ліміт замаплених сегментів (як FD у JsonlAppender)
+    _MAX_CACHED_INDEXES = 1024  # .idx дрібні (32 B/блок) — тримаємо більше
 
     def __init__(self, data_root: str) -> None:
         self._data_root = data_root
+        # Витіснений сегмент не закриваємо явно: його ще може ітерувати інший
+        # executor-потік; mmap звільниться GC коли зникнуть посилання.
+        self._segments: "OrderedDict[str, SsotSegment]" = OrderedDict()
+        self._segments_lock = threading.Lock()
+        self._segment_reads = 0
+        self._jsonl_reads = 0
+        # path → ((jsonl_size, idx_size), PartIndex)
+        self._indexes: "OrderedDict[str, tuple[tuple[int, int], PartIndex]]" = (
+            OrderedDict()
+        )
+        self._index_reads = 0
+        self._parts_skipped = 0
 
     def list_parts(self, symbol: str, tf_s: int) -> list[str]:
         d = os.path.join(self._data_root, symbol.replace("/", "_"), f"tf_{tf_s}")
@@ -359,6 +486,151 @@ class DiskLayer:
         parts.sort()
         return parts
 
+    def _segment_for(self, jsonl_path: str) -> Optional[SsotSegment]:
+        """Свіжий сегмент для part-файлу або None (→ JSONL fallback).
+
+        Свіжість = сегмент не змінився з моменту mmap і JSONL має ті самі
+        (size, mtime_ns), що й на момент компакції. Поточний відкритий день
+        сегмента не має — завжди JSONL.
+        """
+        seg_path = segment_path_for(jsonl_path)
+        try:
+            seg_st = os.stat(seg_path)
+            jsonl_st = os.stat(jsonl_path)
+        except FileNotFoundError:
+            with self._segments_lock:
+                self._segments.pop(jsonl_path, None)
+                self._jsonl_reads += 1
+            return None
+        with self._segments_lock:
+            seg = self._segments.get(jsonl_path)
+            if seg is not None and seg.stat_sig == (
+                seg_st.st_size,
+                seg_st.st_mtime_ns,
+            ):
+                self._segments.move_to_end(jsonl_path)
+            else:
+                seg = None
+        if seg is None:
+            try:
+                seg = SsotSegment(seg_path)
+            except Exception:
+                logger.warning(
+                    "DISK_SEGMENT_OPEN_FAIL path=%s (fallback JSONL)",
+                    seg_path,
+                    exc_info=True,
+                )
+                with self._segments_lock:
+                    self._jsonl_reads += 1
+                return None
+            with self._segments_lock:
+                self._segments[jsonl_path] = seg
+                self._segments.move_to_end(jsonl_path)
+                while len(self._segments) > self._MAX_OPEN_SEGMENTS:
+                    self._segments.popitem(last=False)
+        fresh = seg.is_fresh_for(jsonl_st.st_size, jsonl_st.st_mtime_ns)
+        with self._segments_lock:
+            if fresh:
+                self._segment_reads += 1
+            else:
+                self._jsonl_reads += 1
+        return seg if fresh else None
+
+    def _index_for(self, jsonl_path: str) -> Optional[PartIndex]:
+        """Sparse індекс part-файлу; відсутній/невалідний → лінива перебудова."""
+        try:
+            size = os.path.getsize(jsonl_path)
+        except OSError:  # bare_except: allow  # part-файлу немає
+            return None
+        try:
+            idx_size = os.path.getsize(index_path_for(jsonl_path))
+        except OSError:  # bare_except: allow  # .idx немає → build нижче
+            idx_size = -1
+        sig = (size, idx_size)
+        with self._segments_lock:
+            cached = self._indexes.get(jsonl_path)
+            if cached is not None and cached[0] == sig:
+                self._indexes.move_to_end(jsonl_path)
+                return cached[1]
+        idx = load_part_index(jsonl_path) if idx_size >= 0 else None
+        if idx is None:
+            try:
+                idx = build_part_index(jsonl_path)
+            except OSError:
+                logger.debug("DISK_INDEX_BUILD_FAIL path=%s", jsonl_path, exc_info=True)
+                return None
+            if idx is None:
+                return None
+            try:
+                idx_size = os.path.getsize(index_path_for(jsonl_path))
+            except OSError:  # bare_except: allow  # persist не вдався (вже залоговано)
+                idx_size = -1
+            sig = (idx.size, idx_size)
+        with self._segments_lock:
+            self._indexes[jsonl_path] = (sig, idx)
+            self._indexes.move_to_end(jsonl_path)
+            while len(self._indexes) > self._MAX_CACHED_INDEXES:
+                self._indexes.popitem(last=False)
+        return idx
+
+    def _part_rows(
+        self,
+        jsonl_path: str,
+        since_open_ms: Optional[int],
+        to_open_ms: Optional[int],
+        reverse: bool,
+    ) -> Iterable[dict[str, Any]]:
+        """Джерело рядків part-файлу: сегмент → sparse індекс → повний JSONL скан."""
+        # Reverse (tail) читач робить early-return на рядку <= since, тому
+        # відсікання по since для нього некоректне — лише по to_open_ms.
+        since_eff = None if reverse else since_open_ms
+        seg = self._segment_for(jsonl_path)
+        if seg is not None:
+            bounds = seg.bounds()
+            if bounds is not None and not _bounds_overlap(bounds, since_eff, to_open_ms):
+                self._count_skipped()
+                return ()
+            if reverse:
+                return seg.iter_dicts_reverse(to_open_ms)
+            # Запечатаний день: open_ms-відсікання по колонці, без json.loads.
+            return seg.iter_dicts(since_open_ms, to_open_ms)
+        try:
+            idx = self._index_for(jsonl_path)
+        except Exception:
+            logger.warning(
+                "DISK_INDEX_LOAD_FAIL path=%s (fallback full scan)",
+                jsonl_path,
+                exc_info=True,
+            )
+            idx = None
+        if idx is None:
+            return _jsonl_part_rows(jsonl_path, since_open_ms, to_open_ms, reverse)
+        bounds = idx.bounds()
+        if bounds is None or not _bounds_overlap(bounds, since_eff, to_open_ms):
+            # Файл без валідних рядків або повністю поза (since, to].
+            self._count_skipped()
+            return ()
+        with self._segments_lock:
+            self._index_reads += 1
+        return _iter_indexed_objects(
+            jsonl_path, idx, since_open_ms, to_open_ms, reverse
+        )
+
+    def _count_skipped(self) -> None:
+        with self._segments_lock:
+            self._parts_skipped += 1
+
+    def segment_stats(self) -> dict[str, int]:
+        with self._segments_lock:
+            return {
+                "segment_reads": self._segment_reads,
+                "jsonl_reads": self._jsonl_reads,
+                "segments_open": len(self._segments),
+                "index_reads": self._index_reads,
+                "parts_skipped": self._parts_skipped,
+                "indexes_cached": len(self._indexes),
+            }
+
     def read_window_with_geom(
         self,
         symbol: str,
@@ -384,6 +656,7 @@ class DiskLayer:
                 final_only=final_only,
                 skip_preview=skip_preview,
                 final_sources=final_sources,
+                part_rows=self._part_rows,
             )
         return (
             _read_jsonl_filtered(
@@ -394,6 +667,7 @@ class DiskLayer:
                 final_only=final_only,
                 skip_preview=skip_preview,
                 final_sources=final_sources,
+                part_rows=self._part_rows,
             ),
             None,
         )
@@ -402,7 +676,8 @@ class DiskLayer:
         parts = self.list_parts(symbol, tf_s)
         if not parts:
             return None
-        last_obj = _read_last_jsonl(parts[-1])
+        seg = self._segment_for(parts[-1])
+        last_obj = seg.last_dict() if seg is not None else _read_last_jsonl(parts[-1])
         if not last_obj:
             return None
         open_ms = last_obj.get("open_time_ms")
@@ -1,75 +1,290 @@
+"""RAM шар UDS: LRU вікна барів у процесі.
+
+Вікно ключа (symbol, tf_s) — паралельні відсортовані масиви open_ms
+(list[int]) та барів (list[dict]):
+  - upsert: append fast-path для найновішого бару (O(1)), інакше bisect
+    (replace O(log n), insert O(log n) + memmove);
+  - get_window: зріз хвоста без копіювання самих барів (лише вказівники);
+    інваріант — open_time_ms строго зростає, без дублів.
+
+Локи (ADR-0010): глобальний лок тримає лише мапу ключів/LRU/бюджети,
+мутації й читання вікна — під локом самого ключа, тож upsert одного
+TF не блокує read_window інших. Порядок захоплення: ключ → глобальний
+(ніколи навпаки).
+
+Бюджети замість фіксованого max_keys: max_bars на ключ, max_total_bars
+та max_bytes (оцінка за sys.getsizeof) на весь шар; LRU-витіснення до
+виконання бюджетів (останній торкнутий ключ не витісняється).
+"""
+
 from __future__ import annotations
 
-from collections import OrderedDict
+import bisect
+import sys
 import threading
+import time
+from collections import OrderedDict
 from typing import Any, Optional
 
+RAM_MAX_BARS_DEFAULT = 60000
+RAM_MAX_TOTAL_BARS_DEFAULT = 2_000_000
+RAM_MAX_BYTES_DEFAULT = 1024 * 1024 * 1024
+
+# list-слоти (open_ms + bar) + сам int open_ms
+_SLOT_OVERHEAD_BYTES = 2 * 8 + 32
+
+
+def _bar_nbytes(bar: dict[str, Any]) -> int:
+    """Оцінка пам'яті одного бару (dict + значення + слоти вікна)."""
+    size = sys.getsizeof(bar) + _SLOT_OVERHEAD_BYTES
+    for value in bar.values():
+        size += sys.getsizeof(value)
+    return size
+
+
+class _Window:
+    """Відсортоване вікно одного ключа + його лок.
+
+    acct_bars/acct_bytes — внесок вікна в агрегати бюджету (під глобальним
+    локом); витіснення віднімає саме їх, а не len(bars), який писач може
+    саме змінювати під локом ключа.
+    """
+
+    __slots__ = (
+        "open_ms",
+        "bars",
+        "bar_nbytes",
+        "lock",
+        "evicted",
+        "acct_bars",
+        "acct_bytes",
+    )
+
+    def __init__(self) -> None:
+        self.open_ms: list[int] = []
+        self.bars: list[dict[str, Any]] = []
+        self.bar_nbytes = 0
+        self.lock = threading.Lock()
+        self.evicted = False
+        self.acct_bars = 0
+        self.acct_bytes = 0
+
+    @property
+    def nbytes(self) -> int:
+        return len(self.bars) * self.bar_nbytes
+
+
+class _Latency:
+    """Лічильник викликів + сумарна/максимальна тривалість (мкс)."""
+
+    __slots__ = ("count", "total_us", "max_us")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.total_us = 0.0
+        self.max_us = 0.0
+
+    def add(self, dt_us: float) -> None:
+        self.count += 1
+        self.total_us += dt_us
+        if dt_us > self.max_us:
+            self.max_us = dt_us
+
+    def as_dict(self) -> dict[str, Any]:
+        avg = self.total_us / self.count if self.count else 0.0
+        return {
+            "count": self.count,
+            "avg_us": round(avg, 2),
+            "max_us": round(self.max_us, 2),
+        }
+
 
 class RamLayer:
-    """RAM шар: LRU вікна у процесі."""
+    """RAM шар: LRU вікна у процесі (sorted arrays, per-key locks, budgets)."""
 
-    def __init__(self, max_keys: int = 8, max_bars: int = 60000) -> None:
-        self._max_keys = max(1, int(max_keys))
+    def __init__(
+        self,
+        max_bars: int = RAM_MAX_BARS_DEFAULT,
+        *,
+        max_total_bars: int = RAM_MAX_TOTAL_BARS_DEFAULT,
+        max_bytes: int = RAM_MAX_BYTES_DEFAULT,
+        max_keys: Optional[int] = None,
+    ) -> None:
         self._max_bars = max(1, int(max_bars))
-        self._windows: OrderedDict[tuple[str, int], list[dict[str, Any]]] = OrderedDict()
+        self._max_total_bars = max(1, int(max_total_bars))
+        self._max_bytes = max(1, int(max_bytes))
+        self._max_keys = max(1, int(max_keys)) if max_keys is not None else None
+        self._windows: OrderedDict[tuple[str, int], _Window] = OrderedDict()
         self._lock = threading.Lock()
+        # Агрегати бюджету (під self._lock)
+        self._total_bars = 0
+        self._total_bytes = 0
+        self._evictions = 0
+        self._hits = 0
+        self._misses = 0
+        self._upsert_append = 0
+        self._upsert_replace = 0
+        self._upsert_insert = 0
+        self._upsert_dropped = 0
+        self._lat_get = _Latency()
+        self._lat_upsert = _Latency()
+        self._lat_set = _Latency()
 
-    def _touch(self, key: tuple[str, int]) -> None:
-        if key in self._windows:
+    # ── карта ключів / бюджети (викликати під self._lock) ────────────
+
+    def _acquire_window(self, key: tuple[str, int], create: bool) -> Optional[_Window]:
+        win = self._windows.get(key)
+        if win is None:
+            if not create:
+                return None
+            win = _Window()
+            self._windows[key] = win
+        else:
             self._windows.move_to_end(key)
+        return win
 
-    def _evict_if_needed(self) -> None:
-        while len(self._windows) > self._max_keys:
-            self._windows.popitem(last=False)
+    def _over_budget(self) -> bool:
+        if self._max_keys is not None and len(self._windows) > self._max_keys:
+            return True
+        return (
+            self._total_bars > self._max_total_bars
+            or self._total_bytes > self._max_bytes
+        )
 
-    def get_window(self, symbol: str, tf_s: int, limit: int) -> Optional[list[dict[str, Any]]]:
-        with self._lock:
-            key = (symbol, tf_s)
-            bars = self._windows.get(key)
-            if not bars:
-                return None
-            self._touch(key)
-            if limit > 0:
-                return bars[-limit:]
-            return list(bars)
+    def _evict_if_needed(self) -> None:
+        while len(self._windows) > 1 and self._over_budget():
+            _key, win = self._windows.popitem(last=False)
+            win.evicted = True
+            self._total_bars -= win.acct_bars
+            self._total_bytes -= win.acct_bytes
+            self._evictions += 1
 
-    def set_window(self, symbol: str, tf_s: int, bars: list[dict[str, Any]]) -> None:
+    def _account(self, win: _Window, d_bars: int, d_bytes: int) -> None:
         with self._lock:
-            key = (symbol, tf_s)
-            trimmed = list(bars)
-            if self._max_bars and len(trimmed) > self._max_bars:
-                trimmed = trimmed[-self._max_bars :]
-            self._windows[key] = trimmed
-            self._touch(key)
+            if win.evicted:
+                return
+            win.acct_bars += d_bars
+            win.acct_bytes += d_bytes
+            self._total_bars += d_bars
+            self._total_bytes += d_bytes
             self._evict_if_needed()
 
-    def upsert_bar(self, symbol: str, tf_s: int, bar: dict[str, Any]) -> None:
+    def _window_for_write(self, key: tuple[str, int]) -> _Window:
+        """Вікно під власним локом (caller відпускає); evicted → нове."""
+        while True:
+            with self._lock:
+                win = self._acquire_window(key, create=True)
+            win.lock.acquire()
+            if not win.evicted:
+                return win
+            win.lock.release()
+
+    # ── публічний API ────────────────────────────────────────────────
+
+    def get_window(
+        self, symbol: str, tf_s: int, limit: int
+    ) -> Optional[list[dict[str, Any]]]:
+        """Хвіст вікна (limit<=0 → усе); відсортований, без дублів open_ms."""
+        t0 = time.perf_counter()
+        key = (symbol, tf_s)
         with self._lock:
-            key = (symbol, tf_s)
-            bars = self._windows.get(key)
-            if bars is None:
-                self._windows[key] = [bar]
-                self._touch(key)
-                self._evict_if_needed()
-                return
+            win = self._acquire_window(key, create=False)
+        out: Optional[list[dict[str, Any]]] = None
+        if win is not None:
+            with win.lock:
+                bars = win.bars
+                if bars:
+                    out = bars[-limit:] if 0 < limit < len(bars) else bars[:]
+        dt_us = (time.perf_counter() - t0) * 1e6
+        with self._lock:
+            if out is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+            self._lat_get.add(dt_us)
+        return out
+
+    def set_window(self, symbol: str, tf_s: int, bars: list[dict[str, Any]]) -> None:
+        """Замінює вікно ключа (останні max_bars, відсортовано + dedup)."""
+        t0 = time.perf_counter()
+        by_open: dict[int, dict[str, Any]] = {}
+        ordered = True
+        prev = None
+        for bar in bars:
             open_ms = bar.get("open_time_ms")
             if not isinstance(open_ms, int):
-                return
-            replaced = False
-            for idx, existing in enumerate(bars):
-                if existing.get("open_time_ms") == open_ms:
-                    bars[idx] = bar
-                    replaced = True
-                    break
-            if not replaced:
+                continue
+            if prev is not None and open_ms <= prev:
+                ordered = False
+            prev = open_ms
+            by_open[open_ms] = bar  # дубль → пізніший виграє (як upsert)
+        open_list = list(by_open) if ordered else sorted(by_open)
+        if len(open_list) > self._max_bars:
+            open_list = open_list[-self._max_bars :]
+        bar_list = [by_open[t] for t in open_list]
+
+        win = self._window_for_write((symbol, tf_s))
+        try:
+            old_bars, old_bytes = len(win.bars), win.nbytes
+            win.open_ms = open_list
+            win.bars = bar_list
+            if bar_list:
+                win.bar_nbytes = _bar_nbytes(bar_list[-1])
+            d_bars, d_bytes = len(bar_list) - old_bars, win.nbytes - old_bytes
+        finally:
+            win.lock.release()
+        self._account(win, d_bars, d_bytes)
+        dt_us = (time.perf_counter() - t0) * 1e6
+        with self._lock:
+            self._lat_set.add(dt_us)
+
+    def upsert_bar(self, symbol: str, tf_s: int, bar: dict[str, Any]) -> None:
+        """Replace за open_time_ms або вставка у відсортовану позицію."""
+        open_ms = bar.get("open_time_ms")
+        if not isinstance(open_ms, int):
+            with self._lock:
+                self._upsert_dropped += 1
+            return
+        t0 = time.perf_counter()
+        win = self._window_for_write((symbol, tf_s))
+        kind = "append"
+        try:
+            keys, bars = win.open_ms, win.bars
+            old_bars, old_bytes = len(bars), win.nbytes
+            if not bars:
+                win.bar_nbytes = _bar_nbytes(bar)
+            if not keys or open_ms > keys[-1]:
+                keys.append(open_ms)
                 bars.append(bar)
-                bars.sort(key=lambda x: x.get("open_time_ms", 0))
-            if self._max_bars and len(bars) > self._max_bars:
-                self._windows[key] = bars[-self._max_bars :]
+            elif open_ms == keys[-1]:
+                bars[-1] = bar
+                kind = "replace"
             else:
-                self._windows[key] = bars
-            self._touch(key)
-            self._evict_if_needed()
+                idx = bisect.bisect_left(keys, open_ms)
+                if keys[idx] == open_ms:
+                    bars[idx] = bar
+                    kind = "replace"
+                else:
+                    keys.insert(idx, open_ms)
+                    bars.insert(idx, bar)
+                    kind = "insert"
+            excess = len(bars) - self._max_bars
+            if excess > 0:
+                del keys[:excess]
+                del bars[:excess]
+            d_bars, d_bytes = len(bars) - old_bars, win.nbytes - old_bytes
+        finally:
+            win.lock.release()
+        self._account(win, d_bars, d_bytes)
+        dt_us = (time.perf_counter() - t0) * 1e6
+        with self._lock:
+            if kind == "append":
+                self._upsert_append += 1
+            elif kind == "replace":
+                self._upsert_replace += 1
+            else:
+                self._upsert_insert += 1
+            self._lat_upsert.add(dt_us)
 
     def stats(self) -> dict[str, Any]:
         with self._lock:
@@ -77,4 +292,22 @@ class RamLayer:
                 "ram_keys": len(self._windows),
                 "ram_max_keys": self._max_keys,
                 "ram_max_bars": self._max_bars,
+                "ram_max_total_bars": self._max_total_bars,
+                "ram_max_bytes": self._max_bytes,
+                "ram_total_bars": self._total_bars,
+                "ram_bytes_est": self._total_bytes,
+                "ram_evictions": self._evictions,
+                "ram_hits": self._hits,
+                "ram_misses": self._misses,
+                "ram_upserts": {
+                    "append": self._upsert_append,
+                    "replace": self._upsert_replace,
+                    "insert": self._upsert_insert,
+                    "dropped": self._upsert_dropped,
+                },
+                "ram_latency_us": {
+                    "get_window": self._lat_get.as_dict(),
+                    "upsert_bar": self._lat_upsert.as_dict(),
+                    "set_window": self._lat_set.as_dict(),
+                },
             }
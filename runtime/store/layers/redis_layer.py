@@ -6,16 +6,26 @@ from typing import Any, Optional, Tuple
 
 from runtime.store.redis_keys import (
     preview_curr_key,
+    preview_tail_bars_key,
     preview_tail_key,
     preview_updates_list_key,
     preview_updates_seq_key,
     symbol_key,
 )
+from runtime.store.redis_pool import RedisSteps, adrive, async_twin, drive, note_round_trips
 
 
 logger = logging.getLogger(__name__)
 
 
+def _text(raw: Any) -> Any:
+    return raw.decode("utf-8") if isinstance(raw, bytes) else raw
+
+
+def _ttl_left(ttl: Any) -> int:
+    return -1 if ttl is None else int(ttl)
+
+
 class RedisLayer:
     """Redis шар: читання tail/snap для Phase A."""
 
@@ -45,28 +55,74 @@ class RedisLayer:
             return None, None, "redis_error"
 
     def _write_json(
-        self, key: str, payload: dict[str, Any], ttl_s: Optional[int]
+        self,
+        key: str,
+        payload: dict[str, Any],
+        ttl_s: Optional[int],
+        path: str = "preview.set",
     ) -> None:
         raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+        note_round_trips(path)
         if ttl_s is not None and ttl_s > 0:
             self._client.set(key, raw, ex=int(ttl_s))
         else:
             self._client.set(key, raw)
 
     def read_tail_or_snap(
-        self, symbol: str, tf_s: int
+        self, symbol: str, tf_s: int, limit: int = 0
     ) -> Tuple[Optional[dict[str, Any]], Optional[int], Optional[str], Optional[str]]:
+        """Останні limit барів tail (limit<=0 → увесь) або snap.
+
+        Один pipeline: LRANGE tail_list + TTL + GET/TTL snap. Payload tail
+        збирається у форматі попереднього whole-JSON tail (bars + метадані
+        зі snap, що пишеться тією ж транзакцією). Legacy string tail
+        читається лише якщо tail_list порожній (перехідний період до prime).
+        """
         key_symbol = symbol_key(symbol)
-        tail_key = self._key("ohlcv", "tail", key_symbol, str(tf_s))
-        payload, ttl_left, err = self._get_json(tail_key)
-        if err == "redis_miss":
-            snap_key = self._key("ohlcv", "snap", key_symbol, str(tf_s))
-            payload, ttl_left, err = self._get_json(snap_key)
-            if err is None:
-                return payload, ttl_left, "redis_snap", None
+        list_key = self._key("ohlcv", "tail_list", key_symbol, str(tf_s))
+        snap_key = self._key("ohlcv", "snap", key_symbol, str(tf_s))
+        start = -int(limit) if limit > 0 else 0
+        try:
+            pipe = self._client.pipeline(transaction=False)
+            pipe.lrange(list_key, start, -1)
+            pipe.ttl(list_key)
+            pipe.get(snap_key)
+            pipe.ttl(snap_key)
+            raw_bars, list_ttl, raw_snap, snap_ttl = pipe.execute()
+            note_round_trips("read.tail", commands=4)
+            snap = json.loads(_text(raw_snap)) if raw_snap is not None else None
+            bars = [json.loads(_text(raw)) for raw in raw_bars or ()]
+        except Exception:
+            logger.debug("REDIS_LAYER_TAIL_READ_FAILED key=%s", list_key, exc_info=True)
+            return None, None, None, "redis_error"
+
+        if bars:
+            meta = snap if isinstance(snap, dict) else {}
+            payload = {
+                "v": 1,
+                "symbol": symbol,
+                "tf_s": tf_s,
+                "bars": bars,
+                "complete": meta.get("complete", True),
+                "source": meta.get("source", ""),
+                "last_seq": meta.get("seq"),
+                "payload_ts_ms": meta.get("payload_ts_ms"),
+            }
+            return payload, _ttl_left(list_ttl), "redis_tail", None
+
+        legacy_key = self._key("ohlcv", "tail", key_symbol, str(tf_s))
+        payload, ttl_left, err = self._get_json(legacy_key)
         if err is None:
+            if isinstance(payload, dict) and limit > 0:
+                legacy_bars = payload.get("bars")
+                if isinstance(legacy_bars, list) and len(legacy_bars) > limit:
+                    payload["bars"] = legacy_bars[-limit:]
             return payload, ttl_left, "redis_tail", None
-        return None, ttl_left, None, err
+        if err != "redis_miss":
+            return None, ttl_left, None, err
+        if snap is None:
+            return None, None, None, "redis_miss"
+        return snap, _ttl_left(snap_ttl), "redis_snap", None
 
     def read_preview_curr(
         self, symbol: str, tf_s: int
@@ -75,26 +131,84 @@ class RedisLayer:
         return self._get_json(key)
 
     def read_preview_tail(
-        self, symbol: str, tf_s: int
+        self, symbol: str, tf_s: int, limit: int = 0
     ) -> Tuple[Optional[dict[str, Any]], Optional[int], Optional[str]]:
-        key = preview_tail_key(self._ns, symbol, tf_s)
-        return self._get_json(key)
+        """Останні limit барів preview tail (limit<=0 → увесь ring).
+
+        Ring — sorted set (score=open_ms, member=JSON бару); payload
+        повертається у форматі {"bars": [...]} без source (його дає curr).
+        """
+        key = preview_tail_bars_key(self._ns, symbol, tf_s)
+        start = -int(limit) if limit > 0 else 0
+        try:
+            pipe = self._client.pipeline(transaction=False)
+            pipe.zrange(key, start, -1)
+            pipe.ttl(key)
+            raws, ttl_left = pipe.execute()
+            note_round_trips("read.preview_tail", commands=2)
+            if not raws:
+                return None, None, "redis_miss"
+            bars = [json.loads(_text(raw)) for raw in raws]
+        except Exception:
+            logger.debug("REDIS_LAYER_PREVIEW_TAIL_READ_FAILED key=%s", key, exc_info=True)
+            return None, None, "redis_error"
+        payload = {"v": 1, "symbol": symbol, "tf_s": int(tf_s), "bars": bars}
+        return payload, _ttl_left(ttl_left), None
 
     def write_preview_curr(
         self, symbol: str, tf_s: int, payload: dict[str, Any], ttl_s: Optional[int]
     ) -> None:
         key = preview_curr_key(self._ns, symbol, tf_s)
-        self._write_json(key, payload, ttl_s)
+        self._write_json(key, payload, ttl_s, path="preview.curr")
 
-    def write_preview_tail(
+    def write_preview_tail_bars(
         self,
         symbol: str,
         tf_s: int,
-        payload: dict[str, Any],
+        bars: list[dict[str, Any]],
+        retain: int,
         ttl_s: Optional[int] = None,
     ) -> None:
-        key = preview_tail_key(self._ns, symbol, tf_s)
-        self._write_json(key, payload, ttl_s)
+        """Upsert барів у preview ring за open_ms + trim до retain + TTL.
+
+        Один MULTI/EXEC; на кожен бар — ZREMRANGEBYSCORE(open_ms) + ZADD,
+        тож повторний flush того ж forming бару перезаписує лише його.
+        """
+        key = preview_tail_bars_key(self._ns, symbol, tf_s)
+        pipe = self._client.pipeline(transaction=True)
+        for bar in bars:
+            open_ms = int(bar["open_ms"])
+            raw = json.dumps(bar, ensure_ascii=False, separators=(",", ":"))
+            pipe.zremrangebyscore(key, open_ms, open_ms)
+            pipe.zadd(key, {raw: open_ms})
+        pipe.zremrangebyrank(key, 0, -max(1, int(retain)) - 1)
+        if ttl_s is not None and ttl_s > 0:
+            pipe.expire(key, int(ttl_s))
+        pipe.execute()
+        note_round_trips("preview.tail", commands=2 * len(bars) + 2)
+
+    def migrate_legacy_preview_tail(
+        self,
+        symbol: str,
+        tf_s: int,
+        retain: int,
+        ttl_s: Optional[int] = None,
+    ) -> int:
+        """Переносить legacy whole-JSON preview:tail у ring (one-shot, DEL)."""
+        legacy_key = preview_tail_key(self._ns, symbol, tf_s)
+        payload, _ttl, err = self._get_json(legacy_key)
+        if err is not None or not isinstance(payload, dict):
+            return 0
+        raw_bars = payload.get("bars")
+        bars = [
+            b
+            for b in (raw_bars if isinstance(raw_bars, list) else [])
+            if isinstance(b, dict) and isinstance(b.get("open_ms"), int)
+        ][-max(1, int(retain)) :]
+        if bars:
+            self.write_preview_tail_bars(symbol, tf_s, bars, retain, ttl_s)
+        self._client.delete(legacy_key)
+        return len(bars)
 
     def publish_preview_event(
         self, symbol: str, tf_s: int, event: dict[str, Any], retain: int
@@ -105,10 +219,35 @@ class RedisLayer:
         event = dict(event)
         event["seq"] = seq
         payload = json.dumps(event, ensure_ascii=False, separators=(",", ":"))
-        self._client.rpush(list_key, payload)
-        self._client.ltrim(list_key, -max(1, int(retain)), -1)
+        pipe = self._client.pipeline(transaction=True)
+        pipe.rpush(list_key, payload)
+        pipe.ltrim(list_key, -max(1, int(retain)), -1)
+        pipe.execute()
+        note_round_trips("preview.event", commands=3, round_trips=2)
         return seq
 
+    def publish_preview_events(
+        self, symbol: str, tf_s: int, events: list[dict[str, Any]], retain: int
+    ) -> list[int]:
+        """Batch publish_preview_event: INCRBY + RPUSH/LTRIM — 2 round-trip."""
+        if not events:
+            return []
+        seq_key = preview_updates_seq_key(self._ns, symbol, tf_s)
+        list_key = preview_updates_list_key(self._ns, symbol, tf_s)
+        last = int(self._client.incrby(seq_key, len(events)))
+        seqs = list(range(last - len(events) + 1, last + 1))
+        payloads = []
+        for ev, seq in zip(events, seqs):
+            event = dict(ev)
+            event["seq"] = seq
+            payloads.append(json.dumps(event, ensure_ascii=False, separators=(",", ":")))
+        pipe = self._client.pipeline(transaction=True)
+        pipe.rpush(list_key, *payloads)
+        pipe.ltrim(list_key, -max(1, int(retain)), -1)
+        pipe.execute()
+        note_round_trips("preview.events", commands=3, round_trips=2)
+        return seqs
+
     def read_preview_updates(
         self,
         symbol: str,
@@ -117,6 +256,37 @@ class RedisLayer:
         limit: int,
         retain: int,
     ) -> tuple[list[dict[str, Any]], int, Optional[dict[str, Any]], Optional[str]]:
+        return drive(
+            self._client,
+            self._preview_updates_steps(symbol, tf_s, since_seq, limit, retain),
+        )
+
+    async def read_preview_updates_async(
+        self,
+        symbol: str,
+        tf_s: int,
+        since_seq: Optional[int],
+        limit: int,
+        retain: int,
+    ) -> Optional[
+        tuple[list[dict[str, Any]], int, Optional[dict[str, Any]], Optional[str]]
+    ]:
+        """read_preview_updates через redis.asyncio; None — async клієнта немає."""
+        aclient = async_twin(self._client)
+        if aclient is None:
+            return None
+        return await adrive(
+            aclient, self._preview_updates_steps(symbol, tf_s, since_seq, limit, retain)
+        )
+
+    def _preview_updates_steps(
+        self,
+        symbol: str,
+        tf_s: int,
+        since_seq: Optional[int],
+        limit: int,
+        retain: int,
+    ) -> RedisSteps:
         try:
             seq_key = preview_updates_seq_key(self._ns, symbol, tf_s)
             list_key = preview_updates_list_key(self._ns, symbol, tf_s)
@@ -124,7 +294,7 @@ class RedisLayer:
             # P2: since_seq is None → adopt-tail (перший poll після loadBarsFull)
             # Повертаємо events=[], cursor_seq=max_seq (fast-forward)
             if since_seq is None:
-                last_seq_raw = self._client.get(seq_key)
+                last_seq_raw = yield "get", (seq_key,), {}
                 if isinstance(last_seq_raw, bytes):
                     last_seq_raw = last_seq_raw.decode("utf-8")
                 try:
@@ -140,7 +310,7 @@ class RedisLayer:
                     cursor_seq = 0
                 return [], cursor_seq, None, None
 
-            raw_list = self._client.lrange(list_key, -max(1, int(retain)), -1)
+            raw_list = yield "lrange", (list_key, -max(1, int(retain)), -1), {}
             events: list[dict[str, Any]] = []
             min_seq: Optional[int] = None
             max_seq: Optional[int] = None
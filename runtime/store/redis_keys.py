@@ -13,6 +13,10 @@ def preview_tail_key(ns: str, symbol: str, tf_s: int) -> str:
     return f"{ns}:preview:tail:{symbol_key(symbol)}:{int(tf_s)}"
 
 
+def preview_tail_bars_key(ns: str, symbol: str, tf_s: int) -> str:
+    return f"{ns}:preview:tail_bars:{symbol_key(symbol)}:{int(tf_s)}"
+
+
 def preview_updates_seq_key(ns: str, symbol: str, tf_s: int) -> str:
     return f"{ns}:preview:updates:{symbol_key(symbol)}:{int(tf_s)}:seq"
 
@@ -0,0 +1,234 @@
+"""Спільні пули Redis-з'єднань + лічильники round-trip по шляхах запису.
+
+pooled_client(spec, ...) — redis.Redis поверх ConnectionPool, спільного
+для процесу на ключ (host, port, db, decode_responses, timeouts). Окремі
+компоненти (read layer, updates bus, snapshot writer, воркери) більше не
+тримають власних standalone з'єднань: клієнти з однаковими параметрами
+ділять один пул.
+
+note_round_trips(path, commands) — per-path лічильник мережевих round-trip
+і команд у них (pipeline = 1 round-trip на N команд); підсумок раз на 60 с
+у рядку OBS_60S label=redis (runtime/obs_60s.py).
+
+async_twin(client) — redis.asyncio клієнт з тими самими параметрами
+з'єднання, що й sync client (пул per event loop). Read-шляхи, яким він
+потрібен, пишуться один раз як генератор команд (RedisSteps): drive()
+виконує їх sync клієнтом (executor / CLI), adrive() — async клієнтом
+у event loop, без блокування і без executor.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+import threading
+import weakref
+from typing import Any, Dict, Generator, Optional, Tuple
+
+from runtime.obs_60s import Obs60s
+from runtime.store.redis_spec import RedisSpec, resolve_redis_spec
+
+try:
+    import redis as redis_lib  # type: ignore
+except Exception:
+    redis_lib = None  # type: ignore
+
+try:
+    import redis.asyncio as redis_async_lib  # type: ignore
+except Exception:
+    redis_async_lib = None  # type: ignore
+
+_PoolKey = Tuple[str, int, int, bool, Optional[float], Optional[float]]
+
+_POOLS: Dict[_PoolKey, Any] = {}
+_POOLS_LOCK = threading.Lock()
+
+_OBS = Obs60s("redis")
+_OBS_LOCK = threading.Lock()
+
+
+def note_round_trips(path: str, commands: int = 1, round_trips: int = 1) -> None:
+    """Облік мережевих round-trip шляху запису/читання (Obs60s)."""
+    with _OBS_LOCK:
+        _OBS.inc_redis_round_trips(path, round_trips, commands)
+
+
+def pooled_client(
+    spec: RedisSpec,
+    *,
+    decode_responses: bool = False,
+    socket_timeout: Optional[float] = None,
+    socket_connect_timeout: Optional[float] = None,
+    max_connections: Optional[int] = None,
+) -> Any:
+    """redis.Redis на спільному ConnectionPool (None якщо redis не встановлено)."""
+    if redis_lib is None:
+        return None
+    key: _PoolKey = (
+        spec.host,
+        int(spec.port),
+        int(spec.db),
+        bool(decode_responses),
+        socket_timeout,
+        socket_connect_timeout,
+    )
+    with _POOLS_LOCK:
+        pool = _POOLS.get(key)
+        if pool is None:
+            kwargs: Dict[str, Any] = {
+                "host": spec.host,
+                "port": int(spec.port),
+                "db": int(spec.db),
+                "decode_responses": bool(decode_responses),
+                "socket_timeout": socket_timeout,
+                "socket_connect_timeout": socket_connect_timeout,
+            }
+            if max_connections is not None:
+                kwargs["max_connections"] = int(max_connections)
+            pool = redis_lib.ConnectionPool(**kwargs)
+            _POOLS[key] = pool
+            logging.debug(
+                "REDIS_POOL_NEW host=%s port=%s db=%s decode=%s timeout=%s pools=%d",
+                spec.host,
+                spec.port,
+                spec.db,
+                int(bool(decode_responses)),
+                socket_timeout,
+                len(_POOLS),
+            )
+    return redis_lib.Redis(connection_pool=pool)
+
+
+def pooled_client_from_cfg(
+    cfg: Dict[str, Any],
+    *,
+    role: str,
+    log: bool = False,
+    **kwargs: Any,
+) -> Tuple[Any, Optional[RedisSpec]]:
+    """resolve_redis_spec + pooled_client; (None, None) якщо Redis вимкнено."""
+    if redis_lib is None:
+        return None, None
+    spec = resolve_redis_spec(cfg, role=role, log=log)
+    if spec is None:
+        return None, None
+    return pooled_client(spec, **kwargs), spec
+
+
+def pool_stats() -> Dict[str, Any]:
+    """Кількість пулів і з'єднань у них (для status / діагностики)."""
+    with _POOLS_LOCK:
+        pools = list(_POOLS.values())
+    in_use = 0
+    available = 0
+    for pool in pools:
+        in_use += len(getattr(pool, "_in_use_connections", ()) or ())
+        available += len(getattr(pool, "_available_connections", ()) or ())
+    return {"pools": len(pools), "in_use": in_use, "available": available}
+
+
+# ── Async read-side (redis.asyncio) ─────────────────────────
+
+# Генератор yield-ить (command, args, kwargs), отримує reply (або виняток
+# через throw) і повертає результат — Redis I/O відокремлено від логіки.
+RedisSteps = Generator[Tuple[str, Tuple[Any, ...], Dict[str, Any]], Any, Any]
+
+# Параметри з'єднання sync пулу, що переносяться в async пул (retry/
+# credential_provider sync-типів — ні).
+_ASYNC_CONN_KWARGS = (
+    "host",
+    "port",
+    "path",
+    "db",
+    "username",
+    "password",
+    "socket_timeout",
+    "socket_connect_timeout",
+    "decode_responses",
+    "encoding",
+    "encoding_errors",
+    "client_name",
+)
+
+# event loop → (параметри з'єднання → async ConnectionPool); пул прив'язаний
+# до loop, тож інший loop (тести, restart) отримує свій.
+_ASYNC_POOLS: "weakref.WeakKeyDictionary[Any, Dict[Tuple[Any, ...], Any]]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def async_twin(client: Any) -> Any:
+    """redis.asyncio.Redis з параметрами з'єднання sync client-а або None.
+
+    None: redis.asyncio недоступний, client без connection_pool (fake /
+    None) або виклик поза event loop — caller лишається на sync шляху.
+    """
+    if redis_async_lib is None or client is None:
+        return None
+    kwargs = getattr(getattr(client, "connection_pool", None), "connection_kwargs", None)
+    if not isinstance(kwargs, dict):
+        return None
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        logging.debug("REDIS_ASYNC_TWIN_SKIP reason=no_running_loop")
+        return None
+    conn = {k: kwargs[k] for k in _ASYNC_CONN_KWARGS if k in kwargs}
+    key = tuple(sorted((k, repr(v)) for k, v in conn.items()))
+    with _POOLS_LOCK:
+        pools = _ASYNC_POOLS.setdefault(loop, {})
+        pool = pools.get(key)
+        if pool is None:
+            path = conn.pop("path", None)
+            if path:
+                pool = redis_async_lib.ConnectionPool(
+                    connection_class=redis_async_lib.UnixDomainSocketConnection,
+                    path=path,
+                    **conn,
+                )
+            else:
+                pool = redis_async_lib.ConnectionPool(**conn)
+            pools[key] = pool
+            logging.debug(
+                "REDIS_ASYNC_POOL_NEW host=%s port=%s db=%s loops=%d",
+                conn.get("host", path),
+                conn.get("port"),
+                conn.get("db"),
+                len(_ASYNC_POOLS),
+            )
+    return redis_async_lib.Redis(connection_pool=pool)
+
+
+def drive(client: Any, steps: RedisSteps) -> Any:
+    """Виконує RedisSteps sync клієнтом; винятки Redis — назад у генератор."""
+    try:
+        cmd = next(steps)
+        while True:
+            name, args, kwargs = cmd
+            try:
+                reply = getattr(client, name)(*args, **kwargs)
+            except Exception as exc:  # bare_except: allow  # виняток → назад у RedisSteps
+                cmd = steps.throw(exc)
+            else:
+                cmd = steps.send(reply)
+    except StopIteration as stop:  # bare_except: allow  # генератор завершився → результат
+        return stop.value
+
+
+async def adrive(client: Any, steps: RedisSteps) -> Any:
+    """Як drive(), але await-ить reply (redis.asyncio); sync reply теж приймає."""
+    try:
+        cmd = next(steps)
+        while True:
+            name, args, kwargs = cmd
+            try:
+                reply = getattr(client, name)(*args, **kwargs)
+                if inspect.isawaitable(reply):
+                    reply = await reply
+            except Exception as exc:  # bare_except: allow  # виняток → назад у RedisSteps
+                cmd = steps.throw(exc)
+            else:
+                cmd = steps.send(reply)
+    except StopIteration as stop:  # bare_except: allow  # генератор завершився → результат
+        return stop.value
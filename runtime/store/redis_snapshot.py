@@ -1,13 +1,22 @@
+"""RedisSnapshotWriter: snap/tail кеш OHLCV для cold-load UI.
+
+Tail — Redis list per-bar JSON записів (`ohlcv:tail_list:{sym}:{tf_s}`):
+commit = RPUSH + LTRIM(-N) + EXPIRE в одній транзакції з snap/status,
+без перезапису всього вікна; читач бере лише LRANGE останніх N.
+Метадані tail (complete/source/last_seq/payload_ts_ms) — у snap-ключі,
+який пишеться тією ж транзакцією.
+"""
+
 from __future__ import annotations
 
 import json
 import logging
 import time
-from collections import deque
-from typing import Any, Deque, Dict, Optional, Tuple, cast
+from typing import Any, Dict, List, Optional, Tuple
 
 from core.model.bars import CandleBar
 from runtime.store.redis_keys import symbol_key
+from runtime.store.redis_pool import note_round_trips, pooled_client
 from runtime.store.redis_spec import resolve_redis_spec
 
 try:
@@ -16,6 +25,23 @@ except Exception:
     redis_lib = None  # type: ignore
 
 
+def _dumps(payload: Dict[str, Any]) -> str:
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+
+
+class _TailAppend:
+    """Відкладений запис у tail list одного ключа (RPUSH/LTRIM/EXPIRE)."""
+
+    __slots__ = ("raws", "maxlen", "ttl_s", "reset")
+
+    def __init__(self, maxlen: int, ttl_s: Optional[int], reset: bool = False) -> None:
+        self.raws: List[str] = []
+        self.maxlen = maxlen
+        self.ttl_s = ttl_s
+        # reset → DEL перед RPUSH (prime замінює вікно повністю)
+        self.reset = reset
+
+
 class RedisSnapshotWriter:
     def __init__(
         self,
@@ -31,7 +57,6 @@ class RedisSnapshotWriter:
         self._tail_n_by_tf_s = tail_n_by_tf_s
         self._boot_id = boot_id
         self._seq = 0
-        self._tails: Dict[Tuple[str, int], Deque[Dict[str, Any]]] = {}
         self._last_final_close_ms: Optional[int] = None
         self._redis_ok = True
         self._last_err_ts = 0.0
@@ -93,9 +118,14 @@ class RedisSnapshotWriter:
         self._last_err_msg = message
 
     def _write_json(
-        self, key: str, payload: Dict[str, Any], ttl_s: Optional[int]
+        self,
+        key: str,
+        payload: Dict[str, Any],
+        ttl_s: Optional[int],
+        path: str = "snap.set",
     ) -> None:
         raw = json.dumps(payload, ensure_ascii=False, separators=(",", ":"))
+        note_round_trips(path)
         try:
             if ttl_s is not None:
                 self._client.set(key, raw, ex=ttl_s)
@@ -113,6 +143,58 @@ class RedisSnapshotWriter:
             self._redis_ok = False
             self._log_error_throttled(f"REDIS_SNAP_WRITE_FAILED key={key} err={exc}")
 
+    def _write_json_many(
+        self,
+        writes: Dict[str, Tuple[Dict[str, Any], Optional[int]]],
+        path: str,
+        tails: Optional[Dict[str, _TailAppend]] = None,
+        deletes: Tuple[str, ...] = (),
+    ) -> None:
+        """SET-и + tail appends однією MULTI/EXEC транзакцією (1 round-trip)."""
+        tails = tails or {}
+        try:
+            pipe = self._client.pipeline(transaction=True)
+            cmds = 0
+            total = 0
+            for key in deletes:
+                pipe.delete(key)
+                cmds += 1
+            for key, (payload, ttl_s) in writes.items():
+                raw = _dumps(payload)
+                total += len(raw)
+                if ttl_s is not None:
+                    pipe.set(key, raw, ex=ttl_s)
+                else:
+                    pipe.set(key, raw)
+                cmds += 1
+            for key, op in tails.items():
+                if op.reset:
+                    pipe.delete(key)
+                    cmds += 1
+                if op.raws:
+                    total += sum(len(raw) for raw in op.raws)
+                    pipe.rpush(key, *op.raws)
+                    pipe.ltrim(key, -op.maxlen, -1)
+                    cmds += 2
+                if op.ttl_s is not None:
+                    pipe.expire(key, op.ttl_s)
+                    cmds += 1
+            note_round_trips(path, cmds)
+            pipe.execute()
+            self._redis_ok = True
+            if logging.getLogger().isEnabledFor(logging.DEBUG):
+                logging.debug(
+                    "REDIS_SNAP_WRITE_MANY_OK keys=%s tails=%s bytes=%s",
+                    len(writes),
+                    len(tails),
+                    total,
+                )
+        except Exception as exc:
+            self._redis_ok = False
+            self._log_error_throttled(
+                f"REDIS_SNAP_WRITE_FAILED keys={len(writes)} err={exc}"
+            )
+
     def _bar_to_cache_bar(self, bar: CandleBar) -> Optional[Dict[str, Any]]:
         """Convert CandleBar (end-excl) → Redis cache dict (end-incl).
 
@@ -212,26 +294,18 @@ class RedisSnapshotWriter:
             "payload_ts_ms": payload_ts_ms,
         }
         key = self._key("ohlcv", "snap", key_symbol, str(tf_s))
-        self._write_json(key, snap, self._ttl(tf_s))
+        writes: Dict[str, Tuple[Dict[str, Any], Optional[int]]] = {
+            key: (snap, self._ttl(tf_s))
+        }
 
+        tails: Dict[str, _TailAppend] = {}
         n = int(self._tail_n_by_tf_s.get(tf_s, 0))
         if n > 0:
             if len(tail) > n:
                 tail = tail[-n:]
-            k = (key_symbol, tf_s)
-            self._tails[k] = deque(tail, maxlen=n)
-            tail_payload = {
-                "v": 1,
-                "symbol": symbol,
-                "tf_s": tf_s,
-                "bars": list(self._tails[k]),
-                "complete": bool(last_complete),
-                "source": last_src,
-                "last_seq": seq,
-                "payload_ts_ms": payload_ts_ms,
-            }
-            tail_key = self._key("ohlcv", "tail", key_symbol, str(tf_s))
-            self._write_json(tail_key, tail_payload, self._ttl(tf_s))
+            op = _TailAppend(n, self._ttl(tf_s), reset=True)
+            op.raws = [_dumps(b) for b in tail]
+            tails[self._key("ohlcv", "tail_list", key_symbol, str(tf_s))] = op
 
         logging.debug(
             "REDIS_SNAP_PRIME ok symbol=%s tf_s=%s count=%s key=%s",
@@ -247,7 +321,11 @@ class RedisSnapshotWriter:
                 or last_close_ms_excl > self._last_final_close_ms
             ):
                 self._last_final_close_ms = last_close_ms_excl
-        self._write_status(payload_ts_ms)
+        # legacy whole-JSON tail (до tail_list) — прибираємо при prime
+        legacy = self._key("ohlcv", "tail", key_symbol, str(tf_s))
+        self._write_with_status(
+            writes, payload_ts_ms, "snap.prime", tails, deletes=(legacy,)
+        )
         return len(tail)
 
     def set_prime_ready(
@@ -260,14 +338,12 @@ class RedisSnapshotWriter:
         if component:
             parts.append(component)
         key = self._key(*parts)
-        self._write_json(key, payload, ttl_s)
-
-    def put_bar(self, bar: CandleBar) -> None:
-        """Write single bar snapshot to Redis.
+        self._write_json(key, payload, ttl_s, path="snap.prime_ready")
 
-        Convention: Redis close_ms = end-incl (open + tf*1000 - 1).
-        """
-        payload_ts_ms = int(time.time() * 1000)
+    def _snap_for_bar(
+        self, bar: CandleBar, payload_ts_ms: int
+    ) -> Optional[Dict[str, Any]]:
+        """Snapshot payload одного бару (None → бар невалідний, WARNING)."""
         open_ms = bar.open_time_ms
         close_ms_excl = bar.close_time_ms
         tf_ms = int(bar.tf_s) * 1000
@@ -279,7 +355,7 @@ class RedisSnapshotWriter:
                 open_ms,
                 close_ms_excl,
             )
-            return
+            return None
         if bar.complete and close_ms_excl != open_ms + tf_ms:
             logging.warning(
                 "REDIS_SNAP_SKIP_INVALID_BAR symbol=%s tf_s=%s open_ms=%s close_ms=%s reason=close_mismatch",
@@ -288,11 +364,9 @@ class RedisSnapshotWriter:
                 open_ms,
                 close_ms_excl,
             )
-            return
+            return None
         close_ms_incl = close_ms_excl - 1
-        seq = self._next_seq()
-        key_symbol = symbol_key(bar.symbol)
-        snap = {
+        return {
             "v": 1,
             "symbol": bar.symbol,
             "tf_s": bar.tf_s,
@@ -308,31 +382,38 @@ class RedisSnapshotWriter:
             "complete": bool(bar.complete),
             "source": str(bar.src),
             "event_ts_ms": close_ms_incl if bar.complete else None,
-            "seq": seq,
+            "seq": self._next_seq(),
             "payload_ts_ms": payload_ts_ms,
         }
+
+    def _apply_bar(
+        self,
+        bar: CandleBar,
+        payload_ts_ms: int,
+        writes: Dict[str, Tuple[Dict[str, Any], Optional[int]]],
+        tails: Dict[str, _TailAppend],
+    ) -> None:
+        """Кладе snap у writes, бар — у tail appends; оновлює last_final.
+
+        writes — key → (payload, ttl); пізніший бар того ж ключа
+        перезаписує ранній (у Redis потрапляє лише фінальний стан).
+        tails — key → накопичені RPUSH записи (порядок барів зберігається).
+        """
+        snap = self._snap_for_bar(bar, payload_ts_ms)
+        if snap is None:
+            return
+        key_symbol = symbol_key(bar.symbol)
+        ttl = self._ttl(bar.tf_s)
         key = self._key("ohlcv", "snap", key_symbol, str(bar.tf_s))
-        self._write_json(key, snap, self._ttl(bar.tf_s))
+        writes[key] = (snap, ttl)
 
         n = int(self._tail_n_by_tf_s.get(bar.tf_s, 0))
         if n > 0:
-            k = (key_symbol, bar.tf_s)
-            if k not in self._tails:
-                self._tails[k] = deque(maxlen=n)
-            tail_bar = cast(Dict[str, Any], snap["bar"])
-            self._tails[k].append(tail_bar)
-            tail = {
-                "v": 1,
-                "symbol": bar.symbol,
-                "tf_s": bar.tf_s,
-                "bars": list(self._tails[k]),
-                "complete": bool(bar.complete),
-                "source": str(bar.src),
-                "last_seq": seq,
-                "payload_ts_ms": payload_ts_ms,
-            }
-            tail_key = self._key("ohlcv", "tail", key_symbol, str(bar.tf_s))
-            self._write_json(tail_key, tail, self._ttl(bar.tf_s))
+            tail_key = self._key("ohlcv", "tail_list", key_symbol, str(bar.tf_s))
+            op = tails.get(tail_key)
+            if op is None:
+                op = tails[tail_key] = _TailAppend(n, ttl)
+            op.raws.append(_dumps(snap["bar"]))
 
         if bar.complete:
             if (
@@ -340,10 +421,54 @@ class RedisSnapshotWriter:
                 or bar.close_time_ms > self._last_final_close_ms
             ):
                 self._last_final_close_ms = bar.close_time_ms
-        self._write_status(payload_ts_ms)
+
+    def put_bar(self, bar: CandleBar) -> None:
+        """Write single bar snapshot to Redis.
+
+        Convention: Redis close_ms = end-incl (open + tf*1000 - 1).
+        snap + tail + status — одна MULTI/EXEC транзакція (1 round-trip).
+        """
+        self._put_bars([bar], "snap.put_bar")
+
+    def put_bars(self, bars: list[CandleBar]) -> None:
+        """Batch put_bar: snap кожного ключа + status — один раз.
+
+        Усі команди йдуть однією транзакцією (один round-trip); tail
+        отримує один RPUSH усіх барів ключа + LTRIM, seq рахується по
+        кожному бару — фінальний стан ключів ідентичний послідовним put_bar.
+        """
+        self._put_bars(bars, "snap.put_bars")
+
+    def _put_bars(self, bars: list[CandleBar], path: str) -> None:
+        payload_ts_ms = int(time.time() * 1000)
+        writes: Dict[str, Tuple[Dict[str, Any], Optional[int]]] = {}
+        tails: Dict[str, _TailAppend] = {}
+        for bar in bars:
+            self._apply_bar(bar, payload_ts_ms, writes, tails)
+        if not writes:
+            return
+        self._write_with_status(writes, payload_ts_ms, path, tails)
+
+    def _write_with_status(
+        self,
+        writes: Dict[str, Tuple[Dict[str, Any], Optional[int]]],
+        now_ms: int,
+        path: str,
+        tails: Optional[Dict[str, _TailAppend]] = None,
+        deletes: Tuple[str, ...] = (),
+    ) -> None:
+        status = self._status_payload(now_ms)
+        # status потрапляє в Redis лише разом з успішною транзакцією
+        status["redis"] = {"ok": True}
+        writes[self._key("status", "snapshot")] = (status, None)
+        self._write_json_many(writes, path, tails, deletes)
 
     def _write_status(self, now_ms: int) -> None:
-        status = {
+        key = self._key("status", "snapshot")
+        self._write_json(key, self._status_payload(now_ms), None, path="snap.status")
+
+    def _status_payload(self, now_ms: int) -> Dict[str, Any]:
+        return {
             "v": 1,
             "boot_id": self._boot_id,
             "now_ms": now_ms,
@@ -361,8 +486,6 @@ class RedisSnapshotWriter:
             "warnings": [],
             "last_error": None,
         }
-        key = self._key("status", "snapshot")
-        self._write_json(key, status, None)
 
 
 _WRITER_CACHE: Dict[str, RedisSnapshotWriter] = {}
@@ -428,12 +551,7 @@ def build_redis_snapshot_writer(config_path: str) -> Optional[RedisSnapshotWrite
         spec.db,
         spec.namespace,
     )
-    client = redis_lib.Redis(
-        host=spec.host,
-        port=spec.port,
-        db=spec.db,
-        decode_responses=True,
-    )
+    client = pooled_client(spec, decode_responses=True)
     try:
         ok = bool(client.ping())
         logging.info(
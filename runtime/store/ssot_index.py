@@ -0,0 +1,340 @@
+"""Sparse open_ms індекс для part-YYYYMMDD.jsonl (sidecar part-YYYYMMDD.idx).
+
+Індекс ділить JSONL на послідовні блоки по `INDEX_STRIDE_LINES` рядків і для
+кожного завершеного блоку зберігає (start_offset, end_offset, min_open_ms,
+max_open_ms). Рядки після останнього блоку — «хвіст» (< stride рядків), його
+читач сканує лінійно. Завдяки min/max per-block індекс коректний і для
+невпорядкованих файлів: читач лише пропускає блоки, всі рядки яких і так були б
+відфільтровані по (since, to].
+
+Layout (little-endian):
+  [0:8)   magic b"V3IDX001"
+  [8:12)  stride uint32
+  [12:16) reserved
+  records <qqqq> × N: start, end, min_open_ms, max_open_ms
+
+Інваріанти (перевіряються при load, інакше індекс вважається відсутнім):
+  - блоки суміжні: start_0 == 0, start_i == end_{i-1};
+  - end_last <= розмір JSONL.
+Блок без валідних рядків має min=INT64_MAX, max=INT64_MIN (завжди пропускається).
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import struct
+from dataclasses import dataclass, field
+from typing import Optional
+
+logger = logging.getLogger("ssot_index")
+
+INDEX_MAGIC = b"V3IDX001"
+INDEX_SUFFIX = ".idx"
+INDEX_STRIDE_LINES = 64
+_HEADER = struct.Struct("<8sII")
+_RECORD = struct.Struct("<qqqq")
+_EMPTY_MIN = (1 << 63) - 1
+_EMPTY_MAX = -(1 << 63)
+
+
+def index_path_for(jsonl_path: str) -> str:
+    """part-YYYYMMDD.jsonl → part-YYYYMMDD.idx (той самий каталог)."""
+    if jsonl_path.endswith(".jsonl"):
+        return jsonl_path[: -len(".jsonl")] + INDEX_SUFFIX
+    return jsonl_path + INDEX_SUFFIX
+
+
+def _line_open_ms(raw: bytes) -> Optional[int]:
+    raw = raw.strip()
+    if not raw:
+        return None
+    try:
+        obj = json.loads(raw.decode("utf-8"))
+    except Exception:
+        logger.debug("SSOT_INDEX_JSON_DECODE_FAIL raw=%r", raw[:80])
+        return None
+    if not isinstance(obj, dict):
+        return None
+    open_ms = obj.get("open_time_ms")
+    return open_ms if isinstance(open_ms, int) else None
+
+
+@dataclass
+class BlockAccumulator:
+    """Незавершений блок: накопичується writer-ом або при скануванні хвоста."""
+
+    start: int
+    end: int
+    lines: int = 0
+    min_open_ms: int = _EMPTY_MIN
+    max_open_ms: int = _EMPTY_MAX
+
+    def add(self, nbytes: int, open_ms: Optional[int]) -> None:
+        self.end += nbytes
+        self.lines += 1
+        if open_ms is not None:
+            if open_ms < self.min_open_ms:
+                self.min_open_ms = open_ms
+            if open_ms > self.max_open_ms:
+                self.max_open_ms = open_ms
+
+    def record(self) -> tuple[int, int, int, int]:
+        return (self.start, self.end, self.min_open_ms, self.max_open_ms)
+
+
+@dataclass
+class PartIndex:
+    """Завантажений індекс + просканований хвіст part-файлу."""
+
+    stride: int
+    blocks: list[tuple[int, int, int, int]]
+    tail: BlockAccumulator
+    size: int
+    idx_size: int = 0
+    _bounds: Optional[tuple[int, int]] = field(default=None, repr=False)
+
+    def bounds(self) -> Optional[tuple[int, int]]:
+        """(first/min open_ms, last/max open_ms) усього файлу або None якщо порожній."""
+        if self._bounds is None:
+            lo = min([b[2] for b in self.blocks] + [self.tail.min_open_ms])
+            hi = max([b[3] for b in self.blocks] + [self.tail.max_open_ms])
+            self._bounds = (lo, hi)
+        lo, hi = self._bounds
+        if lo > hi:
+            return None
+        return lo, hi
+
+    def overlaps(self, since_open_ms: Optional[int], to_open_ms: Optional[int]) -> bool:
+        b = self.bounds()
+        if b is None:
+            return False
+        return _range_overlaps(b[0], b[1], since_open_ms, to_open_ms)
+
+    def select(
+        self, since_open_ms: Optional[int], to_open_ms: Optional[int]
+    ) -> list[tuple[int, Optional[int]]]:
+        """Байтові діапазони (start, end|None=EOF), що можуть містити (since, to].
+
+        Хвіст після останнього блоку читається завжди (до EOF, < stride рядків):
+        так результат еквівалентний повному скану навіть якщо writer щойно дописав.
+        """
+        out: list[tuple[int, Optional[int]]] = [
+            (b[0], b[1])
+            for b in self.blocks
+            if _range_overlaps(b[2], b[3], since_open_ms, to_open_ms)
+        ]
+        out.append((self.tail.start, None))
+        return out
+
+
+def _range_overlaps(
+    lo: int, hi: int, since_open_ms: Optional[int], to_open_ms: Optional[int]
+) -> bool:
+    if lo > hi:
+        return False
+    if since_open_ms is not None and hi <= since_open_ms:
+        return False
+    if to_open_ms is not None and lo > to_open_ms:
+        return False
+    return True
+
+
+def scan_lines(path: str, start: int, end: Optional[int] = None) -> BlockAccumulator:
+    """Сканує рядки з offset `start` до `end`/EOF у новий акумулятор."""
+    acc = BlockAccumulator(start=start, end=start)
+    with open(path, "rb") as f:
+        f.seek(start)
+        for raw in f:
+            if end is not None and acc.end + len(raw) > end:
+                break
+            if not raw.endswith(b"\n"):
+                # напівзаписаний рядок writer-а — не індексуємо
+                break
+            acc.add(len(raw), _line_open_ms(raw))
+    return acc
+
+
+def read_index_records(
+    idx_path: str, jsonl_size: int
+) -> Optional[tuple[int, list[tuple[int, int, int, int]], int]]:
+    """(stride, blocks, idx_size) або None якщо індекс відсутній/невалідний.
+
+    Невалідний / нечитабельний .idx логуються (SSOT_INDEX_LOAD_FAILED) —
+    caller перебудовує індекс повним скануванням.
+    """
+    try:
+        with open(idx_path, "rb") as f:
+            data = f.read()
+    except FileNotFoundError:  # bare_except: allow  # індексу ще немає → build
+        return None
+    except OSError as exc:
+        logger.warning("SSOT_INDEX_LOAD_FAILED path=%s err=%s", idx_path, exc)
+        return None
+    if len(data) < _HEADER.size:
+        return _load_failed(idx_path, "short_header")
+    magic, stride, _reserved = _HEADER.unpack_from(data, 0)
+    if magic != INDEX_MAGIC or stride <= 0:
+        return _load_failed(idx_path, "bad_header")
+    body = data[_HEADER.size :]
+    # Обрізаний останній запис (crash посеред write) — ігноруємо його.
+    n = len(body) // _RECORD.size
+    blocks = [r for r in _RECORD.iter_unpack(body[: n * _RECORD.size])]
+    prev_end = 0
+    for start, end, _lo, _hi in blocks:
+        if start != prev_end or end <= start:
+            return _load_failed(idx_path, "non_contiguous")
+        prev_end = end
+    if prev_end > jsonl_size:
+        return _load_failed(idx_path, "beyond_jsonl")
+    return stride, blocks, len(data)
+
+
+def _load_failed(idx_path: str, reason: str) -> None:
+    logger.warning("SSOT_INDEX_LOAD_FAILED path=%s reason=%s", idx_path, reason)
+    return None
+
+
+def load_part_index(jsonl_path: str) -> Optional[PartIndex]:
+    """Завантажує валідний індекс і сканує хвіст; None якщо індексу немає."""
+    try:
+        size = os.path.getsize(jsonl_path)
+    except OSError:  # bare_except: allow  # part-файлу немає
+        return None
+    parsed = read_index_records(index_path_for(jsonl_path), size)
+    if parsed is None:
+        return None
+    stride, blocks, idx_size = parsed
+    start = blocks[-1][1] if blocks else 0
+    tail = scan_lines(jsonl_path, start, size)
+    return PartIndex(
+        stride=stride, blocks=blocks, tail=tail, size=size, idx_size=idx_size
+    )
+
+
+def _write_index_file(
+    idx_path: str, stride: int, blocks: list[tuple[int, int, int, int]]
+) -> None:
+    tmp_path = idx_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_HEADER.pack(INDEX_MAGIC, stride, 0))
+        for rec in blocks:
+            f.write(_RECORD.pack(*rec))
+    os.replace(tmp_path, idx_path)
+
+
+def build_part_index(
+    jsonl_path: str, stride: int = INDEX_STRIDE_LINES, *, persist: bool = True
+) -> Optional[PartIndex]:
+    """Повна (лінива) перебудова індексу з JSONL; persist → atomic write."""
+    try:
+        size = os.path.getsize(jsonl_path)
+    except OSError:  # bare_except: allow  # part-файлу немає
+        return None
+    blocks: list[tuple[int, int, int, int]] = []
+    acc = BlockAccumulator(start=0, end=0)
+    with open(jsonl_path, "rb") as f:
+        for raw in f:
+            if acc.end + len(raw) > size or not raw.endswith(b"\n"):
+                break
+            acc.add(len(raw), _line_open_ms(raw))
+            if acc.lines >= stride:
+                blocks.append(acc.record())
+                acc = BlockAccumulator(start=acc.end, end=acc.end)
+    if persist and blocks:
+        try:
+            _write_index_file(index_path_for(jsonl_path), stride, blocks)
+        except OSError as exc:
+            logger.warning("SSOT_INDEX_WRITE_FAIL path=%s err=%s", jsonl_path, exc)
+    return PartIndex(stride=stride, blocks=blocks, tail=acc, size=size)
+
+
+class PartIndexWriter:
+    """Підтримка індексу під час JsonlAppender.append (state per part-файл).
+
+    Запис у .idx — лише при завершенні блоку (раз на stride рядків), файл
+    відкривається на кожен запис: процес-читач може атомарно замінити .idx
+    лінивою перебудовою, і writer не має писати у «осиротілий» inode.
+    """
+
+    def __init__(self, stride: int = INDEX_STRIDE_LINES) -> None:
+        self._stride = max(1, int(stride))
+        self._blocks: dict[str, BlockAccumulator] = {}
+
+    def open_part(self, jsonl_path: str) -> None:
+        """Ініціалізує state для part-файлу (перебудова індексу якщо відсутній)."""
+        self._blocks[jsonl_path] = self._resync(jsonl_path)
+
+    def forget(self, jsonl_path: str) -> None:
+        self._blocks.pop(jsonl_path, None)
+
+    def _resync(self, jsonl_path: str) -> BlockAccumulator:
+        try:
+            size = os.path.getsize(jsonl_path)
+        except OSError:  # bare_except: allow  # новий part, ще не створений
+            size = 0
+        if size == 0:
+            return BlockAccumulator(start=0, end=0)
+        idx = load_part_index(jsonl_path)
+        if idx is None:
+            idx = build_part_index(jsonl_path, self._stride)
+        if idx is None:
+            return BlockAccumulator(start=0, end=0)
+        return idx.tail
+
+    def on_line(
+        self, jsonl_path: str, end_offset: int, nbytes: int, open_ms: int
+    ) -> None:
+        """Враховує щойно записаний рядок [end_offset - nbytes, end_offset)."""
+        acc = self._blocks.get(jsonl_path)
+        if acc is None or acc.end != end_offset - nbytes:
+            # Хтось ще дописав у файл (інший процес/tool) — перечитати стан;
+            # resync сканує хвіст з диску, тож наш рядок уже врахований.
+            acc = self._resync(jsonl_path)
+            if acc.end != end_offset:
+                logger.debug(
+                    "SSOT_INDEX_DESYNC path=%s acc_end=%s end=%s",
+                    jsonl_path,
+                    acc.end,
+                    end_offset,
+                )
+        else:
+            acc.add(nbytes, open_ms)
+        if acc.lines >= self._stride:
+            acc = self._flush_block(jsonl_path, acc)
+        self._blocks[jsonl_path] = acc
+
+    def _flush_block(
+        self, jsonl_path: str, acc: BlockAccumulator
+    ) -> BlockAccumulator:
+        """Дописує запис завершеного блоку; повертає state наступного блоку."""
+        idx_path = index_path_for(jsonl_path)
+        try:
+            with open(idx_path, "a+b") as f:
+                f.seek(0, os.SEEK_END)
+                idx_size = f.tell()
+                body = idx_size - _HEADER.size
+                if idx_size == 0:
+                    f.write(_HEADER.pack(INDEX_MAGIC, self._stride, 0))
+                    expected_start = 0
+                elif body < 0 or body % _RECORD.size:
+                    expected_start = -1
+                elif body == 0:
+                    expected_start = 0
+                else:
+                    f.seek(idx_size - _RECORD.size)
+                    expected_start = _RECORD.unpack(f.read(_RECORD.size))[1]
+                if expected_start == acc.start:
+                    f.seek(0, os.SEEK_END)
+                    f.write(_RECORD.pack(*acc.record()))
+                    return BlockAccumulator(start=acc.end, end=acc.end)
+        except OSError as exc:
+            logger.warning("SSOT_INDEX_APPEND_FAIL path=%s err=%s", idx_path, exc)
+            return BlockAccumulator(start=acc.end, end=acc.end)
+        # .idx розійшовся з writer-ом (лінива перебудова читачем, ручна правка) —
+        # перебудувати з JSONL і продовжити з його хвоста.
+        rebuilt = build_part_index(jsonl_path, self._stride)
+        if rebuilt is None:
+            return BlockAccumulator(start=acc.end, end=acc.end)
+        return rebuilt.tail
@@ -7,6 +7,7 @@ import os
 from typing import Any, Dict, List, Optional, Tuple
 
 from core.model.bars import CandleBar, FINAL_SOURCES, assert_invariants, ms_to_utc_dt
+from runtime.store.ssot_index import PartIndexWriter
 
 
 def _d1_anchor_offsets(
@@ -77,7 +78,11 @@ def select_anchor_offset_for_open_ms(
 
 
 class JsonlAppender:
-    """Append-only JSONL writer із ротацією по даті open_time_utc (YYYYMMDD)."""
+    """Append-only JSONL writer із ротацією по даті open_time_utc (YYYYMMDD).
+
+    Паралельно підтримує sparse open_ms індекс (part-YYYYMMDD.idx, див.
+    runtime/store/ssot_index.py), який DiskLayer використовує для range reads.
+    """
 
     _MAX_OPEN_FILES = 64  # LRU-ліміт відкритих FD (запобігає витоку)
 
@@ -90,6 +95,7 @@ class JsonlAppender:
         day_anchor_offset_s_alt: Optional[int] = None,
         day_anchor_offset_s_alt2: Optional[int] = None,
         fsync: bool = False,
+        sparse_index: bool = True,
     ) -> None:
         self._root = root
         self._open_files: Dict[str, Any] = {}
@@ -103,6 +109,9 @@ class JsonlAppender:
         self._drop_preview_total = 0
         self._drop_log_last_ts = 0.0
         self._drop_log_suppressed = 0
+        self._index: Optional[PartIndexWriter] = (
+            PartIndexWriter() if sparse_index else None
+        )
 
     def drop_preview_total(self) -> int:
         return int(self._drop_preview_total)
@@ -123,27 +132,27 @@ class JsonlAppender:
         os.makedirs(out_dir, exist_ok=True)
         return os.path.join(out_dir, f"part-{day}.jsonl")
 
-    def append(self, bar: CandleBar) -> None:
-        if not bar.complete or bar.src not in FINAL_SOURCES:
-            self._drop_preview_total += 1
-            self._drop_log_suppressed += 1
-            import time as _time
-
-            now = _time.monotonic()
-            if now - self._drop_log_last_ts >= 30.0:
-                logging.error(
-                    "SSOT_DROP_NON_FINAL symbol=%s tf_s=%s open_ms=%s complete=%s src=%s drop_total=%s suppressed=%s",
-                    bar.symbol,
-                    bar.tf_s,
-                    bar.open_time_ms,
-                    bar.complete,
-                    bar.src,
-                    self._drop_preview_total,
-                    self._drop_log_suppressed,
-                )
-                self._drop_log_last_ts = now
-                self._drop_log_suppressed = 0
-            return
+    def _note_drop_non_final(self, bar: CandleBar) -> None:
+        self._drop_preview_total += 1
+        self._drop_log_suppressed += 1
+        import time as _time
+
+        now = _time.monotonic()
+        if now - self._drop_log_last_ts >= 30.0:
+            logging.error(
+                "SSOT_DROP_NON_FINAL symbol=%s tf_s=%s open_ms=%s complete=%s src=%s drop_total=%s suppressed=%s",
+                bar.symbol,
+                bar.tf_s,
+                bar.open_time_ms,
+                bar.complete,
+                bar.src,
+                self._drop_preview_total,
+                self._drop_log_suppressed,
+            )
+            self._drop_log_last_ts = now
+            self._drop_log_suppressed = 0
+
+    def _check_bar(self, bar: CandleBar) -> None:
         anchor_offset_s = select_anchor_offset_for_open_ms(
             bar.tf_s,
             bar.open_time_ms,
@@ -154,13 +163,16 @@ class JsonlAppender:
             self._day_anchor_offset_s_d1_alt,
         )
         assert_invariants(bar, anchor_offset_s=anchor_offset_s)
-        path = self._path_for(bar.symbol, bar.tf_s, bar.open_time_ms)
+
+    def _handle_for(self, path: str) -> Any:
         fh = self._open_files.get(path)
         if fh is None:
             # LRU eviction: закрити найстаріший FD якщо ліміт досягнуто
             if len(self._open_files) >= self._MAX_OPEN_FILES:
                 evict_path = self._open_files_order.pop(0)
                 evict_fh = self._open_files.pop(evict_path, None)
+                if self._index is not None:
+                    self._index.forget(evict_path)
                 if evict_fh is not None:
                     try:
                         evict_fh.close()
@@ -169,6 +181,12 @@ class JsonlAppender:
                             "SSOT_EVICT_CLOSE_FAIL path=%s", evict_path, exc_info=True
                         )
                         pass
+            if self._index is not None:
+                try:
+                    self._index.open_part(path)
+                except OSError as exc:
+                    # Індекс — оптимізація читання; SSOT append не блокуємо.
+                    logging.warning("SSOT_INDEX_OPEN_FAIL path=%s err=%s", path, exc)
             fh = open(path, "a", encoding="utf-8")
             self._open_files[path] = fh
             self._open_files_order.append(path)
@@ -177,11 +195,69 @@ class JsonlAppender:
             if path in self._open_files_order:
                 self._open_files_order.remove(path)
                 self._open_files_order.append(path)
-        line = json.dumps(bar.to_dict(), ensure_ascii=False, separators=(",", ":"))
-        fh.write(line + "\n")
+        return fh
+
+    def _write_lines(
+        self, path: str, lines: List[str], open_ms_list: List[int]
+    ) -> None:
+        """Один write + flush (+fsync) на part-файл; індекс по кожному рядку."""
+        fh = self._handle_for(path)
+        fh.write("".join(line + "\n" for line in lines))
         fh.flush()
         if self._fsync:
             os.fsync(fh.fileno())
+        if self._index is not None:
+            # text mode: "\n" → os.linesep; end offset з fstat (O_APPEND-safe)
+            sizes = [len(line.encode("utf-8")) + len(os.linesep) for line in lines]
+            end_offset = os.fstat(fh.fileno()).st_size - sum(sizes)
+            try:
+                for nbytes, open_ms in zip(sizes, open_ms_list):
+                    end_offset += nbytes
+                    self._index.on_line(path, end_offset, nbytes, open_ms)
+            except OSError as exc:
+                logging.warning("SSOT_INDEX_UPDATE_FAIL path=%s err=%s", path, exc)
+
+    def append(self, bar: CandleBar) -> None:
+        if not bar.complete or bar.src not in FINAL_SOURCES:
+            self._note_drop_non_final(bar)
+            return
+        self._check_bar(bar)
+        path = self._path_for(bar.symbol, bar.tf_s, bar.open_time_ms)
+        line = json.dumps(bar.to_dict(), ensure_ascii=False, separators=(",", ":"))
+        self._write_lines(path, [line], [bar.open_time_ms])
+
+    def append_many(self, bars: List[CandleBar]) -> List[Optional[Exception]]:
+        """Batch append: один буферизований write на part-файл.
+
+        Повертає помилку (або None) для кожного бару в порядку входу;
+        бар з порушеним інваріантом не блокує решту батчу. Non-final
+        бари дропаються як у append() (None — це не помилка запису).
+        """
+        errors: List[Optional[Exception]] = [None] * len(bars)
+        groups: Dict[str, Tuple[List[int], List[str], List[int]]] = {}
+        for i, bar in enumerate(bars):
+            if not bar.complete or bar.src not in FINAL_SOURCES:
+                self._note_drop_non_final(bar)
+                continue
+            try:
+                self._check_bar(bar)
+                path = self._path_for(bar.symbol, bar.tf_s, bar.open_time_ms)
+            except Exception as exc:  # bare_except: allow  # повертається caller-у
+                errors[i] = exc
+                continue
+            idxs, lines, opens = groups.setdefault(path, ([], [], []))
+            idxs.append(i)
+            lines.append(
+                json.dumps(bar.to_dict(), ensure_ascii=False, separators=(",", ":"))
+            )
+            opens.append(bar.open_time_ms)
+        for path, (idxs, lines, opens) in groups.items():
+            try:
+                self._write_lines(path, lines, opens)
+            except Exception as exc:
+                for i in idxs:
+                    errors[i] = exc
+        return errors
 
     def close(self) -> None:
         for fh in self._open_files.values():
@@ -0,0 +1,449 @@
+"""Колонковий бінарний сегмент для запечатаних (завершених) днів SSOT.
+
+`part-YYYYMMDD.jsonl` лишається SSOT. `part-YYYYMMDD.seg` — похідне, lossless
+представлення тих самих рядків (той самий порядок, дублі включно), яке
+DiskLayer читає через mmap без `json.loads` на кожен бар.
+
+Сегмент вважається свіжим лише поки JSONL має той самий (size, mtime_ns),
+що й на момент компакції. Пізній append (derived D1/H4, backfill, dedup tool)
+робить сегмент stale → читач автоматично повертається до JSONL, а наступний
+прохід компакції перезапечатує день.
+
+Layout (little-endian):
+  [0:8)   magic b"V3SEG001"
+  [8:12)  header_len uint32
+  [..]    header JSON: symbol, tf_s, rows, sorted, src_codes, jsonl_size,
+          jsonl_mtime_ns, ext_len
+  pad до 8 байт
+  open_ms int64[rows]
+  o, h, low, c, v float64[rows] кожна
+  flags uint8[rows]: bit0 = complete, bits1..7 = індекс у src_codes
+  ext JSON {row_idx: extensions} — лише для рядків з extensions (sparse)
+"""
+
+from __future__ import annotations
+
+import bisect
+import datetime as dt
+import json
+import logging
+import mmap
+import os
+import struct
+from dataclasses import dataclass
+from typing import Any, Iterator, Optional
+
+from core.model.bars import ms_to_utc_dt
+
+logger = logging.getLogger("ssot_segment")
+
+SEGMENT_MAGIC = b"V3SEG001"
+SEGMENT_SUFFIX = ".seg"
+JSONL_SUFFIX = ".jsonl"
+
+_COLUMNS_F64 = ("o", "h", "low", "c", "v")
+# Рядок JSONL запечатується лише якщо має рівно поля CandleBar.to_dict()
+# (extensions — опційно). Інакше компакція відмовляє: сегмент мусить бути lossless.
+_REQUIRED_KEYS = frozenset(
+    {
+        "symbol",
+        "tf_s",
+        "open_time_ms",
+        "close_time_ms",
+        "o",
+        "h",
+        "low",
+        "c",
+        "v",
+        "complete",
+        "src",
+    }
+)
+_OPTIONAL_KEYS = frozenset({"extensions"})
+_MAX_SRC_CODES = 127  # 7 біт у flags
+
+
+def segment_path_for(jsonl_path: str) -> str:
+    """part-YYYYMMDD.jsonl → part-YYYYMMDD.seg (той самий каталог)."""
+    if jsonl_path.endswith(JSONL_SUFFIX):
+        return jsonl_path[: -len(JSONL_SUFFIX)] + SEGMENT_SUFFIX
+    return jsonl_path + SEGMENT_SUFFIX
+
+
+def _align8(n: int) -> int:
+    return (n + 7) & ~7
+
+
+class SsotSegment:
+    """Read-only view на сегмент через mmap (zero-copy колонки)."""
+
+    def __init__(self, path: str) -> None:
+        self.path = path
+        with open(path, "rb") as f:
+            st = os.fstat(f.fileno())
+            self.stat_sig = (st.st_size, st.st_mtime_ns)
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._parse()
+        except Exception:
+            self.close()
+            raise
+
+    def _parse(self) -> None:
+        mm = self._mm
+        if mm[:8] != SEGMENT_MAGIC:
+            raise ValueError("SSOT_SEGMENT_BAD_MAGIC path=%s" % self.path)
+        (header_len,) = struct.unpack_from("<I", mm, 8)
+        header = json.loads(mm[12 : 12 + header_len].decode("utf-8"))
+        self.symbol = str(header["symbol"])
+        self.tf_s = int(header["tf_s"])
+        self.rows = int(header["rows"])
+        self.sorted = bool(header["sorted"])
+        self.src_codes: list[str] = [str(x) for x in header["src_codes"]]
+        self.jsonl_size = int(header["jsonl_size"])
+        self.jsonl_mtime_ns = int(header["jsonl_mtime_ns"])
+        ext_len = int(header["ext_len"])
+
+        n = self.rows
+        off = _align8(12 + header_len)
+        expected = off + 8 * n * (1 + len(_COLUMNS_F64)) + n + ext_len
+        if len(mm) != expected:
+            raise ValueError(
+                "SSOT_SEGMENT_SIZE_MISMATCH path=%s size=%d expected=%d"
+                % (self.path, len(mm), expected)
+            )
+        view = memoryview(mm)
+        self._views: list[memoryview] = [view]
+        self.open_ms = self._cast(view, off, n, "q")
+        off += 8 * n
+        cols: dict[str, memoryview] = {}
+        for name in _COLUMNS_F64:
+            cols[name] = self._cast(view, off, n, "d")
+            off += 8 * n
+        self._cols = cols
+        self.flags = self._cast(view, off, n, "B")
+        off += n
+        ext_raw = json.loads(bytes(mm[off : off + ext_len]).decode("utf-8"))
+        self._ext: dict[int, dict[str, Any]] = {int(k): v for k, v in ext_raw.items()}
+
+    def _cast(self, view: memoryview, off: int, n: int, fmt: str) -> memoryview:
+        width = struct.calcsize(fmt)
+        mv = view[off : off + width * n].cast(fmt)
+        self._views.append(mv)
+        return mv
+
+    def is_fresh_for(self, jsonl_size: int, jsonl_mtime_ns: int) -> bool:
+        return (
+            self.jsonl_size == jsonl_size and self.jsonl_mtime_ns == jsonl_mtime_ns
+        )
+
+    def row_dict(self, i: int) -> dict[str, Any]:
+        """Матеріалізує рядок i у dict формату CandleBar.to_dict()."""
+        open_ms = self.open_ms[i]
+        flags = self.flags[i]
+        cols = self._cols
+        d: dict[str, Any] = {
+            "symbol": self.symbol,
+            "tf_s": self.tf_s,
+            "open_time_ms": open_ms,
+            "close_time_ms": open_ms + self.tf_s * 1000,
+            "o": cols["o"][i],
+            "h": cols["h"][i],
+            "low": cols["low"][i],
+            "c": cols["c"][i],
+            "v": cols["v"][i],
+            "complete": bool(flags & 1),
+            "src": self.src_codes[flags >> 1],
+        }
+        ext = self._ext.get(i)
+        if ext:
+            d["extensions"] = dict(ext)
+        return d
+
+    def _row_bounds(
+        self, since_open_ms: Optional[int], to_open_ms: Optional[int]
+    ) -> tuple[int, int]:
+        if not self.sorted:
+            return 0, self.rows
+        lo = 0
+        hi = self.rows
+        if since_open_ms is not None:
+            lo = bisect.bisect_right(self.open_ms, since_open_ms)
+        if to_open_ms is not None:
+            hi = bisect.bisect_right(self.open_ms, to_open_ms)
+        return lo, max(lo, hi)
+
+    def iter_dicts(
+        self, since_open_ms: Optional[int] = None, to_open_ms: Optional[int] = None
+    ) -> Iterator[dict[str, Any]]:
+        """Рядки у порядку файлу з відсіканням (since, to] по колонці open_ms."""
+        lo, hi = self._row_bounds(since_open_ms, to_open_ms)
+        open_col = self.open_ms
+        for i in range(lo, hi):
+            open_ms = open_col[i]
+            if since_open_ms is not None and open_ms <= since_open_ms:
+                continue
+            if to_open_ms is not None and open_ms > to_open_ms:
+                continue
+            yield self.row_dict(i)
+
+    def iter_dicts_reverse(
+        self, to_open_ms: Optional[int] = None
+    ) -> Iterator[dict[str, Any]]:
+        """Рядки у зворотному порядку; у sorted-сегменті пропускає open_ms > to."""
+        _lo, hi = self._row_bounds(None, to_open_ms)
+        for i in range(hi - 1, -1, -1):
+            yield self.row_dict(i)
+
+    def bounds(self) -> Optional[tuple[int, int]]:
+        """(min, max) open_ms; None якщо сегмент порожній або не відсортований."""
+        if self.rows <= 0 or not self.sorted:
+            return None
+        return self.open_ms[0], self.open_ms[self.rows - 1]
+
+    def last_dict(self) -> Optional[dict[str, Any]]:
+        if self.rows <= 0:
+            return None
+        return self.row_dict(self.rows - 1)
+
+    def close(self) -> None:
+        for mv in reversed(getattr(self, "_views", [])):
+            mv.release()
+        self._views = []
+        try:
+            self._mm.close()
+        except Exception:
+            logger.debug("SSOT_SEGMENT_CLOSE_FAIL path=%s", self.path, exc_info=True)
+
+
+def open_fresh_segment(jsonl_path: str) -> Optional[SsotSegment]:
+    """Відкриває сегмент для part-файлу лише якщо він свіжий відносно JSONL."""
+    seg_path = segment_path_for(jsonl_path)
+    try:
+        st = os.stat(jsonl_path)
+        seg = SsotSegment(seg_path)
+    except FileNotFoundError:  # bare_except: allow  # сегмент ще не запечатаний → JSONL шлях
+        return None
+    except Exception:
+        logger.warning("SSOT_SEGMENT_OPEN_FAIL path=%s", seg_path, exc_info=True)
+        return None
+    if not seg.is_fresh_for(st.st_size, st.st_mtime_ns):
+        seg.close()
+        return None
+    return seg
+
+
+@dataclass
+class SealResult:
+    ok: bool
+    reason: Optional[str]
+    rows: int = 0
+
+
+def _encode_rows(
+    rows: list[dict[str, Any]], symbol: str, tf_s: int
+) -> Optional[tuple[bytes, list[str], bool, bytes]]:
+    """Кодує рядки в колонки. None якщо рядок не можна відтворити без втрат."""
+    tf_ms = tf_s * 1000
+    src_codes: list[str] = []
+    src_index: dict[str, int] = {}
+    n = len(rows)
+    open_col: list[int] = []
+    f64_cols: dict[str, list[float]] = {name: [] for name in _COLUMNS_F64}
+    flags = bytearray(n)
+    ext_map: dict[str, Any] = {}
+    is_sorted = True
+    prev_open: Optional[int] = None
+    for i, obj in enumerate(rows):
+        keys = obj.keys()
+        if not _REQUIRED_KEYS.issubset(keys) or not (
+            set(keys) <= _REQUIRED_KEYS | _OPTIONAL_KEYS
+        ):
+            return None
+        open_ms = obj["open_time_ms"]
+        if obj["symbol"] != symbol or obj["tf_s"] != tf_s:
+            return None
+        if obj["close_time_ms"] != open_ms + tf_ms:
+            return None
+        complete = obj["complete"]
+        src = obj["src"]
+        if not isinstance(complete, bool) or not isinstance(src, str):
+            return None
+        for name in _COLUMNS_F64:
+            val = obj[name]
+            if isinstance(val, bool) or not isinstance(val, (int, float)):
+                return None
+            f64_cols[name].append(float(val))
+        code = src_index.get(src)
+        if code is None:
+            if len(src_codes) >= _MAX_SRC_CODES:
+                return None
+            code = len(src_codes)
+            src_index[src] = code
+            src_codes.append(src)
+        flags[i] = (code << 1) | (1 if complete else 0)
+        ext = obj.get("extensions")
+        if ext is not None:
+            if not isinstance(ext, dict):
+                return None
+            ext_map[str(i)] = ext
+        if prev_open is not None and open_ms < prev_open:
+            is_sorted = False
+        prev_open = open_ms
+        open_col.append(open_ms)
+
+    body = bytearray(struct.pack("<%dq" % n, *open_col))
+    for name in _COLUMNS_F64:
+        body += struct.pack("<%dd" % n, *f64_cols[name])
+    body += flags
+    ext_blob = json.dumps(ext_map, ensure_ascii=False, separators=(",", ":")).encode(
+        "utf-8"
+    )
+    return bytes(body), src_codes, is_sorted, ext_blob
+
+
+def seal_part(jsonl_path: str, tf_s: int) -> SealResult:
+    """Компактує один part-файл у сегмент (atomic write tmp → replace).
+
+    Рядки, які JSONL-читач і так пропускає (битий JSON, open_time_ms не int),
+    пропускаються і тут — семантика читання не змінюється.
+    """
+    try:
+        st = os.stat(jsonl_path)
+        with open(jsonl_path, "rb") as f:
+            raw = f.read(st.st_size)
+    except FileNotFoundError:  # bare_except: allow  # part видалено між listdir і seal
+        return SealResult(False, "jsonl_missing")
+    if raw and not raw.endswith(b"\n"):
+        # Writer посеред рядка — не запечатуємо напівзаписаний стан.
+        return SealResult(False, "partial_tail")
+
+    rows: list[dict[str, Any]] = []
+    for line in raw.splitlines():
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            obj = json.loads(line.decode("utf-8"))
+        except Exception:
+            logger.debug("SSOT_SEGMENT_JSON_DECODE_FAIL path=%s", jsonl_path)
+            continue
+        if not isinstance(obj, dict) or not isinstance(obj.get("open_time_ms"), int):
+            continue
+        rows.append(obj)
+    if not rows:
+        return SealResult(False, "empty")
+
+    symbol = rows[0].get("symbol")
+    if not isinstance(symbol, str):
+        return SealResult(False, "non_canonical_row")
+    encoded = _encode_rows(rows, symbol, tf_s)
+    if encoded is None:
+        return SealResult(False, "non_canonical_row")
+    body, src_codes, is_sorted, ext_blob = encoded
+
+    header = json.dumps(
+        {
+            "symbol": symbol,
+            "tf_s": tf_s,
+            "rows": len(rows),
+            "sorted": is_sorted,
+            "src_codes": src_codes,
+            "jsonl_size": st.st_size,
+            "jsonl_mtime_ns": st.st_mtime_ns,
+            "ext_len": len(ext_blob),
+        },
+        separators=(",", ":"),
+    ).encode("utf-8")
+    prefix = SEGMENT_MAGIC + struct.pack("<I", len(header)) + header
+    prefix += b"\x00" * (_align8(len(prefix)) - len(prefix))
+
+    seg_path = segment_path_for(jsonl_path)
+    # pid у tmp: m1_ingestion_worker і binance_ingest_worker запечатують
+    # спільний data_root — паралельний seal того ж part не змішує байти
+    tmp_path = "%s.%d.tmp" % (seg_path, os.getpid())
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(prefix)
+            f.write(body)
+            f.write(ext_blob)
+        os.replace(tmp_path, seg_path)
+    except OSError as exc:
+        # Windows: сегмент може бути замаплений читачем — спробуємо наступного проходу.
+        logger.warning("SSOT_SEGMENT_WRITE_FAIL path=%s err=%s", seg_path, exc)
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            logger.debug("SSOT_SEGMENT_TMP_CLEANUP_FAIL path=%s", tmp_path)
+        return SealResult(False, "write_failed")
+    return SealResult(True, None, len(rows))
+
+
+def _segment_is_fresh(jsonl_path: str) -> bool:
+    seg = open_fresh_segment(jsonl_path)
+    if seg is None:
+        return False
+    seg.close()
+    return True
+
+
+def seal_finished_days(
+    data_root: str,
+    *,
+    now_ms: int,
+    grace_days: int = 1,
+    max_parts: Optional[int] = None,
+) -> dict[str, Any]:
+    """Запечатує part-файли днів, старших за `today - grace_days` (UTC).
+
+    `max_parts` обмежує кількість нових сегментів за прохід, щоб виклик
+    з hot-loop writer-а не блокував polling (решта — наступним проходом).
+    """
+    cutoff_day = (
+        ms_to_utc_dt(now_ms).date() - dt.timedelta(days=max(0, grace_days))
+    ).strftime("%Y%m%d")
+    stats: dict[str, Any] = {
+        "sealed": 0,
+        "fresh": 0,
+        "skipped": {},
+        "rows": 0,
+        "budget_exhausted": False,
+    }
+    if not os.path.isdir(data_root):
+        return stats
+    for sym_dir in sorted(os.listdir(data_root)):
+        sym_path = os.path.join(data_root, sym_dir)
+        if not os.path.isdir(sym_path):
+            continue
+        for tf_dir in sorted(os.listdir(sym_path)):
+            if not tf_dir.startswith("tf_"):
+                continue
+            try:
+                tf_s = int(tf_dir[3:])
+            except ValueError:  # bare_except: allow  # не tf_<int> каталог
+                continue
+            tf_path = os.path.join(sym_path, tf_dir)
+            if not os.path.isdir(tf_path):
+                continue
+            for name in sorted(os.listdir(tf_path)):
+                if not (name.startswith("part-") and name.endswith(JSONL_SUFFIX)):
+                    continue
+                day = name[len("part-") : -len(JSONL_SUFFIX)]
+                if day >= cutoff_day:
+                    continue
+                jsonl_path = os.path.join(tf_path, name)
+                if _segment_is_fresh(jsonl_path):
+                    stats["fresh"] += 1
+                    continue
+                if max_parts is not None and stats["sealed"] >= max_parts:
+                    stats["budget_exhausted"] = True
+                    return stats
+                res = seal_part(jsonl_path, tf_s)
+                if res.ok:
+                    stats["sealed"] += 1
+                    stats["rows"] += res.rows
+                else:
+                    skipped = stats["skipped"]
+                    skipped[res.reason] = skipped.get(res.reason, 0) + 1
+    return stats
+
@@ -6,7 +6,7 @@ import os
 import threading
 import time
 from dataclasses import dataclass
-from typing import Any, Optional
+from typing import Any, Mapping, Optional, Sequence
 
 from core.model.bars import CandleBar, FINAL_SOURCES
 from core.config_loader import (
@@ -19,14 +19,29 @@ from core.config_loader import (
 
 from runtime.obs_60s import Obs60s
 from runtime.store.layers.disk_layer import DiskLayer
-from runtime.store.layers.ram_layer import RamLayer
+from runtime.store.layers.ram_layer import (
+    RAM_MAX_BARS_DEFAULT,
+    RAM_MAX_BYTES_DEFAULT,
+    RAM_MAX_TOTAL_BARS_DEFAULT,
+    RamLayer,
+)
 from runtime.store.layers.redis_layer import RedisLayer
+from runtime.store.redis_pool import (
+    RedisSteps,
+    adrive,
+    async_twin,
+    drive,
+    note_round_trips,
+    pool_stats,
+    pooled_client,
+)
 from runtime.store.redis_snapshot import (
     RedisSnapshotWriter,
     build_redis_snapshot_writer,
 )
 from runtime.store.redis_spec import resolve_redis_spec
 from runtime.store.ssot_jsonl import JsonlAppender
+from runtime.store.ssot_segment import seal_finished_days
 
 Logging = logging.getLogger("uds")
 
@@ -90,7 +105,7 @@ REDIS_SOCKET_TIMEOUT_S = 0.4
 _DEFAULT_PREVIEW_CURR_TTL_S = 1800  # SSOT fallback; runtime значення з config.json
 PREVIEW_TAIL_RETAIN = 2000
 PREVIEW_UPDATES_RETAIN = 2000
-_TAIL_FLUSH_INTERVAL_S = 5  # O3: flush in-memory tail to Redis max once per N seconds
+_TAIL_FLUSH_INTERVAL_S = 5  # O3: flush forming bar to preview ring max once per N seconds
 
 
 def _disk_bar_to_candle(
@@ -147,6 +162,9 @@ def _disk_bar_to_candle(
 
 
 UPDATES_REDIS_RETAIN_DEFAULT = 2000
+UPDATES_BACKEND_DEFAULT = "list"
+# Стеля одного XREAD BLOCK (wait_updates); socket_timeout wait-client = стеля + rail
+UPDATES_WAIT_MAX_S = 5.0
 
 
 def _watermark_drop_reason(open_ms: int, wm_open_ms: Optional[int]) -> Optional[str]:
@@ -159,6 +177,36 @@ def _watermark_drop_reason(open_ms: int, wm_open_ms: Optional[int]) -> Optional[
     return None
 
 
+def _update_event(bar: CandleBar) -> dict[str, Any]:
+    """Event updates bus для бару (seq додає bus при publish)."""
+    return {
+        "key": {
+            "symbol": bar.symbol,
+            "tf_s": int(bar.tf_s),
+            "open_ms": int(bar.open_time_ms),
+        },
+        "bar": bar.to_dict(),
+        "complete": bar.complete,
+        "source": str(bar.src),
+        "event_ts": (int(bar.close_time_ms) if bar.complete else None),
+    }
+
+
+def _final_preview_event(bar: CandleBar) -> dict[str, Any]:
+    """Event фінального бару для preview ring (final>preview у UI)."""
+    return {
+        "key": {
+            "symbol": bar.symbol,
+            "tf_s": int(bar.tf_s),
+            "open_ms": int(bar.open_time_ms),
+        },
+        "bar": bar.to_dict(),
+        "complete": True,
+        "source": str(bar.src),
+        "event_ts": int(bar.close_time_ms),
+    }
+
+
 def _mark_degraded(meta: dict[str, Any], reason: str) -> None:
     ext = meta.setdefault("extensions", {})
     if isinstance(ext, dict):
@@ -385,6 +433,8 @@ class UnifiedDataStore:
         self._jsonl = jsonl_appender
         self._redis_writer = redis_snapshot_writer
         self._updates_bus = updates_bus
+        # Read-through кеш вікон (runtime/store/window_cache.py); ставить build_uds_from_config
+        self.window_cache: Optional[Any] = None
         self._wm_by_key: dict[tuple[str, int], int] = {}
         self._updates_bus_warned = False
         self._redis_spec_mismatch = bool(redis_spec_mismatch)
@@ -400,8 +450,9 @@ class UnifiedDataStore:
         self._preview_last_publish_ms: dict[tuple[str, int], int] = {}
         self._preview_tail_updates_total = 0
         self._preview_tail_updates_log_ts_ms = 0
-        # O3: in-memory tail cache — avoids json.loads/dumps 214KB on every publish
-        self._tail_cache: dict[tuple[str, int], list[dict[str, Any]]] = {}
+        # O3: preview ring — per-bar upsert; у RAM лише незафлашений forming бар
+        self._tail_pending: dict[tuple[str, int], dict[str, Any]] = {}
+        self._tail_migrated: set[tuple[str, int]] = set()
         self._tail_last_flush_ts: dict[tuple[str, int], float] = {}
         self._preview_nomix_violation = False
         self._preview_nomix_violation_reason: Optional[str] = None
@@ -558,7 +609,13 @@ class UnifiedDataStore:
         if spec.since_open_ms is None and spec.to_open_ms is None:
             ram_bars = self._ram.get_window(symbol, tf_s, spec.limit)
             if ram_bars is not None:
-                ram_bars, geom = _ensure_sorted_dedup(ram_bars, tf_ms=tf_s * 1000)
+                # RamLayer гарантує строго зростаючий open_ms без дублів;
+                # лишається тільки HTF near-dedup (DST jitter).
+                geom = None
+                if tf_s >= 86400:
+                    ram_bars, geom = _ensure_sorted_dedup(
+                        ram_bars, tf_ms=tf_s * 1000
+                    )
                 if geom is not None:
                     _mark_geom_fix(meta, warnings, geom, source="ram", tf_s=tf_s)
                 # P1-unified: якщо RAM має менше барів ніж запитано і disk доступний,
@@ -619,26 +676,68 @@ class UnifiedDataStore:
         return result
 
     def read_updates(self, spec: UpdatesSpec) -> UpdatesResult:
-        symbol = spec.symbol
-        tf_s = spec.tf_s
-        limit = spec.limit
+        meta, warnings, preview_mode = self._updates_begin(spec)
+        fetched = None
+        if preview_mode:
+            if self._redis is not None:
+                fetched = self._redis.read_preview_updates(
+                    spec.symbol,
+                    spec.tf_s,
+                    spec.since_seq,
+                    spec.limit,
+                    self._preview_updates_retain,
+                )
+        elif self._updates_bus is not None:
+            fetched = self._updates_bus.read_updates(
+                spec.symbol, spec.tf_s, spec.since_seq, spec.limit
+            )
+        return self._updates_end(spec, meta, warnings, preview_mode, fetched)
+
+    async def read_updates_async(self, spec: UpdatesSpec) -> Optional[UpdatesResult]:
+        """read_updates у event loop через redis.asyncio (без executor).
+
+        None — шар без async клієнта (fake / redis.asyncio недоступний):
+        caller виконує sync read_updates у executor.
+        """
+        meta, warnings, preview_mode = self._updates_begin(spec)
+        fetched = None
+        if preview_mode:
+            if self._redis is not None:
+                fetched = await self._redis.read_preview_updates_async(
+                    spec.symbol,
+                    spec.tf_s,
+                    spec.since_seq,
+                    spec.limit,
+                    self._preview_updates_retain,
+                )
+                if fetched is None:
+                    return None
+        elif self._updates_bus is not None:
+            fetched = await self._updates_bus.read_updates_async(
+                spec.symbol, spec.tf_s, spec.since_seq, spec.limit
+            )
+            if fetched is None:
+                return None
+        return self._updates_end(spec, meta, warnings, preview_mode, fetched)
+
+    def _updates_begin(
+        self, spec: UpdatesSpec
+    ) -> tuple[dict[str, Any], list[str], bool]:
+        """Спільний початок read_updates: meta/warnings, preview plane."""
         if Logging.isEnabledFor(logging.DEBUG):
             Logging.debug(
                 "UDS: читання updates symbol=%s tf_s=%s limit=%s since_seq=%s",
-                symbol,
-                tf_s,
-                limit,
+                spec.symbol,
+                spec.tf_s,
+                spec.limit,
                 spec.since_seq,
             )
         warnings: list[str] = []
         meta: dict[str, Any] = {"boot_id": self._boot_id}
         if self._redis_spec_mismatch:
             _mark_redis_mismatch(meta, warnings, self._redis_spec_mismatch_fields)
-        events: list[dict[str, Any]] = []
-        cursor_seq = spec.since_seq if spec.since_seq is not None else 0
-        gap: Optional[dict[str, Any]] = None
 
-        preview_mode = tf_s in self._preview_tf_allowlist
+        preview_mode = spec.tf_s in self._preview_tf_allowlist
         if spec.include_preview and not preview_mode:
             warnings.append("include_preview_ignored")
             ext = meta.setdefault("extensions", {})
@@ -652,53 +751,43 @@ class UnifiedDataStore:
                 warnings.append("preview_requires_redis")
                 if isinstance(ext, dict):
                     ext["degraded"] = ["preview_requires_redis"]
-            else:
-                events, cursor_seq, gap, err = self._redis.read_preview_updates(
-                    symbol,
-                    tf_s,
-                    spec.since_seq,
-                    limit,
-                    self._preview_updates_retain,
-                )
-                if err is not None:
-                    warnings.append("redis_down")
-                    if isinstance(ext, dict):
-                        degraded = ext.get("degraded")
-                        if isinstance(degraded, list):
-                            if "redis_down" not in degraded:
-                                degraded.append("redis_down")
-                        else:
-                            ext["degraded"] = ["redis_down"]
-                    events = []
-                    if spec.since_seq is not None:
-                        cursor_seq = spec.since_seq
-                    else:
-                        cursor_seq = 0
-        else:
-            if self._updates_bus is None:
-                warnings.append("updates_bus_missing")
-            else:
-                events, cursor_seq, gap, err = self._updates_bus.read_updates(
-                    symbol,
-                    tf_s,
-                    spec.since_seq,
-                    limit,
-                )
-                if err is not None:
-                    warnings.append("redis_down")
-                    ext = meta.setdefault("extensions", {})
-                    if isinstance(ext, dict):
-                        degraded = ext.get("degraded")
-                        if isinstance(degraded, list):
-                            if "redis_down" not in degraded:
-                                degraded.append("redis_down")
-                        else:
-                            ext["degraded"] = ["redis_down"]
-                    events = []
-                    if spec.since_seq is not None:
-                        cursor_seq = spec.since_seq
+        elif self._updates_bus is None:
+            warnings.append("updates_bus_missing")
+        return meta, warnings, preview_mode
+
+    def _updates_end(
+        self,
+        spec: UpdatesSpec,
+        meta: dict[str, Any],
+        warnings: list[str],
+        preview_mode: bool,
+        fetched: Optional[
+            tuple[list[dict[str, Any]], int, Optional[dict[str, Any]], Optional[str]]
+        ],
+    ) -> UpdatesResult:
+        """Спільний хвіст read_updates: redis_down, gap, trim, RAM upsert, result."""
+        symbol = spec.symbol
+        tf_s = spec.tf_s
+        events: list[dict[str, Any]] = []
+        cursor_seq = spec.since_seq if spec.since_seq is not None else 0
+        gap: Optional[dict[str, Any]] = None
+        if fetched is not None:
+            events, cursor_seq, gap, err = fetched
+            if err is not None:
+                warnings.append("redis_down")
+                ext = meta.setdefault("extensions", {})
+                if isinstance(ext, dict):
+                    degraded = ext.get("degraded")
+                    if isinstance(degraded, list):
+                        if "redis_down" not in degraded:
+                            degraded.append("redis_down")
                     else:
-                        cursor_seq = 0
+                        ext["degraded"] = ["redis_down"]
+                events = []
+                if spec.since_seq is not None:
+                    cursor_seq = spec.since_seq
+                else:
+                    cursor_seq = 0
 
         if gap is not None:
             warnings.append("cursor_gap")
@@ -737,6 +826,76 @@ class UnifiedDataStore:
         _log_updates_result(result)
         return result
 
+    def updates_cursors(
+        self, targets: Sequence[tuple[str, int]]
+    ) -> Optional[list[Optional[int]]]:
+        """Поточний seq updates bus per (symbol, tf_s) — один round-trip.
+
+        Змінюється на кожен опублікований final commit ключа; None — bus
+        відсутній або без last_seqs (caller не може валідувати кеш).
+        """
+        getter = getattr(self._updates_bus, "last_seqs", None)
+        if getter is None:
+            return None
+        return getter(targets)
+
+    async def updates_cursors_async(
+        self, targets: Sequence[tuple[str, int]]
+    ) -> Optional[list[Optional[int]]]:
+        """updates_cursors через redis.asyncio; без async клієнта — sync MGET."""
+        getter = getattr(self._updates_bus, "last_seqs_async", None)
+        if getter is not None:
+            cursors = await getter(targets)
+            if cursors is not None:
+                return cursors
+        return self.updates_cursors(targets)
+
+    def wait_updates(
+        self,
+        cursors: Mapping[tuple[str, int], Optional[int]],
+        timeout_s: float,
+    ) -> Optional[set[tuple[str, int]]]:
+        """Блокуюче очікування нових events для final plane (stream backend).
+
+        cursors: (symbol, tf_s) → since_seq. Preview plane (окремі Redis
+        ключі) не очікується. Повертає цілі з новими events (порожній set —
+        timeout) або None: bus без blocking reads / помилка → caller робить
+        звичайний poll.
+        """
+        waiter = getattr(self._updates_bus, "wait_updates", None)
+        if waiter is None:
+            return None
+        final_cursors = {
+            target: since
+            for target, since in cursors.items()
+            if target[1] not in self._preview_tf_allowlist
+        }
+        if not final_cursors:
+            return None
+        return waiter(final_cursors, timeout_s)
+
+    async def wait_updates_async(
+        self,
+        cursors: Mapping[tuple[str, int], Optional[int]],
+        timeout_s: float,
+    ) -> Optional[set[tuple[str, int]]]:
+        """wait_updates у event loop (XREAD BLOCK через redis.asyncio).
+
+        Контракт той самий; LookupError — async шлях недоступний (bus без
+        blocking reads або без async клієнта), caller — sync wait_updates.
+        """
+        waiter = getattr(self._updates_bus, "wait_updates_async", None)
+        if waiter is None:
+            raise LookupError("async_wait_unavailable")
+        final_cursors = {
+            target: since
+            for target, since in cursors.items()
+            if target[1] not in self._preview_tf_allowlist
+        }
+        if not final_cursors:
+            return None
+        return await waiter(final_cursors, timeout_s)
+
     def commit_final_bar(
         self,
         bar: CandleBar,
@@ -745,6 +904,132 @@ class UnifiedDataStore:
     ) -> CommitResult:
         self._ensure_writer_role("commit_final_bar")
         warnings: list[str] = []
+        rejected = self._commit_precheck(bar, warnings)
+        if rejected is not None:
+            return rejected
+        if bar.src not in FINAL_SOURCES:
+            return self._reject_non_final_source(bar, warnings)
+        wm = self._init_watermark_for_key(bar.symbol, bar.tf_s)
+        dropped = self._commit_watermark_drop(bar, wm, warnings)
+        if dropped is not None:
+            return dropped
+
+        ssot_written = self._append_to_disk(bar, ssot_write_ts_ms, warnings)
+        redis_written = self._write_redis_snapshot(bar, warnings)
+        updates_published = self._publish_update(bar, warnings)
+        result = self._finish_commit(
+            bar, ssot_written, redis_written, updates_published, warnings
+        )
+        # Bridge: фінальний бар preview-TF → preview ring для UI
+        if ssot_written and bar.tf_s in self._preview_tf_allowlist:
+            self._publish_final_to_preview_ring(bar)
+        return result
+
+    def commit_final_bars(
+        self,
+        bars: list[CandleBar],
+        *,
+        ssot_write_ts_ms: Optional[int] = None,
+    ) -> list[CommitResult]:
+        """Batch commit_final_bar: ті самі правила, I/O — раз на батч.
+
+        Валідація + watermark по кожному бару (у межах батчу watermark
+        ключа просувається від попереднього успішно записаного бару), далі:
+          - disk: один буферизований write на part-файл;
+          - Redis snapshot: snap/tail кожного ключа + status одним pipeline;
+          - updates bus / preview ring: один батч на ключ.
+        Повертає CommitResult на кожен бар у порядку входу.
+        """
+        self._ensure_writer_role("commit_final_bars")
+        results: list[Optional[CommitResult]] = [None] * len(bars)
+        warnings_by_bar: list[list[str]] = [[] for _ in bars]
+        candidates: list[int] = []
+        for i, bar in enumerate(bars):
+            rejected = self._commit_precheck(bar, warnings_by_bar[i])
+            if rejected is None and bar.src not in FINAL_SOURCES:
+                rejected = self._reject_non_final_source(bar, warnings_by_bar[i])
+            if rejected is not None:
+                results[i] = rejected
+                continue
+            candidates.append(i)
+        ssot_by_idx, drop_wm = self._append_batch_ssot(
+            bars, candidates, ssot_write_ts_ms, warnings_by_bar
+        )
+        accepted = [i for i in candidates if i in ssot_by_idx]
+        ssot_ok = [ssot_by_idx[i] for i in accepted]
+        for i, wm in drop_wm.items():
+            results[i] = self._commit_watermark_drop(bars[i], wm, warnings_by_bar[i])
+
+        if accepted:
+            batch = [bars[i] for i in accepted]
+            batch_warnings = [warnings_by_bar[i] for i in accepted]
+            redis_ok = self._write_redis_snapshots(batch, batch_warnings)
+            published = self._publish_updates(batch, batch_warnings)
+            for j, i in enumerate(accepted):
+                results[i] = self._finish_commit(
+                    bars[i], ssot_ok[j], redis_ok[j], published[j], warnings_by_bar[i]
+                )
+            self._publish_finals_to_preview_ring(
+                [
+                    b
+                    for b, ok in zip(batch, ssot_ok)
+                    if ok and b.tf_s in self._preview_tf_allowlist
+                ]
+            )
+        return [r for r in results if r is not None]
+
+    def _append_batch_ssot(
+        self,
+        bars: list[CandleBar],
+        candidates: list[int],
+        ssot_write_ts_ms: Optional[int],
+        warnings_by_bar: list[list[str]],
+    ) -> tuple[dict[int, bool], dict[int, Optional[int]]]:
+        """SSOT запис батчу з watermark-семантикою послідовного commit_final_bar.
+
+        Watermark ключа просувається лише барами, чий запис успішний. Бар,
+        відкинутий як duplicate/stale відносно бару з невдалим записом
+        (повтор у тому ж батчі), перевіряється і пишеться наступним проходом.
+        Повертає ({index: ssot_ok} записаних барів, {index: wm} для drop).
+        """
+        ssot_by_idx: dict[int, bool] = {}
+        init_wm: dict[tuple[str, int], Optional[int]] = {}
+        while True:
+            batch_wm: dict[tuple[str, int], Optional[int]] = {}
+            pending: list[int] = []
+            drop_wm: dict[int, Optional[int]] = {}
+            for i in candidates:
+                bar = bars[i]
+                key = (bar.symbol, bar.tf_s)
+                if key not in batch_wm:
+                    if key not in init_wm:
+                        init_wm[key] = self._init_watermark_for_key(
+                            bar.symbol, bar.tf_s
+                        )
+                    batch_wm[key] = init_wm[key]
+                if i in ssot_by_idx:
+                    if ssot_by_idx[i]:
+                        batch_wm[key] = bar.open_time_ms
+                    continue
+                if _watermark_drop_reason(bar.open_time_ms, batch_wm[key]) is None:
+                    # tentative: наступні бари ключа перевіряються проти нього
+                    batch_wm[key] = bar.open_time_ms
+                    pending.append(i)
+                else:
+                    drop_wm[i] = batch_wm[key]
+            if not pending:
+                return ssot_by_idx, drop_wm
+            written = self._append_many_to_disk(
+                [bars[i] for i in pending],
+                ssot_write_ts_ms,
+                [warnings_by_bar[i] for i in pending],
+            )
+            ssot_by_idx.update(zip(pending, written))
+
+    def _commit_precheck(
+        self, bar: CandleBar, warnings: list[str]
+    ) -> Optional[CommitResult]:
+        """Тип / complete; None → бар придатний до перевірки source."""
         if not isinstance(bar, CandleBar):
             Logging.warning("UDS: commit_final_bar очікує CandleBar")
             return CommitResult(False, "invalid_bar", False, False, False, warnings)
@@ -756,46 +1041,56 @@ class UnifiedDataStore:
                 bar.open_time_ms,
             )
             return CommitResult(False, "not_complete", False, False, False, warnings)
-        if bar.src not in FINAL_SOURCES:
-            Logging.warning(
-                "UDS: commit_final_bar пропущено (non_final_source) symbol=%s tf_s=%s src=%s",
-                bar.symbol,
-                bar.tf_s,
-                bar.src,
-            )
-            return CommitResult(
-                False, "non_final_source", False, False, False, warnings
-            )
+        return None
 
-        wm = self._init_watermark_for_key(bar.symbol, bar.tf_s)
+    def _reject_non_final_source(
+        self, bar: CandleBar, warnings: list[str]
+    ) -> CommitResult:
+        Logging.warning(
+            "UDS: commit_final_bar пропущено (non_final_source) symbol=%s tf_s=%s src=%s",
+            bar.symbol,
+            bar.tf_s,
+            bar.src,
+        )
+        return CommitResult(False, "non_final_source", False, False, False, warnings)
+
+    def _commit_watermark_drop(
+        self, bar: CandleBar, wm: Optional[int], warnings: list[str]
+    ) -> Optional[CommitResult]:
         drop_reason = _watermark_drop_reason(bar.open_time_ms, wm)
-        if drop_reason is not None:
-            _OBS.inc_writer_drop(drop_reason, bar.tf_s)
-            # Throttle: один підсумковий рядок раз на 30 с замість кожного дропа (антиспам)
-            self._commit_drop_counts[drop_reason] = (
-                self._commit_drop_counts.get(drop_reason, 0) + 1
-            )
-            now_mono = time.monotonic()
-            if now_mono - self._commit_drop_last_log_ts >= 30.0:
-                stale_n = self._commit_drop_counts.get("stale", 0)
-                dup_n = self._commit_drop_counts.get("duplicate", 0)
-                if stale_n or dup_n:
-                    Logging.warning(
-                        "UDS: commit_final_bar drops (throttled 30s) stale=%s duplicate=%s example symbol=%s tf_s=%s open_ms=%s wm_open_ms=%s",
-                        stale_n,
-                        dup_n,
-                        bar.symbol,
-                        bar.tf_s,
-                        bar.open_time_ms,
-                        wm,
-                    )
-                self._commit_drop_counts.clear()
-                self._commit_drop_last_log_ts = now_mono
-            return CommitResult(False, drop_reason, False, False, False, warnings)
+        if drop_reason is None:
+            return None
+        _OBS.inc_writer_drop(drop_reason, bar.tf_s)
+        # Throttle: один підсумковий рядок раз на 30 с замість кожного дропа (антиспам)
+        self._commit_drop_counts[drop_reason] = (
+            self._commit_drop_counts.get(drop_reason, 0) + 1
+        )
+        now_mono = time.monotonic()
+        if now_mono - self._commit_drop_last_log_ts >= 30.0:
+            stale_n = self._commit_drop_counts.get("stale", 0)
+            dup_n = self._commit_drop_counts.get("duplicate", 0)
+            if stale_n or dup_n:
+                Logging.warning(
+                    "UDS: commit_final_bar drops (throttled 30s) stale=%s duplicate=%s example symbol=%s tf_s=%s open_ms=%s wm_open_ms=%s",
+                    stale_n,
+                    dup_n,
+                    bar.symbol,
+                    bar.tf_s,
+                    bar.open_time_ms,
+                    wm,
+                )
+            self._commit_drop_counts.clear()
+            self._commit_drop_last_log_ts = now_mono
+        return CommitResult(False, drop_reason, False, False, False, warnings)
 
-        ssot_written = self._append_to_disk(bar, ssot_write_ts_ms, warnings)
-        redis_written = self._write_redis_snapshot(bar, warnings)
-        updates_published = self._publish_update(bar, warnings)
+    def _finish_commit(
+        self,
+        bar: CandleBar,
+        ssot_written: bool,
+        redis_written: bool,
+        updates_published: bool,
+        warnings: list[str],
+    ) -> CommitResult:
         degraded_reasons: list[str] = []
         if not redis_written:
             degraded_reasons.append("redis_write_failed")
@@ -808,11 +1103,7 @@ class UnifiedDataStore:
 
         if ssot_written:
             self._wm_by_key[(bar.symbol, bar.tf_s)] = bar.open_time_ms
-        if ssot_written:
             self._ram.upsert_bar(bar.symbol, bar.tf_s, bar.to_dict())
-        # Bridge: фінальний бар preview-TF → preview ring для UI
-        if ssot_written and bar.tf_s in self._preview_tf_allowlist:
-            self._publish_final_to_preview_ring(bar)
         ok = ssot_written
         reason = None if ok else "ssot_write_failed"
         return CommitResult(
@@ -946,51 +1237,39 @@ class UnifiedDataStore:
         rollover = last_open is None or last_open != bar.open_time_ms
         self._preview_last_open_ms[key] = bar.open_time_ms
 
-        # O3: in-memory tail cache — modify list in RAM, flush to Redis on rollover
-        # or every _TAIL_FLUSH_INTERVAL_S seconds. Eliminates json.loads/dumps 214KB per tick.
+        # O3: preview ring зберігається per-bar (sorted set за open_ms): flush
+        # пише лише forming бар (+ останній стан попереднього на rollover),
+        # на rollover або раз на _TAIL_FLUSH_INTERVAL_S. Без JSON усього tail.
         try:
-            tail_bars = self._tail_cache.get(key)
-            if tail_bars is None:
-                # Cold start: seed from Redis once
-                tail_payload, _, _ = self._redis.read_preview_tail(bar.symbol, bar.tf_s)
-                tail_bars = []
-                if isinstance(tail_payload, dict):
-                    raw = tail_payload.get("bars")
-                    if isinstance(raw, list):
-                        tail_bars = [b for b in raw if isinstance(b, dict)]
-                self._tail_cache[key] = tail_bars
-
-            if tail_bars and isinstance(tail_bars[-1].get("open_ms"), int):
-                if tail_bars[-1]["open_ms"] == int(bar_item["open_ms"]):
-                    tail_bars[-1] = bar_item
-                else:
-                    tail_bars.append(bar_item)
-            else:
-                tail_bars.append(bar_item)
-            if len(tail_bars) > self._preview_tail_retain:
-                self._tail_cache[key] = tail_bars[-self._preview_tail_retain :]
-                tail_bars = self._tail_cache[key]
+            tail_ttl = (
+                self._preview_curr_ttl_s * 2 if self._preview_curr_ttl_s else None
+            )
+            if key not in self._tail_migrated:
+                # Cold start: legacy whole-JSON tail → ring (один раз на ключ)
+                self._tail_migrated.add(key)
+                self._redis.migrate_legacy_preview_tail(
+                    bar.symbol, bar.tf_s, self._preview_tail_retain, tail_ttl
+                )
+
+            flush_bars: list[dict[str, Any]] = []
+            pending = self._tail_pending.get(key)
+            if pending is not None and pending["open_ms"] != bar_item["open_ms"]:
+                flush_bars.append(pending)  # незафлашений фінальний стан попереднього
+            self._tail_pending[key] = bar_item
 
-            # Flush to Redis on rollover or throttled interval
             now_t = time.time()
             last_flush = self._tail_last_flush_ts.get(key, 0.0)
             need_flush = rollover or (now_t - last_flush >= _TAIL_FLUSH_INTERVAL_S)
             if need_flush:
-                new_tail = {
-                    "v": 1,
-                    "symbol": bar.symbol,
-                    "tf_s": int(bar.tf_s),
-                    "bars": tail_bars,
-                    "complete": False,
-                    "source": str(bar.src),
-                    "payload_ts_ms": payload_ts_ms,
-                }
-                tail_ttl = (
-                    self._preview_curr_ttl_s * 2 if self._preview_curr_ttl_s else None
-                )
-                self._redis.write_preview_tail(
-                    bar.symbol, bar.tf_s, new_tail, ttl_s=tail_ttl
+                flush_bars.append(bar_item)
+                self._redis.write_preview_tail_bars(
+                    bar.symbol,
+                    bar.tf_s,
+                    flush_bars,
+                    self._preview_tail_retain,
+                    ttl_s=tail_ttl,
                 )
+                del self._tail_pending[key]
                 self._tail_last_flush_ts[key] = now_t
                 self._preview_tail_updates_total += 1
                 now_ms = int(time.time() * 1000)
@@ -1034,7 +1313,7 @@ class UnifiedDataStore:
             meta["source"] = "preview_unavailable"
             return WindowResult([], meta, warnings)
 
-        tail_payload, _, tail_err = self._redis.read_preview_tail(symbol, tf_s)
+        tail_payload, _, tail_err = self._redis.read_preview_tail(symbol, tf_s, limit)
         curr_payload, _, curr_err = self._redis.read_preview_curr(symbol, tf_s)
         if tail_err is not None and curr_err is not None:
             warnings.append("preview_empty")
@@ -1046,6 +1325,9 @@ class UnifiedDataStore:
         bars: list[dict[str, Any]] = []
         source = "preview_unavailable"
         if isinstance(tail_payload, dict):
+            if isinstance(curr_payload, dict) and "source" not in tail_payload:
+                # ring зберігає лише OHLCV; source — єдиний writer ключа (curr)
+                tail_payload["source"] = curr_payload.get("source", "preview_tick")
             bars = self._preview_payload_to_bars(tail_payload, symbol, tf_s)
             if bars:
                 source = "preview_tail"
@@ -1119,22 +1401,10 @@ class UnifiedDataStore:
         if self._redis is None:
             return False
         try:
-            bar_payload = bar.to_dict()
-            event = {
-                "key": {
-                    "symbol": bar.symbol,
-                    "tf_s": int(bar.tf_s),
-                    "open_ms": int(bar.open_time_ms),
-                },
-                "bar": bar_payload,
-                "complete": True,
-                "source": str(bar.src),
-                "event_ts": int(bar.close_time_ms),
-            }
             self._redis.publish_preview_event(
                 bar.symbol,
                 int(bar.tf_s),
-                event,
+                _final_preview_event(bar),
                 self._preview_updates_retain,
             )
             return True
@@ -1147,6 +1417,30 @@ class UnifiedDataStore:
             )
             return False
 
+    def _publish_finals_to_preview_ring(self, bars: list[CandleBar]) -> None:
+        """Batch _publish_final_to_preview_ring: один publish на ключ."""
+        if self._redis is None or not bars:
+            return
+        by_key: dict[tuple[str, int], list[CandleBar]] = {}
+        for bar in bars:
+            by_key.setdefault((bar.symbol, int(bar.tf_s)), []).append(bar)
+        for (symbol, tf_s), group in by_key.items():
+            try:
+                self._redis.publish_preview_events(
+                    symbol,
+                    tf_s,
+                    [_final_preview_event(b) for b in group],
+                    self._preview_updates_retain,
+                )
+            except Exception as exc:
+                Logging.warning(
+                    "UDS: final→preview ring publish failed symbol=%s tf_s=%s bars=%s err=%s",
+                    symbol,
+                    tf_s,
+                    len(group),
+                    exc,
+                )
+
     def _publish_preview_update(
         self,
         bar_payload: dict[str, Any],
@@ -1190,6 +1484,7 @@ class UnifiedDataStore:
     def snapshot_status(self) -> dict[str, Any]:
         status: dict[str, Any] = {"boot_id": self._boot_id}
         status.update(self._ram.stats())
+        status["redis_pools"] = pool_stats()
         status["redis_enabled"] = self._redis is not None
         status["redis_spec_mismatch"] = bool(self._redis_spec_mismatch)
         status["redis_spec_mismatch_fields"] = list(self._redis_spec_mismatch_fields)
@@ -1376,6 +1671,36 @@ class UnifiedDataStore:
     def has_redis_writer(self) -> bool:
         return self._redis_writer is not None
 
+    def seal_finished_days(
+        self,
+        now_ms: int,
+        *,
+        grace_days: int = 1,
+        max_parts: Optional[int] = None,
+    ) -> dict[str, Any]:
+        """Компакція завершених днів JSONL у колонкові сегменти (disk-only).
+
+        JSONL лишається SSOT; сегмент — похідне представлення для швидкого
+        читання DiskLayer. Пізні append-и роблять сегмент stale автоматично.
+        """
+        self._ensure_writer_role("seal_finished_days")
+        stats = seal_finished_days(
+            self._data_root,
+            now_ms=now_ms,
+            grace_days=grace_days,
+            max_parts=max_parts,
+        )
+        if stats["sealed"] or stats["skipped"]:
+            Logging.info(
+                "UDS: ssot_segments sealed=%s fresh=%s rows=%s skipped=%s budget_exhausted=%s",
+                stats["sealed"],
+                stats["fresh"],
+                stats["rows"],
+                stats["skipped"],
+                stats["budget_exhausted"],
+            )
+        return stats
+
     def close(self) -> None:
         if self._jsonl is not None:
             try:
@@ -1501,19 +1826,7 @@ class UnifiedDataStore:
                 )
             return False
         try:
-            bar_payload = bar.to_dict()
-            event = {
-                "key": {
-                    "symbol": bar.symbol,
-                    "tf_s": int(bar.tf_s),
-                    "open_ms": int(bar.open_time_ms),
-                },
-                "bar": bar_payload,
-                "complete": bar.complete,
-                "source": str(bar.src),
-                "event_ts": (int(bar.close_time_ms) if bar.complete else None),
-            }
-            self._updates_bus.publish(event)
+            self._updates_bus.publish(_update_event(bar))
             return True
         except Exception as exc:
             warnings.append("updates_publish_failed")
@@ -1526,6 +1839,86 @@ class UnifiedDataStore:
             )
             return False
 
+    def _append_many_to_disk(
+        self,
+        bars: list[CandleBar],
+        ssot_write_ts_ms: Optional[int],
+        warnings_by_bar: list[list[str]],
+    ) -> list[bool]:
+        append_many = getattr(self._jsonl, "append_many", None)
+        if self._jsonl is None or append_many is None:
+            return [
+                self._append_to_disk(bar, ssot_write_ts_ms, w)
+                for bar, w in zip(bars, warnings_by_bar)
+            ]
+        try:
+            errors = list(append_many(bars))
+        except Exception as exc:  # bare_except: allow  # логується per-bar нижче
+            errors = [exc] * len(bars)
+        out: list[bool] = []
+        for bar, w, err in zip(bars, warnings_by_bar, errors):
+            if err is None:
+                out.append(True)
+                continue
+            w.append("ssot_write_failed")
+            Logging.warning(
+                "UDS: ssot write failed symbol=%s tf_s=%s err=%s",
+                bar.symbol,
+                bar.tf_s,
+                err,
+            )
+            out.append(False)
+        return out
+
+    def _write_redis_snapshots(
+        self, bars: list[CandleBar], warnings_by_bar: list[list[str]]
+    ) -> list[bool]:
+        put_bars = getattr(self._redis_writer, "put_bars", None)
+        if self._redis_writer is None or put_bars is None:
+            return [
+                self._write_redis_snapshot(bar, w)
+                for bar, w in zip(bars, warnings_by_bar)
+            ]
+        try:
+            put_bars(bars)
+            return [True] * len(bars)
+        except Exception as exc:
+            for w in warnings_by_bar:
+                w.append("redis_write_failed")
+            _METRIC_REDIS_WRITE_FAIL_TOTAL.inc(len(bars))
+            Logging.warning(
+                "[DEGRADED] [%s] [UDS] Помилка запису Redis snapshot (batch) bars=%s err=%s | %s",
+                bars[-1].symbol,
+                len(bars),
+                exc,
+                self._head_tail_marker(bars[-1]),
+            )
+            return [False] * len(bars)
+
+    def _publish_updates(
+        self, bars: list[CandleBar], warnings_by_bar: list[list[str]]
+    ) -> list[bool]:
+        publish_many = getattr(self._updates_bus, "publish_many", None)
+        if self._updates_bus is None or publish_many is None:
+            return [
+                self._publish_update(bar, w) for bar, w in zip(bars, warnings_by_bar)
+            ]
+        try:
+            publish_many([_update_event(bar) for bar in bars])
+            return [True] * len(bars)
+        except Exception as exc:
+            for w in warnings_by_bar:
+                w.append("updates_publish_failed")
+            _METRIC_PUBSUB_FAIL_TOTAL.inc(len(bars))
+            Logging.warning(
+                "[DEGRADED] [%s] [UDS] Помилка публікації updates (batch) bars=%s err=%s | %s",
+                bars[-1].symbol,
+                len(bars),
+                exc,
+                self._head_tail_marker(bars[-1]),
+            )
+            return [False] * len(bars)
+
     # ── P1: disk_policy enforcement ─────────────────────────
     def _disk_allowed(self, policy: ReadPolicy, reason: str) -> bool:
         """Перевіряє чи дозволено disk-читання згідно disk_policy.
@@ -1672,8 +2065,9 @@ class UnifiedDataStore:
             warnings.append("redis_small_tail")
             _mark_degraded(meta, "redis_small_tail")
 
+        # LRANGE лише останніх limit барів замість json.loads усього tail
         payload, ttl_left, source, err = self._redis.read_tail_or_snap(
-            spec.symbol, spec.tf_s
+            spec.symbol, spec.tf_s, spec.limit
         )
         if err is not None:
             _redis_log = Logging.warning if err == "redis_error" else Logging.info
@@ -2160,13 +2554,10 @@ def _redis_layer_from_cfg(cfg: dict[str, Any]) -> Optional[RedisLayer]:
     spec = resolve_redis_spec(cfg, role="read_layer", log=False)
     if spec is None:
         return None
-    client = redis_lib.Redis(
-        host=spec.host,
-        port=spec.port,
-        db=spec.db,
+    client = pooled_client(
+        spec,
         socket_timeout=REDIS_SOCKET_TIMEOUT_S,
         socket_connect_timeout=REDIS_SOCKET_TIMEOUT_S,
-        decode_responses=False,
     )
     return RedisLayer(client, spec.namespace)
 
@@ -2188,10 +2579,89 @@ class _RedisUpdatesBus:
         event = dict(event)
         event["seq"] = seq
         payload = json.dumps(event, ensure_ascii=False, separators=(",", ":"))
-        self._client.rpush(list_key, payload)
-        self._client.ltrim(list_key, -self._retain, -1)
+        pipe = self._client.pipeline(transaction=True)
+        pipe.rpush(list_key, payload)
+        pipe.ltrim(list_key, -self._retain, -1)
+        pipe.execute()
+        note_round_trips("updates.publish", commands=3, round_trips=2)
         return seq
 
+    def _queue_appends(
+        self, pipe: Any, sym: str, tf_s: Any, seqs: list[int], payloads: list[str]
+    ) -> int:
+        """Ставить append-и ключа у pipeline; повертає кількість команд."""
+        list_key = self._key("updates", "list", sym, str(tf_s))
+        pipe.rpush(list_key, *payloads)
+        pipe.ltrim(list_key, -self._retain, -1)
+        return 2
+
+    def publish_many(self, events: list[dict[str, Any]]) -> list[int]:
+        """Batch publish: INCRBY на ключ (блок seq) + append-и — 2 round-trip.
+
+        Порядок і seq ті самі, що в послідовних publish; повертає seq
+        кожного event у порядку входу.
+        """
+        groups: dict[tuple[str, Any], list[int]] = {}
+        for i, ev in enumerate(events):
+            sym = str(ev["key"]["symbol"]).replace("_", "/")
+            groups.setdefault((sym, ev["key"]["tf_s"]), []).append(i)
+        if not groups:
+            return []
+        pipe = self._client.pipeline(transaction=True)
+        for (sym, tf_s), idxs in groups.items():
+            pipe.incrby(self._key("updates", "seq", sym, str(tf_s)), len(idxs))
+        last_seqs = pipe.execute()
+        out = [0] * len(events)
+        pipe = self._client.pipeline(transaction=True)
+        n_cmds = 0
+        for ((sym, tf_s), idxs), last in zip(groups.items(), last_seqs):
+            first = int(last) - len(idxs) + 1
+            seqs = list(range(first, int(last) + 1))
+            payloads = []
+            for i, seq in zip(idxs, seqs):
+                event = dict(events[i])
+                event["seq"] = seq
+                payloads.append(
+                    json.dumps(event, ensure_ascii=False, separators=(",", ":"))
+                )
+                out[i] = seq
+            n_cmds += self._queue_appends(pipe, sym, tf_s, seqs, payloads)
+        pipe.execute()
+        note_round_trips(
+            "updates.publish_many", commands=len(groups) + n_cmds, round_trips=2
+        )
+        return out
+
+    def last_seqs(self, targets: Sequence[tuple[str, int]]) -> list[Optional[int]]:
+        """Останній seq кожного (symbol, tf_s) одним MGET (None — ключа ще немає)."""
+        return drive(self._client, self._last_seqs_steps(targets))
+
+    async def last_seqs_async(
+        self, targets: Sequence[tuple[str, int]]
+    ) -> Optional[list[Optional[int]]]:
+        """last_seqs через redis.asyncio; None — async клієнта немає (sync шлях)."""
+        aclient = async_twin(self._client)
+        if aclient is None:
+            return None
+        return await adrive(aclient, self._last_seqs_steps(targets))
+
+    def _last_seqs_steps(self, targets: Sequence[tuple[str, int]]) -> RedisSteps:
+        keys = [
+            self._key("updates", "seq", str(sym).replace("_", "/"), str(tf_s))
+            for sym, tf_s in targets
+        ]
+        raw = (yield "mget", (keys,), {}) if keys else []
+        note_round_trips("updates.last_seqs", commands=1, round_trips=1)
+        out: list[Optional[int]] = []
+        for val in raw:
+            if isinstance(val, bytes):
+                val = val.decode("utf-8")
+            try:
+                out.append(int(val) if val is not None else None)
+            except (TypeError, ValueError):
+                out.append(None)
+        return out
+
     def read_updates(
         self,
         symbol: str,
@@ -2199,31 +2669,47 @@ class _RedisUpdatesBus:
         since_seq: Optional[int],
         limit: int,
     ) -> tuple[list[dict[str, Any]], int, Optional[dict[str, Any]], Optional[str]]:
+        return drive(
+            self._client, self._read_updates_steps(symbol, tf_s, since_seq, limit)
+        )
+
+    async def read_updates_async(
+        self,
+        symbol: str,
+        tf_s: int,
+        since_seq: Optional[int],
+        limit: int,
+    ) -> Optional[
+        tuple[list[dict[str, Any]], int, Optional[dict[str, Any]], Optional[str]]
+    ]:
+        """read_updates через redis.asyncio; None — async клієнта немає."""
+        aclient = async_twin(self._client)
+        if aclient is None:
+            return None
+        return await adrive(
+            aclient, self._read_updates_steps(symbol, tf_s, since_seq, limit)
+        )
+
+    def _read_updates_steps(
+        self,
+        symbol: str,
+        tf_s: int,
+        since_seq: Optional[int],
+        limit: int,
+    ) -> RedisSteps:
         try:
             sym = str(symbol).replace("_", "/")
             seq_key = self._key("updates", "seq", sym, str(tf_s))
             list_key = self._key("updates", "list", sym, str(tf_s))
-            raw_list = self._client.lrange(list_key, -self._retain, -1)
+            raw_list = yield "lrange", (list_key, -self._retain, -1), {}
             events: list[dict[str, Any]] = []
             min_seq: Optional[int] = None
             max_seq: Optional[int] = None
             for raw in raw_list or []:
-                if isinstance(raw, bytes):
-                    raw = raw.decode("utf-8")
-                try:
-                    ev = json.loads(raw)
-                except Exception:
-                    Logging.debug(
-                        "UDS_UPDATES_EVENT_DECODE_FAILED symbol=%s tf_s=%s raw=%r",
-                        sym,
-                        tf_s,
-                        raw,
-                        exc_info=True,
-                    )
-                    continue
-                seq = ev.get("seq")
-                if not isinstance(seq, int):
+                ev = _decode_update_event(raw, sym, tf_s)
+                if ev is None:
                     continue
+                seq = ev["seq"]
                 if min_seq is None or seq < min_seq:
                     min_seq = seq
                 if max_seq is None or seq > max_seq:
@@ -2232,41 +2718,162 @@ class _RedisUpdatesBus:
                     continue
                 events.append(ev)
 
-            if limit > 0 and len(events) > limit:
-                events = events[-limit:]
+            return (
+                yield from self._result(
+                    seq_key, sym, tf_s, since_seq, limit, events, min_seq, max_seq
+                )
+            )
+        except Exception as exc:
+            Logging.debug(
+                "UDS_UPDATES_READ_FAILED symbol=%s tf_s=%s since_seq=%r limit=%s",
+                symbol,
+                tf_s,
+                since_seq,
+                limit,
+                exc_info=True,
+            )
+            return [], since_seq if since_seq is not None else 0, None, str(exc)
+
+    def _result(
+        self,
+        seq_key: str,
+        sym: str,
+        tf_s: int,
+        since_seq: Optional[int],
+        limit: int,
+        events: list[dict[str, Any]],
+        min_seq: Optional[int],
+        max_seq: Optional[int],
+    ) -> RedisSteps:
+        """Спільний хвіст read_updates: limit, cursor_seq, gap (min/max retained)."""
+        if limit > 0 and len(events) > limit:
+            events = events[-limit:]
+
+        cursor_seq = since_seq if since_seq is not None else 0
+        if events:
+            cursor_seq = max(ev.get("seq", 0) for ev in events)
+        else:
+            last_seq_raw = yield "get", (seq_key,), {}
+            if isinstance(last_seq_raw, bytes):
+                last_seq_raw = last_seq_raw.decode("utf-8")
+            try:
+                last_seq = int(last_seq_raw) if last_seq_raw is not None else 0
+            except Exception:
+                Logging.debug(
+                    "UDS_UPDATES_LAST_SEQ_PARSE_FAILED symbol=%s tf_s=%s raw=%r",
+                    sym,
+                    tf_s,
+                    last_seq_raw,
+                    exc_info=True,
+                )
+                last_seq = 0
+            if since_seq is None:
+                cursor_seq = last_seq
+
+        gap: Optional[dict[str, Any]] = None
+        if (
+            since_seq is not None
+            and min_seq is not None
+            and since_seq < min_seq - 1
+        ):
+            gap = {
+                "first_seq_available": min_seq,
+                "last_seq_available": max_seq if max_seq is not None else min_seq,
+            }
+        return events, int(cursor_seq), gap, None
+
+
+class _RedisStreamUpdatesBus(_RedisUpdatesBus):
+    """Updates bus на Redis Streams (updates.backend="stream").
+
+    XADD з явним id "<seq>-0" (seq — той самий INCR-лічильник, що й у list
+    backend) + MAXLEN=retain (точний, як LTRIM). Reader: XREAD від id
+    "<since_seq>-0" → лише нові events, без json.loads усього хвоста.
+    wait_updates: XREAD BLOCK по кількох стрімах — WS delta loop прокидається
+    на появу event замість фіксованого poll.
 
-            cursor_seq = since_seq if since_seq is not None else 0
+    Контракт read_updates той самий: limit → найновіші, gap коли since_seq
+    старший за перший утриманий seq.
+    """
+
+    def __init__(
+        self, client: Any, ns: str, retain: int, wait_client: Any = None
+    ) -> None:
+        super().__init__(client, ns, retain)
+        # окремий client для BLOCK (socket_timeout > block), інакше — той самий
+        self._wait_client = wait_client if wait_client is not None else client
+
+    def _stream_key(self, sym: str, tf_s: Any) -> str:
+        return self._key("updates", "stream", sym, str(tf_s))
+
+    def publish(self, event: dict[str, Any]) -> Optional[int]:
+        sym = str(event["key"]["symbol"]).replace("_", "/")
+        seq_key = self._key("updates", "seq", sym, str(event["key"]["tf_s"]))
+        stream_key = self._stream_key(sym, event["key"]["tf_s"])
+        seq = int(self._client.incr(seq_key))
+        event = dict(event)
+        event["seq"] = seq
+        payload = json.dumps(event, ensure_ascii=False, separators=(",", ":"))
+        self._client.xadd(
+            stream_key,
+            {"e": payload},
+            id="%d-0" % seq,
+            maxlen=self._retain,
+            approximate=False,
+        )
+        note_round_trips("updates.publish", commands=2, round_trips=2)
+        return seq
+
+    def _queue_appends(
+        self, pipe: Any, sym: str, tf_s: Any, seqs: list[int], payloads: list[str]
+    ) -> int:
+        stream_key = self._stream_key(sym, tf_s)
+        for seq, payload in zip(seqs, payloads):
+            pipe.xadd(
+                stream_key,
+                {"e": payload},
+                id="%d-0" % seq,
+                maxlen=self._retain,
+                approximate=False,
+            )
+        return len(seqs)
+
+    def _read_updates_steps(
+        self,
+        symbol: str,
+        tf_s: int,
+        since_seq: Optional[int],
+        limit: int,
+    ) -> RedisSteps:
+        try:
+            sym = str(symbol).replace("_", "/")
+            seq_key = self._key("updates", "seq", sym, str(tf_s))
+            stream_key = self._stream_key(sym, tf_s)
+            start_id = _stream_id(since_seq)
+            resp = yield "xread", ({stream_key: start_id},), {"count": self._retain}
+            events: list[dict[str, Any]] = []
+            for _name, entries in resp or []:
+                for _entry_id, fields in entries:
+                    raw = fields.get(b"e", fields.get("e")) if fields else None
+                    ev = _decode_update_event(raw, sym, tf_s)
+                    if ev is not None:
+                        events.append(ev)
+
+            min_seq: Optional[int] = None
+            max_seq: Optional[int] = None
             if events:
-                cursor_seq = max(ev.get("seq", 0) for ev in events)
-            else:
-                last_seq_raw = self._client.get(seq_key)
-                if isinstance(last_seq_raw, bytes):
-                    last_seq_raw = last_seq_raw.decode("utf-8")
-                try:
-                    last_seq = int(last_seq_raw) if last_seq_raw is not None else 0
-                except Exception:
-                    Logging.debug(
-                        "UDS_UPDATES_LAST_SEQ_PARSE_FAILED symbol=%s tf_s=%s raw=%r",
-                        sym,
-                        tf_s,
-                        last_seq_raw,
-                        exc_info=True,
-                    )
-                    last_seq = 0
-                if since_seq is None:
-                    cursor_seq = last_seq
-
-            gap: Optional[dict[str, Any]] = None
-            if (
-                since_seq is not None
-                and min_seq is not None
-                and since_seq < min_seq - 1
-            ):
-                gap = {
-                    "first_seq_available": min_seq,
-                    "last_seq_available": max_seq if max_seq is not None else min_seq,
-                }
-            return events, int(cursor_seq), gap, None
+                max_seq = events[-1]["seq"]
+                min_seq = events[0]["seq"]
+                if since_seq is not None and min_seq > since_seq + 1:
+                    # gap лише якщо до since_seq нічого не утримано (як list)
+                    head = yield "xrange", (stream_key,), {"count": 1}
+                    if head:
+                        min_seq = _stream_id_seq(head[0][0])
+            return (
+                yield from self._result(
+                    seq_key, sym, tf_s, since_seq, limit, events, min_seq, max_seq
+                )
+            )
         except Exception as exc:
             Logging.debug(
                 "UDS_UPDATES_READ_FAILED symbol=%s tf_s=%s since_seq=%r limit=%s",
@@ -2278,6 +2885,98 @@ class _RedisUpdatesBus:
             )
             return [], since_seq if since_seq is not None else 0, None, str(exc)
 
+    def wait_updates(
+        self,
+        cursors: Mapping[tuple[str, int], Optional[int]],
+        timeout_s: float,
+    ) -> Optional[set[tuple[str, int]]]:
+        """Блокує до появи events після cursor (або timeout) → цілі з новими events.
+
+        cursor None → лише нові ("$"). Порожній set — timeout. None — помилка
+        Redis (caller деградує до звичайного poll).
+        """
+        return drive(self._wait_client, self._wait_updates_steps(cursors, timeout_s))
+
+    async def wait_updates_async(
+        self,
+        cursors: Mapping[tuple[str, int], Optional[int]],
+        timeout_s: float,
+    ) -> Optional[set[tuple[str, int]]]:
+        """wait_updates через redis.asyncio: XREAD BLOCK без потоку-очікувача.
+
+        Raises LookupError якщо async клієнта немає (caller — sync шлях).
+        """
+        aclient = async_twin(self._wait_client)
+        if aclient is None:
+            raise LookupError("async_redis_unavailable")
+        return await adrive(aclient, self._wait_updates_steps(cursors, timeout_s))
+
+    def _wait_updates_steps(
+        self,
+        cursors: Mapping[tuple[str, int], Optional[int]],
+        timeout_s: float,
+    ) -> RedisSteps:
+        if not cursors:
+            return set()
+        by_key: dict[str, tuple[str, int]] = {}
+        streams: dict[str, str] = {}
+        for (symbol, tf_s), since_seq in cursors.items():
+            sym = str(symbol).replace("_", "/")
+            key = self._stream_key(sym, tf_s)
+            by_key[key] = (symbol, tf_s)
+            streams[key] = _stream_id(since_seq) if since_seq is not None else "$"
+        block_ms = int(max(0.0, min(float(timeout_s), UPDATES_WAIT_MAX_S)) * 1000)
+        try:
+            resp = yield "xread", (streams,), {"count": 1, "block": max(1, block_ms)}
+        except Exception:
+            Logging.debug(
+                "UDS_UPDATES_WAIT_FAILED streams=%s", len(streams), exc_info=True
+            )
+            return None
+        woke: set[tuple[str, int]] = set()
+        for name, _entries in resp or []:
+            if isinstance(name, bytes):
+                name = name.decode("utf-8")
+            target = by_key.get(name)
+            if target is not None:
+                woke.add(target)
+        return woke
+
+
+def _stream_id(since_seq: Optional[int]) -> str:
+    """since_seq → id для XREAD (exclusive): "<seq>-0"; None/<=0 → з початку."""
+    if since_seq is None or since_seq <= 0:
+        return "0-0"
+    return "%d-0" % int(since_seq)
+
+
+def _stream_id_seq(entry_id: Any) -> int:
+    if isinstance(entry_id, bytes):
+        entry_id = entry_id.decode("ascii")
+    return int(str(entry_id).split("-", 1)[0])
+
+
+def _decode_update_event(raw: Any, sym: str, tf_s: int) -> Optional[dict[str, Any]]:
+    """JSON event з updates bus → dict з int seq; інакше None (debug лог)."""
+    if raw is None:
+        return None
+    if isinstance(raw, bytes):
+        raw = raw.decode("utf-8")
+    try:
+        ev = json.loads(raw)
+    except Exception:
+        Logging.debug(
+            "UDS_UPDATES_EVENT_DECODE_FAILED symbol=%s tf_s=%s raw=%r",
+            sym,
+            tf_s,
+            raw,
+            exc_info=True,
+        )
+        return None
+    if not isinstance(ev, dict) or not isinstance(ev.get("seq"), int):
+        return None
+    return ev
+
 
 def _updates_bus_from_cfg(cfg: dict[str, Any]) -> Optional[_RedisUpdatesBus]:
     if redis_lib is None:
@@ -2287,6 +2986,7 @@ def _updates_bus_from_cfg(cfg: dict[str, Any]) -> Optional[_RedisUpdatesBus]:
         return None
     updates_cfg = cfg.get("updates")
     retain = UPDATES_REDIS_RETAIN_DEFAULT
+    backend = UPDATES_BACKEND_DEFAULT
     if isinstance(updates_cfg, dict):
         try:
             retain = int(updates_cfg.get("retain", retain))
@@ -2297,17 +2997,59 @@ def _updates_bus_from_cfg(cfg: dict[str, Any]) -> Optional[_RedisUpdatesBus]:
                 exc_info=True,
             )
             retain = UPDATES_REDIS_RETAIN_DEFAULT
-    client = redis_lib.Redis(
-        host=spec.host,
-        port=spec.port,
-        db=spec.db,
+        backend = str(updates_cfg.get("backend", backend)).lower()
+        if backend not in ("list", "stream"):
+            Logging.warning(
+                "UDS_UPDATES_BACKEND_UNKNOWN backend=%r → %s",
+                updates_cfg.get("backend"),
+                UPDATES_BACKEND_DEFAULT,
+            )
+            backend = UPDATES_BACKEND_DEFAULT
+    client = pooled_client(
+        spec,
         socket_timeout=REDIS_SOCKET_TIMEOUT_S,
         socket_connect_timeout=REDIS_SOCKET_TIMEOUT_S,
-        decode_responses=False,
     )
+    if backend == "stream":
+        # BLOCK-з'єднання — окремий пул (довший socket_timeout)
+        wait_client = pooled_client(
+            spec,
+            socket_timeout=UPDATES_WAIT_MAX_S + REDIS_SOCKET_TIMEOUT_S,
+            socket_connect_timeout=REDIS_SOCKET_TIMEOUT_S,
+        )
+        return _RedisStreamUpdatesBus(client, spec.namespace, retain, wait_client)
     return _RedisUpdatesBus(client, spec.namespace, retain)
 
 
+def _ram_layer_from_cfg(cfg: dict[str, Any]) -> RamLayer:
+    ram_cfg = cfg.get("ram_layer")
+    if not isinstance(ram_cfg, dict):
+        ram_cfg = {}
+    values = {
+        "max_bars": RAM_MAX_BARS_DEFAULT,
+        "max_total_bars": RAM_MAX_TOTAL_BARS_DEFAULT,
+        "max_bytes": RAM_MAX_BYTES_DEFAULT,
+    }
+    for name, cfg_key in (
+        ("max_bars", "max_bars_per_key"),
+        ("max_total_bars", "max_total_bars"),
+        ("max_bytes", "max_bytes"),
+    ):
+        raw = ram_cfg.get(cfg_key)
+        if raw is None:
+            continue
+        try:
+            values[name] = int(raw)
+        except Exception:
+            Logging.warning(
+                "UDS_RAM_CFG_INVALID key=%s raw=%r → default %s",
+                cfg_key,
+                raw,
+                values[name],
+            )
+    return RamLayer(**values)
+
+
 def _opt_int(value: Any) -> Optional[int]:
     if value is None:
         return None
@@ -2377,16 +3119,9 @@ def build_uds_from_config(
             fsync=bool(cfg.get("ssot_jsonl_fsync", False)),
         )
         redis_writer = build_redis_snapshot_writer(config_path)
-    # S6.5: RAM cache dynamic для обох ролей (writer і reader)
-    # symbols × TFs ≈ 13×8 = 104 + запас; max_keys=8 hardcode → LRU thrashing
-    n_symbols = len(cfg.get("symbols", []))
-    if n_symbols < 1:
-        n_symbols = 1
-    n_tfs = len(tf_allowlist)
-    if n_tfs < 1:
-        n_tfs = 8
-    ram_max_keys = max(n_symbols * n_tfs + 16, 128)
-    ram_layer = RamLayer(max_keys=ram_max_keys, max_bars=60000)
+    # S6.5: RAM cache для обох ролей (writer і reader); бюджети bars/bytes
+    # замість max_keys (symbols × TFs × різна глибина вікон)
+    ram_layer = _ram_layer_from_cfg(cfg)
 
     # ADR-0017: replay mode → UI/WS reader не читає з диску.
     # Replay process пише в Redis, UI бачить тільки replayed бари.
@@ -2397,7 +3132,7 @@ def build_uds_from_config(
     if replay_mode:
         Logging.info("UDS_REPLAY_MODE disk=NullDiskLayer (V3_REPLAY_MODE=1)")
 
-    return UnifiedDataStore(
+    uds = UnifiedDataStore(
         data_root=data_root,
         boot_id=boot_id,
         tf_allowlist=tf_allowlist,
@@ -2417,3 +3152,8 @@ def build_uds_from_config(
             cfg.get("preview_curr_ttl_s", _DEFAULT_PREVIEW_CURR_TTL_S)
         ),
     )
+    if updates_bus is not None:
+        from runtime.store.window_cache import WindowCache
+
+        uds.window_cache = WindowCache.from_config(uds, cfg)
+    return uds
@@ -0,0 +1,250 @@
+"""Read-through кеш tail-вікон UDS.read_window для API/TDA читачів процесу.
+
+Ключ: (symbol, tf_s, limit_class, cold_load, policy). limit_class — найменший
+клас із limit_classes, що покриває spec.limit. Вікно читається один раз на
+класі й нарізається до потрібного limit (tail), тож bars/window (200),
+TDA cascade (30..96), smc/zones і smc/levels (1, 9) ділять одне читання.
+
+Інвалідація — курсор updates bus (last seq per (symbol, tf_s)): кожен
+commit_final_bar інкрементує seq ключа, тож вікно з тим самим курсором
+ідентичне. Курсори всіх TF запиту — один MGET (UDS.updates_cursors).
+Без bus / помилка курсора → пряме read_window (bypass), кеш не ризикує
+віддати застаріле вікно. max_age_s — верхня межа життя запису навіть за
+незмінного курсора (prime/rebuild без updates events).
+
+Декодовані форми (CandleBar, wire dict) кешуються per запис через
+decoded(name, fn): конвертер викликається раз на рядок на commit. Результати
+спільні між споживачами — лише для читання.
+
+Invariants:
+  S1 — read-only: кеш лише читає UDS.
+  Вікна з warnings (prime pending, degraded, fallback) не кешуються.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+from runtime.store.uds import ReadPolicy, WindowSpec
+
+log = logging.getLogger("uds.window_cache")
+
+DEFAULT_LIMIT_CLASSES = (16, 64, 256)
+DEFAULT_MAX_ENTRIES = 512
+DEFAULT_MAX_AGE_S = 30.0
+# Скільки послідовник чекає на лідера, що вже читає той самий ключ
+_INFLIGHT_WAIT_S = 5.0
+_STATS_EMIT_INTERVAL_S = 60.0
+
+_Key = Tuple[str, int, int, bool, ReadPolicy]
+
+
+class _Entry:
+    __slots__ = ("cursor", "rows", "loaded_ts", "decoded")
+
+    def __init__(self, cursor: int, rows: List[Dict[str, Any]], loaded_ts: float) -> None:
+        self.cursor = cursor
+        self.rows = rows
+        self.loaded_ts = loaded_ts
+        self.decoded: Dict[Hashable, List[Any]] = {}
+
+
+class CachedWindow:
+    """Tail-зріз запису кешу (або прямого читання при bypass)."""
+
+    __slots__ = ("_entry", "_start", "_lock")
+
+    def __init__(self, entry: _Entry, limit: int, lock: threading.Lock) -> None:
+        self._entry = entry
+        self._start = max(0, len(entry.rows) - limit) if limit > 0 else 0
+        self._lock = lock
+
+    @property
+    def rows(self) -> List[Dict[str, Any]]:
+        """bars_lwc рядки вікна (ASC, як у read_window)."""
+        return self._entry.rows[self._start :]
+
+    def decoded(self, name: Hashable, fn: Callable[[Dict[str, Any]], Any]) -> List[Any]:
+        """fn(row) для кожного рядка вікна, memo per запис; None-результати відкидаються.
+
+        name ідентифікує конвертер (разом з усім, що він замикає: symbol, tf_s).
+        """
+        entry = self._entry
+        with self._lock:
+            full = entry.decoded.get(name)
+        if full is None:
+            full = [fn(r) for r in entry.rows]
+            with self._lock:
+                full = entry.decoded.setdefault(name, full)
+        return [x for x in full[self._start :] if x is not None]
+
+
+class WindowCache:
+    """Process-level read-through кеш вікон поверх UDS (див. модуль)."""
+
+    def __init__(
+        self,
+        uds: Any,
+        *,
+        limit_classes: Sequence[int] = DEFAULT_LIMIT_CLASSES,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        max_age_s: float = DEFAULT_MAX_AGE_S,
+    ) -> None:
+        self._uds = uds
+        self._limit_classes = sorted({int(x) for x in limit_classes if int(x) > 0})
+        self._max_entries = max(1, int(max_entries))
+        self._max_age_s = max(0.0, float(max_age_s))
+        self._lock = threading.Lock()
+        self._entries: Dict[_Key, _Entry] = {}
+        self._inflight: Dict[_Key, threading.Event] = {}
+        self._stats: Dict[str, int] = {}
+        self._stats_last_emit_ts = time.monotonic()
+
+    @classmethod
+    def from_config(cls, uds: Any, cfg: Dict[str, Any]) -> Optional["WindowCache"]:
+        """config.json:window_cache → WindowCache або None (enabled=false)."""
+        raw = cfg.get("window_cache")
+        section = raw if isinstance(raw, dict) else {}
+        if not bool(section.get("enabled", True)):
+            return None
+        return cls(
+            uds,
+            limit_classes=section.get("limit_classes", DEFAULT_LIMIT_CLASSES),
+            max_entries=int(section.get("max_entries", DEFAULT_MAX_ENTRIES)),
+            max_age_s=float(section.get("max_age_s", DEFAULT_MAX_AGE_S)),
+        )
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            out = dict(self._stats)
+            out["entries"] = len(self._entries)
+        return out
+
+    def read(self, spec: WindowSpec, policy: ReadPolicy) -> CachedWindow:
+        return self.read_many([spec], policy)[0]
+
+    def read_many(
+        self, specs: Sequence[WindowSpec], policy: ReadPolicy
+    ) -> List[CachedWindow]:
+        """Вікна для кількох spec; курсори всіх cacheable ключів — один MGET."""
+        keys: List[Optional[_Key]] = [self._key(s, policy) for s in specs]
+        targets = [(s.symbol, s.tf_s) for s, k in zip(specs, keys) if k is not None]
+        cursors: Dict[Tuple[str, int], int] = {}
+        if targets:
+            raw = self._cursors(targets)
+            if raw is not None:
+                cursors = {t: c for t, c in zip(targets, raw) if c is not None}
+        out: List[CachedWindow] = []
+        for spec, key in zip(specs, keys):
+            cursor = cursors.get((spec.symbol, spec.tf_s)) if key is not None else None
+            if key is None or cursor is None:
+                self._inc("bypass")
+                out.append(_direct(self._uds, spec, policy, self._lock))
+                continue
+            out.append(CachedWindow(self._get(key, cursor, spec, policy), spec.limit, self._lock))
+        self._maybe_emit_stats()
+        return out
+
+    # ── internals ───────────────────────────────────────────
+
+    def _key(self, spec: WindowSpec, policy: ReadPolicy) -> Optional[_Key]:
+        if spec.since_open_ms is not None or spec.to_open_ms is not None:
+            return None
+        if policy.force_disk or spec.limit <= 0:
+            return None
+        for limit_class in self._limit_classes:
+            if spec.limit <= limit_class:
+                return (spec.symbol, int(spec.tf_s), limit_class, bool(spec.cold_load), policy)
+        return None
+
+    def _cursors(self, targets: List[Tuple[str, int]]) -> Optional[List[Optional[int]]]:
+        getter = getattr(self._uds, "updates_cursors", None)
+        if getter is None:
+            return None
+        try:
+            return getter(targets)
+        except Exception:
+            log.debug("WINDOW_CACHE_CURSOR_FAILED targets=%d", len(targets), exc_info=True)
+            return None
+
+    def _get(self, key: _Key, cursor: int, spec: WindowSpec, policy: ReadPolicy) -> _Entry:
+        waited = False
+        while True:
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and self._fresh(entry, cursor):
+                    self._stats["hit"] = self._stats.get("hit", 0) + 1
+                    return entry
+                event = self._inflight.get(key)
+                if event is None or waited:
+                    leader = event is None
+                    if leader:
+                        self._inflight[key] = threading.Event()
+                    break
+            # Інший потік уже читає цей ключ — чекаємо його результат (single-flight)
+            event.wait(_INFLIGHT_WAIT_S)
+            waited = True
+        try:
+            self._inc("miss")
+            full = WindowSpec(
+                symbol=spec.symbol, tf_s=spec.tf_s, limit=key[2], cold_load=spec.cold_load
+            )
+            result = self._uds.read_window(full, policy)
+            rows = list(getattr(result, "bars_lwc", None) or [])
+            entry = _Entry(cursor, rows, time.monotonic())
+            if result is None or getattr(result, "warnings", None):
+                self._inc("uncacheable")
+                return entry
+            with self._lock:
+                self._entries.pop(key, None)
+                self._entries[key] = entry
+                while len(self._entries) > self._max_entries:
+                    self._entries.pop(next(iter(self._entries)))
+                    self._stats["evicted"] = self._stats.get("evicted", 0) + 1
+            return entry
+        finally:
+            if leader:
+                with self._lock:
+                    done = self._inflight.pop(key, None)
+                if done is not None:
+                    done.set()
+
+    def _fresh(self, entry: _Entry, cursor: int) -> bool:
+        if entry.cursor != cursor:
+            return False
+        return time.monotonic() - entry.loaded_ts <= self._max_age_s
+
+    def _inc(self, key: str) -> None:
+        with self._lock:
+            self._stats[key] = self._stats.get(key, 0) + 1
+
+    def _maybe_emit_stats(self) -> None:
+        now = time.monotonic()
+        if now - self._stats_last_emit_ts < _STATS_EMIT_INTERVAL_S:
+            return
+        self._stats_last_emit_ts = now
+        stats = self.stats()
+        with self._lock:
+            self._stats = {}
+        if len(stats) > 1:
+            log.info("WINDOW_CACHE_STATS %s", json.dumps(stats, sort_keys=True))
+
+
+def _direct(uds: Any, spec: WindowSpec, policy: ReadPolicy, lock: threading.Lock) -> CachedWindow:
+    """Пряме read_window без кешу (bypass / UDS без window_cache)."""
+    result = uds.read_window(spec, policy)
+    rows = list(getattr(result, "bars_lwc", None) or [])
+    return CachedWindow(_Entry(-1, rows, 0.0), 0, lock)
+
+
+def read_windows(uds: Any, specs: Sequence[WindowSpec], policy: ReadPolicy) -> List[CachedWindow]:
+    """Вікна через uds.window_cache (якщо є), інакше пряме read_window на кожен spec."""
+    cache = getattr(uds, "window_cache", None)
+    if isinstance(cache, WindowCache):
+        return cache.read_many(specs, policy)
+    lock = threading.Lock()
+    return [_direct(uds, spec, policy, lock) for spec in specs]
@@ -28,6 +28,7 @@ from aiohttp import web
 # ── Core lifecycle ───────────────────────────────────────────────────────
 APP_HEARTBEAT_S = web.AppKey("heartbeat_s", int)
 APP_DELTA_POLL_S = web.AppKey("delta_poll_s", float)
+APP_DELTA_MIN_INTERVAL_S = web.AppKey("delta_min_interval_s", float)
 APP_WS_SESSIONS = web.AppKey("ws_sessions", dict)
 APP_CONFIG_PATH = web.AppKey("config_path", str)
 APP_BOOT_ID = web.AppKey("boot_id", str)
@@ -24,11 +24,12 @@ import os
 import time
 import uuid
 from concurrent.futures import ThreadPoolExecutor
-from typing import Any, Dict, Optional, Protocol, cast
+from typing import Any, Dict, Optional, Protocol, Tuple, cast
 
 from aiohttp import web, WSMsgType
 
 from runtime.ws.candle_map import map_bars_to_candles_v4
+from runtime.store.redis_pool import async_twin
 from core.config_loader import (
     load_system_config,
     resolve_config_path,
@@ -44,6 +45,7 @@ DEFAULT_HOST = "127.0.0.1"
 DEFAULT_PORT = 8000
 DEFAULT_HEARTBEAT_S = 30
 DEFAULT_DELTA_POLL_S = 2.0
+DEFAULT_DELTA_MIN_INTERVAL_S = 0.1  # rail для wake-on-arrival (stream updates bus)
 DEFAULT_BG_SMC_POLL_S = 10.0
 DEFAULT_COLD_START_BARS = 300
 
@@ -104,6 +106,7 @@ from runtime.ws.app_keys import (  # noqa: E402
     APP_CONFIG_PATH,
     APP_CORS_ORIGINS,
     APP_D1_TICK_RELAY_TFS,
+    APP_DELTA_MIN_INTERVAL_S,
     APP_DELTA_POLL_S,
     APP_FULL_CONFIG,
     APP_GLOBAL_DELTA_TASK,
@@ -742,11 +745,27 @@ async def _uds_read_updates(
         limit=500,
         include_preview=include_preview,
     )
+    # redis.asyncio шлях — без executor; None → шар без async клієнта
+    reader = getattr(uds, "read_updates_async", None)
+    if reader is not None:
+        result = await reader(spec)
+        if result is not None:
+            return result
     loop = asyncio.get_event_loop()
     executor = app[APP_UDS_EXECUTOR]
     return await loop.run_in_executor(executor, uds.read_updates, spec)
 
 
+async def _tick_redis_get(app: web.Application, tick_redis: Any, key: str) -> Any:
+    """GET tick:last — redis.asyncio у loop, інакше sync client в executor."""
+    client = async_twin(tick_redis)
+    if client is not None:
+        return await client.get(key)
+    return await asyncio.get_event_loop().run_in_executor(
+        app[APP_UDS_EXECUTOR], tick_redis.get, key
+    )
+
+
 async def _send_full_frame(session: WsSession, app: web.Application) -> None:
     """Р§РёС‚Р°С” UDS read_window в†’ map в†’ full frame в†’ send."""
     if session.symbol is None or session.tf_s is None:
@@ -949,23 +968,58 @@ async def _send_full_frame(session: WsSession, app: web.Application) -> None:
         _log.warning("WS_FULL_FRAME_ERROR client=%s err=%s", session.client_id, exc)
 
 
+# Sentinel для meta.seq у шаблоні broadcast (не буває реальним seq: seq >= 1)
+_SEQ_SENTINEL = -9007199254740991
+_SEQ_MARKER = '"seq": %d' % _SEQ_SENTINEL
+
+
+def _encode_seq_template(frame: Dict[str, Any]) -> Optional[Tuple[str, str]]:
+    """Серіалізує frame один раз → (prefix, suffix) навколо значення meta.seq.
+
+    payload(seq) = prefix + str(seq) + suffix — байт-у-байт те саме, що
+    json.dumps(frame) з meta.seq = seq. None → шаблон неоднозначний (маркер
+    зустрівся не рівно один раз) або meta відсутня: caller серіалізує per-client.
+    """
+    meta = frame.get("meta")
+    if not isinstance(meta, dict):
+        return None
+    prev = meta.get("seq")
+    meta["seq"] = _SEQ_SENTINEL
+    try:
+        payload = json.dumps(frame)
+    finally:
+        meta["seq"] = prev
+    head, sep, tail = payload.partition(_SEQ_MARKER)
+    if not sep or _SEQ_MARKER in tail:
+        return None
+    return head + '"seq": ', tail
+
+
 async def _safe_broadcast(
     frame: Dict[str, Any],
     recipients: tuple,
     sessions: Dict[str, "WsSession"],
     timeout_s: float = BROADCAST_SEND_TIMEOUT_S,
 ) -> float:
-    """ADR-0011 BC5+BC6: broadcast Р· per-client seq + timeout + degraded-but-loud.
+    """ADR-0011 BC5+BC6: broadcast з per-client seq + timeout + degraded-but-loud.
 
-    Р”Р»СЏ РєРѕР¶РЅРѕРіРѕ РєР»С–С”РЅС‚Р°: С–РЅР¶РµРєС‚РёС‚СЊ session.next_seq() РІ meta.seq,
-    СЃРµСЂС–Р°Р»С–Р·СѓС”, РІС–РґРїСЂР°РІР»СЏС” Р· timeout. РџРѕРІРµСЂС‚Р°С” t_send_ms.
+    Frame серіалізується один раз (_encode_seq_template); для кожного клієнта
+    у готовий payload вставляється лише session.next_seq(), відправка з
+    timeout. Повертає t_send_ms.
     """
     if not recipients:
         return 0.0
 
+    # Serialize-once: тіло frame кодується один раз, per-client лише seq.
+    template = _encode_seq_template(frame)
+
     async def _guarded_send(s: "WsSession") -> None:
-        frame["meta"]["seq"] = s.next_seq()
-        payload = json.dumps(frame)
+        seq = s.next_seq()
+        if template is not None:
+            payload = template[0] + str(seq) + template[1]
+        else:
+            frame["meta"]["seq"] = seq
+            payload = json.dumps(frame)
         await asyncio.wait_for(s.ws.send_str(payload), timeout=timeout_s)
 
     t1 = time.perf_counter()
@@ -1065,9 +1119,85 @@ def _seed_forming_from_uds(
     }
 
 
+def _delta_wait_cursors(
+    sessions: Dict[str, WsSession],
+) -> Dict[tuple[str, int], Optional[int]]:
+    """(symbol, tf_s) → min last_update_seq підписників (None — лише adopt)."""
+    cursors: Dict[tuple[str, int], Optional[int]] = {}
+    for sess in (sessions or {}).values():
+        if sess.ws.closed or sess.symbol is None or sess.tf_s is None:
+            continue
+        target = (sess.symbol, sess.tf_s)
+        seq = sess.last_update_seq
+        prev = cursors.get(target)
+        if target not in cursors or (
+            seq is not None and (prev is None or seq < prev)
+        ):
+            cursors[target] = seq
+    return cursors
+
+
+_NO_ASYNC_WAIT = object()
+
+
+async def _wait_updates_async(uds: Any, cursors: Dict, poll_s: float) -> Any:
+    """UDS.wait_updates_async або _NO_ASYNC_WAIT (нема redis.asyncio / bus)."""
+    waiter = getattr(uds, "wait_updates_async", None)
+    if waiter is None:
+        return _NO_ASYNC_WAIT
+    try:
+        return await waiter(cursors, poll_s)
+    except LookupError:  # bare_except: allow  # bus без async шляху → sync wait
+        return _NO_ASYNC_WAIT
+
+
+async def _wait_delta_tick(
+    app: web.Application,
+    wait_executor: ThreadPoolExecutor,
+    poll_s: float,
+    min_interval_s: float,
+) -> None:
+    """Пауза між тіками delta loop.
+
+    Stream updates bus (UDS.wait_updates): XREAD BLOCK до poll_s — loop
+    прокидається на появу final event, не чекаючи повний інтервал. BLOCK
+    іде через redis.asyncio у самому loop; без async клієнта — на
+    wait_executor. Інакше (list backend / Redis down / нема підписників) —
+    sleep(poll_s).
+    Rail: не частіше за min_interval_s, щоб cursor, що не просувається,
+    не перетворив loop на busy-wait.
+    """
+    loop = asyncio.get_event_loop()
+    started = loop.time()
+    uds = app[APP_UDS] if APP_UDS in app else None
+    waiter = getattr(uds, "wait_updates", None)
+    woke = None
+    if waiter is not None:
+        cursors = _delta_wait_cursors(app.get(APP_WS_SESSIONS, {}))
+        if cursors:
+            try:
+                woke = await _wait_updates_async(uds, cursors, poll_s)
+                if woke is _NO_ASYNC_WAIT:
+                    woke = await loop.run_in_executor(
+                        wait_executor, waiter, cursors, poll_s
+                    )
+            except Exception:
+                _log.debug("WS_DELTA_WAIT_ERR", exc_info=True)
+                woke = None
+    if woke is None:
+        await asyncio.sleep(max(0.0, poll_s - (loop.time() - started)))
+        return
+    elapsed = loop.time() - started
+    if elapsed < min_interval_s:
+        await asyncio.sleep(min_interval_s - elapsed)
+
+
 async def _global_delta_loop(app: web.Application) -> None:
     """ADR-0011: Global Background task: poll UDS read_updates в†’ serialize once в†’ fanout."""
     poll_s = app.get(APP_DELTA_POLL_S, DEFAULT_DELTA_POLL_S)
+    min_interval_s = app.get(APP_DELTA_MIN_INTERVAL_S, DEFAULT_DELTA_MIN_INTERVAL_S)
+    # окремий потік під blocking XREAD — не займає APP_UDS_EXECUTOR
+    wait_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="uds_wait")
     preview_tfs: set = app.get(APP_PREVIEW_TF_SET, set())
     forming_by_target: Dict[tuple[str, int], Dict[str, Any]] = (
         {}
@@ -1077,6 +1207,7 @@ async def _global_delta_loop(app: web.Application) -> None:
 
     # O3-sleep: dedicated Redis client for viewer signal (lightweight, best-effort)
     _viewer_redis = None
+    _viewer_async = None
     _viewer_ns = "v3_local"
     try:
         from runtime.store.redis_spec import resolve_redis_spec
@@ -1095,6 +1226,8 @@ async def _global_delta_loop(app: web.Application) -> None:
                 decode_responses=False,
             )
             _viewer_ns = _v_spec.namespace
+            # SET раз на тік — async twin у loop (None → sync client)
+            _viewer_async = async_twin(_viewer_redis)
     except Exception:
         _log.warning(
             "VIEWER_REDIS_INIT_FAIL: viewer Redis init failed, tick_preview falls back to normal throttle",
@@ -1103,7 +1236,7 @@ async def _global_delta_loop(app: web.Application) -> None:
 
     try:
         while True:
-            await asyncio.sleep(poll_s)
+            await _wait_delta_tick(app, wait_executor, poll_s, min_interval_s)
             sessions: Dict[str, WsSession] = app.get(APP_WS_SESSIONS, {})
 
             # O3-sleep: publish active viewer count to Redis for tick_preview_worker
@@ -1115,7 +1248,10 @@ async def _global_delta_loop(app: web.Application) -> None:
             if _viewer_redis is not None:
                 try:
                     _vk = f"{_viewer_ns}:ws:viewer_count"
-                    _viewer_redis.set(_vk, str(active_count), ex=30)
+                    if _viewer_async is not None:
+                        await _viewer_async.set(_vk, str(active_count), ex=30)
+                    else:
+                        _viewer_redis.set(_vk, str(active_count), ex=30)
                 except Exception:
                     _log.warning(
                         "VIEWER_REDIS_SET_FAIL: cannot publish viewer_count to Redis",
@@ -1167,12 +1303,8 @@ async def _global_delta_loop(app: web.Application) -> None:
                                 tick_key = (
                                     f"{tick_ns}:tick:last:{symbol.replace('/', '_')}"
                                 )
-                                tick_raw = (
-                                    await asyncio.get_event_loop().run_in_executor(
-                                        app[APP_UDS_EXECUTOR],
-                                        tick_redis.get,
-                                        tick_key,
-                                    )
+                                tick_raw = await _tick_redis_get(
+                                    app, tick_redis, tick_key
                                 )
                                 if tick_raw:
                                     tick_data = json.loads(tick_raw)
@@ -1608,6 +1740,8 @@ async def _global_delta_loop(app: web.Application) -> None:
     except asyncio.CancelledError:
         _log.debug("WS_GLOBAL_DELTA_CANCELLED")
         pass
+    finally:
+        wait_executor.shutdown(wait=False)
 
 
 async def _bg_smc_feed_loop(app: web.Application) -> None:
@@ -2047,6 +2181,9 @@ def build_app(
     app[APP_DELTA_POLL_S] = float(
         ws_cfg.get("delta_poll_interval_s", DEFAULT_DELTA_POLL_S)
     )
+    app[APP_DELTA_MIN_INTERVAL_S] = float(
+        ws_cfg.get("delta_min_interval_s", DEFAULT_DELTA_MIN_INTERVAL_S)
+    )
     app[APP_WS_SESSIONS] = {}
     app[APP_CONFIG_PATH] = config_path
     app[APP_BOOT_ID] = uuid.uuid4().hex[:16]
@@ -2071,18 +2208,13 @@ def build_app(
     _d1_relay_tfs = app[APP_D1_TICK_RELAY_TFS]
     if _d1_relay_enabled and _d1_relay_tfs:
         try:
+            from runtime.store.redis_pool import pooled_client
             from runtime.store.redis_spec import resolve_redis_spec
-            import redis as _redis_lib
 
             spec = resolve_redis_spec(full_cfg, role="tick_relay", log=False)
             if spec is not None:
-                app[APP_TICK_REDIS_CLIENT] = _redis_lib.Redis(
-                    host=spec.host,
-                    port=spec.port,
-                    db=spec.db,
-                    socket_timeout=2.0,
-                    socket_connect_timeout=2.0,
-                    decode_responses=False,
+                app[APP_TICK_REDIS_CLIENT] = pooled_client(
+                    spec, socket_timeout=2.0, socket_connect_timeout=2.0
                 )
                 app[APP_TICK_REDIS_NS] = spec.namespace
                 _log.info(
@@ -2252,6 +2384,8 @@ def build_app(
     if bool(_api_v3_cfg.get("enabled", False)):
         try:
             from runtime.api_v3.endpoints import register_routes as _register_api_v3
+            from runtime.api_v3.local_cache import LocalCacheConfig as _LocalCacheConfig
+            from runtime.api_v3.response_cache import ResponseCache as _ResponseCache
             from runtime.api_v3.token_store import TokenStore as _TokenStore
 
             if _agent_redis_client is None:
@@ -2259,12 +2393,37 @@ def build_app(
             _signals_dir = str(_api_v3_cfg.get("signals_dir", "data_v3/_signals"))
             _audit_dir_cfg = _api_v3_cfg.get("audit_dir", "data_v3/_audit")
             _audit_dir = str(_audit_dir_cfg) if _audit_dir_cfg else None
-            _token_store = _TokenStore(_agent_redis_client, namespace=_agent_ns)
+            # Локальні кеші token / kill flag + pub/sub інвалідація
+            _local_cache = _LocalCacheConfig.from_config(full_cfg or {})
+            _token_store = _TokenStore(
+                _agent_redis_client,
+                namespace=_agent_ns,
+                cache_ttl_s=_local_cache.token_cache_ttl_s,
+                cache_max_entries=_local_cache.token_max_entries,
+            )
+            _response_cache = _ResponseCache.from_config(full_cfg or {})
+            # Per-consumer rate limit (ADR-0076 F6), лічильники в Redis батчами
+            _rate_limit_cfg = _api_v3_cfg.get("rate_limit") or {}
+            _rate_limiter = None
+            if bool(_rate_limit_cfg.get("enabled", False)):
+                from runtime.api.rate_limit import (
+                    LocalRateLimiter as _LocalRateLimiter,
+                    RateLimitConfig as _RateLimitConfig,
+                )
+
+                _rate_limiter = _LocalRateLimiter(
+                    _agent_redis_client,
+                    _RateLimitConfig.from_mapping(
+                        {"key_prefix": f"{_agent_ns}:api_v3:ratelimit:", **_rate_limit_cfg}
+                    ),
+                )
             _register_api_v3(
                 app,
                 token_store=_token_store,
                 signals_dir=_signals_dir,
                 audit_dir=_audit_dir,
+                response_cache=_response_cache,
+                rate_limiter=_rate_limiter,
             )
             # ADR-0059 §3.4 (slice 059.4) — analysis kill switch.
             # Mounted unconditionally when api_v3 is enabled so the
@@ -2276,18 +2435,35 @@ def build_app(
             )
 
             _analysis_enabled = bool(_api_v3_cfg.get("analysis_enabled", True))
-            _register_kill_switch(
+            _kill_switch = _register_kill_switch(
                 app,
                 redis_client=_agent_redis_client,
                 namespace=_agent_ns,
                 analysis_enabled=_analysis_enabled,
+                cache_ttl_s=_local_cache.kill_cache_ttl_s,
             )
+            if _local_cache.enabled:
+                from runtime.api_v3.local_cache import (
+                    register_invalidation_listener as _register_invalidation,
+                )
+
+                _register_invalidation(
+                    app,
+                    redis_client=_agent_redis_client,
+                    namespace=_agent_ns,
+                    token_store=_token_store,
+                    kill_switch=_kill_switch,
+                )
             _log.info(
-                "API_V3_ENABLED: ns=%s signals_dir=%s audit_dir=%s analysis_enabled=%s",
+                "API_V3_ENABLED: ns=%s signals_dir=%s audit_dir=%s analysis_enabled=%s"
+                " response_cache=%s local_cache=%s rate_limit=%s",
                 _agent_ns,
                 _signals_dir,
                 _audit_dir or "DISABLED",
                 _analysis_enabled,
+                "on" if _response_cache is not None else "off",
+                "on" if _local_cache.enabled else "off",
+                "on" if _rate_limiter is not None else "off",
             )
         except Exception as _av3_exc:  # pragma: no cover — surfaced loud
             _log.warning("API_V3_INIT_FAIL: %s", _av3_exc)
@@ -3353,9 +3529,7 @@ def build_app(
             if tick_redis is not None:
                 tick_ns = app[APP_TICK_REDIS_NS]
                 tick_key = f"{tick_ns}:tick:last:{symbol.replace('/', '_')}"
-                tick_raw = await asyncio.get_event_loop().run_in_executor(
-                    app[APP_UDS_EXECUTOR], tick_redis.get, tick_key
-                )
+                tick_raw = await _tick_redis_get(app, tick_redis, tick_key)
                 if tick_raw:
                     tick_data = json.loads(tick_raw)
                     _tp = float(tick_data.get("mid", 0))
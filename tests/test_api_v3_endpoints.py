@@ -212,6 +212,53 @@ async def test_redis_error_returns_503(
     assert body["data"]["code"] == "auth_backend_unavailable"
 
 
+class _CounterRedis:
+    """INCRBY/EXPIRE pipeline — мінімум для LocalRateLimiter."""
+
+    def __init__(self) -> None:
+        self.kv: Dict[str, int] = {}
+
+    def pipeline(self, transaction: bool = True) -> "_CounterRedis":
+        self._ops: List[Any] = []
+        return self
+
+    def incrby(self, key: str, n: int) -> None:
+        self._ops.append(key)
+        self.kv[key] = self.kv.get(key, 0) + n
+
+    def expire(self, key: str, ttl: int) -> None:
+        self._ops.append(True)
+
+    def execute(self) -> List[Any]:
+        return [self.kv[op] if isinstance(op, str) else op for op in self._ops]
+
+
+async def test_rate_limited_consumer_gets_429(
+    token_store, signals_dir, smc_runner, aiohttp_client
+):
+    from runtime.api.rate_limit import LocalRateLimiter, RateLimitConfig
+
+    redis = _CounterRedis()
+    app = _build_app(
+        token_store=token_store, signals_dir=signals_dir, smc_runner=smc_runner
+    )
+    app[ep.APP_RATE_LIMITER] = LocalRateLimiter(
+        redis,  # type: ignore[arg-type]
+        RateLimitConfig(enabled=True, requests_per_minute=2, key_prefix="rl:"),
+    )
+    cl = await aiohttp_client(app)
+    statuses = []
+    for _ in range(3):
+        resp = await cl.get("/api/v3/macro/context", headers=_auth())
+        statuses.append(resp.status)
+    assert statuses == [200, 200, 429]
+    body = await resp.json()
+    assert body["data"]["code"] == "rate_limited"
+    assert int(resp.headers["Retry-After"]) == body["data"]["retry_after_s"] >= 1
+    assert sum(redis.kv.values()) == 3
+    assert all(k.startswith("rl:old_news_bot:") for k in redis.kv)
+
+
 # ────────────────────────────────────────────────────────────
 # /api/v3/signals/latest
 # ────────────────────────────────────────────────────────────
@@ -0,0 +1,306 @@
+"""api_v3.local_cache: кеш TokenStore / KillSwitch, pub/sub інвалідація,
+LocalRateLimiter (батч-синхронізація з Redis, fail-open)."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+
+import pytest
+from redis.exceptions import RedisError
+
+from runtime.api import rate_limit as rl
+from runtime.api_v3 import kill_switch as ks
+from runtime.api_v3 import local_cache as lc
+from runtime.api_v3 import token_store as ts
+from runtime.api_v3.kill_switch import KillSwitch
+from runtime.api_v3.token_store import TokenStore, token_redis_key
+
+NS = "ns"
+TOKEN = "tk_" + "b" * 64
+
+
+class _Clock:
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class _FakeRedis:
+    """kv + INCRBY/EXPIRE pipeline; `down=True` → RedisError на кожну команду."""
+
+    def __init__(self) -> None:
+        self.kv = {}
+        self.calls = []
+        self.down = False
+        self.on_get = None
+
+    def _cmd(self, name):
+        if self.down:
+            raise RedisError("down")
+        self.calls.append(name)
+
+    def get(self, key):
+        self._cmd("get")
+        if self.on_get is not None:
+            self.on_get()
+        return self.kv.get(key)
+
+    def exists(self, key):
+        self._cmd("exists")
+        return int(key in self.kv)
+
+    def incr(self, key):
+        return self.incrby(key, 1)
+
+    def incrby(self, key, n):
+        self._cmd("incrby")
+        self.kv[key] = int(self.kv.get(key, 0)) + n
+        return self.kv[key]
+
+    def expire(self, key, ttl):
+        self._cmd("expire")
+        return True
+
+    def pipeline(self, transaction=True):
+        return _Pipe(self)
+
+
+class _Pipe:
+    def __init__(self, client):
+        self._client = client
+        self._ops = []
+
+    def incrby(self, key, n):
+        self._ops.append(("incrby", key, n))
+
+    def expire(self, key, ttl):
+        self._ops.append(("expire", key, ttl))
+
+    def execute(self):
+        self._client._cmd("execute")
+        return [getattr(self._client, op)(*args) for op, *args in self._ops]
+
+
+def _store(client, clock, monkeypatch, ttl=30.0, max_entries=1024):
+    if clock is not None:
+        monkeypatch.setattr(ts.time, "monotonic", clock)
+    client.kv[token_redis_key(NS, TOKEN)] = json.dumps(
+        {"consumer": "bot", "scope": "read", "created": "c", "expires": "e"}
+    )
+    return TokenStore(client, NS, cache_ttl_s=ttl, cache_max_entries=max_entries)
+
+
+def test_token_cache_hit_ttl_and_invalidate(monkeypatch) -> None:
+    client, clock = _FakeRedis(), _Clock()
+    store = _store(client, clock, monkeypatch)
+    first = store.lookup(TOKEN)
+    assert first is not None and first.consumer == "bot"
+    assert store.lookup(TOKEN) == first
+    assert asyncio.run(store.lookup_async(TOKEN)) == first
+    assert client.calls == ["get"] and store.cache_hits == 2
+
+    client.down = True  # кешований токен обслуговується і без Redis
+    assert store.lookup(TOKEN) == first
+    clock.now += 31  # TTL минув → промах → fail-closed як раніше
+    with pytest.raises(RedisError):
+        store.lookup(TOKEN)
+    client.down = False
+
+    store.lookup(TOKEN)
+    del client.kv[token_redis_key(NS, TOKEN)]  # revoke ...
+    lc.apply_invalidation(b"token:" + TOKEN.encode(), token_store=store, kill_switch=None)
+    assert store.lookup(TOKEN) is None  # ... видно одразу
+    assert store.lookup(TOKEN) is None
+    assert client.calls.count("get") == 4  # негативні відповіді не кешуються
+
+
+def test_token_cache_revoke_during_get_and_lru(monkeypatch) -> None:
+    client, clock = _FakeRedis(), _Clock()
+    store = _store(client, clock, monkeypatch, max_entries=2)
+    client.on_get = lambda: store.invalidate(TOKEN)  # revoke між GET і put
+    assert store.lookup(TOKEN) is not None
+    client.on_get = None
+    assert store.lookup(TOKEN) is not None
+    assert client.calls == ["get", "get"]
+
+    others = ["tk_" + c * 64 for c in "cd"]
+    for tok in others:
+        client.kv[token_redis_key(NS, tok)] = json.dumps({"consumer": tok, "scope": "read"})
+        store.lookup(tok)
+    assert TOKEN not in store._cache and len(store._cache) == 2
+
+    plain = TokenStore(client, NS)  # cache_ttl_s=0 → GET на кожен виклик
+    plain.lookup(TOKEN)
+    plain.lookup(TOKEN)
+    assert client.calls.count("get") == 6
+
+
+def test_kill_switch_cache(monkeypatch) -> None:
+    client, clock = _FakeRedis(), _Clock()
+    monkeypatch.setattr(ks.time, "monotonic", clock)
+    switch = KillSwitch(redis_client=client, namespace=NS, analysis_enabled=True,
+                        cache_ttl_s=2.0)
+    assert switch.is_killed() == (False, None)
+    client.kv[switch.redis_key] = "1"
+    assert asyncio.run(switch.is_killed_async()) == (False, None)  # з кешу
+    lc.apply_invalidation("kill", token_store=None, kill_switch=switch)
+    assert switch.is_killed() == (True, "analysis_disabled_runtime")
+    assert client.calls == ["exists", "exists"]
+    clock.now += 2.5
+    del client.kv[switch.redis_key]
+    client.down = True  # помилки не кешуються: fail-open на кожен запит
+    assert switch.is_killed() == (False, None)
+    assert switch.is_killed() == (False, None)
+    assert switch.fail_open_count == 2
+    off = KillSwitch(redis_client=client, namespace=NS, analysis_enabled=False,
+                     cache_ttl_s=2.0)
+    assert off.is_killed() == (True, "analysis_disabled_config")
+
+
+def test_local_cache_config() -> None:
+    assert lc.LocalCacheConfig.from_config({}).token_cache_ttl_s == 0.0
+    cfg = lc.LocalCacheConfig.from_config(
+        {"api_v3": {"local_cache": {"enabled": True, "token_ttl_s": 10, "kill_ttl_s": 1}}}
+    )
+    assert (cfg.token_cache_ttl_s, cfg.kill_cache_ttl_s, cfg.token_max_entries) == (
+        10.0, 1.0, 1024,
+    )
+
+
+class _FakePubSub:
+    def __init__(self, script):
+        self.script = script
+        self.subscribed = []
+        self.closed = False
+
+    async def subscribe(self, channel):
+        self.subscribed.append(channel)
+
+    async def get_message(self, timeout=0.0):
+        await asyncio.sleep(0)
+        if not self.script:
+            await asyncio.sleep(3600)
+        item = self.script.pop(0)
+        if isinstance(item, Exception):
+            raise item
+        return item
+
+    async def aclose(self):
+        self.closed = True
+
+
+def test_invalidation_listener_applies_and_flushes_on_reconnect(monkeypatch) -> None:
+    client = _FakeRedis()
+    store = _store(client, None, monkeypatch)  # реальний clock: loop.sleep
+    switch = KillSwitch(redis_client=client, namespace=NS, analysis_enabled=True,
+                        cache_ttl_s=60.0)
+    other = "tk_" + "e" * 64
+    client.kv[token_redis_key(NS, other)] = json.dumps({"consumer": "o", "scope": "read"})
+    first = _FakePubSub([
+        {"type": "message", "data": "token:" + TOKEN},
+        ConnectionError("lost"),
+    ])
+    second = _FakePubSub([])
+    subs = [first, second]
+
+    class _Async:
+        def pubsub(self, ignore_subscribe_messages=False):
+            return subs.pop(0)
+
+    monkeypatch.setattr(lc, "async_twin", lambda c: _Async())
+
+    async def _run():
+        task = asyncio.create_task(
+            lc.run_invalidation_listener(client, NS, token_store=store,
+                                         kill_switch=switch, retry_s=0.01)
+        )
+        await asyncio.sleep(0)
+        for tok in (TOKEN, other):
+            store.lookup(tok)
+        switch.is_killed()
+        while not second.subscribed:
+            await asyncio.sleep(0.005)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(_run())
+    assert first.subscribed == [lc.invalidation_channel(NS)] and first.closed
+    # token:<TOKEN> прибрав один запис, reconnect скинув решту
+    assert store._cache == {} and switch._cached is None
+    assert second.closed
+
+
+def test_local_rate_limiter_matches_per_call_limiter() -> None:
+    rnd = random.Random(3)
+    cfg = rl.RateLimitConfig(enabled=True, requests_per_minute=5, window_seconds=60)
+    local_client, plain_client = _FakeRedis(), _FakeRedis()
+    limiter = rl.LocalRateLimiter(local_client, cfg)
+    ts_s = 0.0
+    for _ in range(300):
+        ts_s += rnd.uniform(0.0, 3.0)
+        ident = rnd.choice(["a", "b", "c"])
+        assert limiter.check_and_consume(ident, ts_s) == rl.check_and_consume(
+            plain_client, ident, cfg, ts_s
+        )
+    assert local_client.kv == plain_client.kv
+
+
+def test_local_rate_limiter_batches_and_fails_open() -> None:
+    cfg = rl.RateLimitConfig(enabled=True, requests_per_minute=30, window_seconds=60,
+                             sync_interval_s=5.0, sync_batch=10)
+    client = _FakeRedis()
+    client.kv["ratelimit:peer:0"] = 12  # інший воркер уже витратив 12
+    limiter = rl.LocalRateLimiter(client, cfg)
+    results = [limiter.check_and_consume("peer", 1.0 + i * 0.1) for i in range(25)]
+    assert client.calls.count("execute") == 3  # перший виклик + 2 батчі по 10
+    assert results[:18] == [(True, 0)] * 18
+    assert results[18][0] is False  # 12 чужих + 19 локальних > 30
+    assert client.kv["ratelimit:peer:0"] == 12 + 21  # 4 ще pending
+
+    client.down = True
+    assert limiter.check_and_consume("peer", 9.0) == (True, -1)  # fail-open
+    assert limiter.check_and_consume("peer", 9.1) == (True, -1)
+    client.down = False
+    assert limiter.check_and_consume("peer", 9.2)[0] is False
+    assert client.kv["ratelimit:peer:0"] == 12 + 28  # pending не загублені
+    assert limiter.check_and_consume("peer", 61.0) == (True, 0)  # нове вікно
+    assert list(limiter._windows) == ["ratelimit:peer:1"]
+
+
+def test_local_rate_limiter_prunes_state_while_degraded() -> None:
+    cfg = rl.RateLimitConfig(enabled=True, requests_per_minute=100, window_seconds=60,
+                             sync_interval_s=5.0, max_keys=3)
+    client = _FakeRedis()
+    client.down = True
+    limiter = rl.LocalRateLimiter(client, cfg)
+    for i in range(5):
+        assert limiter.check_and_consume(f"id{i}", 1.0) == (True, -1)
+    assert len(limiter._windows) == 3  # max_keys: найстаріші витіснено
+    assert limiter._pending_total == 3
+    assert limiter.check_and_consume("id0", 61.0) == (True, -1)
+    # нове вікно скинуло минулі разом із pending, хоч Redis досі down
+    assert list(limiter._windows) == ["ratelimit:id0:1"]
+    assert limiter._pending_total == 1
+    client.down = False
+    assert limiter.check_and_consume("id0", 61.5) == (True, 0)
+    assert client.kv == {"ratelimit:id0:1": 2}
+
+
+def test_local_rate_limiter_async_matches_sync() -> None:
+    cfg = rl.RateLimitConfig(enabled=True, requests_per_minute=3, window_seconds=60,
+                             sync_interval_s=1.0)
+    sync_limiter = rl.LocalRateLimiter(_FakeRedis(), cfg)
+    async_limiter = rl.LocalRateLimiter(_FakeRedis(), cfg)
+
+    async def _run():
+        return [await async_limiter.check_and_consume_async("a", 1.0 + i * 0.4)
+                for i in range(6)]
+
+    expected = [sync_limiter.check_and_consume("a", 1.0 + i * 0.4) for i in range(6)]
+    assert asyncio.run(_run()) == expected
+    assert expected[3][0] is False
@@ -0,0 +1,215 @@
+"""Response cache /api/v3: pre-encoded тіла, ETag/If-None-Match → 304, hit ratio per route."""
+
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Any, Dict, List, Optional, cast
+
+import pytest
+from aiohttp import web
+
+from runtime.api_v3 import endpoints as ep
+from runtime.api_v3.response_cache import ResponseCache, etag_matches
+
+VALID_TOKEN = "tk_" + ("c" * 64)
+SYM = "XAU/USD"
+
+
+class _StubRecord:
+    consumer = "test_consumer"
+    scope = "read"
+    created = "2026-04-01T00:00:00Z"
+    expires = "2026-12-31T00:00:00Z"
+
+
+class _StubTokenStore:
+    def lookup(self, token: Optional[str]):
+        return _StubRecord() if token == VALID_TOKEN else None
+
+
+class _StubWindowResult:
+    def __init__(self, bars_lwc: List[Dict[str, Any]]) -> None:
+        self.bars_lwc = bars_lwc
+        self.meta: Dict[str, Any] = {}
+        self.warnings: List[str] = []
+
+
+class _StubUds:
+    """read_window + updates_cursors з керованим seq per (symbol, tf)."""
+
+    def __init__(self) -> None:
+        self.bars = {tf: [_bar(tf, i) for i in range(20)] for tf in (900, 3600, 14400)}
+        self.seq = {(SYM, tf): 1 for tf in self.bars}
+        self.reads = 0
+
+    def read_window(self, spec: Any, _policy: Any) -> _StubWindowResult:
+        self.reads += 1
+        rows = self.bars.get(spec.tf_s, [])
+        return _StubWindowResult(list(rows[-spec.limit :]))
+
+    def updates_cursors(self, targets):
+        return [self.seq.get(t) for t in targets]
+
+    def commit(self, tf_s: int) -> None:
+        self.bars[tf_s].append(_bar(tf_s, len(self.bars[tf_s])))
+        self.seq[(SYM, tf_s)] += 1
+
+
+class _StubRunner:
+    def __init__(self) -> None:
+        self.version = 1
+        self.price = 2000.0
+        self.narrative_calls = 0
+
+    def state_version(self, symbol: str) -> int:
+        return self.version
+
+    def get_last_price(self, symbol: str) -> float:
+        return self.price
+
+    def get_narrative(self, symbol: str, tf_s: int, price: float, atr: float):
+        self.narrative_calls += 1
+        return _StubBlock(self.narrative_calls)
+
+
+class _StubBlock:
+    def __init__(self, n: int) -> None:
+        self.n = n
+
+    def to_wire(self) -> Dict[str, Any]:
+        return {"mode": "wait", "headline": f"block {self.n}"}
+
+
+def _bar(tf_s: int, i: int) -> Dict[str, Any]:
+    open_ms = 1_700_000_000_000 + i * tf_s * 1000
+    return {
+        "time": open_ms // 1000, "open": 1.0 + i, "high": 2.0 + i, "low": 0.5 + i,
+        "close": 1.5 + i, "volume": 1.0, "open_time_ms": open_ms, "complete": True,
+    }
+
+
+def _build_app(uds: Any, runner: Any, tmp_path: Path, cache: Optional[ResponseCache]):
+    from runtime.ws.app_keys import APP_FULL_CONFIG, APP_SMC_RUNNER, APP_UDS
+
+    app = web.Application()
+    app[APP_UDS] = cast(Any, uds)
+    app[APP_SMC_RUNNER] = cast(Any, runner)
+    app[APP_FULL_CONFIG] = {"symbols": [SYM]}
+    ep.register_routes(
+        app,
+        token_store=_StubTokenStore(),  # type: ignore[arg-type]
+        signals_dir=str(tmp_path),
+        audit_dir=None,
+        response_cache=cache,
+    )
+    return app
+
+
+def _auth(**extra: str) -> Dict[str, str]:
+    return {"X-API-Key": VALID_TOKEN, **extra}
+
+
+URL = "/api/v3/bars/window?symbol=XAU/USD&tfs=M15,H1&count=50"
+
+
+@pytest.mark.asyncio
+async def test_bars_window_hit_304_and_invalidation(aiohttp_client, tmp_path) -> None:
+    uds = _StubUds()
+    cache = ResponseCache()
+    client = await aiohttp_client(_build_app(uds, _StubRunner(), tmp_path, cache))
+
+    first = await client.get(URL, headers=_auth())
+    assert first.status == 200
+    etag = first.headers["ETag"]
+    body = await first.read()
+    reads = uds.reads
+
+    second = await client.get(URL, headers=_auth())
+    assert second.status == 200 and await second.read() == body
+    assert second.headers["ETag"] == etag and uds.reads == reads  # pre-encoded hit
+
+    nm = await client.get(URL, headers=_auth(**{"If-None-Match": f'"x", W/{etag}'}))
+    assert nm.status == 304 and nm.headers["ETag"] == etag and await nm.read() == b""
+
+    # інший набір параметрів — окремий ключ
+    other = await client.get(URL.replace("count=50", "count=60"), headers=_auth())
+    assert other.status == 200 and other.headers["ETag"] != etag
+
+    uds.commit(3600)  # новий final H1 → нова версія
+    fresh = await client.get(URL, headers=_auth(**{"If-None-Match": etag}))
+    assert fresh.status == 200 and fresh.headers["ETag"] != etag
+    assert uds.reads > reads
+    assert (await fresh.json())["data"]["bars"]["H1"][-1]["open_ms"] == uds.bars[3600][-1]["open_time_ms"]
+
+    stats = cache.stats()["bars_window"]
+    assert stats == {"hit": 1, "not_modified": 1, "miss": 3, "bypass": 0, "hit_ratio": 0.4}
+
+
+@pytest.mark.asyncio
+async def test_narrative_cached_per_state_and_price(aiohttp_client, tmp_path) -> None:
+    runner = _StubRunner()
+    cache = ResponseCache()
+    client = await aiohttp_client(_build_app(_StubUds(), runner, tmp_path, cache))
+    url = "/api/v3/narrative/snapshot?symbol=XAU/USD&tf=900"
+
+    a = await (await client.get(url, headers=_auth())).json()
+    b = await (await client.get(url, headers=_auth())).json()
+    assert a == b and runner.narrative_calls == 1
+
+    runner.price = 2001.0
+    c = await (await client.get(url, headers=_auth())).json()
+    runner.version += 1
+    await client.get(url, headers=_auth())
+    assert runner.narrative_calls == 3 and c["data"]["current_price"] == 2001.0
+    assert cache.stats()["narrative_snapshot"]["hit"] == 1
+
+
+@pytest.mark.asyncio
+async def test_bypass_without_versions_or_cache(aiohttp_client, tmp_path) -> None:
+    uds = _StubUds()
+    uds.updates_cursors = None  # type: ignore[assignment]  # UDS без updates bus
+    cache = ResponseCache()
+    client = await aiohttp_client(_build_app(uds, _StubRunner(), tmp_path, cache))
+    for _ in range(2):
+        resp = await client.get(URL, headers=_auth())
+        assert resp.status == 200 and "ETag" not in resp.headers
+    assert uds.reads == 4
+    assert cache.stats()["bars_window"]["bypass"] == 2
+
+    plain = _StubUds()
+    client = await aiohttp_client(_build_app(plain, _StubRunner(), tmp_path, None))
+    resp = await client.get(URL, headers=_auth())
+    assert resp.status == 200 and "ETag" not in resp.headers
+
+
+def test_entries_replace_versions_expire_and_lru() -> None:
+    class _Req:
+        headers: Dict[str, str] = {}
+
+    req = cast(Any, _Req())
+    cache = ResponseCache(max_entries=2, max_age_s=60)
+    for version in (1, 2):
+        lookup = cache.lookup(req, "r", ("a",), (version,))
+        assert lookup.response is None
+        lookup.store(web.Response(body=b"v%d" % version, content_type="application/json"))
+    assert len(cache._entries) == 1  # новий version заміщує старий запис
+    assert cache.lookup(req, "r", ("a",), (2,)).response.body == b"v2"
+    assert cache.lookup(req, "r", ("a",), (1,)).response is None
+
+    cache.lookup(req, "r", ("b",), (1,)).store(web.Response(body=b"b", status=200))
+    cache.lookup(req, "r", ("c",), (1,)).store(web.Response(body=b"c", status=200))
+    assert ("r", ("a",)) not in cache._entries  # LRU
+    cache.lookup(req, "r", ("d",), (1,)).store(web.Response(body=b"e", status=503))
+    assert ("r", ("d",)) not in cache._entries  # лише 200
+
+    expired = ResponseCache(max_age_s=0)
+    expired.lookup(req, "r", ("a",), (1,)).store(web.Response(body=b"x"))
+    expired._entries[("r", ("a",))] = expired._entries[("r", ("a",))][:3] + (0.0,)
+    assert expired.lookup(req, "r", ("a",), (1,)).response is None
+
+
+def test_etag_matches() -> None:
+    assert etag_matches('"a", "b"', '"b"')
+    assert etag_matches('W/"b"', '"b"')
+    assert etag_matches("*", '"b"')
+    assert not etag_matches(None, '"b"') and not etag_matches('"bb"', '"b"')
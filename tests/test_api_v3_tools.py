@@ -135,6 +135,10 @@ class TestRevokeToken:
         rc = revoke_token.main(["--token", token])
         assert rc == 0
         redis_mock.delete.assert_called_once_with(token_redis_key("test_ns", token))
+        # servers with api_v3.local_cache drop the cached record immediately
+        redis_mock.publish.assert_called_once_with(
+            "test_ns:api_v3:invalidate", "token:" + token
+        )
 
     def test_revoke_by_token_not_found(self, redis_mock: MagicMock) -> None:
         token = TOKEN_PREFIX + "f" * 64
@@ -166,6 +170,10 @@ class TestRevokeToken:
         rc = revoke_token.main(["--consumer", "target_bot"])
         assert rc == 0
         assert redis_mock.delete.call_count == 2
+        assert [c.args[1] for c in redis_mock.publish.call_args_list] == [
+            "token:" + token_a,
+            "token:" + token_c,
+        ]
 
     def test_revoke_consumer_not_found(self, redis_mock: MagicMock) -> None:
         redis_mock.scan.return_value = (0, [])
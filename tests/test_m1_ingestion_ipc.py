@@ -1,7 +1,10 @@
 from __future__ import annotations
 
 import json
+import types
 
+from core.model.bars import CandleBar, ms_to_utc_dt
+from runtime.ingest import broker_sidecar, m1_ingestion_worker
 from runtime.ingest.m1_ingestion_worker import BrokerRedisProxy
 from runtime.ingest.polling import m1_poller as m1_poller_module
 
@@ -135,3 +138,220 @@ def test_poll_once_empty_fetch_still_runs_recovery_and_stale(monkeypatch):
     poller.poll_once()
 
     assert calls == ["recover", ("stale", 1710000300000)]
+
+
+class _LoopbackRedis(_FakeRedis):
+    """Команди з cmd queue одразу обслуговує broker_sidecar._handle_command."""
+
+    def __init__(self, provider):
+        super().__init__()
+        self._provider = provider
+        self.cmd_pushes = 0
+        self.reconnects = 0
+
+    def rpush(self, key, value):
+        if not key.endswith(":broker:m1:cmd"):
+            return super().rpush(key, value)
+        self.cmd_pushes += 1
+        if broker_sidecar._handle_command(self._provider, value, self, "legacy"):
+            self.reconnects += 1
+        return 1
+
+    def expire(self, key, ttl):
+        return True
+
+    def ltrim(self, key, start, end):
+        return True
+
+    def pipeline(self, transaction=True):
+        return _Pipe(self)
+
+
+class _Pipe:
+    def __init__(self, client):
+        self._client = client
+        self._ops = []
+
+    def __getattr__(self, name):
+        def _queue(*args):
+            self._ops.append((name, args))
+
+        return _queue
+
+    def execute(self):
+        self._client.pipelines = getattr(self._client, "pipelines", 0) + 1
+        return [getattr(self._client, n)(*a) for n, a in self._ops]
+
+
+class _FxcmStub:
+    """Бари M1 до date_to (у зворотному порядку, як FXCM); BAD → виняток."""
+
+    def __init__(self):
+        self.calls = []
+
+    def fetch_last_n_m1(self, symbol, n, date_to_utc=None):
+        self.calls.append((symbol, n, date_to_utc))
+        if symbol == "BAD":
+            raise RuntimeError("session lost")
+        end_ms = int(date_to_utc.timestamp() * 1000)
+        return [
+            CandleBar(symbol=symbol, tf_s=60, open_time_ms=end_ms - i * 60_000,
+                      close_time_ms=end_ms - i * 60_000 + 60_000, o=1.0, h=2.0,
+                      low=0.5, c=1.5, v=3.0, complete=True, src="history")
+            for i in range(n)
+        ]
+
+    def consume_last_error(self):
+        return None
+
+
+def test_broker_proxy_batch_single_round_trip():
+    stub = _FxcmStub()
+    fake_redis = _LoopbackRedis(stub)
+    proxy = BrokerRedisProxy(fake_redis, "v3_local")
+    date_to = ms_to_utc_dt(1710000300000)
+
+    got = proxy.fetch_m1_batch([("XAU/USD", 3, date_to), ("BAD", 2, None),
+                                ("NAS100", 2, date_to)])
+
+    assert fake_redis.cmd_pushes == 1 and len(fake_redis.blpop_keys) == 1
+    assert fake_redis.pipelines == 1 and fake_redis.reconnects == 1
+    assert [len(bars) for bars in got] == [3, 0, 2]
+    assert got[2][0].symbol == "NAS100"
+    assert got[0] == proxy.fetch_last_n_m1("XAU/USD", n=3, date_to_utc=date_to)
+    assert fake_redis.blpop_keys[0] in fake_redis.deleted_keys
+    assert proxy.fetch_m1_batch([]) == [] and fake_redis.cmd_pushes == 2
+
+
+def test_broker_proxy_batch_splits_at_sidecar_limit():
+    assert m1_ingestion_worker._BATCH_MAX_ITEMS == broker_sidecar._MAX_BATCH_ITEMS
+    stub = _FxcmStub()
+    fake_redis = _LoopbackRedis(stub)
+    proxy = BrokerRedisProxy(fake_redis, "v3_local")
+    date_to = ms_to_utc_dt(1710000300000)
+    requests = [("S%03d" % i, 1 + i % 3, date_to) for i in range(130)]
+
+    got = proxy.fetch_m1_batch(requests)
+
+    # 64 + 64 + 2: жоден чанк не впирається в batch_too_large
+    assert fake_redis.cmd_pushes == 3 and len(fake_redis.blpop_keys) == 3
+    assert [len(bars) for bars in got] == [n for _, n, _ in requests]
+    assert [bars[0].symbol for bars in got] == [sym for sym, _, _ in requests]
+
+
+def test_broker_proxy_batch_wait_is_capped(monkeypatch):
+    clock = [1000.0]
+
+    class _SilentRedis(_FakeRedis):
+        def __init__(self):
+            super().__init__()
+            self.timeouts = []
+
+        def blpop(self, key, timeout=None):
+            self.timeouts.append(timeout)
+            clock[0] += timeout  # sidecar мовчить — чекаємо повний timeout
+            return super().blpop(key, timeout)
+
+    monkeypatch.setattr(
+        m1_ingestion_worker, "time", types.SimpleNamespace(monotonic=lambda: clock[0])
+    )
+    fake_redis = _SilentRedis()
+    proxy = BrokerRedisProxy(fake_redis, "v3_local")
+
+    got = proxy.fetch_m1_batch([("S%03d" % i, 1, None) for i in range(70)])
+
+    budget = m1_ingestion_worker._BATCH_WAIT_BUDGET_S
+    assert budget < 60
+    # 64-item чанк просив би 15 + 5*63 s; обрізано до бюджету, другий не чекає
+    assert fake_redis.timeouts == [budget]
+    assert got == [[] for _ in range(70)]
+    assert len(fake_redis.deleted_keys) == 2
+
+
+def test_runner_batched_cycle_matches_per_symbol_poll(monkeypatch):
+    symbols = ["XAU/USD", "BAD", "NAS100", "EUR/USD"]
+    now_ms = 1710000300000
+    monkeypatch.setattr(m1_poller_module, "_utc_now_ms", lambda: now_ms)
+    monkeypatch.setattr(
+        m1_poller_module,
+        "_expected_closed_m1_calendar",
+        lambda calendar, now_ms: 1710000240000,
+    )
+
+    def _run(batched):
+        stub = _FxcmStub()
+        proxy = BrokerRedisProxy(_LoopbackRedis(stub), "v3_local")
+        log = []
+        pollers = []
+        for sym in symbols:
+            p = m1_poller_module.M1SymbolPoller(
+                symbol=sym, provider=proxy, uds=object(), calendar=None
+            )
+            p._watermark_ms = 1710000000000  # noqa: SLF001
+            if sym == "EUR/USD":
+                p._watermark_ms = 1710000240000  # caught up → без fetch  # noqa: SLF001
+            monkeypatch.setattr(
+                p, "_ingest_bars",
+                lambda bars, s=sym: log.append((s, [b.open_time_ms for b in bars])),
+            )
+            monkeypatch.setattr(p, "_live_recover_check", lambda s=sym: log.append(s))
+            pollers.append(p)
+        runner = m1_poller_module.M1PollerRunner(
+            pollers, proxy, uds=object(), redis_tail_n={}, batch_fetch=batched
+        )
+        if batched:
+            errors = runner._poll_cycle_batched()  # noqa: SLF001
+        else:
+            errors = 0
+            for p in pollers:
+                p.poll_once()
+        return log, stub.calls, [p.stats for p in pollers], errors, proxy
+
+    seq_log, seq_calls, seq_stats, _, _ = _run(False)
+    batch_log, batch_calls, batch_stats, errors, proxy = _run(True)
+    assert batch_log == seq_log and batch_calls == seq_calls
+    assert batch_stats == seq_stats and errors == 0
+    assert ("XAU/USD", [1710000060000, 1710000120000, 1710000180000, 1710000240000]) in batch_log
+    assert proxy._redis.cmd_pushes == 1  # noqa: SLF001
+
+    class _Broken:
+        def fetch_m1_batch(self, requests):
+            raise ConnectionError("redis down")
+
+    pollers = [
+        m1_poller_module.M1SymbolPoller(symbol=s, provider=None, uds=object(), calendar=None)
+        for s in symbols[:2]
+    ]
+    runner = m1_poller_module.M1PollerRunner(
+        pollers, _Broken(), uds=object(), redis_tail_n={}, batch_fetch=True
+    )
+    for p in pollers:
+        monkeypatch.setattr(p, "_stale_check", lambda now_ms: None)
+        monkeypatch.setattr(p, "_live_recover_check", lambda: None)
+    assert runner._poll_cycle_batched() == 2  # noqa: SLF001
+    assert [p.stats["errors"] for p in pollers] == [1, 1]
+
+
+def test_ingestion_worker_runner_seals_segments(monkeypatch):
+    cfg = {
+        "symbols": ["XAU/USD"],
+        "m1_poller": {"enabled": True, "derive_engine_enabled": False},
+        "ssot_segments": {"enabled": True, "seal_interval_s": 600, "grace_days": 2},
+    }
+    monkeypatch.setattr(m1_ingestion_worker, "load_system_config", lambda path: cfg)
+    monkeypatch.setattr(
+        m1_ingestion_worker,
+        "resolve_redis_spec",
+        lambda cfg, role, log: types.SimpleNamespace(namespace="v3_local"),
+    )
+    monkeypatch.setattr(m1_ingestion_worker, "pooled_client", lambda spec, **kw: _FakeRedis())
+    monkeypatch.setattr(
+        m1_ingestion_worker, "build_uds_from_config", lambda **kw: types.SimpleNamespace()
+    )
+
+    runner = m1_ingestion_worker.build_ingestion_worker("config.json")
+
+    # all-режим з broker venv запускає саме цей worker, не legacy m1_poller
+    assert runner._segment_seal_enabled is True  # noqa: SLF001
+    assert runner._segment_seal_interval_s == 600  # noqa: SLF001
+    assert runner._segment_seal_grace_days == 2  # noqa: SLF001
@@ -227,5 +227,122 @@ class TestMultiBreakNoOverlap(unittest.TestCase):
         self.assertTrue(self.cal.is_trading_minute(_ms(2026, 2, 10, 14, 0)))
 
 
+# ── CompiledCalendar (bitmap хвилин тижня) ─────────────────────────
+
+
+def _reference_is_trading(cal, now_ms):
+    # type: (MarketCalendar, int) -> bool
+    """Datetime-реалізація (до компіляції) — reference для bitmap."""
+    if not cal.enabled:
+        return True
+    d = dt.datetime.fromtimestamp(now_ms / 1000.0, tz=dt.timezone.utc)
+    cur_min = d.hour * 60 + d.minute
+    return cal._is_trading_week_minute(
+        d.weekday(), cur_min, cal._all_break_intervals()
+    )
+
+
+def _config_calendars():
+    # type: () -> list
+    import json
+    import os
+
+    from runtime.ingest.tick_common import calendar_from_group
+
+    path = os.path.join(os.path.dirname(__file__), "..", "config.json")
+    with open(path, encoding="utf-8") as fh:
+        groups = json.load(fh).get("market_calendar_by_group", {})
+    cals = [calendar_from_group(g) for g in groups.values() if isinstance(g, dict)]
+    return [c for c in cals if c is not None]
+
+
+class TestCompiledCalendar(unittest.TestCase):
+    def setUp(self):
+        self.cals = _config_calendars() + [
+            _make_cal("19:00", "01:15"),
+            _make_cal("03:30", "04:30", daily_breaks=(("08:00", "09:00"),)),
+            MarketCalendar(
+                enabled=False,
+                weekend_close_dow=4,
+                weekend_close_hm="21:00",
+                weekend_open_dow=6,
+                weekend_open_hm="22:00",
+                daily_break_start_hm="22:00",
+                daily_break_end_hm="23:00",
+                daily_break_enabled=True,
+            ),
+        ]
+        self.assertGreater(len(self.cals), 3)
+
+    def test_every_minute_of_week_matches_reference(self):
+        t0 = _ms(2026, 2, 9, 0, 0)  # понеділок
+        for cal in self.cals:
+            for m in range(0, 7 * 1440):
+                t = t0 + m * 60_000 + (m % 60) * 997
+                self.assertEqual(
+                    cal.is_trading_minute(t), _reference_is_trading(cal, t), (cal, m)
+                )
+
+    def test_range_queries_match_per_slot_loop(self):
+        import random
+
+        rnd = random.Random(3)
+        for cal in self.cals:
+            comp = cal.compiled()
+            self.assertIs(comp, cal.compiled())
+            for _ in range(300):
+                step = rnd.choice((60_000, 180_000, 300_000, 900_000, 3_600_000))
+                start = _ms(2026, 2, 6, 0, 0) + rnd.randrange(0, 4 * 1440) * 60_000
+                end = start + rnd.randrange(0, 3 * 1440) * 60_000 + rnd.choice((0, 1))
+                want = [t for t in range(start, end, step) if comp(t)]
+                self.assertEqual(comp.trading_slots(start, end, step), want)
+                self.assertEqual(comp.trading_count(start, end, step), len(want))
+                minutes = [t for t in range(start, end, 60_000) if comp(t)]
+                self.assertEqual(comp.any_trading(start, end), bool(minutes))
+
+    def test_compiled_excluded_from_equality(self):
+        a = _make_cal("22:00", "23:00")
+        b = _make_cal("22:00", "23:00")
+        a.compiled()
+        self.assertEqual(a, b)
+        self.assertEqual(hash(a), hash(b))
+        self.assertNotIn("_compiled", repr(a))
+
+
+    def test_derive_with_compiled_matches_plain_callable(self):
+        from core.derive import GenericBuffer, derive_bar
+        from core.model.bars import CandleBar
+
+        cal = _make_cal("22:00", "23:00")
+        comp = cal.compiled()
+        plain = lambda t: cal.is_trading_minute(t)  # noqa: E731 — без trading_slots
+        t0 = _ms(2026, 2, 11, 0, 0)
+        buf = GenericBuffer(tf_s=60, max_keep=4000)
+        buf.upsert_many(
+            [
+                CandleBar("XAU/USD", 60, t, t + 60_000, 1.0, 2.0, 0.5, 1.5, 1.0, True, "history")
+                for t in range(t0 - 1440 * 60_000, t0 + 1440 * 60_000, 60_000)
+                if comp(t) and (t // 60_000) % 97 != 0  # кілька дір
+            ]
+        )
+        built = 0
+        for tf_s in (180, 300, 86400):  # M1-джерело
+            for b in range(t0 - 86_400_000, t0 + 86_400_000 - tf_s * 1000 + 1, tf_s * 1000):
+                a = derive_bar(
+                    symbol="XAU/USD", target_tf_s=tf_s, source_buffer=buf,
+                    bucket_open_ms=b, is_trading_fn=comp,
+                )
+                p = derive_bar(
+                    symbol="XAU/USD", target_tf_s=tf_s, source_buffer=buf,
+                    bucket_open_ms=b, is_trading_fn=plain,
+                )
+                self.assertEqual(a, p, (tf_s, b))
+                built += a is not None
+                self.assertEqual(
+                    buf.missing_count(b, b + tf_s * 1000, comp),
+                    buf.missing_count(b, b + tf_s * 1000, plain),
+                )
+        self.assertGreater(built, 100)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,176 @@
+"""Preview tail ring: per-bar upsert (sorted set) замість whole-JSON flush."""
+
+from __future__ import annotations
+
+import json
+from unittest.mock import patch
+
+from core.model.bars import CandleBar
+from runtime.store.layers.redis_layer import RedisLayer
+from runtime.store.uds import UnifiedDataStore
+
+T0 = 1_740_000_000_000
+RING = "ns:preview:tail_bars:XAU_USD:60"
+
+
+class _Pipe:
+    def __init__(self, client: "_FakeRedis") -> None:
+        self._client = client
+        self._ops: list = []
+
+    def __getattr__(self, name):
+        def _queue(*args, **kwargs):
+            self._ops.append((name, args, kwargs))
+            return self
+
+        return _queue
+
+    def execute(self):
+        return [getattr(self._client, n)(*a, **kw) for n, a, kw in self._ops]
+
+
+class _FakeRedis:
+    """Strings, counters, lists, sorted sets + TTL; лічить байти ZADD."""
+
+    def __init__(self) -> None:
+        self.kv: dict = {}
+        self.lists: dict = {}
+        self.zsets: dict = {}
+        self.ttls: dict = {}
+        self.zadd_bytes: list = []
+
+    def pipeline(self, transaction: bool = True) -> _Pipe:
+        return _Pipe(self)
+
+    def set(self, key, value, ex=None):
+        self.kv[key] = value
+        self.ttls[key] = ex if ex is not None else -1
+
+    def get(self, key):
+        return self.kv.get(key)
+
+    def delete(self, key):
+        self.kv.pop(key, None)
+        self.zsets.pop(key, None)
+
+    def incr(self, key):
+        self.kv[key] = int(self.kv.get(key, 0)) + 1
+        return self.kv[key]
+
+    def rpush(self, key, *values):
+        self.lists.setdefault(key, []).extend(values)
+
+    def ltrim(self, key, start, end):
+        lst = self.lists.get(key, [])
+        self.lists[key] = lst[start:] if end == -1 else lst[start : end + 1]
+
+    def _sorted(self, key) -> list:
+        return sorted(self.zsets.get(key, {}).items(), key=lambda kv: (kv[1], kv[0]))
+
+    def zadd(self, key, mapping):
+        self.zadd_bytes.append(sum(len(m) for m in mapping))
+        self.zsets.setdefault(key, {}).update(mapping)
+
+    def zremrangebyscore(self, key, lo, hi):
+        z = self.zsets.get(key, {})
+        for member in [m for m, s in z.items() if lo <= s <= hi]:
+            del z[member]
+
+    def zremrangebyrank(self, key, start, end):
+        items = self._sorted(key)
+        n = len(items)
+        stop = end + n if end < 0 else end
+        if stop < start:
+            return
+        for member, _score in items[start : stop + 1]:
+            del self.zsets[key][member]
+
+    def zrange(self, key, start, end):
+        members = [m for m, _s in self._sorted(key)]
+        return members[start:] if end == -1 else members[start : end + 1]
+
+    def expire(self, key, ttl_s):
+        self.ttls[key] = ttl_s
+
+    def ttl(self, key):
+        if key not in self.kv and not self.zsets.get(key):
+            return -2
+        return self.ttls.get(key, -1)
+
+
+def _bar(i: int, c: float) -> CandleBar:
+    open_ms = T0 + i * 60_000
+    return CandleBar(
+        "XAU/USD", 60, open_ms, open_ms + 60_000,
+        2000.0, 2010.0, 1990.0, c, 1.0, False, "preview_tick",
+    )
+
+
+def _uds(client: _FakeRedis, retain: int = 3) -> UnifiedDataStore:
+    return UnifiedDataStore(
+        data_root="./data_v3",
+        boot_id="b",
+        tf_allowlist={60},
+        min_coldload_bars={},
+        role="writer",
+        redis_layer=RedisLayer(client, "ns"),
+        preview_tf_allowlist={60},
+        preview_curr_ttl_s=100,
+        preview_tail_retain=retain,
+    )
+
+
+def _ring(client: _FakeRedis) -> list:
+    return [(b["open_ms"], b["c"]) for b in map(json.loads, client.zrange(RING, 0, -1))]
+
+
+def test_flush_writes_only_forming_bar_and_rollover_keeps_last_state() -> None:
+    client = _FakeRedis()
+    uds = _uds(client)
+    now = [1000.0]
+    with patch("runtime.store.uds.time.time", side_effect=lambda: now[0]):
+        uds.publish_preview_bar(_bar(0, 1.0))  # rollover → flush
+        now[0] += 1
+        uds.publish_preview_bar(_bar(0, 2.0))  # throttled → pending
+        assert _ring(client) == [(T0, 1.0)]
+        now[0] += 1
+        uds.publish_preview_bar(_bar(1, 3.0))  # rollover: pending bar0 + bar1
+        assert _ring(client) == [(T0, 2.0), (T0 + 60_000, 3.0)]
+        now[0] += 10
+        uds.publish_preview_bar(_bar(1, 4.0))  # інтервал → overwrite forming
+        for i in range(2, 5):
+            now[0] += 1
+            uds.publish_preview_bar(_bar(i, float(i)))
+    assert _ring(client) == [(T0 + i * 60_000, float(i)) for i in (2, 3, 4)]
+    assert client.ttls[RING] == 200
+    # кожен ZADD — один бар (~100 байт), не весь tail
+    assert max(client.zadd_bytes) < 200
+
+
+def test_read_preview_window_uses_ranged_ring_and_curr() -> None:
+    client = _FakeRedis()
+    uds = _uds(client, retain=50)
+    now = [1000.0]
+    with patch("runtime.store.uds.time.time", side_effect=lambda: now[0]):
+        for i in range(10):
+            now[0] += 1
+            uds.publish_preview_bar(_bar(i, float(i)))
+        uds.publish_preview_bar(_bar(9, 99.0))  # throttled: лише curr
+    res = uds.read_preview_window("XAU/USD", 60, 3)
+    assert [b["open_time_ms"] for b in res.bars_lwc] == [T0 + i * 60_000 for i in (7, 8, 9)]
+    assert res.bars_lwc[-1]["close"] == 99.0
+    assert res.bars_lwc[0]["src"] == "preview_tick"
+    assert res.meta["source"] == "preview_tail"
+
+    tail, _ttl, err = RedisLayer(client, "ns").read_preview_tail("XAU/USD", 60, 2)
+    assert err is None and [b["c"] for b in tail["bars"]] == [8.0, 9.0]
+
+
+def test_legacy_tail_is_migrated_once() -> None:
+    client = _FakeRedis()
+    legacy = [{"open_ms": T0 - k * 60_000, "close_ms": 0, "c": float(k)} for k in (3, 2, 1)]
+    client.set("ns:preview:tail:XAU_USD:60", json.dumps({"bars": legacy}))
+    uds = _uds(client, retain=3)
+    uds.publish_preview_bar(_bar(0, 7.0))
+    assert "ns:preview:tail:XAU_USD:60" not in client.kv
+    assert _ring(client) == [(T0 - 120_000, 2.0), (T0 - 60_000, 1.0), (T0, 7.0)]
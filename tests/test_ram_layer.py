@@ -0,0 +1,127 @@
+"""RamLayer: sorted-array вікна, bisect upsert, per-key локи, бюджети, stats."""
+
+from __future__ import annotations
+
+import random
+import threading
+
+from runtime.store.layers.ram_layer import RamLayer
+from runtime.store.uds import _ram_layer_from_cfg
+
+
+def _bar(open_ms: int, c: float = 1.0) -> dict:
+    return {"open_time_ms": open_ms, "o": 1.0, "h": 2.0, "low": 0.5, "c": c}
+
+
+def _reference_upsert(bars: list, bar: dict, max_bars: int) -> list:
+    """Попередня семантика: лінійний replace або append + sort + trim."""
+    for idx, existing in enumerate(bars):
+        if existing["open_time_ms"] == bar["open_time_ms"]:
+            bars[idx] = bar
+            break
+    else:
+        bars.append(bar)
+        bars.sort(key=lambda x: x["open_time_ms"])
+    return bars[-max_bars:]
+
+
+def test_upsert_matches_reference_and_keeps_order() -> None:
+    rnd = random.Random(11)
+    ram = RamLayer(max_bars=50)
+    ref: list = []
+    for i in range(2000):
+        t = rnd.choice((i, i, i - rnd.randint(1, 80), rnd.randint(0, i + 1))) * 60_000
+        bar = _bar(t, c=float(i))
+        ram.upsert_bar("XAU/USD", 60, bar)
+        ref = _reference_upsert(ref, bar, 50)
+        assert ram.get_window("XAU/USD", 60, 0) == ref
+    got = ram.get_window("XAU/USD", 60, 7)
+    assert got == ref[-7:]
+    opens = [b["open_time_ms"] for b in ram.get_window("XAU/USD", 60, 0)]
+    assert opens == sorted(set(opens))
+    up = ram.stats()["ram_upserts"]
+    assert up["append"] and up["replace"] and up["insert"]
+
+
+def test_set_window_sorts_dedups_and_returned_slice_is_detached() -> None:
+    ram = RamLayer(max_bars=3)
+    ram.set_window(
+        "XAU/USD",
+        300,
+        [_bar(5), _bar(1), _bar(3, c=1.0), _bar(3, c=2.0), {"open_time_ms": "x"}, _bar(4)],
+    )
+    got = ram.get_window("XAU/USD", 300, 0)
+    assert [b["open_time_ms"] for b in got] == [3, 4, 5]
+    assert got[0]["c"] == 2.0
+    got.append(_bar(99))
+    ram.upsert_bar("XAU/USD", 300, _bar(6))
+    assert [b["open_time_ms"] for b in ram.get_window("XAU/USD", 300, 0)] == [4, 5, 6]
+    assert ram.get_window("XAU/USD", 900, 10) is None
+    ram.upsert_bar("XAU/USD", 300, {"open_time_ms": None})
+    st = ram.stats()
+    assert st["ram_hits"] == 2 and st["ram_misses"] == 1
+    assert st["ram_upserts"]["dropped"] == 1
+    assert st["ram_total_bars"] == 3
+
+
+def test_budgets_evict_lru_keys() -> None:
+    ram = RamLayer(max_bars=100, max_total_bars=250)
+    for tf_s in (60, 300, 900):
+        ram.set_window("XAU/USD", tf_s, [_bar(i) for i in range(100)])
+    # 300 > 250 → LRU (60) витіснено
+    assert ram.get_window("XAU/USD", 60, 0) is None
+    assert ram.get_window("XAU/USD", 300, 1) is not None
+    st = ram.stats()
+    assert st["ram_keys"] == 2 and st["ram_total_bars"] == 200
+    assert st["ram_evictions"] == 1
+
+    one_key = RamLayer(max_bars=100, max_bytes=1)
+    one_key.set_window("XAU/USD", 60, [_bar(i) for i in range(10)])
+    one_key.set_window("XAU/USD", 300, [_bar(i) for i in range(10)])
+    # останній торкнутий ключ лишається навіть понад бюджет
+    assert one_key.get_window("XAU/USD", 300, 0) is not None
+    assert one_key.get_window("XAU/USD", 60, 0) is None
+    assert one_key.stats()["ram_bytes_est"] > 0
+
+
+def test_concurrent_upserts_and_reads_stay_consistent() -> None:
+    ram = RamLayer(max_bars=500, max_total_bars=1200)
+    errors: list = []
+
+    def _writer(tf_s: int) -> None:
+        rnd = random.Random(tf_s)
+        for i in range(3000):
+            t = (i - rnd.randint(0, 3)) * 1000
+            ram.upsert_bar("XAU/USD", tf_s, _bar(t))
+
+    def _reader() -> None:
+        for _ in range(3000):
+            for tf_s in (60, 300, 900):
+                bars = ram.get_window("XAU/USD", tf_s, 200) or []
+                opens = [b["open_time_ms"] for b in bars]
+                if opens != sorted(set(opens)):
+                    errors.append(opens)
+
+    threads = [threading.Thread(target=_writer, args=(tf,)) for tf in (60, 300, 900)]
+    threads += [threading.Thread(target=_reader) for _ in range(2)]
+    for th in threads:
+        th.start()
+    for th in threads:
+        th.join()
+    assert not errors
+    st = ram.stats()
+    assert st["ram_total_bars"] == sum(
+        len(ram.get_window("XAU/USD", tf, 0) or []) for tf in (60, 300, 900)
+    )
+    assert st["ram_total_bars"] <= 1200
+    assert st["ram_latency_us"]["upsert_bar"]["count"] == 9000
+
+
+def test_ram_layer_from_cfg() -> None:
+    ram = _ram_layer_from_cfg(
+        {"ram_layer": {"max_bars_per_key": 10, "max_total_bars": "x", "max_bytes": 4096}}
+    )
+    st = ram.stats()
+    assert st["ram_max_bars"] == 10
+    assert st["ram_max_total_bars"] == 2_000_000
+    assert st["ram_max_bytes"] == 4096
@@ -0,0 +1,173 @@
+"""tools.rebuild_from_m1: process-pool шарди дають байт-у-байт той самий SSOT, що й послідовний rebuild."""
+
+from __future__ import annotations
+
+import os
+import random
+import shutil
+
+from core.model.bars import CandleBar
+from runtime.store.ssot_jsonl import JsonlAppender
+from tools import rebuild_from_m1 as rb
+
+# Вівторок 00:00 UTC; 9 діб → вихідні, daily break, H4/D1 через північ
+T0 = 1_740_441_600_000
+DAYS = 9
+SYM = "XAU/USD"
+
+CFG = {
+    "day_anchor_offset_s": 79200,
+    "day_anchor_offset_s_d1": 75600,
+    "market_calendar_symbol_groups": {SYM: "cfd_us_22_23"},
+    "market_calendar_by_group": {
+        "cfd_us_22_23": {
+            "market_weekend_open_dow": 6,
+            "market_weekend_open_hm": "22:00",
+            "market_weekend_close_dow": 4,
+            "market_weekend_close_hm": "20:45",
+            "market_daily_break_start_hm": "21:00",
+            "market_daily_break_end_hm": "22:00",
+        }
+    },
+}
+
+
+def _writer(root: str) -> JsonlAppender:
+    return JsonlAppender(root, day_anchor_offset_s=79200, day_anchor_offset_s_d1=75600)
+
+
+def _seed(root: str) -> None:
+    """M1 лише в торгові хвилини, з дірками та calendar_pause_flat; трохи готових M5/H1."""
+    rnd = random.Random(14)
+    is_trading = rb._build_calendar(CFG, SYM).compiled()
+    app = _writer(root)
+    price = 2000.0
+    for i in range(DAYS * 1440):
+        open_ms = T0 + i * 60_000
+        if not is_trading(open_ms) or rnd.random() < 0.01:
+            continue
+        step = rnd.uniform(-1.0, 1.0)
+        ext = {"calendar_pause_flat": True} if rnd.random() < 0.002 else {}
+        app.append(
+            CandleBar(
+                SYM, 60, open_ms, open_ms + 60_000,
+                price, price + abs(step) + 0.1, price - abs(step) - 0.1, price + step,
+                float(rnd.randint(1, 9)), True, "history", extensions=ext,
+            )
+        )
+        price += step
+    # Наявні derived (мають пережити non-force rebuild і стати джерелами каскаду)
+    for k in (3, 40, 41, 500):
+        o = T0 + k * 300_000
+        app.append(CandleBar(SYM, 300, o, o + 300_000, 1.0, 3.0, 0.5, 2.0, 1.0, True, "derived"))
+    o = T0 + 30 * 3_600_000
+    app.append(CandleBar(SYM, 3600, o, o + 3_600_000, 1.0, 3.0, 0.5, 2.0, 1.0, True, "derived"))
+    app.close()
+
+
+def _tree(root: str) -> dict:
+    out = {}
+    for dirpath, _dirs, files in os.walk(root):
+        for name in files:
+            path = os.path.join(dirpath, name)
+            with open(path, "rb") as fh:
+                out[os.path.relpath(path, root)] = fh.read()
+    return out
+
+
+def _sequential(root: str, start_ms: int, end_ms: int, **kw) -> dict:
+    writer = _writer(root)
+    try:
+        return rb.rebuild_one_symbol(root, SYM, start_ms, end_ms, cfg=CFG, writer=writer, **kw)
+    finally:
+        writer.close()
+
+
+def _parallel(root: str, start_ms: int, end_ms: int, **kw) -> dict:
+    writer = _writer(root)
+    try:
+        return rb.rebuild_parallel(
+            root, {SYM: (start_ms, end_ms)}, cfg=CFG, writer=writer,
+            workers=2, shard_days=2, **kw,
+        )[SYM]
+    finally:
+        writer.close()
+
+
+def test_shard_bounds_cover_range_once() -> None:
+    start = T0 + 7 * 60_000
+    bounds = rb._shard_bounds(start, T0 + 5 * rb.DAY_MS + 1, 2)
+    assert bounds == [
+        (None, T0 + 2 * rb.DAY_MS),
+        (T0 + 2 * rb.DAY_MS, T0 + 4 * rb.DAY_MS),
+        (T0 + 4 * rb.DAY_MS, None),
+    ]
+    assert rb._shard_bounds(start, T0 + rb.DAY_MS, 7) == [(None, None)]
+
+
+def test_parallel_rebuild_is_byte_identical(tmp_path) -> None:
+    seed = str(tmp_path / "seed")
+    _seed(seed)
+    start_ms = T0 + 7 * 60_000  # не вирівняний → перший бакет часткового покриття
+    end_ms = T0 + DAYS * rb.DAY_MS
+
+    for kw in ({"dry_run": False}, {"dry_run": False, "force": True}, {"dry_run": True}):
+        seq_root = str(tmp_path / "seq")
+        par_root = str(tmp_path / "par")
+        for root in (seq_root, par_root):
+            shutil.rmtree(root, ignore_errors=True)
+            shutil.copytree(seed, root)
+
+        seq_stats = _sequential(seq_root, start_ms, end_ms, **kw)
+        par_stats = _parallel(par_root, start_ms, end_ms, **kw)
+
+        assert par_stats == seq_stats, kw
+        assert _tree(par_root) == _tree(seq_root), kw
+        assert seq_stats["tf_14400_written"] > 0 and seq_stats["tf_86400_written"] > 0
+        if not kw.get("force"):
+            assert seq_stats["tf_300_existed"] == 4
+            assert seq_stats["tf_3600_existed"] == 1
+
+
+def test_parallel_writes_each_symbol_after_its_last_shard(monkeypatch) -> None:
+    import concurrent.futures
+
+    events = []
+
+    class _Pool:
+        def __init__(self, max_workers=None, mp_context=None):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+        def map(self, fn, tasks):
+            for task in tasks:
+                events.append(("shard", task["symbol"], task["own_lo"]))
+                yield fn(task)
+
+    def _fake_shard(task):
+        o = task["own_lo"] or T0
+        bar = CandleBar(task["symbol"], 300, o, o + 300_000, 1.0, 2.0, 0.5, 1.5, 1.0, True, "derived")
+        return {"m1_loaded": 1}, {300: [bar]}
+
+    class _Writer:
+        def append_many(self, bars):
+            events.append(("write", bars[0].symbol, len(bars)))
+            return [None] * len(bars)
+
+    monkeypatch.setattr(concurrent.futures, "ProcessPoolExecutor", _Pool)
+    monkeypatch.setattr(rb, "_rebuild_shard", _fake_shard)
+    end = T0 + 4 * rb.DAY_MS
+    stats = rb.rebuild_parallel(
+        "unused", {"A": (T0, end), "B": (T0, end)}, dry_run=False, cfg={},
+        writer=_Writer(), workers=2, shard_days=2,
+    )
+    assert [e[:2] for e in events] == [
+        ("shard", "A"), ("shard", "A"), ("write", "A"),
+        ("shard", "B"), ("shard", "B"), ("write", "B"),
+    ]
+    assert stats == {"A": {"m1_loaded": 2}, "B": {"m1_loaded": 2}}
@@ -0,0 +1,329 @@
+"""redis.asyncio read-side: async_twin, parity sync/async (updates bus, UDS,
+token store, kill switch, rate limit) і ws шлях без executor."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+
+import pytest
+import redis
+from redis.exceptions import RedisError
+
+from runtime.api import rate_limit as rl
+from runtime.api_v3 import kill_switch as ks
+from runtime.api_v3 import token_store as ts
+from runtime.store import redis_pool
+from runtime.store import uds as uds_mod
+from runtime.store.uds import (
+    UnifiedDataStore,
+    UpdatesSpec,
+    _RedisStreamUpdatesBus,
+    _RedisUpdatesBus,
+)
+
+TOKEN = "tk_" + "a" * 64
+
+
+class _Pipe:
+    def __init__(self, client):
+        self._client = client
+        self._ops = []
+
+    def __getattr__(self, name):
+        def _queue(*args, **kwargs):
+            self._ops.append((name, args, kwargs))
+            return self
+
+        return _queue
+
+    def execute(self):
+        return [getattr(self._client, n)(*a, **kw) for n, a, kw in self._ops]
+
+
+class _FakeRedis:
+    """In-memory Redis: kv, lists, streams (id "<ms>-<n>") + лічильник викликів."""
+
+    def __init__(self):
+        self.kv = {}
+        self.lists = {}
+        self.streams = {}
+        self.calls = []
+
+    def _note(self, name):
+        self.calls.append(name)
+
+    def pipeline(self, transaction=True):
+        return _Pipe(self)
+
+    def incr(self, key):
+        self._note("incr")
+        self.kv[key] = int(self.kv.get(key, 0)) + 1
+        return self.kv[key]
+
+    def expire(self, key, ttl):
+        self._note("expire")
+        return True
+
+    def exists(self, key):
+        self._note("exists")
+        return int(key in self.kv)
+
+    def get(self, key):
+        self._note("get")
+        v = self.kv.get(key)
+        return None if v is None else str(v).encode()
+
+    def mget(self, keys):
+        self._note("mget")
+        return [self.get(k) for k in keys]
+
+    def rpush(self, key, *values):
+        self.lists.setdefault(key, []).extend(v.encode() for v in values)
+
+    def ltrim(self, key, start, end):
+        lst = self.lists.get(key, [])
+        self.lists[key] = lst[start:] if end == -1 else lst[start : end + 1]
+
+    def lrange(self, key, start, end):
+        self._note("lrange")
+        lst = self.lists.get(key, [])
+        return lst[start:] if end == -1 else lst[start : end + 1]
+
+    @staticmethod
+    def _id(entry_id):
+        ms, _, n = str(entry_id).partition("-")
+        return int(ms), int(n or 0)
+
+    def xadd(self, key, fields, id="*", maxlen=None, approximate=True):
+        entries = self.streams.setdefault(key, [])
+        entries.append((id.encode(), {k.encode(): v.encode() for k, v in fields.items()}))
+        if maxlen is not None and len(entries) > maxlen:
+            del entries[: len(entries) - maxlen]
+        return id.encode()
+
+    def xread(self, streams, count=None, block=None):
+        self._note("xread")
+        out = []
+        for key, last in streams.items():
+            if last == "$":
+                continue
+            last_id = self._id(last)
+            new = [e for e in self.streams.get(key, []) if self._id(e[0].decode()) > last_id]
+            if count is not None:
+                new = new[:count]
+            if new:
+                out.append([key.encode(), new])
+        return out
+
+    def xrange(self, key, min="-", max="+", count=None):
+        self._note("xrange")
+        entries = list(self.streams.get(key, []))
+        return entries[:count] if count is not None else entries
+
+
+class _AsyncFacade:
+    """redis.asyncio-подібний фасад над sync fake: кожна команда — coroutine."""
+
+    def __init__(self, client):
+        self.client = client
+        self.awaited = []
+
+    def __getattr__(self, name):
+        method = getattr(self.client, name)
+
+        async def _call(*args, **kwargs):
+            self.awaited.append(name)
+            return method(*args, **kwargs)
+
+        return _call
+
+
+@pytest.fixture
+def async_fakes(monkeypatch):
+    """async_twin → _AsyncFacade у кожному модулі read-side."""
+    facades = []
+
+    def _twin(client):
+        if client is None:
+            return None
+        facade = _AsyncFacade(client)
+        facades.append(facade)
+        return facade
+
+    for mod in (uds_mod, ts, ks, rl):
+        monkeypatch.setattr(mod, "async_twin", _twin)
+    from runtime.store.layers import redis_layer
+
+    monkeypatch.setattr(redis_layer, "async_twin", _twin)
+    return facades
+
+
+def _event(i: int, tf_s: int = 300) -> dict:
+    return {
+        "key": {"symbol": "XAU/USD", "tf_s": tf_s, "open_ms": i * 300_000},
+        "bar": {"open_time_ms": i * 300_000, "c": 2000.0 + i},
+        "complete": True,
+        "source": "history",
+        "event_ts": i * 300_000 + 300_000,
+    }
+
+
+def test_async_twin_mirrors_sync_pool_per_loop() -> None:
+    sync = redis.Redis(host="127.0.0.1", port=6390, db=3, decode_responses=True,
+                       socket_timeout=1.5)
+    assert redis_pool.async_twin(sync) is None  # поза event loop
+    assert redis_pool.async_twin(_FakeRedis()) is None
+
+    async def _twins():
+        a = redis_pool.async_twin(sync)
+        b = redis_pool.async_twin(sync)
+        return a, b
+
+    a, b = asyncio.run(_twins())
+    assert a.connection_pool is b.connection_pool
+    kw = a.connection_pool.connection_kwargs
+    assert (kw["host"], kw["port"], kw["db"]) == ("127.0.0.1", 6390, 3)
+    assert kw["decode_responses"] is True and kw["socket_timeout"] == 1.5
+    c, _ = asyncio.run(_twins())  # інший loop → свій пул
+    assert c.connection_pool is not a.connection_pool
+
+
+def test_drive_and_adrive_throw_errors_into_steps() -> None:
+    class _Down:
+        def get(self, key):
+            raise RedisError("down")
+
+    def _steps():
+        try:
+            return (yield "get", ("k",), {})
+        except RedisError as exc:
+            return f"err:{exc}"
+
+    assert redis_pool.drive(_Down(), _steps()) == "err:down"
+    assert asyncio.run(redis_pool.adrive(_AsyncFacade(_Down()), _steps())) == "err:down"
+
+
+@pytest.mark.parametrize("bus_cls", [_RedisUpdatesBus, _RedisStreamUpdatesBus])
+def test_updates_bus_async_matches_sync(bus_cls, async_fakes) -> None:
+    client = _FakeRedis()
+    bus = bus_cls(client, "ns", retain=20)
+    assert asyncio.run(bus.last_seqs_async([("XAU/USD", 300)])) == [None]
+    for i in range(1, 31):
+        bus.publish(_event(i))
+    for since in (None, 0, 5, 12, 29, 30):
+        sync = bus.read_updates("XAU/USD", 300, since, 500)
+        assert asyncio.run(bus.read_updates_async("XAU/USD", 300, since, 500)) == sync
+    targets = [("XAU/USD", 300), ("XAU/USD", 900)]
+    assert asyncio.run(bus.last_seqs_async(targets)) == bus.last_seqs(targets) == [30, None]
+    assert all(f.awaited for f in async_fakes)
+
+
+def test_stream_wait_async_and_uds_read_updates(tmp_path, async_fakes) -> None:
+    client = _FakeRedis()
+    bus = _RedisStreamUpdatesBus(client, "ns", retain=10)
+    for i in range(1, 4):
+        bus.publish(_event(i))
+    store = UnifiedDataStore(
+        data_root=str(tmp_path),
+        boot_id="b",
+        tf_allowlist={60, 300},
+        min_coldload_bars={},
+        role="reader",
+        updates_bus=bus,
+        preview_tf_allowlist={60},
+    )
+    woke = asyncio.run(store.wait_updates_async({("XAU/USD", 300): 1, ("XAU/USD", 60): 0}, 1.0))
+    assert woke == {("XAU/USD", 300)}
+    assert asyncio.run(store.wait_updates_async({("XAU/USD", 60): 0}, 1.0)) is None
+
+    spec = UpdatesSpec(symbol="XAU/USD", tf_s=300, since_seq=1, limit=500)
+    got = asyncio.run(store.read_updates_async(spec))
+    want = store.read_updates(spec)
+    assert got is not None
+    assert (got.events, got.cursor_seq, got.warnings, got.meta) == (
+        want.events, want.cursor_seq, want.warnings, want.meta,
+    )
+    assert [ev["seq"] for ev in got.events] == [2, 3]
+    cursors = asyncio.run(store.updates_cursors_async([("XAU/USD", 300)]))
+    assert cursors == [3]
+
+
+def test_async_paths_fall_back_without_twin(tmp_path) -> None:
+    bus = _RedisStreamUpdatesBus(_FakeRedis(), "ns", retain=10)
+    bus.publish(_event(1))
+    store = UnifiedDataStore(
+        data_root=str(tmp_path),
+        boot_id="b",
+        tf_allowlist={300},
+        min_coldload_bars={},
+        role="reader",
+        updates_bus=bus,
+        preview_tf_allowlist={60},
+    )
+    spec = UpdatesSpec(symbol="XAU/USD", tf_s=300, since_seq=0, limit=500)
+    assert asyncio.run(store.read_updates_async(spec)) is None
+    assert asyncio.run(store.updates_cursors_async([("XAU/USD", 300)])) == [1]
+    with pytest.raises(LookupError):
+        asyncio.run(store.wait_updates_async({("XAU/USD", 300): 0}, 0.5))
+
+
+def test_token_kill_switch_rate_limit_async(async_fakes) -> None:
+    client = _FakeRedis()
+    client.kv[ts.token_redis_key("ns", TOKEN)] = json.dumps(
+        {"consumer": "bot", "scope": "read", "created": "c", "expires": "e"}
+    )
+    store = ts.TokenStore(client, "ns")
+    assert asyncio.run(store.lookup_async(TOKEN)) == store.lookup(TOKEN)
+    assert asyncio.run(store.lookup_async(TOKEN)).consumer == "bot"
+    assert asyncio.run(store.lookup_async("garbage")) is None
+
+    class _Down(_FakeRedis):
+        def get(self, key):
+            raise RedisError("down")
+
+    with pytest.raises(RedisError):  # fail-closed контракт зберігається
+        asyncio.run(ts.TokenStore(_Down(), "ns").lookup_async(TOKEN))
+
+    switch = ks.KillSwitch(redis_client=client, namespace="ns", analysis_enabled=True)
+    assert asyncio.run(switch.is_killed_async()) == (False, None)
+    client.kv[switch.redis_key] = "1"
+    assert asyncio.run(switch.is_killed_async()) == (True, "analysis_disabled_runtime")
+
+    class _DownExists(_FakeRedis):
+        def exists(self, key):
+            raise RedisError("down")
+
+    down = ks.KillSwitch(redis_client=_DownExists(), namespace="ns", analysis_enabled=True)
+    assert asyncio.run(down.is_killed_async()) == (False, None)
+    assert down.fail_open_count == 1
+
+    cfg = rl.RateLimitConfig(enabled=True, requests_per_minute=2)
+    results = [
+        asyncio.run(rl.check_and_consume_async(client, "ip", cfg, now_s=30.0))
+        for _ in range(3)
+    ]
+    assert results == [(True, 0), (True, 0), (False, 30)]
+    assert client.calls.count("expire") == 1
+    assert asyncio.run(rl.check_and_consume_async(None, "ip", cfg)) == (True, -1)
+    awaited = {name for f in async_fakes for name in f.awaited}
+    assert {"get", "exists", "incr", "expire"} <= awaited
+
+
+def test_ws_read_updates_skips_executor(tmp_path, async_fakes) -> None:
+    from runtime.ws import ws_server as mod
+
+    bus = _RedisUpdatesBus(_FakeRedis(), "ns", retain=10)
+    bus.publish(_event(1))
+    store = UnifiedDataStore(
+        data_root=str(tmp_path),
+        boot_id="b",
+        tf_allowlist={300},
+        min_coldload_bars={},
+        role="reader",
+        updates_bus=bus,
+        preview_tf_allowlist={60},
+    )
+    app = {mod.APP_UDS: store}  # без APP_UDS_EXECUTOR: executor шлях → KeyError
+    result = asyncio.run(mod._uds_read_updates(app, "XAU/USD", 300, 0, False))
+    assert [ev["seq"] for ev in result.events] == [1]
@@ -0,0 +1,93 @@
+"""redis_pool: спільні ConnectionPool + round-trip лічильники; snapshot = 1 MULTI/EXEC."""
+
+from __future__ import annotations
+
+from core.model.bars import CandleBar
+from runtime.obs_60s import Obs60s
+from runtime.store import redis_pool
+from runtime.store.redis_snapshot import RedisSnapshotWriter
+from runtime.store.redis_spec import RedisSpec
+
+
+class _FakeRedis:
+    """SET + pipeline; рахує мережеві round-trip."""
+
+    def __init__(self) -> None:
+        self.kv: dict = {}
+        self.round_trips = 0
+        self.transactions: list = []
+
+    def set(self, key, value, ex=None):
+        self.round_trips += 1
+        self.kv[key] = value
+
+    def pipeline(self, transaction: bool = True):
+        client = self
+        ops: list = []
+        self.transactions.append(transaction)
+
+        class _Pipe:
+            def set(self, key, value, ex=None):
+                ops.append((key, value))
+
+            def rpush(self, key, *values):
+                ops.append((key, list(values)))
+
+            def ltrim(self, key, start, end):
+                pass
+
+            def expire(self, key, ttl_s):
+                pass
+
+            def execute(self):
+                client.round_trips += 1
+                client.kv.update(ops)
+
+        return _Pipe()
+
+
+def _spec(db: int = 0) -> RedisSpec:
+    return RedisSpec(
+        "127.0.0.1", 6379, db, "ns", "test", "127.0.0.1", 6379, db, "ns", False, []
+    )
+
+
+def test_clients_with_same_params_share_pool() -> None:
+    a = redis_pool.pooled_client(_spec(), socket_timeout=2.0)
+    b = redis_pool.pooled_client(_spec(), socket_timeout=2.0)
+    c = redis_pool.pooled_client(_spec(), socket_timeout=2.0, decode_responses=True)
+    d = redis_pool.pooled_client(_spec(db=1), socket_timeout=2.0)
+    assert a is not b
+    assert a.connection_pool is b.connection_pool
+    assert c.connection_pool is not a.connection_pool
+    assert d.connection_pool is not a.connection_pool
+    assert c.connection_pool.connection_kwargs["decode_responses"] is True
+    assert redis_pool.pool_stats()["pools"] >= 3
+
+
+def test_round_trips_are_reported_per_path() -> None:
+    obs = Obs60s("redis")
+    obs._last_emit_ts = float("inf")  # без emit під час накопичення
+    obs.inc_redis_round_trips("snap.put_bars", 1, 12)
+    obs.inc_redis_round_trips("snap.put_bars", 1, 3)
+    obs.inc_redis_round_trips("updates.publish", 2, 3)
+    assert obs._build_payload()["redis_round_trips"] == {
+        "snap.put_bars": {"rt": 2, "cmds": 15},
+        "updates.publish": {"rt": 2, "cmds": 3},
+    }
+
+
+def test_put_bar_is_single_transaction() -> None:
+    client = _FakeRedis()
+    writer = RedisSnapshotWriter(client, "ns", {60: 3600}, {60: 5}, "b")
+    writer.put_bar(
+        CandleBar("XAU/USD", 60, 60_000, 120_000, 1.0, 2.0, 0.5, 1.5, 1.0, True, "history")
+    )
+    # snap + tail + status однією MULTI/EXEC
+    assert client.round_trips == 1
+    assert client.transactions == [True]
+    assert sorted(client.kv) == [
+        "ns:ohlcv:snap:XAU_USD:60",
+        "ns:ohlcv:tail_list:XAU_USD:60",
+        "ns:status:snapshot",
+    ]
@@ -0,0 +1,159 @@
+"""Redis tail_list: O(1) append у writer + ranged LRANGE у RedisLayer."""
+
+from __future__ import annotations
+
+import json
+from collections import deque
+
+from core.model.bars import CandleBar
+from runtime.store.layers.redis_layer import RedisLayer
+from runtime.store.redis_snapshot import RedisSnapshotWriter
+
+T0 = 1_740_000_000_000
+
+
+class _Pipe:
+    def __init__(self, client: "_FakeRedis") -> None:
+        self._client = client
+        self._ops: list = []
+
+    def __getattr__(self, name):
+        def _queue(*args, **kwargs):
+            self._ops.append((name, args, kwargs))
+            return self
+
+        return _queue
+
+    def execute(self):
+        self._client.round_trips += 1
+        return [getattr(self._client, n)(*a, **kw) for n, a, kw in self._ops]
+
+
+class _FakeRedis:
+    """Strings + lists з TTL (decode_responses=True семантика)."""
+
+    def __init__(self) -> None:
+        self.kv: dict = {}
+        self.lists: dict = {}
+        self.ttls: dict = {}
+        self.round_trips = 0
+        self.commands: list = []
+
+    def pipeline(self, transaction: bool = True) -> _Pipe:
+        return _Pipe(self)
+
+    def set(self, key, value, ex=None):
+        self.commands.append(("set", key))
+        self.kv[key] = value
+        self.ttls[key] = ex if ex is not None else -1
+
+    def get(self, key):
+        return self.kv.get(key)
+
+    def delete(self, key):
+        self.kv.pop(key, None)
+        self.lists.pop(key, None)
+
+    def rpush(self, key, *values):
+        self.commands.append(("rpush", key, len(values)))
+        self.lists.setdefault(key, []).extend(values)
+
+    def ltrim(self, key, start, end):
+        lst = self.lists.get(key, [])
+        self.lists[key] = lst[start:] if end == -1 else lst[start : end + 1]
+
+    def lrange(self, key, start, end):
+        lst = self.lists.get(key, [])
+        return lst[start:] if end == -1 else lst[start : end + 1]
+
+    def expire(self, key, ttl_s):
+        self.ttls[key] = ttl_s
+
+    def ttl(self, key):
+        if key not in self.kv and key not in self.lists:
+            return -2
+        return self.ttls.get(key, -1)
+
+
+def _bar(i: int, tf_s: int = 60) -> CandleBar:
+    open_ms = T0 + i * tf_s * 1000
+    return CandleBar(
+        "XAU/USD", tf_s, open_ms, open_ms + tf_s * 1000,
+        2000.0 + i, 2001.0 + i, 1999.0 + i, 2000.5 + i, 1.0, True, "history",
+    )
+
+
+def _writer(client: _FakeRedis, tail_n: int = 5) -> RedisSnapshotWriter:
+    return RedisSnapshotWriter(client, "ns", {60: 3600}, {60: tail_n}, "b")
+
+
+def test_put_bar_appends_without_rewriting_tail() -> None:
+    client = _FakeRedis()
+    writer = _writer(client)
+    expected: deque = deque(maxlen=5)  # попередня семантика in-process deque
+    for i in range(12):
+        writer.put_bar(_bar(i))
+        expected.append(_bar(i).open_time_ms)
+    key = "ns:ohlcv:tail_list:XAU_USD:60"
+    opens = [json.loads(raw)["open_ms"] for raw in client.lists[key]]
+    assert opens == list(expected)
+    # кожен commit дописує один бар, а не SET усього вікна
+    assert ("rpush", key, 1) in client.commands
+    assert not any(cmd[0] == "set" and "tail" in cmd[1] for cmd in client.commands)
+    assert client.ttls[key] == 3600
+
+    writer.put_bars([_bar(20), _bar(21)])
+    assert ("rpush", key, 2) in client.commands
+    assert len(client.lists[key]) == 5
+
+
+def test_layer_reads_only_requested_tail() -> None:
+    client = _FakeRedis()
+    writer = _writer(client, tail_n=50)
+    writer.prime_from_bars("XAU/USD", 60, [_bar(i) for i in range(40)])
+    layer = RedisLayer(client, "ns")
+    client.round_trips = 0
+
+    payload, ttl_left, source, err = layer.read_tail_or_snap("XAU/USD", 60, 7)
+    assert err is None and source == "redis_tail" and ttl_left == 3600
+    assert [b["open_ms"] for b in payload["bars"]] == [
+        _bar(i).open_time_ms for i in range(33, 40)
+    ]
+    snap = json.loads(client.kv["ns:ohlcv:snap:XAU_USD:60"])
+    assert payload["last_seq"] == snap["seq"]
+    assert payload["source"] == "history" and payload["complete"] is True
+    assert client.round_trips == 1
+
+    full, _ttl, _src, _err = layer.read_tail_or_snap("XAU/USD", 60)
+    assert len(full["bars"]) == 40
+
+
+def test_prime_replaces_tail_and_drops_legacy_key() -> None:
+    client = _FakeRedis()
+    client.kv["ns:ohlcv:tail:XAU_USD:60"] = json.dumps({"bars": []})
+    writer = _writer(client)
+    writer.put_bar(_bar(100))
+    writer.prime_from_bars("XAU/USD", 60, [_bar(i) for i in range(8)])
+    opens = [json.loads(r)["open_ms"] for r in client.lists["ns:ohlcv:tail_list:XAU_USD:60"]]
+    assert opens == [_bar(i).open_time_ms for i in range(3, 8)]
+    assert "ns:ohlcv:tail:XAU_USD:60" not in client.kv
+
+
+def test_layer_falls_back_to_legacy_tail_then_snap() -> None:
+    client = _FakeRedis()
+    layer = RedisLayer(client, "ns")
+    assert layer.read_tail_or_snap("XAU/USD", 60, 10) == (
+        None, None, None, "redis_miss",
+    )
+
+    bars = [{"open_ms": i, "close_ms": i + 59_999} for i in range(6)]
+    client.set("ns:ohlcv:tail:XAU_USD:60", json.dumps({"bars": bars, "last_seq": 3}), ex=60)
+    payload, ttl_left, source, err = layer.read_tail_or_snap("XAU/USD", 60, 2)
+    assert (source, err, ttl_left) == ("redis_tail", None, 60)
+    assert payload["bars"] == bars[-2:]
+
+    client.delete("ns:ohlcv:tail:XAU_USD:60")
+    _writer(client, tail_n=0).put_bar(_bar(1))
+    payload, ttl_left, source, err = layer.read_tail_or_snap("XAU/USD", 60, 10)
+    assert (source, err, ttl_left) == ("redis_snap", None, 3600)
+    assert payload["bar"]["open_ms"] == _bar(1).open_time_ms
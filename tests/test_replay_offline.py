@@ -0,0 +1,95 @@
+"""Offline replay: DeriveEngine+SmcEngine in-process з диску, без Redis/sleep, diff vs data_v3."""
+
+from __future__ import annotations
+
+from unittest.mock import patch
+
+from core.model.bars import CandleBar
+from runtime.ingest.replay_offline import replay_offline
+from runtime.store.ssot_jsonl import JsonlAppender
+
+# Вівторок 00:00 UTC — без вихідних у вікні
+T0 = 1_740_441_600_000
+N_M1 = 1_800  # 30 год → D1 + частина наступної доби
+
+
+def _m1(i: int) -> CandleBar:
+    open_ms = T0 + i * 60_000
+    base = 2000.0 + (i % 37) * 0.25 - (i % 11) * 0.5
+    return CandleBar(
+        "XAU/USD", 60, open_ms, open_ms + 60_000,
+        base, base + 1.0, base - 1.0, base + 0.5, 1.0 + i % 3, True, "history",
+    )
+
+
+def _m5(i: int, c_shift: float = 0.0) -> CandleBar:
+    src = [_m1(k) for k in range(i * 5, i * 5 + 5)]
+    open_ms = src[0].open_time_ms
+    return CandleBar(
+        "XAU/USD", 300, open_ms, open_ms + 300_000,
+        src[0].o, max(b.h for b in src), min(b.low for b in src),
+        src[-1].c + c_shift, sum(b.v for b in src), True, "derived",
+    )
+
+
+def _seed(root: str) -> None:
+    app = JsonlAppender(root)
+    for i in range(N_M1):
+        app.append(_m1(i))
+    app.close()
+
+
+def _cfg(root: str) -> dict:
+    return {"data_root": root, "smc": {"compute_tfs": [300, 900]}}
+
+
+def test_offline_replay_is_deterministic_and_never_sleeps(tmp_path) -> None:
+    root = str(tmp_path)
+    _seed(root)
+    with patch("time.sleep", side_effect=AssertionError("sleep in offline replay")):
+        r1 = replay_offline(_cfg(root), ["XAU/USD"])
+        r2 = replay_offline(_cfg(root), ["XAU/USD"])
+    assert r1["m1_bars"] == N_M1
+    assert r1["fingerprints"] == r2["fingerprints"]
+    assert r1["derived_by_tf"]["300"] == N_M1 // 5
+    assert r1["derived_by_tf"]["180"] == N_M1 // 3
+    assert r1["derived_by_tf"]["86400"] == 1
+    assert r1["derived_by_tf"]["14400"] == N_M1 // 240
+    stages = r1["stages"]
+    assert stages["load"]["bars"] == stages["derive"]["bars"] == N_M1
+    # SMC отримує лише compute_tfs: M5 + M15
+    assert stages["smc"]["bars"] == N_M1 // 5 + N_M1 // 15
+    assert r1["smc"]["on_bar"] == stages["smc"]["bars"]
+    assert stages["derive"]["bars_per_s"] > 0
+    assert r1["diff"] is None
+
+    no_smc = replay_offline(_cfg(root), ["XAU/USD"], with_smc=False, end_ms=T0 + 599 * 60_000)
+    assert no_smc["smc"] is None and no_smc["stages"]["smc"]["bars"] == 0
+    assert no_smc["derived_by_tf"]["300"] == 120
+
+
+def test_offline_replay_diff_against_disk(tmp_path) -> None:
+    root = str(tmp_path)
+    _seed(root)
+    app = JsonlAppender(root)
+    for i in range(N_M1 // 5):
+        app.append(_m5(i))
+    app.close()
+
+    report = replay_offline(_cfg(root), ["XAU/USD"], diff=True, with_smc=False)
+    m5 = report["diff"]["XAU/USD"]["300"]
+    assert m5["matched"] == m5["replayed"] == m5["disk"] == N_M1 // 5
+    assert m5["only_disk"] == m5["only_replay"] == m5["mismatch"] == 0
+    # M15 на диску немає → усе лише у replay
+    m15 = report["diff"]["XAU/USD"]["900"]
+    assert m15["disk"] == 0 and m15["only_replay"] == N_M1 // 15
+    assert report["stages"]["diff"]["bars"] > 0
+
+    app = JsonlAppender(root)
+    app.append(_m5(7, c_shift=0.25))  # пізніший рядок перекриває (last wins)
+    app.close()
+    m5 = replay_offline(_cfg(root), ["XAU/USD"], diff=True, with_smc=False)["diff"][
+        "XAU/USD"
+    ]["300"]
+    assert m5["mismatch"] == 1
+    assert m5["samples"]["mismatch"] == [_m5(7).open_time_ms]
@@ -0,0 +1,119 @@
+"""JournalStore: індекс journal-*.idx, запити symbol/source/час/latest, самовідновлення індексу."""
+
+from __future__ import annotations
+
+import json
+import os
+from datetime import datetime, timezone
+
+from runtime.smc import journal_store as js
+from runtime.smc.journal_store import JournalStore, append_record, index_path_for, journal_path
+from runtime.smc.signal_journal import SignalJournal
+
+DAY = "2026-03-10"
+
+
+def _rec(i: int, symbol: str = "XAU/USD", source: str = "", **extra) -> dict:
+    rec = {"wall_ms": 1_000 + i, "symbol": symbol, "tf_s": 900, "event": "signal_ready", "i": i}
+    if source:
+        rec["source"] = source
+    rec.update(extra)
+    return rec
+
+
+def _seed(base: str, n: int = 30, date_str: str = DAY) -> None:
+    for i in range(n):
+        sym = "XAU/USD" if i % 3 else "BTCUSDT"
+        append_record(base, _rec(i, sym, "tda_cascade" if i % 5 == 0 else ""), date_str)
+
+
+def test_queries_by_symbol_source_time_and_latest(tmp_path) -> None:
+    base = str(tmp_path)
+    _seed(base)
+    _seed(base, 4, "2026-03-09")
+    assert os.path.isfile(index_path_for(journal_path(base, DAY)))
+    store = JournalStore(base)
+
+    xau_tda = store.query(DAY, source="tda_cascade", symbol="XAU/USD")
+    assert [r["i"] for r in xau_tda] == [5, 10, 20, 25]
+    narrative = store.query(DAY, source="smc_narrative")
+    assert all("source" not in r for r in narrative) and len(narrative) == 24
+    assert [r["i"] for r in store.query(DAY, since_ms=1_027, until_ms=1_028)] == [27, 28]
+    assert [r["i"] for r in store.query(DAY, symbol="BTCUSDT", limit=2, newest_first=True)] == [27, 24]
+
+    now = datetime(2026, 3, 10, 12, tzinfo=timezone.utc)
+    latest = store.latest(32, now=now, max_days=5)
+    assert [r["i"] for r in latest[:2]] == [29, 28] and len(latest) == 32
+    assert [r["i"] for r in latest[-2:]] == [3, 2]  # добір з попереднього дня
+    assert store.latest(3, now=now, max_days=1, source="tda_cascade") == [
+        r for r in reversed(store.query(DAY, source="tda_cascade"))
+    ][:3]
+
+
+def test_only_selected_lines_are_decoded(tmp_path, monkeypatch) -> None:
+    base = str(tmp_path)
+    _seed(base, 200)
+    store = JournalStore(base)
+    store.index(DAY)  # індекс з .idx, без JSON
+    calls = []
+    orig = js._parse_line
+    monkeypatch.setattr(js, "_parse_line", lambda raw: calls.append(raw) or orig(raw))
+    assert len(store.latest(3, now=datetime(2026, 3, 10, tzinfo=timezone.utc))) == 3
+    assert len(store.query(DAY, source="tda_cascade", symbol="BTCUSDT")) == 14
+    assert len(calls) == 3 + 14
+
+
+def test_external_jsonl_without_index_and_malformed_lines(tmp_path) -> None:
+    base = str(tmp_path)
+    path = journal_path(base, DAY)
+    with open(path, "w", encoding="utf-8") as fh:
+        fh.write(json.dumps(_rec(0)) + "\n")
+        fh.write("not-json\n\n")
+        fh.write(json.dumps(_rec(1, symbol="S" * 40)) + "\n")  # поле поза індексом
+        fh.write(json.dumps(_rec(2))[:10])  # напівзаписаний рядок
+    store = JournalStore(base)
+    assert [r["i"] for r in store.query(DAY)] == [0, 1]
+    assert [r["i"] for r in store.query(DAY, symbol="S" * 40)] == [1]
+    assert os.path.isfile(index_path_for(path))  # лінива перебудова persist-иться
+
+    with open(path, "a", encoding="utf-8") as fh:  # дописати рядок повністю
+        fh.write(json.dumps(_rec(2))[10:] + "\n")
+    append_record(base, _rec(3), DAY)  # writer бачить розбіжність → rebuild
+    entries = js.read_index(index_path_for(path), os.path.getsize(path))
+    assert entries is not None and entries[-1].end == os.path.getsize(path)
+    assert [r["i"] for r in JournalStore(base).query(DAY)] == [0, 1, 2, 3]
+
+
+def test_rewritten_file_with_stale_index_is_rebuilt(tmp_path) -> None:
+    base = str(tmp_path)
+    append_record(base, _rec(1, symbol="AAA/USD"), DAY)
+    append_record(base, _rec(2, symbol="AAA/USD"), DAY)
+    path = journal_path(base, DAY)
+    size = os.path.getsize(path)
+    # той самий розмір, інші межі рядків → індекс формально валідний, але застарілий
+    line = json.dumps(_rec(7, symbol="BBB/USD"))
+    body = (line + " " * (size - len(line) - 1) + "\n").encode()
+    assert len(body) == size
+    with open(path, "wb") as fh:
+        fh.write(body)
+    assert [r["i"] for r in JournalStore(base).query(DAY)] == [7]
+
+
+def test_recovery_decodes_only_final_lines(tmp_path, monkeypatch) -> None:
+    base = str(tmp_path)
+    today = datetime.now(timezone.utc).strftime("%Y-%m-%d")
+    for i in range(50):
+        append_record(base, {"symbol": "XAU/USD", "tf_s": 900, "event": "signal_ready",
+                             "mode": "trade", "zone_id": f"z{i}", "trigger": "ready"}, today)
+        if i == 10:
+            append_record(base, {"symbol": "XAU/USD", "tf_s": 900, "event": "trade_entered",
+                                 "mode": "trade", "zone_id": "z10", "direction": "long",
+                                 "price": 1.0, "trigger": "ready"}, today)
+    append_record(base, {"source": "tda_cascade", "symbol": "XAU/USD", "event": "x"}, today)
+    calls = []
+    orig = js._parse_line
+    monkeypatch.setattr(js, "_parse_line", lambda raw: calls.append(raw) or orig(raw))
+    journal = SignalJournal({"smc": {"signal_journal": {"enabled": True, "path": base}}})
+    assert journal._last_state[("XAU/USD", 900)] == ("trade", "z49", "ready")
+    assert journal._active[("XAU/USD", 900)].direction == "long"
+    assert len(calls) == 2  # останній запис + останній trade_entered
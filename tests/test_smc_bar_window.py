@@ -0,0 +1,202 @@
+"""
+tests/test_smc_bar_window.py — numpy BarWindow + vectorized детектори.
+
+  - BarWindow (ring buffer, компакція, replace останнього) == deque(maxlen);
+  - swing_pivots / ATR / RV / FVG lifecycle на колонках == прямі цикли
+    по CandleBar (reference-реалізації нижче, семантика до векторизації).
+"""
+from __future__ import annotations
+
+import dataclasses
+import random
+from collections import deque
+from typing import List
+
+import pytest
+
+from core.model.bars import CandleBar
+from core.smc.bar_window import BarArrays, BarWindow
+from core.smc.config import SmcConfig
+from core.smc.fvg import _update_fvg_status, detect_fvg, fvg_status_step
+from core.smc.swings import compute_atr, compute_rv, detect_fractals, detect_raw_swings
+
+SYM = "XAU/USD"
+T0 = 1_700_006_400_000
+
+
+def _bars(seed: int, n: int, tf_s: int = 300) -> List[CandleBar]:
+    rnd = random.Random(seed)
+    price = 2000.0
+    out = []  # type: List[CandleBar]
+    for i in range(n):
+        o = price + (rnd.uniform(-4.0, 4.0) if rnd.random() < 0.1 else 0.0)
+        c = o + rnd.gauss(0.0, 1.5)
+        # рівні high/low (ties) — перевірка > / >= у pivots
+        h = round(max(o, c) + abs(rnd.gauss(0.0, 0.4)), 1)
+        low = round(min(o, c) - abs(rnd.gauss(0.0, 0.4)), 1)
+        r = rnd.random()
+        v = None if r < 0.05 else (0.0 if r < 0.1 else float(rnd.randint(1, 300)))
+        open_ms = T0 + i * tf_s * 1000
+        out.append(
+            CandleBar(
+                symbol=SYM,
+                tf_s=tf_s,
+                open_time_ms=open_ms,
+                close_time_ms=open_ms + tf_s * 1000,
+                o=round(o, 2),
+                h=h,
+                low=low,
+                c=round(c, 2),
+                v=v,
+                complete=rnd.random() > 0.03,
+                src="history",
+            )
+        )
+        price = c
+    return out
+
+
+# ── reference (CandleBar цикли) ──────────────────────────────────────
+
+
+def _ref_pivots(bars: List[CandleBar], p: int):
+    hi, lo = [], []
+    for i in range(p, len(bars) - p):
+        b = bars[i]
+        if b.h > max(x.h for x in bars[i - p : i]) and b.h >= max(
+            x.h for x in bars[i + 1 : i + p + 1]
+        ):
+            hi.append(i)
+        if b.low < min(x.low for x in bars[i - p : i]) and b.low <= min(
+            x.low for x in bars[i + 1 : i + p + 1]
+        ):
+            lo.append(i)
+    return hi, lo
+
+
+def _ref_atr(bars: List[CandleBar], period: int) -> float:
+    if not bars:
+        return 1.0
+    n = min(len(bars), period)
+    total = 0.0
+    for i in range(1, n + 1):
+        total += bars[-i].h - bars[-i].low
+    atr = total / n
+    return atr if atr > 0.0 else 1.0
+
+
+def _ref_rv(bars: List[CandleBar], period: int) -> float:
+    if len(bars) < period + 1:
+        return 1.0
+    last_v = bars[-1].v
+    if last_v is None or last_v <= 0:
+        return 1.0
+    valid = [float(b.v) for b in bars[-(period + 1) : -1] if b.v is not None and b.v > 0]
+    if not valid or len(valid) < period // 2:  # period=1: без ZeroDivision
+        return 1.0
+    sma = sum(valid) / len(valid)
+    return float(last_v) / sma if sma > 0 else 1.0
+
+
+def _ref_fvg_status(zone, bars: List[CandleBar]):
+    status, end_ms = zone.status, zone.end_ms
+    for bar in bars:
+        if bar.open_time_ms <= zone.anchor_bar_ms or not bar.complete:
+            continue
+        new_status = fvg_status_step(zone, status, bar)
+        if new_status == "filled" and status != "filled":
+            return "filled", bar.open_time_ms
+        status = new_status
+    return status, end_ms
+
+
+# ── BarWindow ────────────────────────────────────────────────────────
+
+
+@pytest.mark.parametrize("maxlen", [1, 3, 50])
+def test_bar_window_matches_deque(maxlen: int) -> None:
+    bars = _bars(1, 400)
+    win = BarWindow(maxlen)
+    ref = deque(maxlen=maxlen)  # type: deque
+    for i, bar in enumerate(bars):
+        assert win.append(bar) is False
+        ref.append(bar)
+        if i % 7 == 0:
+            fixed = dataclasses.replace(bar, c=bar.c + 1.0, v=None)
+            assert win.append(fixed) is True
+            ref[-1] = fixed
+        assert win.bars_list() == list(ref)
+        assert win.last() is ref[-1]
+        got, want = win.views(), BarArrays.from_bars(list(ref))
+        for name in ("open_ms", "o", "h", "low", "c", "v", "complete"):
+            assert getattr(got, name).tolist() == pytest.approx(
+                getattr(want, name).tolist(), nan_ok=True
+            ), name
+
+    win.reset(bars[:5])
+    assert win.bars_list() == bars[:5][-maxlen:]
+    win.reset([])
+    assert len(win) == 0
+
+
+# ── vectorized детектори ─────────────────────────────────────────────
+
+
+@pytest.mark.parametrize("seed,period", [(2, 1), (3, 2), (4, 5), (5, 8)])
+def test_pivots_match_reference(seed: int, period: int) -> None:
+    bars = _bars(seed, 300)
+    hi, lo = _ref_pivots(bars, period)
+    raw = detect_raw_swings(bars, period=period)
+    want = sorted(
+        [(bars[i].open_time_ms, 0, "sh") for i in hi]
+        + [(bars[i].open_time_ms, 1, "sl") for i in lo]
+    )
+    assert [(s.time_ms, s.id.split("_")[0]) for s in raw] == [(t, k) for t, _, k in want]
+    fr = detect_fractals(bars, period=period, arrays=BarArrays.from_bars(bars))
+    assert [s.time_ms for s in fr] == [s.time_ms for s in raw]
+    assert detect_raw_swings(bars[: 2 * period], period=period) == []
+
+
+def test_atr_rv_match_reference() -> None:
+    bars = _bars(6, 120)
+    for end in range(0, len(bars) + 1):
+        window = bars[:end]
+        for period in (1, 14, 20):
+            assert compute_atr(window, period) == _ref_atr(window, period)
+            assert compute_rv(window, period) == _ref_rv(window, period)
+
+
+@pytest.mark.parametrize("seed", [7, 8, 9])
+def test_fvg_lifecycle_matches_per_bar_loop(seed: int) -> None:
+    bars = _bars(seed, 500)
+    cfg = SmcConfig.from_dict({"tda": {"enabled": True, "ifvg_enabled": True}})
+    zones = detect_fvg(bars, cfg)
+    assert zones
+    # статуси повних кандидатів (до caps), включно з уже терміналь-
+    # ними початковими статусами
+    cands = [
+        dataclasses.replace(z, status=st, end_ms=None)
+        for z in zones
+        for st in ("active", "partially_filled", "filled")
+    ]
+    updated, ifvgs = _update_fvg_status(cands, bars, ifvg_enabled=True)
+    fills = {}  # type: dict
+    for z, u in zip(cands, updated):
+        status, end_ms = _ref_fvg_status(z, bars)
+        assert (u.status, u.end_ms) == (status, end_ms), z.id
+        if z.status != "filled" and status == "filled":
+            fills.setdefault(z.id, []).append(end_ms)
+    assert sorted(i.anchor_bar_ms for i in ifvgs) == sorted(
+        t for ts in fills.values() for t in ts
+    )
+
+
+def test_fvg_scan_is_chunked(monkeypatch) -> None:
+    import core.smc.fvg as fvg_mod
+
+    bars = _bars(10, 300)
+    cfg = SmcConfig.from_dict({})
+    full = detect_fvg(bars, cfg)
+    monkeypatch.setattr(fvg_mod, "_SCAN_CELLS", 1)
+    assert detect_fvg(bars, cfg) == full
+
@@ -0,0 +1,116 @@
+"""
+tests/test_smc_display_cache.py — мемоізація SmcEngine.get_display_snapshot.
+
+  - повторний виклик між закриттями барів → той самий об'єкт без rebuild;
+  - закриття бару TF-джерела (base або HTF) → rebuild; нижчий TF — ні;
+  - результат і zone grades == performance.display_cache=False на кожному кроці.
+
+Python 3.7 compatible.
+"""
+from __future__ import annotations
+
+import dataclasses
+import random
+from typing import Dict, List
+
+from core.model.bars import CandleBar
+from core.smc.config import SmcConfig
+from core.smc.engine import SmcEngine
+
+SYM = "XAU/USD"
+T0 = 1_700_006_400_000
+TFS = (300, 900, 3600, 14400)
+
+
+def _stream(seed: int, n: int, tf_s: int) -> List[CandleBar]:
+    rnd = random.Random(seed)
+    price = 2000.0
+    bars = []  # type: List[CandleBar]
+    for i in range(n):
+        o = price
+        c = o + rnd.gauss(0.0, 1.5)
+        open_ms = T0 + i * tf_s * 1000
+        bars.append(
+            CandleBar(
+                symbol=SYM,
+                tf_s=tf_s,
+                open_time_ms=open_ms,
+                close_time_ms=open_ms + tf_s * 1000,
+                o=round(o, 2),
+                h=round(max(o, c) + abs(rnd.gauss(0.0, 0.6)), 2),
+                low=round(min(o, c) - abs(rnd.gauss(0.0, 0.6)), 2),
+                c=round(c, 2),
+                v=1.0,
+                complete=True,
+                src="history",
+            )
+        )
+        price = c
+    return bars
+
+
+def _engine(display_cache: bool) -> SmcEngine:
+    cfg = SmcConfig.from_dict(
+        {
+            "lookback_bars": 120,
+            "compute_tfs": list(TFS),
+            "performance": {"display_cache": display_cache},
+        }
+    )
+    engine = SmcEngine(cfg)
+    for i, tf in enumerate(TFS):
+        engine.update(SYM, tf, _stream(i + 1, 80, tf))
+    return engine
+
+
+def _count_builds(engine: SmcEngine) -> Dict[int, int]:
+    calls = {}  # type: Dict[int, int]
+    orig = engine._build_display_snapshot
+
+    def _wrapped(symbol, viewer_tf_s, base_tf):
+        calls[viewer_tf_s] = calls.get(viewer_tf_s, 0) + 1
+        return orig(symbol, viewer_tf_s, base_tf)
+
+    engine._build_display_snapshot = _wrapped  # type: ignore[assignment]
+    return calls
+
+
+def test_hit_between_closes_and_invalidation_by_source_tf() -> None:
+    engine = _engine(True)
+    builds = _count_builds(engine)
+    first = engine.get_display_snapshot(SYM, 900)
+    assert engine.get_display_snapshot(SYM, 900) is first
+    assert builds == {900: 1}
+
+    # M5 — не джерело для M15 display
+    engine.on_bar(_stream(11, 81, 300)[-1])
+    assert engine.get_display_snapshot(SYM, 900) is first
+    # H4 — HTF-джерело (FVG / context stack / key levels)
+    engine.on_bar(_stream(3, 81, 14400)[-1])
+    assert engine.get_display_snapshot(SYM, 900) is not first
+    assert builds == {900: 2}
+
+    # reset + повторне наповнення не повертає стару версію
+    engine.reset(SYM, 900)
+    engine.update(SYM, 900, _stream(2, 80, 900))
+    engine.get_display_snapshot(SYM, 900)
+    assert builds == {900: 3}
+
+
+def _strip(snap):
+    return dataclasses.replace(snap, computed_at_ms=0)
+
+
+def test_cached_matches_uncached_every_bar() -> None:
+    cached, plain = _engine(True), _engine(False)
+    streams = {tf: _stream(20 + i, 130, tf) for i, tf in enumerate(TFS)}
+    for step in range(80, 130):
+        for tf in TFS:
+            if step % (1 + TFS.index(tf)) == 0:
+                cached.on_bar(streams[tf][step])
+                plain.on_bar(streams[tf][step])
+        for viewer in (60, 900, 1800, 14400, 86400):
+            a = cached.get_display_snapshot(SYM, viewer)
+            b = plain.get_display_snapshot(SYM, viewer)
+            assert _strip(a) == _strip(b)
+            assert cached.get_zone_grades(SYM, viewer) == plain.get_zone_grades(SYM, viewer)
@@ -0,0 +1,141 @@
+"""
+tests/test_smc_incremental_parity.py — incremental SMC == full recompute.
+
+Записані (seeded) потоки барів проганяються бар за баром:
+  - IncrementalDetectors.detect() == detect_all(вікно) на КОЖНОМУ кроці
+    (малий lookback → багато зсувів вікна, replay structure до збіжності);
+  - SmcEngine(performance.incremental) дає ті самі snapshot/delta, що full,
+    включно з replace останнього бару та incomplete барами у warmup.
+
+Python 3.7 compatible.
+"""
+from __future__ import annotations
+
+import dataclasses
+import random
+from typing import List
+
+import pytest
+
+from core.model.bars import CandleBar
+from core.smc.config import SmcConfig
+from core.smc.engine import SmcEngine
+from core.smc.incremental import IncrementalDetectors, detect_all
+
+SYM = "XAU/USD"
+T0 = 1_700_006_400_000
+
+
+def _stream(seed: int, n: int, tf_s: int, incomplete_every: int = 0) -> List[CandleBar]:
+    """Random walk з режимами тренду, гепами (FVG) і сплесками (displacement)."""
+    rnd = random.Random(seed)
+    price = 2000.0
+    drift = 0.0
+    bars = []  # type: List[CandleBar]
+    for i in range(n):
+        if i % 40 == 0:
+            drift = rnd.choice((-0.6, -0.2, 0.0, 0.2, 0.6))
+        o = price + (rnd.uniform(-3.0, 3.0) if rnd.random() < 0.08 else 0.0)
+        c = o + drift + rnd.gauss(0.0, 1.2) * (3.0 if rnd.random() < 0.05 else 1.0)
+        h = max(o, c) + abs(rnd.gauss(0.0, 0.5))
+        low = min(o, c) - abs(rnd.gauss(0.0, 0.5))
+        open_ms = T0 + i * tf_s * 1000
+        bars.append(
+            CandleBar(
+                symbol=SYM,
+                tf_s=tf_s,
+                open_time_ms=open_ms,
+                close_time_ms=open_ms + tf_s * 1000,
+                o=round(o, 2),
+                h=round(h, 2),
+                low=round(low, 2),
+                c=round(c, 2),
+                v=float(rnd.randint(1, 500)),
+                complete=not (incomplete_every and i % incomplete_every == 7),
+                src="history",
+            )
+        )
+        price = c
+    return bars
+
+
+def _cfg(**perf) -> SmcConfig:
+    cfg = SmcConfig.from_dict(
+        {
+            "lookback_bars": 120,
+            "hide_mitigated": True,
+            "tda": {"enabled": True, "ifvg_enabled": True},
+            "tf_overrides": {"300": {"swing_period": 3}},
+            "performance": dict(perf),
+        }
+    )
+    return cfg
+
+
+@pytest.mark.parametrize(
+    "tf_s,seed,confirmation_bars,incomplete_every",
+    [
+        (300, 1, 1, 0),
+        (900, 2, 1, 0),
+        (3600, 3, 2, 0),
+        (14400, 4, 1, 25),
+        (86400, 5, 3, 0),
+    ],
+)
+def test_detectors_match_full_recompute_every_bar(
+    tf_s: int, seed: int, confirmation_bars: int, incomplete_every: int
+) -> None:
+    base = _cfg()
+    cfg = dataclasses.replace(
+        base.for_tf(tf_s),
+        structure=dataclasses.replace(
+            base.structure, confirmation_bars=confirmation_bars
+        ),
+    )
+    lookback = base.lookback_bars
+    bars = _stream(seed, 600, tf_s, incomplete_every)
+    inc = IncrementalDetectors(cfg, lookback)
+    for i, bar in enumerate(bars):
+        assert inc.append(bar)
+        window = bars[max(0, i + 1 - lookback) : i + 1]
+        assert inc.detect() == detect_all(window, cfg), "diverged at bar %d" % i
+
+
+def test_out_of_order_bar_is_rejected() -> None:
+    cfg = _cfg()
+    bars = _stream(7, 30, 300)
+    inc = IncrementalDetectors.build(cfg, 120, bars)
+    assert inc is not None
+    assert not inc.append(bars[-1])
+    assert not inc.append(bars[3])
+    assert IncrementalDetectors.build(cfg, 120, bars[:10] + bars[5:8]) is None
+
+
+def _strip(snap):
+    return dataclasses.replace(snap, computed_at_ms=0)
+
+
+@pytest.mark.parametrize("tf_s,seed", [(300, 11), (3600, 12), (14400, 13)])
+def test_engine_incremental_matches_full(tf_s: int, seed: int) -> None:
+    full = SmcEngine(_cfg(incremental=False))
+    inc = SmcEngine(_cfg(incremental=True))
+    bars = _stream(seed, 700, tf_s)
+
+    # warmup (update) з incomplete баром у хвості
+    warm = bars[:150] + [dataclasses.replace(bars[150], complete=False)]
+    assert _strip(full.update(SYM, tf_s, warm)) == _strip(inc.update(SYM, tf_s, warm))
+
+    for i, bar in enumerate(bars[150:], start=150):
+        d_full = full.on_bar(bar)
+        d_inc = inc.on_bar(bar)
+        assert d_full == d_inc, "delta diverged at bar %d" % i
+        assert _strip(full.get_snapshot(SYM, tf_s)) == _strip(
+            inc.get_snapshot(SYM, tf_s)
+        )
+        if i % 97 == 0:
+            # final bar update від паралельного feed-шляху (replace останнього)
+            fixed = dataclasses.replace(bar, c=round(bar.c + 0.37, 2))
+            assert full.on_bar(fixed) == inc.on_bar(fixed)
+            assert _strip(full.get_snapshot(SYM, tf_s)) == _strip(
+                inc.get_snapshot(SYM, tf_s)
+            )
@@ -291,6 +291,17 @@ class TestSmcRunnerOnBarDict:
         delta = runner.on_bar_dict(SYM, TF, d)
         assert delta is not None
 
+    def test_state_version_bumps_only_on_complete_bars(self):
+        """state_version: +1 на complete bar; preview і bad dict — без змін."""
+        runner = self._runner_with_warmup()
+        v0 = runner.state_version(SYM)
+        runner.on_bar_dict(SYM, TF, _bar_dict(i=104, complete=False))
+        runner.on_bar_dict(SYM, TF, {})
+        assert runner.state_version(SYM) == v0
+        runner.on_bar_dict(SYM, TF, _bar_dict(i=104, complete=True))
+        assert runner.state_version(SYM) == v0 + 1
+        assert runner.state_version("XAG/USD") == 0
+
 
 # ──────────────────────────────────────────────────────────────
 #  SmcRunner.get_snapshot
@@ -20,6 +20,7 @@ from core.smc.sessions import (
     classify_bar_sessions,
     get_current_session,
     compute_session_levels,
+    SessionTracker,
     _parse_utc_minutes,
     _ms_to_utc_minutes,
     _bar_in_session,
@@ -489,3 +490,65 @@ class TestSmcEngineSessions:
         kinds = {lv.kind for lv in levels}
         # At least asia current session H/L
         assert kinds & {"as_h", "as_l"}
+
+
+# ── SessionTracker (streaming) parity ─────────────────────
+
+
+class TestSessionTrackerParity:
+    """SessionTracker.snapshot == compute_session_levels на тих самих барах."""
+
+    def _stream(self):
+        import random
+
+        rnd = random.Random(7)
+        bars = []
+        price = 2000.0
+        minute = 0
+        while minute < 3 * 1440 + 600:
+            if rnd.random() < 0.01:
+                minute += rnd.randint(30, 240)  # гепи (вихідні, outages)
+                continue
+            price += rnd.gauss(0.0, 0.8)
+            h = price + abs(rnd.gauss(0.0, 0.5))
+            low = price - abs(rnd.gauss(0.0, 0.5))
+            bars.append(_make_bar(_DAY_START_MS + minute * 60000, h=h, low=low))
+            minute += 1
+        return bars
+
+    def test_matches_reference_every_hour(self):
+        defs = dict(DEFINITIONS)
+        defs["asia"] = dict(DEFINITIONS["asia"], open_utc="22:00")  # midnight cross
+        sessions = load_session_windows(defs)
+        tracker = SessionTracker(sessions)
+        assert tracker.snapshot(_DAY_START_MS, "XAU/USD") == ([], [])
+        fed = []
+        for bar in self._stream():
+            tracker.feed(bar)
+            fed.append(bar)
+            if bar.open_time_ms % 3600_000 != 0:
+                continue
+            window = fed[-2880:]
+            for now in (bar.open_time_ms + 60000, bar.open_time_ms + 86400_000):
+                assert tracker.snapshot(now, "XAU/USD") == compute_session_levels(
+                    window, sessions, now, "XAU/USD"
+                )
+
+    def test_engine_uses_tracker_and_skips_incomplete(self):
+        from core.smc.config import SmcConfig
+        from core.smc.engine import SmcEngine
+
+        engine = SmcEngine(
+            SmcConfig.from_dict({"sessions": {"enabled": True, "definitions": DEFINITIONS}})
+        )
+        bars = self._stream()[:1500]
+        engine.feed_m1_bars_bulk("XAU/USD", bars[:1000])
+        for bar in bars[1000:]:
+            engine.feed_m1_bar(bar)
+        engine.feed_m1_bar(_make_bar(bars[-1].open_time_ms + 60000, h=1e6, complete=False))
+        now = bars[-1].open_time_ms + 60000
+        ref_levels, ref_states = compute_session_levels(
+            bars, engine._session_windows, now, "XAU/USD"
+        )
+        assert engine.get_session_levels("XAU/USD", now) == ref_levels
+        assert engine.get_session_states("XAU/USD", now) == ref_states
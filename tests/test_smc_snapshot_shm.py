@@ -0,0 +1,172 @@
+"""Shared-memory SMC snapshot: encode/decode, покоління, attach з іншого процесу, ріст регіону."""
+
+from __future__ import annotations
+
+import multiprocessing
+import os
+from typing import Any, Dict, List
+
+from core.smc.config import SmcConfig
+from core.smc.engine import SmcEngine
+from core.smc.types import (
+    RangeExhaustionSnapshot,
+    RangeExhaustionState,
+    SmcLevel,
+    SmcSnapshot,
+    SmcSwing,
+    SmcZone,
+)
+from runtime.smc import snapshot_shm as shm
+from runtime.smc.smc_runner import SmcRunner
+from runtime.smc.snapshot_shm import SharedSnapshotReader, SharedSnapshotWriter, region_path
+
+SYM = "XAU/USD"
+TF = 900
+
+
+def _zone(i: int, **kw: Any) -> SmcZone:
+    base: Dict[str, Any] = dict(
+        id=f"ob_bull_{i}", symbol=SYM, tf_s=TF, kind="ob_bull", start_ms=1_000 + i,
+        end_ms=None, high=2010.5 + i, low=2001.25 + i, status="active",
+        strength=0.75, anchor_bar_ms=900 + i,
+    )
+    base.update(kw)
+    return SmcZone(**base)
+
+
+def _re_state(kind: str) -> RangeExhaustionState:
+    return RangeExhaustionState(
+        anchor_kind=kind, anchor_ms=1, anchor_price=2000.0, current_price=2030.0,
+        traveled_abs=30.0, traveled_dir="up", atr_baseline=20.0, traveled_mult=1.5,
+        phase="stretched", remaining_budget=0.5, confidence_delta=-5.0, degraded=["x"],
+    )
+
+
+def _snapshot(n_zones: int = 3, **kw: Any) -> SmcSnapshot:
+    zones: List[SmcZone] = [_zone(i) for i in range(n_zones)]
+    if zones:
+        zones[-1] = _zone(n_zones - 1, end_ms=5_000, context_layer="L1",
+                          origin_zone_id="ob_bull_0", status="mitigated")
+    base: Dict[str, Any] = dict(
+        symbol=SYM, tf_s=TF, zones=zones,
+        swings=[SmcSwing(id="sw1", symbol=SYM, tf_s=TF, kind="hh", price=2020.0,
+                         time_ms=7_000, confirmed=True)],
+        levels=[
+            SmcLevel(id="pdh", symbol=SYM, tf_s=TF, kind="pdh", price=2031.0,
+                     time_ms=None, touches=1),
+            SmcLevel(id="eq", symbol=SYM, tf_s=TF, kind="eq_highs", price=2030.0,
+                     time_ms=8_000, touches=3),
+        ],
+        trend_bias="bullish", last_bos_ms=6_000, last_choch_ms=None,
+        computed_at_ms=9_000, bar_count=500,
+        range_exhaustion=RangeExhaustionSnapshot(
+            symbol=SYM, primary=_re_state("d1_open"),
+            by_anchor={"d1_open": _re_state("d1_open")}, computed_at_ms=9_000,
+        ),
+    )
+    base.update(kw)
+    return SmcSnapshot(**base)
+
+
+def test_roundtrip_and_generations(tmp_path) -> None:
+    base = str(tmp_path)
+    writer = SharedSnapshotWriter(base)
+    reader = SharedSnapshotReader(base)
+    assert reader.read(SYM, TF) is None and reader.generation(SYM, TF) == 0
+
+    snap = _snapshot()
+    grades = {"ob_bull_0": {"score": 7, "grade": "A"}}
+    assert writer.publish(snap, grades) == 1
+    assert os.path.isfile(region_path(base, SYM, TF))
+    assert reader.get_snapshot(SYM, TF) == snap
+    assert reader.get_zone_grades(SYM, TF) == grades
+
+    view = reader.read(SYM, TF)
+    assert view is not None and view.generation == 1 and view.bar_count == 500
+    assert view.trend_bias == "bullish" and view.last_choch_ms is None
+    bare = _snapshot(0, trend_bias=None, range_exhaustion=None, swings=[], levels=[])
+    assert writer.publish(bare) == 2
+    assert view.valid()  # gen 2 пише інший слот — gen 1 view ще цілий
+    assert reader.get_snapshot(SYM, TF) == bare and reader.get_zone_grades(SYM, TF) == {}
+    writer.publish(snap, grades)
+    assert not view.valid()  # gen 3 перезаписав слот gen 1
+
+    # повторний старт writer-а продовжує нумерацію існуючого файлу
+    writer.close()
+    assert SharedSnapshotWriter(base).publish(snap) == 4
+    assert reader.generation(SYM, TF) == 4
+
+
+def test_torn_slot_is_not_returned(tmp_path) -> None:
+    base = str(tmp_path)
+    writer = SharedSnapshotWriter(base)
+    writer.publish(_snapshot())
+    region = writer._regions[(SYM, TF)]
+    off = region.slot_offset(1)
+    shm._GEN.pack_into(region.mm, off, 0)  # writer «посеред запису» у слот
+    assert SharedSnapshotReader(base).read(SYM, TF) is None
+
+
+def test_region_grows_and_reader_reattaches(tmp_path) -> None:
+    base = str(tmp_path)
+    writer = SharedSnapshotWriter(base, slot_capacity=4096)
+    reader = SharedSnapshotReader(base)
+    writer.publish(_snapshot(2))
+    assert reader.read(SYM, TF) is not None
+    big = _snapshot(200)
+    assert len(shm.encode_snapshot(big)) > 4096
+    assert writer.publish(big) == 2
+    assert writer._regions[(SYM, TF)].capacity >= len(shm.encode_snapshot(big))
+    got = reader.get_snapshot(SYM, TF)  # старий mmap бачить MOVED → перевідкриття
+    assert got == big
+
+
+def _child_read(base: str, out: Any) -> None:
+    snap = SharedSnapshotReader(base).get_snapshot(SYM, TF)
+    out.put(None if snap is None else (snap.bar_count, len(snap.zones), snap.zones[0].id))
+
+
+def test_reader_in_other_process(tmp_path) -> None:
+    base = str(tmp_path)
+    SharedSnapshotWriter(base).publish(_snapshot(5))
+    ctx = multiprocessing.get_context("spawn")
+    out = ctx.Queue()
+    proc = ctx.Process(target=_child_read, args=(base, out))
+    proc.start()
+    result = out.get(timeout=60)
+    proc.join(timeout=30)
+    assert result == (500, 5, "ob_bull_0")
+
+
+def test_smc_runner_publishes_on_complete_bars(tmp_path) -> None:
+    base = str(tmp_path)
+    cfg = {
+        "symbols": [SYM],
+        "tf_allowlist_s": [60, 300],
+        "smc": {
+            "compute_tfs": [60, 300],
+            "signal_journal": {"enabled": False, "path": str(tmp_path / "sig")},
+            "shared_snapshot": {"enabled": True, "dir": base, "slot_capacity_kb": 4},
+        },
+    }
+    runner = SmcRunner(cfg, SmcEngine(SmcConfig()))
+    runner._warmup_done = True
+    reader = SharedSnapshotReader(base)
+    t0 = 1_700_000_000_000
+    for i in range(10):
+        runner.on_bar_dict(SYM, 60, {
+            "open_time_ms": t0 + i * 60_000, "o": 1900.0 + i, "h": 1902.0 + i,
+            "low": 1898.0 + i, "c": 1901.0 + i, "v": 1.0, "complete": True,
+        })
+    runner.on_bar_dict(SYM, 60, {
+        "open_time_ms": t0 + 10 * 60_000, "o": 1.0, "h": 2.0, "low": 0.5, "c": 1.5,
+        "complete": False,
+    })
+    assert reader.generation(SYM, 60) == 10  # preview не публікується
+    assert reader.generation(SYM, 300) == 0  # старший TF без закритих барів
+    published = reader.get_snapshot(SYM, 60)
+    live = runner.get_snapshot(SYM, 60)
+    assert published is not None and live is not None
+    assert (published.zones, published.swings, published.bar_count) == (
+        live.zones, live.swings, live.bar_count,
+    )
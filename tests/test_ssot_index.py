@@ -0,0 +1,163 @@
+"""Sparse open_ms індекс part-файлів: parity з повним сканом, лінива перебудова."""
+
+from __future__ import annotations
+
+import os
+
+from core.model.bars import CandleBar
+from runtime.store.layers.disk_layer import (
+    DiskLayer,
+    _read_jsonl_filtered,
+    _read_jsonl_tail_filtered_with_geom,
+)
+from runtime.store.ssot_index import (
+    INDEX_STRIDE_LINES,
+    index_path_for,
+    load_part_index,
+)
+from runtime.store.ssot_jsonl import JsonlAppender
+
+_DAY_MS = 86_400_000
+_T0 = 1_700_006_400_000  # 2023-11-15 00:00 UTC
+_M1 = 60_000
+
+
+def _bar(open_ms: int, i: int) -> CandleBar:
+    base = 2000.0 + i * 0.1
+    return CandleBar(
+        symbol="XAU/USD",
+        tf_s=60,
+        open_time_ms=open_ms,
+        close_time_ms=open_ms + _M1,
+        o=base,
+        h=base + 1.0,
+        low=base - 1.0,
+        c=base + 0.5,
+        v=float(i % 11),
+        complete=True,
+        src="history",
+    )
+
+
+def _write(root: str, days: int = 3, per_day: int = 1440) -> JsonlAppender:
+    app = JsonlAppender(root)
+    for d in range(days):
+        for j in range(per_day):
+            app.append(_bar(_T0 + d * _DAY_MS + j * _M1, d * per_day + j))
+    # пізні (невпорядковані) дописи у перший день
+    app.append(_bar(_T0 + 17 * _M1, 99_001))
+    app.append(_bar(_T0 + 1000 * _M1, 99_002))
+    return app
+
+
+_WINDOWS = (
+    (None, None, 100),
+    (None, _T0 + 20 * _M1, 50),
+    (_T0 + 10 * _M1, _T0 + 30 * _M1, 1000),
+    (_T0 + 2 * _DAY_MS - 300 * _M1, None, 300),
+    (None, _T0 + _DAY_MS + 500 * _M1, 300),
+    (_T0 + 2 * _DAY_MS + 1400 * _M1, None, 10),
+)
+
+
+def _reference(parts: list[str], since, to, limit, use_tail: bool):
+    kw = dict(final_only=False, skip_preview=False, final_sources=None)
+    if use_tail:
+        return _read_jsonl_tail_filtered_with_geom(parts, since, to, limit, **kw)
+    return _read_jsonl_filtered(parts, since, to, limit, **kw), None
+
+
+def _assert_parity(layer: DiskLayer) -> None:
+    parts = layer.list_parts("XAU/USD", 60)
+    for since, to, limit in _WINDOWS:
+        for use_tail in (False, True):
+            got = layer.read_window_with_geom(
+                "XAU/USD",
+                60,
+                limit,
+                since_open_ms=since,
+                to_open_ms=to,
+                use_tail=use_tail,
+            )
+            assert got == _reference(parts, since, to, limit, use_tail)
+
+
+def test_appender_maintains_index_and_reads_match_full_scan(tmp_path) -> None:
+    root = str(tmp_path)
+    app = _write(root)
+    layer = DiskLayer(root)
+    parts = layer.list_parts("XAU/USD", 60)
+    assert len(parts) == 3
+    for p in parts:
+        assert os.path.exists(index_path_for(p))
+    idx = load_part_index(parts[0])
+    assert idx is not None
+    assert len(idx.blocks) == (1440 + 2) // INDEX_STRIDE_LINES
+    assert idx.bounds() == (_T0, _T0 + 1439 * _M1)
+
+    _assert_parity(layer)
+    stats = layer.segment_stats()
+    assert stats["index_reads"] > 0
+    assert stats["parts_skipped"] > 0
+
+    # writer продовжує дописувати — кешований індекс перечитується по розміру
+    app.append(_bar(_T0 + 2 * _DAY_MS + 1439 * _M1, 5))
+    app.close()
+    _assert_parity(layer)
+
+
+def test_missing_index_is_rebuilt_lazily(tmp_path) -> None:
+    root = str(tmp_path)
+    _write(root, days=2).close()
+    layer = DiskLayer(root)
+    parts = layer.list_parts("XAU/USD", 60)
+    for p in parts:
+        os.remove(index_path_for(p))
+    _assert_parity(layer)
+    assert all(os.path.exists(index_path_for(p)) for p in parts)
+
+
+def test_corrupt_index_is_logged_and_rebuilt(tmp_path, caplog) -> None:
+    root = str(tmp_path)
+    _write(root, days=1).close()
+    layer = DiskLayer(root)
+    path = layer.list_parts("XAU/USD", 60)[0]
+    with open(index_path_for(path), "wb") as fh:
+        fh.write(b"garbage-not-an-index")
+    with caplog.at_level("WARNING", logger="ssot_index"):
+        _assert_parity(layer)
+    assert "SSOT_INDEX_LOAD_FAILED" in caplog.text and "bad_header" in caplog.text
+    assert load_part_index(path) is not None  # перебудований .idx валідний
+
+
+def test_rewritten_part_falls_back_to_full_scan(tmp_path) -> None:
+    root = str(tmp_path)
+    _write(root, days=1).close()
+    layer = DiskLayer(root)
+    path = layer.list_parts("XAU/USD", 60)[0]
+    _assert_parity(layer)
+    # tool переписав файл in-place (інші довжини рядків) не чіпаючи .idx
+    with open(path, encoding="utf-8") as fh:
+        lines = fh.readlines()
+    with open(path, "w", encoding="utf-8") as fh:
+        for ln in lines[:700]:
+            fh.write(ln.replace('"v":', '"v": ', 1))
+    _assert_parity(layer)
+
+
+def test_reopened_appender_resumes_partial_block(tmp_path) -> None:
+    root = str(tmp_path)
+    app = JsonlAppender(root)
+    for j in range(INDEX_STRIDE_LINES + 10):
+        app.append(_bar(_T0 + j * _M1, j))
+    app.close()
+    app = JsonlAppender(root)
+    for j in range(INDEX_STRIDE_LINES + 10, 3 * INDEX_STRIDE_LINES):
+        app.append(_bar(_T0 + j * _M1, j))
+    app.close()
+    path = DiskLayer(root).list_parts("XAU/USD", 60)[0]
+    idx = load_part_index(path)
+    assert idx is not None
+    assert len(idx.blocks) == 3
+    assert idx.tail.lines == 0
+    assert idx.blocks[1][2] == _T0 + INDEX_STRIDE_LINES * _M1
@@ -138,6 +138,28 @@ class TestTickAggregator(unittest.TestCase):
         self.assertIsNone(promoted)
         self.assertIsNotNone(bar1)
 
+    def test_update_state_is_live_view(self) -> None:
+        """update_state: view без CandleBar; to_bar == update(); rollover не мутує старий."""
+        eager = TickAggregator(tf_allowlist=[60], auto_promote=True)
+        lazy = TickAggregator(tf_allowlist=[60], auto_promote=True)
+        symbol = "XAU/USD"
+        t0 = 1_700_000_040_000
+        ticks = [(t0, 100.0), (t0 + 10_000, 101.5), (t0 + 20_000, 99.0), (t0 + 65_000, 102.0)]
+        views = []
+        for ts, price in ticks:
+            promoted_e, bar_e = eager.update(symbol, 60, ts, price)
+            promoted_l, view = lazy.update_state(symbol, 60, ts, price)
+            self.assertEqual(promoted_l, promoted_e)
+            self.assertEqual(lazy.to_bar(symbol, 60, view), bar_e)
+            views.append(view)
+        self.assertIs(views[0], views[2])
+        self.assertIsNot(views[2], views[3])
+        self.assertFalse(hasattr(views[0], "__dict__"))
+        # view попереднього бакету заморожено після rollover
+        self.assertEqual((views[0].h, views[0].low, views[0].c, views[0].ticks_n), (101.5, 99.0, 99.0, 3))
+        self.assertEqual(lazy.stats(), eager.stats())
+        self.assertEqual(lazy.update_state(symbol, 60, t0, 1.0), (None, None))
+
     def test_anchor_offset_matches_final_samples(self) -> None:
         base_dir = os.path.abspath(os.path.join(os.path.dirname(__file__), ".."))
         cfg_path = os.path.join(base_dir, "config.json")
@@ -0,0 +1,167 @@
+"""TickPreviewWorker batched mode: коалесинг тиків per (symbol, tf) + batch/latency stats.
+
++ lazy preview: on_tick матеріалізує CandleBar лише при фактичному publish.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import random
+import time
+
+from unittest.mock import patch
+
+from runtime.ingest.tick_agg import TickAggregator
+from runtime.ingest.tick_preview_worker import TickPreviewWorker
+
+T0 = 1_740_441_600_000  # 00:00 UTC
+
+
+class _Uds:
+    def __init__(self) -> None:
+        self.preview: list = []
+        self.promoted: list = []
+
+    def publish_preview_bar(self, bar, ttl_s=None) -> None:
+        self.preview.append(bar)
+
+    def publish_promoted_bar(self, bar) -> bool:
+        self.promoted.append(bar)
+        return True
+
+
+def _worker(**kw) -> tuple:
+    uds = _Uds()
+    worker = TickPreviewWorker(
+        uds=uds,
+        tfs=[60, 180, 300, 14400],
+        publish_min_interval_ms=0,
+        curr_ttl_s=1800,
+        symbols=["XAU/USD", "XAG/USD"],
+        channel="test:ticks",
+        auto_promote_m1=True,
+        htf_preview_tfs=[14400],
+        htf_anchor_offsets_ms={14400: 79_200_000},
+        **kw,
+    )
+    return worker, uds
+
+
+def _ticks(n: int) -> list:
+    rnd = random.Random(15)
+    ts = T0
+    out = []
+    for seq in range(n):
+        ts += rnd.randint(50, 4_000)
+        sym = "XAU/USD" if rnd.random() < 0.7 else "XAG/USD"
+        out.append(
+            {"v": 1, "symbol": sym, "tick_ts_ms": ts, "mid": 2000 + rnd.uniform(-5, 5),
+             "src": "test", "seq": seq}
+        )
+    return out
+
+
+def _final_states(bars: list) -> dict:
+    return {(b.symbol, b.tf_s, b.open_time_ms): b for b in bars}
+
+
+def test_batched_matches_per_tick_final_state_with_fewer_publishes() -> None:
+    ticks = _ticks(3_000)
+    single, uds1 = _worker()
+    for t in ticks:
+        single.on_tick(t)
+    batched, uds2 = _worker(batch_enabled=True, batch_max=200)
+    for i in range(0, len(ticks), 97):
+        batched.on_ticks(ticks[i : i + 97])
+
+    assert _final_states(uds2.preview) == _final_states(uds1.preview)
+    # порядок у межах (symbol, tf) зберігається; між ними — групування батчу
+    for key in {(b.symbol, b.tf_s) for b in uds1.promoted}:
+        assert [b for b in uds2.promoted if (b.symbol, b.tf_s) == key] == [
+            b for b in uds1.promoted if (b.symbol, b.tf_s) == key
+        ]
+    assert len(uds2.promoted) == len(uds1.promoted) > 0
+    assert len(uds2.preview) < len(uds1.preview) / 3
+    assert batched._agg.stats() == single._agg.stats()
+
+
+def test_update_many_matches_sequential_updates() -> None:
+    a = TickAggregator([60], auto_promote=True)
+    b = TickAggregator([60], auto_promote=True)
+    ticks = [(T0 + 10, 1.0), (T0 + 20, 2.0), (T0 + 61_000, 3.0), (T0 + 62_000, 0.5),
+             (T0 + 15, 9.0), (T0 + 125_000, 4.0)]  # late-bucket тик відкидається
+    seq = [a.update("X", 60, ts, p) for ts, p in ticks]
+    got = b.update_many("X", 60, ticks)
+    assert a.stats() == b.stats()
+    # кожен бакет: promoted попереднього + фінальний preview
+    assert [bar.open_time_ms for _p, bar in got] == [T0, T0 + 60_000, T0 + 120_000]
+    assert got[1][0] == seq[2][0] and got[2][0] == seq[5][0]
+    assert got[0][0] is None and got[1][1] == seq[3][1] and got[2][1] == seq[5][1]
+    assert b.update_many("X", 60, []) == []
+
+
+class _PubSub:
+    def __init__(self, queued: list) -> None:
+        self.queued = list(queued)
+        self.timeouts: list = []
+
+    def get_message(self, timeout=0.0):
+        self.timeouts.append(timeout)
+        if not self.queued:
+            return None
+        return self.queued.pop(0)
+
+
+def test_next_batch_drains_backlog_and_reports_stats(caplog) -> None:
+    worker, _uds = _worker(batch_enabled=True, batch_max=50, batch_window_ms=0)
+    worker._stats_last_emit_ts = time.time()  # emit лише вручну нижче
+    msgs = [{"type": "message", "data": json.dumps(t).encode()} for t in _ticks(120)]
+    msgs.insert(3, {"type": "message", "data": b"{not json"})
+    pubsub = _PubSub(msgs)
+
+    payloads, rx_ts, depth = worker._next_batch(pubsub)
+    assert len(payloads) == 49 and depth == 49  # cap=50 повідомлень, 1 битий JSON
+    assert pubsub.timeouts[0] == worker._BATCH_IDLE_WAIT_S
+    assert all(t == 0.0 for t in pubsub.timeouts[1:])
+    worker.on_ticks(payloads, rx_ts=rx_ts, queue_depth=depth)
+
+    payloads, rx_ts, depth = worker._next_batch(pubsub)
+    worker.on_ticks(payloads, rx_ts=rx_ts, queue_depth=depth)
+    assert worker._next_batch(_PubSub([]))[0] == []
+
+    worker._stats_last_emit_ts = 0.0
+    with caplog.at_level(logging.INFO):
+        worker._maybe_emit_stats()
+    line = next(r.message for r in caplog.records if "TICK_PREVIEW_STATS" in r.message)
+    payload = json.loads(line[line.index("{"):])
+    assert payload["ticks_dropped_json"] == 1
+    assert payload["batch"]["batches"] == 2
+    assert payload["batch"]["size_max"] == 50
+    assert payload["batch"]["capped"] == 1
+    assert payload["batch"]["queue_depth_max"] == 49
+    assert payload["batch"]["hold_ms"]["n"] == 2
+    lat = payload["tick_to_preview_ms"]
+    assert lat["n"] >= 2 and lat["p50"] <= lat["p95"] <= lat["max"]
+    # семпли скидаються після emit
+    assert worker._drain_batch_stats() == {}
+
+
+def test_on_tick_materializes_bar_only_when_published() -> None:
+    worker, uds = _worker()
+    worker._publish_min_interval_ms = 60_000  # усе, крім rollover, throttled
+    built = []
+    orig = worker._agg.to_bar
+
+    def _spy(symbol, tf_s, state):
+        bar = orig(symbol, tf_s, state)
+        built.append(bar)
+        return bar
+
+    ticks = [t for t in _ticks(400) if t["symbol"] == "XAU/USD"]
+    with patch.object(worker._agg, "to_bar", side_effect=_spy):
+        for t in ticks:
+            worker.on_tick(t)
+    agg_preview = [b for b in uds.preview if b.src == "preview_tick"]
+    assert built == agg_preview and len(built) > 0
+    assert worker._stats["preview_publish_throttled_total"] > len(built)
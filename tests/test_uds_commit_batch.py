@@ -0,0 +1,234 @@
+"""UDS.commit_final_bars: parity з послідовними commit_final_bar + батчований I/O."""
+
+from __future__ import annotations
+
+import os
+from unittest.mock import patch
+
+from core.model.bars import CandleBar
+from runtime.store.layers.redis_layer import RedisLayer
+from runtime.store.redis_snapshot import RedisSnapshotWriter
+from runtime.store.ssot_jsonl import JsonlAppender
+from runtime.store.uds import (
+    UnifiedDataStore,
+    _RedisStreamUpdatesBus,
+    _RedisUpdatesBus,
+)
+
+T0 = 1_740_000_000_000 - 1_740_000_000_000 % 86_400_000 + 3_600_000
+
+
+class _Pipe:
+    def __init__(self, client: "_FakeRedis") -> None:
+        self._client = client
+        self._ops: list = []
+
+    def __getattr__(self, name):
+        def _queue(*args, **kwargs):
+            self._ops.append((name, args, kwargs))
+            return self
+
+        return _queue
+
+    def execute(self):
+        self._client.round_trips += 1
+        return [
+            getattr(self._client, name)(*args, _rt=False, **kwargs)
+            for name, args, kwargs in self._ops
+        ]
+
+
+class _FakeRedis:
+    """In-memory Redis: strings, counters, lists (+expire), streams + pipeline."""
+
+    def __init__(self) -> None:
+        self.kv: dict = {}
+        self.lists: dict = {}
+        self.streams: dict = {}
+        self.round_trips = 0
+
+    def _hit(self, rt: bool) -> None:
+        if rt:
+            self.round_trips += 1
+
+    def pipeline(self, transaction: bool = True) -> _Pipe:
+        return _Pipe(self)
+
+    def set(self, key, value, ex=None, _rt=True):
+        self._hit(_rt)
+        self.kv[key] = (value, ex)
+        return True
+
+    def incr(self, key, _rt=True):
+        return self.incrby(key, 1, _rt=_rt)
+
+    def incrby(self, key, n, _rt=True):
+        self._hit(_rt)
+        val = int(self.kv.get(key, (0, None))[0]) + int(n)
+        self.kv[key] = (val, None)
+        return val
+
+    def rpush(self, key, *values, _rt=True):
+        self._hit(_rt)
+        self.lists.setdefault(key, []).extend(values)
+        return len(self.lists[key])
+
+    def ltrim(self, key, start, end, _rt=True):
+        self._hit(_rt)
+        lst = self.lists.get(key, [])
+        self.lists[key] = lst[start:] if end == -1 else lst[start : end + 1]
+        return True
+
+    def expire(self, key, ttl_s, _rt=True):
+        self._hit(_rt)
+        self.kv[("ttl", key)] = (ttl_s, None)
+        return True
+
+    def xadd(self, key, fields, id="*", maxlen=None, approximate=True, _rt=True):
+        self._hit(_rt)
+        entries = self.streams.setdefault(key, [])
+        entries.append((id, dict(fields)))
+        if maxlen is not None and len(entries) > maxlen:
+            del entries[: len(entries) - maxlen]
+        return id
+
+
+def _bar(i: int, tf_s: int = 60, **kw) -> CandleBar:
+    open_ms = T0 + i * tf_s * 1000
+    fields = dict(
+        symbol="XAU/USD",
+        tf_s=tf_s,
+        open_time_ms=open_ms,
+        close_time_ms=open_ms + tf_s * 1000,
+        o=2000.0 + i,
+        h=2001.0 + i,
+        low=1999.0 + i,
+        c=2000.5 + i,
+        v=10.0,
+        complete=True,
+        src="history",
+    )
+    fields.update(kw)
+    return CandleBar(**fields)
+
+
+def _store(root: str, client: _FakeRedis, bus_cls) -> UnifiedDataStore:
+    return UnifiedDataStore(
+        data_root=root,
+        boot_id="b",
+        tf_allowlist={60, 300},
+        min_coldload_bars={},
+        role="writer",
+        redis_layer=RedisLayer(client, "ns"),
+        jsonl_appender=JsonlAppender(root),
+        redis_snapshot_writer=RedisSnapshotWriter(
+            client, "ns", {60: 3600}, {60: 5, 300: 5}, "b"
+        ),
+        updates_bus=bus_cls(client, "ns", retain=50),
+        preview_tf_allowlist={60},
+    )
+
+
+def _tree(root: str) -> dict:
+    out = {}
+    for dirpath, _dirs, files in os.walk(root):
+        for name in files:
+            path = os.path.join(dirpath, name)
+            with open(path, "rb") as fh:
+                out[os.path.relpath(path, root)] = fh.read()
+    return out
+
+
+def _batch() -> list:
+    bars = [_bar(i) for i in range(0, 1500, 1)]  # 2 part-файли (доба = 1440 M1)
+    bars += [_bar(i, tf_s=300) for i in range(10)]
+    bars.insert(5, _bar(3))  # stale
+    bars.insert(9, _bar(7))  # duplicate (той самий open_ms що й попередній)
+    bars.insert(20, _bar(2000, complete=False))
+    bars.insert(21, _bar(2001, src="tick_preview"))
+    return bars
+
+
+def _run(tmp_path, bus_cls, batched: bool):
+    root = str(tmp_path / ("batch" if batched else "single"))
+    client = _FakeRedis()
+    uds = _store(root, client, bus_cls)
+    uds.commit_final_bar(_bar(-1))  # водяний знак з попереднього commit
+    client.round_trips = 0
+    bars = _batch()
+    with patch("runtime.store.redis_snapshot.time.time", return_value=1.0):
+        if batched:
+            results = uds.commit_final_bars(bars)
+        else:
+            results = [uds.commit_final_bar(b) for b in bars]
+    uds._jsonl.close()
+    return results, client, _tree(root), uds
+
+
+def test_batch_matches_sequential_commits(tmp_path) -> None:
+    for bus_cls in (_RedisUpdatesBus, _RedisStreamUpdatesBus):
+        r1, c1, disk1, uds1 = _run(tmp_path / bus_cls.__name__, bus_cls, False)
+        r2, c2, disk2, uds2 = _run(tmp_path / bus_cls.__name__, bus_cls, True)
+        assert r1 == r2
+        reasons = [r.reason for r in r2 if not r.ok]
+        assert sorted(reasons) == ["duplicate", "non_final_source", "not_complete", "stale"]
+        assert disk1 == disk2
+        assert any(k.endswith(".idx") for k in disk2)
+        assert c1.kv == c2.kv
+        assert c1.lists == c2.lists
+        assert c1.streams == c2.streams
+        assert uds1.get_watermark_open_ms("XAU/USD", 60) == _bar(1499).open_time_ms
+        assert uds2.get_watermark_open_ms("XAU/USD", 300) == _bar(9, 300).open_time_ms
+        assert uds1._ram.get_window("XAU/USD", 60, 0) == uds2._ram.get_window(
+            "XAU/USD", 60, 0
+        )
+        # snapshot pipeline + 2 (updates) + 2 (preview ring) замість ~5 на бар
+        assert c2.round_trips <= 5
+        assert c1.round_trips > 4 * 1500
+
+
+def test_batch_partial_disk_failure_marks_only_failed_bars(tmp_path) -> None:
+    client = _FakeRedis()
+    uds = _store(str(tmp_path), client, _RedisStreamUpdatesBus)
+    bad = _bar(1, close_time_ms=_bar(1).close_time_ms + 1)  # порушує інваріант
+    results = uds.commit_final_bars([_bar(0), bad, _bar(2)])
+    assert [r.ok for r in results] == [True, False, True]
+    assert results[1].reason == "ssot_write_failed"
+    assert "ssot_write_failed" in results[1].warnings
+    assert uds.get_watermark_open_ms("XAU/USD", 60) == _bar(2).open_time_ms
+    assert uds.commit_final_bars([]) == []
+
+
+def test_batch_watermark_advances_only_on_written_bars(tmp_path) -> None:
+    client = _FakeRedis()
+    uds = _store(str(tmp_path), client, _RedisStreamUpdatesBus)
+    real_write = uds._jsonl._write_lines
+    calls = []
+
+    def _flaky(path, lines, opens):
+        calls.append(len(lines))
+        if len(calls) == 1:
+            raise OSError("disk full")
+        return real_write(path, lines, opens)
+
+    uds._jsonl._write_lines = _flaky
+    retry = _bar(0, c=2000.75)  # повтор бару 0 у тому ж батчі
+    results = uds.commit_final_bars([_bar(0), retry, _bar(1)])
+    # перший write (бари 0 і 1) впав → повтор не duplicate, пишеться 2-м проходом
+    assert [r.ok for r in results] == [False, True, False]
+    assert calls == [2, 1]
+    assert uds.get_watermark_open_ms("XAU/USD", 60) == _bar(0).open_time_ms
+    assert [r.ok for r in uds.commit_final_bars([_bar(1)])] == [True]
+
+
+def test_batch_redis_failure_is_degraded_not_fatal(tmp_path) -> None:
+    class _DownBus(_RedisStreamUpdatesBus):
+        def publish_many(self, events):
+            raise ConnectionError("down")
+
+    client = _FakeRedis()
+    uds = _store(str(tmp_path), client, _DownBus)
+    results = uds.commit_final_bars([_bar(0), _bar(1)])
+    assert all(r.ok and r.ssot_written and r.redis_written for r in results)
+    assert not any(r.updates_published for r in results)
+    assert all("updates_publish_failed" in r.warnings for r in results)
@@ -0,0 +1,260 @@
+"""Redis Streams updates bus: parity з list backend + wait_updates (wake-on-arrival)."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+
+from runtime.store.uds import (
+    UnifiedDataStore,
+    _RedisStreamUpdatesBus,
+    _RedisUpdatesBus,
+)
+
+
+class _Pipe:
+    """Pipeline: черга викликів, виконується на execute()."""
+
+    def __init__(self, client):
+        self._client = client
+        self._ops = []
+
+    def __getattr__(self, name):
+        def _queue(*args, **kwargs):
+            self._ops.append((name, args, kwargs))
+            return self
+
+        return _queue
+
+    def execute(self):
+        return [getattr(self._client, n)(*a, **kw) for n, a, kw in self._ops]
+
+
+class _FakeRedis:
+    """Мінімальний in-memory Redis: counters, lists, streams (id "<ms>-<n>")."""
+
+    def __init__(self):
+        self.kv = {}
+        self.lists = {}
+        self.streams = {}
+        self.xread_calls = []
+
+    def pipeline(self, transaction=True):
+        return _Pipe(self)
+
+    def incr(self, key):
+        self.kv[key] = int(self.kv.get(key, 0)) + 1
+        return self.kv[key]
+
+    def get(self, key):
+        v = self.kv.get(key)
+        return None if v is None else str(v).encode()
+
+    def rpush(self, key, *values):
+        self.lists.setdefault(key, []).extend(v.encode() for v in values)
+
+    def ltrim(self, key, start, end):
+        lst = self.lists.get(key, [])
+        self.lists[key] = lst[start:] if end == -1 else lst[start : end + 1]
+
+    def lrange(self, key, start, end):
+        lst = self.lists.get(key, [])
+        return lst[start:] if end == -1 else lst[start : end + 1]
+
+    @staticmethod
+    def _id(entry_id):
+        ms, _, n = str(entry_id).partition("-")
+        return int(ms), int(n or 0)
+
+    def xadd(self, key, fields, id="*", maxlen=None, approximate=True):
+        entries = self.streams.setdefault(key, [])
+        new_id = self._id(id)
+        if entries and new_id <= self._id(entries[-1][0].decode()):
+            raise RuntimeError("ERR The ID specified in XADD is equal or smaller")
+        entries.append(
+            (id.encode(), {k.encode(): v.encode() for k, v in fields.items()})
+        )
+        if maxlen is not None and len(entries) > maxlen:
+            del entries[: len(entries) - maxlen]
+        return id.encode()
+
+    def xread(self, streams, count=None, block=None):
+        self.xread_calls.append((dict(streams), count, block))
+        out = []
+        for key, last in streams.items():
+            entries = self.streams.get(key, [])
+            if last == "$":
+                continue
+            last_id = self._id(last)
+            new = [e for e in entries if self._id(e[0].decode()) > last_id]
+            if count is not None:
+                new = new[:count]
+            if new:
+                out.append([key.encode(), new])
+        return out
+
+    def xrange(self, key, min="-", max="+", count=None):
+        entries = list(self.streams.get(key, []))
+        return entries[:count] if count is not None else entries
+
+
+def _event(i: int, tf_s: int = 300) -> dict:
+    return {
+        "key": {"symbol": "XAU/USD", "tf_s": tf_s, "open_ms": i * 300_000},
+        "bar": {"open_time_ms": i * 300_000, "c": 2000.0 + i},
+        "complete": True,
+        "source": "history",
+        "event_ts": i * 300_000 + 300_000,
+    }
+
+
+def test_stream_bus_matches_list_bus() -> None:
+    rnd = random.Random(5)
+    list_bus = _RedisUpdatesBus(_FakeRedis(), "ns", retain=50)
+    stream_bus = _RedisStreamUpdatesBus(_FakeRedis(), "ns", retain=50)
+
+    def _read(since, limit):
+        return (
+            list_bus.read_updates("XAU/USD", 300, since, limit),
+            stream_bus.read_updates("XAU/USD", 300, since, limit),
+        )
+
+    a, b = _read(None, 10)
+    assert a == b == ([], 0, None, None)
+
+    published = 0
+    for _ in range(40):
+        for _ in range(rnd.randint(0, 30)):
+            published += 1
+            assert list_bus.publish(_event(published)) == published
+            assert stream_bus.publish(_event(published)) == published
+        for since in (None, 0, published, published - 1, published - 49,
+                      published - 50, published - 51, rnd.randint(0, published)):
+            for limit in (0, 5, 500):
+                a, b = _read(since, limit)
+                assert a == b, (since, limit)
+    # gap: cursor старший за утриманий хвіст
+    events, cursor, gap, err = stream_bus.read_updates("XAU/USD", 300, 1, 500)
+    assert err is None and cursor == published and len(events) == 50
+    assert gap == {
+        "first_seq_available": published - 49,
+        "last_seq_available": published,
+    }
+
+
+def test_stream_bus_reads_only_new_entries() -> None:
+    client = _FakeRedis()
+    bus = _RedisStreamUpdatesBus(client, "ns", retain=100)
+    for i in range(1, 31):
+        bus.publish(_event(i))
+    events, cursor, gap, _ = bus.read_updates("XAU/USD", 300, 27, 500)
+    assert [ev["seq"] for ev in events] == [28, 29, 30]
+    assert cursor == 30 and gap is None
+    streams, _count, block = client.xread_calls[-1]
+    assert streams == {"ns:updates:stream:XAU/USD:300": "27-0"}
+    assert block is None
+
+
+def test_stream_bus_read_error_is_reported() -> None:
+    class _Down(_FakeRedis):
+        def xread(self, *a, **kw):
+            raise ConnectionError("down")
+
+    bus = _RedisStreamUpdatesBus(_Down(), "ns", retain=10)
+    assert bus.read_updates("XAU/USD", 300, 7, 10) == ([], 7, None, "down")
+    assert bus.wait_updates({("XAU/USD", 300): 7}, 1.0) is None
+
+
+def test_wait_updates_returns_targets_with_new_events() -> None:
+    client = _FakeRedis()
+    wait_client = _FakeRedis()
+    wait_client.streams = client.streams  # той самий "сервер"
+    bus = _RedisStreamUpdatesBus(client, "ns", retain=10, wait_client=wait_client)
+    for i in range(1, 4):
+        bus.publish(_event(i, tf_s=300))
+    bus.publish(_event(1, tf_s=900))
+
+    cursors = {("XAU/USD", 300): 3, ("XAU/USD", 900): 0, ("XAU/USD", 3600): None}
+    assert bus.wait_updates(cursors, 2.0) == {("XAU/USD", 900)}
+    streams, count, block = wait_client.xread_calls[-1]
+    assert streams["ns:updates:stream:XAU/USD:3600"] == "$"
+    assert count == 1 and block == 2000
+    assert client.xread_calls == []
+
+    assert bus.wait_updates({("XAU/USD", 300): 3}, 60.0) == set()
+    assert wait_client.xread_calls[-1][2] == 5000  # UPDATES_WAIT_MAX_S
+
+
+def test_uds_wait_updates_skips_preview_plane(tmp_path) -> None:
+    bus = _RedisStreamUpdatesBus(_FakeRedis(), "ns", retain=10)
+    bus.publish(_event(1, tf_s=60))
+    bus.publish(_event(1, tf_s=300))
+    uds = UnifiedDataStore(
+        data_root=str(tmp_path),
+        boot_id="b",
+        tf_allowlist={60, 300},
+        min_coldload_bars={},
+        role="reader",
+        updates_bus=bus,
+        preview_tf_allowlist={60},
+    )
+    assert uds.wait_updates({("XAU/USD", 60): 0, ("XAU/USD", 300): 0}, 0.5) == {
+        ("XAU/USD", 300)
+    }
+    assert uds.wait_updates({("XAU/USD", 60): 0}, 0.5) is None
+
+    list_uds = UnifiedDataStore(
+        data_root=str(tmp_path),
+        boot_id="b",
+        tf_allowlist={300},
+        min_coldload_bars={},
+        role="reader",
+        updates_bus=_RedisUpdatesBus(_FakeRedis(), "ns", retain=10),
+    )
+    assert list_uds.wait_updates({("XAU/USD", 300): 0}, 0.5) is None
+
+
+def test_delta_tick_wakes_on_arrival_and_falls_back_to_poll() -> None:
+    from concurrent.futures import ThreadPoolExecutor
+
+    from runtime.ws import ws_server as mod
+
+    class _Ws:
+        closed = False
+
+    class _Uds:
+        def __init__(self, result):
+            self.result = result
+            self.calls = []
+
+        def wait_updates(self, cursors, timeout_s):
+            self.calls.append((cursors, timeout_s))
+            return self.result
+
+    s1 = mod.WsSession(_Ws())
+    s1.symbol, s1.tf_s, s1.last_update_seq = "XAU/USD", 300, 9
+    s2 = mod.WsSession(_Ws())
+    s2.symbol, s2.tf_s, s2.last_update_seq = "XAU/USD", 300, 4
+    s3 = mod.WsSession(_Ws())
+    s3.symbol, s3.tf_s, s3.last_update_seq = "XAU/USD", 900, None
+    sessions = {s.client_id: s for s in (s1, s2, s3)}
+    assert mod._delta_wait_cursors(sessions) == {
+        ("XAU/USD", 300): 4,
+        ("XAU/USD", 900): None,
+    }
+
+    async def _tick(uds, poll_s):
+        app = {mod.APP_UDS: uds, mod.APP_WS_SESSIONS: sessions}
+        loop = asyncio.get_event_loop()
+        t0 = loop.time()
+        with ThreadPoolExecutor(max_workers=1) as ex:
+            await mod._wait_delta_tick(app, ex, poll_s, 0.05)
+        return loop.time() - t0
+
+    woke = _Uds({("XAU/USD", 300)})
+    elapsed = asyncio.run(_tick(woke, 5.0))
+    assert 0.04 <= elapsed < 1.0  # не чекає poll_s, але тримає min interval
+    assert woke.calls == [(mod._delta_wait_cursors(sessions), 5.0)]
+
+    unsupported = _Uds(None)
+    assert asyncio.run(_tick(unsupported, 0.2)) >= 0.19
@@ -0,0 +1,166 @@
+"""WindowCache: read-through вікна UDS, інвалідація курсором updates bus, спільний декод."""
+
+from __future__ import annotations
+
+import threading
+import time
+
+from runtime.store.uds import ReadPolicy, WindowResult, WindowSpec, _RedisUpdatesBus
+from runtime.store.window_cache import WindowCache, read_windows
+
+SYM = "XAU/USD"
+POLICY = ReadPolicy(disk_policy="explicit", prefer_redis=True)
+
+
+def _row(tf_s: int, i: int, complete: bool = True) -> dict:
+    return {
+        "open_time_ms": 1_700_000_000_000 + i * tf_s * 1000,
+        "open": 1.0 + i, "high": 2.0 + i, "low": 0.5 + i, "close": 1.5 + i,
+        "volume": 1.0, "complete": complete,
+    }
+
+
+class _Uds:
+    """read_window (tail limit) + updates_cursors з керованим seq per ключ."""
+
+    def __init__(self, n: int = 300) -> None:
+        self.rows = {tf: [_row(tf, i) for i in range(n)] for tf in (900, 3600, 86400)}
+        self.seq = {(SYM, tf): 1 for tf in self.rows}
+        self.reads: list = []
+        self.cursor_calls = 0
+        self.warnings: list = []
+        self.read_delay_s = 0.0
+
+    def read_window(self, spec, policy) -> WindowResult:
+        self.reads.append((spec.tf_s, spec.limit))
+        time.sleep(self.read_delay_s)
+        rows = self.rows[spec.tf_s][-spec.limit :]
+        return WindowResult(list(rows), {}, list(self.warnings))
+
+    def updates_cursors(self, targets):
+        self.cursor_calls += 1
+        return [self.seq.get(t) for t in targets]
+
+    def commit(self, tf_s: int) -> None:
+        i = len(self.rows[tf_s])
+        self.rows[tf_s].append(_row(tf_s, i))
+        self.seq[(SYM, tf_s)] += 1
+
+
+def _spec(tf_s: int, limit: int, **kw) -> WindowSpec:
+    return WindowSpec(symbol=SYM, tf_s=tf_s, limit=limit, cold_load=True, **kw)
+
+
+def test_limit_class_shares_one_read_until_commit() -> None:
+    uds = _Uds()
+    cache = WindowCache(uds, limit_classes=(16, 64, 256))
+    w200, w96, w1 = cache.read_many([_spec(900, 200), _spec(900, 96), _spec(900, 1)], POLICY)
+    assert uds.reads == [(900, 256), (900, 16)] and uds.cursor_calls == 1
+    assert w200.rows == uds.rows[900][-200:]
+    assert w96.rows == uds.rows[900][-96:]
+    assert w1.rows == uds.rows[900][-1:]
+
+    cache.read(_spec(900, 30), POLICY)
+    assert uds.reads[-1] == (900, 64)
+    n_reads = len(uds.reads)
+    assert cache.read(_spec(900, 150), POLICY).rows == uds.rows[900][-150:]
+    assert len(uds.reads) == n_reads  # hit
+
+    uds.commit(900)  # новий final → seq+1 → вікно перечитується
+    fresh = cache.read(_spec(900, 200), POLICY)
+    assert uds.reads[-1] == (900, 256)
+    assert fresh.rows[-1] == uds.rows[900][-1]
+    # інший TF не інвалідовано
+    cache.read(_spec(3600, 48), POLICY)
+    uds.commit(900)
+    n_reads = len(uds.reads)
+    cache.read(_spec(3600, 48), POLICY)
+    assert len(uds.reads) == n_reads
+    assert cache.stats()["hit"] >= 3
+
+
+def test_decoded_is_memoized_per_commit_and_sliced() -> None:
+    uds = _Uds()
+    uds.rows[900][-2] = _row(900, 298, complete=False)
+    cache = WindowCache(uds)
+    calls = []
+
+    def _decode(r):
+        calls.append(r["open_time_ms"])
+        return r["open_time_ms"] if r["complete"] else None
+
+    a = cache.read(_spec(900, 200), POLICY).decoded("ms", _decode)
+    b = cache.read(_spec(900, 3), POLICY)  # інший клас (16) — окремий запис
+    c = cache.read(_spec(900, 100), POLICY).decoded("ms", _decode)
+    assert len(calls) == 256  # один прохід на запис класу 256
+    assert len(a) == 199 and c == a[-99:]
+    assert b.decoded("ms", _decode) == [uds.rows[900][-3]["open_time_ms"], uds.rows[900][-1]["open_time_ms"]]
+    uds.commit(900)
+    cache.read(_spec(900, 200), POLICY).decoded("ms", _decode)
+    assert len(calls) == 256 + 16 + 256
+
+
+def test_bypass_without_cursor_or_for_uncacheable_specs() -> None:
+    uds = _Uds()
+    cache = WindowCache(uds, limit_classes=(64,))
+    cache.read(_spec(900, 65), POLICY)  # > max класу
+    cache.read(_spec(900, 10, since_open_ms=1), POLICY)
+    cache.read(_spec(900, 10), ReadPolicy(force_disk=True))
+    uds.seq.pop((SYM, 900))  # ключа seq ще немає
+    cache.read(_spec(900, 10), POLICY)
+    cache.read(_spec(900, 10), POLICY)
+    assert uds.reads == [(900, 65), (900, 10), (900, 10), (900, 10), (900, 10)]
+    assert cache.stats()["bypass"] == 5
+
+    uds.updates_cursors = None  # UDS без bus
+    assert read_windows(uds, [_spec(3600, 5)], POLICY)[0].rows == uds.rows[3600][-5:]
+
+
+def test_windows_with_warnings_or_expired_are_reread() -> None:
+    uds = _Uds()
+    uds.warnings = ["prime_pending"]
+    cache = WindowCache(uds, max_age_s=0.05)
+    cache.read(_spec(900, 10), POLICY)
+    cache.read(_spec(900, 10), POLICY)
+    assert len(uds.reads) == 2 and cache.stats()["uncacheable"] == 2
+    uds.warnings = []
+    cache.read(_spec(900, 10), POLICY)
+    cache.read(_spec(900, 10), POLICY)
+    assert len(uds.reads) == 3
+    time.sleep(0.06)
+    cache.read(_spec(900, 10), POLICY)
+    assert len(uds.reads) == 4
+
+
+def test_concurrent_misses_share_one_read() -> None:
+    uds = _Uds()
+    uds.read_delay_s = 0.05
+    cache = WindowCache(uds)
+    out = []
+    threads = [
+        threading.Thread(target=lambda: out.append(cache.read(_spec(900, 96), POLICY).rows))
+        for _ in range(8)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert uds.reads == [(900, 256)]
+    assert all(rows == uds.rows[900][-96:] for rows in out)
+
+
+class _MgetRedis:
+    def __init__(self, kv: dict) -> None:
+        self.kv = kv
+        self.mget_calls = []
+
+    def mget(self, keys):
+        self.mget_calls.append(list(keys))
+        return [self.kv.get(k) for k in keys]
+
+
+def test_updates_bus_last_seqs_single_mget() -> None:
+    client = _MgetRedis({"ns:updates:seq:XAU/USD:900": b"42", "ns:updates:seq:XAU/USD:3600": b"bad"})
+    bus = _RedisUpdatesBus(client, "ns", retain=10)
+    assert bus.last_seqs([("XAU_USD", 900), (SYM, 3600), (SYM, 86400)]) == [42, None, None]
+    assert len(client.mget_calls) == 1
@@ -346,3 +346,84 @@ async def test_ws_default_tf_m30(aiohttp_client, ws_app_mock_uds):
         assert msg["tf"] == "M30", f"expected M30, got {msg['tf']}"
     finally:
         await ws.close()
+
+
+# ── Serialize-once broadcast ───────────────────────────
+
+
+class _FakeWs:
+    def __init__(self, fail: bool = False) -> None:
+        self.sent: list = []
+        self.fail = fail
+        self.closed = False
+
+    async def send_str(self, payload: str) -> None:
+        if self.fail:
+            raise ConnectionResetError("gone")
+        self.sent.append(payload)
+
+    async def close(self) -> None:
+        self.closed = True
+
+
+def _delta_frame(candles: int = 3, warnings=None) -> dict:
+    meta = {"schema_v": SCHEMA_V, "seq": 0, "server_ts_ms": 1, "boot_id": "b"}
+    if warnings:
+        meta["warnings"] = warnings
+    return {
+        "type": "render_frame",
+        "frame_type": "delta",
+        "symbol": "XAU/USD",
+        "tf": "M5",
+        "candles": [
+            {"t_ms": i, "o": 1.5, "h": 2.0, "l": 1.0, "c": 1.75, "src": "ñ"}
+            for i in range(candles)
+        ],
+        "meta": meta,
+    }
+
+
+async def test_broadcast_serializes_once_with_per_client_seq(monkeypatch):
+    """Payload кожного клієнта == json.dumps(frame) з його seq; dumps — один раз."""
+    from runtime.ws import ws_server as mod
+
+    sessions = {}
+    recipients = []
+    for i in range(5):
+        s = mod.WsSession(_FakeWs(fail=(i == 3)))
+        s.seq = 10 * i
+        sessions[s.client_id] = s
+        recipients.append(s)
+
+    # "seq" у даних (warnings) не повинен зламати шаблон
+    frame = _delta_frame(warnings=['"seq": 1'])
+    calls = []
+    real_dumps = mod.json.dumps
+    monkeypatch.setattr(
+        mod.json, "dumps", lambda o, **kw: calls.append(1) or real_dumps(o, **kw)
+    )
+    await mod._safe_broadcast(frame, tuple(recipients), sessions)
+    assert len(calls) == 1
+
+    for i, s in enumerate(recipients):
+        if i == 3:
+            assert s.ws.closed and s.client_id not in sessions
+            continue
+        (payload,) = s.ws.sent
+        want = dict(frame, meta=dict(frame["meta"], seq=10 * i + 1))
+        assert payload == real_dumps(want)
+        assert s.seq == 10 * i + 1
+
+
+async def test_seq_template_falls_back_when_ambiguous():
+    from runtime.ws import ws_server as mod
+
+    frame = _delta_frame()
+    # рядки екрануються (\"seq\") — неоднозначність лише від ключа з sentinel
+    frame["candles"][0]["seq"] = mod._SEQ_SENTINEL
+    assert mod._encode_seq_template(frame) is None
+    assert mod._encode_seq_template({"type": "x"}) is None
+
+    s = mod.WsSession(_FakeWs())
+    await mod._safe_broadcast(frame, (s,), {s.client_id: s})
+    assert json.loads(s.ws.sent[0])["meta"]["seq"] == 1
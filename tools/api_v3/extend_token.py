@@ -7,6 +7,8 @@ WARNING: Only use after verifying consumer identity out-of-band (Telegram messag
 from owner). Recommended path is rotation with grace period (Option A).
 
 Updates Redis EXPIRE + rewrites JSON's `expires` field to keep audit accurate.
+Publishes `token:<token>` on the local-cache invalidation channel so running
+servers drop the cached record.
 Returns 0 on success, 1 on no-match, 2 on bad args.
 """
 
@@ -17,6 +19,7 @@ import json
 import sys
 from datetime import datetime, timedelta, timezone
 
+from runtime.api_v3.local_cache import TOKEN_MESSAGE_PREFIX, publish_invalidation
 from runtime.api_v3.token_store import is_well_formed, token_redis_key
 from tools.api_v3._common import get_redis, parse_redis_json
 
@@ -59,6 +62,7 @@ def main(argv: list[str] | None = None) -> int:
     ttl_s = args.days * 86400
     # SETEX rewrites both value (with new expires field) AND TTL atomically.
     client.setex(key, ttl_s, json.dumps(payload))
+    publish_invalidation(client, namespace, TOKEN_MESSAGE_PREFIX + args.token)
     print(
         f"OK extended token={args.token[:11]}... consumer={payload.get('consumer')!r} "
         f"new_expires={payload['expires']}"
@@ -1,5 +1,9 @@
 """Revoke an API token (instant via Redis DEL).
 
+Each revoked token is also published as `token:<token>` on the local-cache
+invalidation channel (runtime/api_v3/local_cache.py) so servers with
+`api_v3.local_cache` enabled drop it immediately.
+
 Usage:
     python -m tools.api_v3.revoke_token --token tk_abc...
     python -m tools.api_v3.revoke_token --consumer old_news_bot   # revokes ALL tokens for consumer
@@ -12,6 +16,7 @@ from __future__ import annotations
 import argparse
 import sys
 
+from runtime.api_v3.local_cache import TOKEN_MESSAGE_PREFIX, publish_invalidation
 from runtime.api_v3.token_store import is_well_formed, token_redis_key
 from tools.api_v3._common import get_redis, parse_redis_json
 from tools.api_v3.list_tokens import iter_token_keys
@@ -33,6 +38,7 @@ def main(argv: list[str] | None = None) -> int:
         key = token_redis_key(namespace, args.token)
         deleted = client.delete(key)
         if deleted:
+            publish_invalidation(client, namespace, TOKEN_MESSAGE_PREFIX + args.token)
             print(f"OK revoked token={args.token[:11]}...")
             return 0
         print(f"NOT_FOUND token={args.token[:11]}...", file=sys.stderr)
@@ -46,7 +52,9 @@ def main(argv: list[str] | None = None) -> int:
             continue
         if payload.get("consumer") == args.consumer:
             if client.delete(key):
-                revoked.append(key.rsplit(":", 1)[-1][:11])
+                token = key.rsplit(":", 1)[-1]
+                publish_invalidation(client, namespace, TOKEN_MESSAGE_PREFIX + token)
+                revoked.append(token[:11])
 
     if not revoked:
         print(f"NOT_FOUND consumer={args.consumer!r}", file=sys.stderr)
@@ -21,6 +21,9 @@ Notes:
       and restarting `smc:smc-ws`.
     * Redis key SSOT lives in `runtime/api_v3/kill_switch.kill_flag_redis_key`
       to keep this CLI and the middleware in lockstep.
+    * --off / --on also publish "kill" on the local-cache invalidation
+      channel, so servers caching the flag (`api_v3.local_cache.kill_ttl_s`)
+      re-read it on the next request instead of after the TTL.
     * Fail-open semantics on the server side: if Redis is unreachable when
       a request arrives, analysis is served (F-S1-002). This means the
       kill switch is best-effort during a Redis outage.
@@ -33,6 +36,7 @@ import sys
 from typing import Any, Optional
 
 from runtime.api_v3.kill_switch import kill_flag_redis_key
+from runtime.api_v3.local_cache import KILL_MESSAGE, publish_invalidation
 from tools.api_v3._common import get_redis
 
 KILL_VALUE = "1"  # presence is what matters; any non-null value works
@@ -109,11 +113,13 @@ def main(argv: list[str] | None = None) -> int:
             else:
                 client.set(key, KILL_VALUE)
                 print(f"OK: kill switch ENGAGED (sticky, no TTL)  key={key}")
+            publish_invalidation(client, namespace, KILL_MESSAGE)
             return 0
 
         if args.on:
             del_raw: Any = client.delete(key)
             removed = int(del_raw)
+            publish_invalidation(client, namespace, KILL_MESSAGE)
             if removed:
                 print(f"OK: kill switch RELEASED  key={key}")
             else:
@@ -0,0 +1,126 @@
+# tools/bench_tick_preview.py
+"""Benchmark: ticks/s через TickPreviewWorker.on_tick — eager vs lazy preview-бар.
+
+Eager (старий шлях): TickAggregator.update будує CandleBar (+ extensions dict)
+на кожен тик і кожен TF, навіть якщо _publish_bar потім його throttle-ить.
+Lazy (поточний on_tick): update_state повертає view стану бакету, CandleBar
+матеріалізується лише при реальному publish. UDS — no-op fake, тож міряється
+CPU агрегації + throttling (без Redis).
+
+  python -m tools.bench_tick_preview --ticks 200000 --throttle-ms 250,0
+"""
+
+import argparse
+import random
+import time
+
+# важливо: запуск з кореня репо, щоб імпорти працювали
+from runtime.ingest.tick_preview_worker import TickPreviewWorker
+
+T0 = 1_740_441_600_000  # вівторок 00:00 UTC
+SYMBOLS = ["XAU/USD", "XAG/USD", "EUR/USD", "NAS100"]
+TFS = [60, 180, 300, 900, 1800, 3600, 14400, 86400]
+HTF = [14400, 86400]
+
+
+class _NullUds:
+    def __init__(self) -> None:
+        self.preview = 0
+        self.promoted = 0
+
+    def publish_preview_bar(self, bar, ttl_s=None) -> None:
+        self.preview += 1
+
+    def publish_promoted_bar(self, bar) -> bool:
+        self.promoted += 1
+        return True
+
+
+class _EagerWorker(TickPreviewWorker):
+    """Попередній on_tick: CandleBar на кожен тик (TickAggregator.update)."""
+
+    def on_tick(self, payload):
+        accepted = self._accept_tick(payload)
+        if accepted is None:
+            return
+        symbol, tick_ts_ms, price = accepted
+        for tf_s in self._tfs:
+            if tf_s == 180 and self._derive_m3:
+                continue
+            promoted, bar = self._agg.update(symbol, tf_s, tick_ts_ms, price)
+            if promoted is not None:
+                self._publish_promoted(promoted, symbol, tf_s)
+            if bar is None:
+                continue
+            self._publish_bar(bar, symbol, tf_s)
+            if tf_s == 60 and self._m3_buffer is not None:
+                m3_bar = self._m3_buffer.update(symbol, bar)
+                if m3_bar is not None:
+                    self._publish_bar(m3_bar, symbol, 180)
+            if tf_s == 60 and self._htf_acc is not None:
+                for htf_bar in self._htf_acc.update(symbol, bar):
+                    self._publish_bar(htf_bar, symbol, htf_bar.tf_s)
+        self._note_latency(tick_ts_ms)
+        self._maybe_emit_stats()
+
+
+def _ticks(n: int, step_ms: int) -> list:
+    rnd = random.Random(16)  # nosec B311 — синтетичні тіки бенчмарку, не криптографія
+    price = {s: 100.0 + 10 * i for i, s in enumerate(SYMBOLS)}
+    out = []
+    ts = T0
+    for seq in range(n):
+        ts += rnd.randint(1, 2 * step_ms)
+        sym = SYMBOLS[seq % len(SYMBOLS)]
+        price[sym] += rnd.uniform(-0.05, 0.05)
+        out.append(
+            {"v": 1, "symbol": sym, "tick_ts_ms": ts, "mid": price[sym], "src": "bench", "seq": seq}
+        )
+    return out
+
+
+def _worker(cls, throttle_ms: int) -> TickPreviewWorker:
+    worker = cls(
+        uds=_NullUds(),
+        tfs=TFS,
+        publish_min_interval_ms=throttle_ms,
+        curr_ttl_s=1800,
+        symbols=SYMBOLS,
+        channel="bench:ticks",
+        auto_promote_m1=True,
+        anchor_offset_ms=79_200_000,
+        htf_preview_tfs=HTF,
+        htf_anchor_offsets_ms={14400: 79_200_000, 86400: 75_600_000},
+    )
+    worker._stats_last_emit_ts = float("inf")  # без STATS логів у вимірі
+    return worker
+
+
+def _bench(cls, ticks: list, throttle_ms: int) -> tuple:
+    worker = _worker(cls, throttle_ms)
+    t0 = time.perf_counter()
+    for payload in ticks:
+        worker.on_tick(payload)
+    elapsed = time.perf_counter() - t0
+    return len(ticks) / elapsed if elapsed > 0 else 0.0, worker._uds.preview
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--ticks", type=int, default=200_000)
+    ap.add_argument("--step-ms", type=int, default=100, help="середній крок tick_ts")
+    ap.add_argument("--throttle-ms", default="250,0", help="publish_min_interval_ms")
+    args = ap.parse_args()
+    ticks = _ticks(args.ticks, args.step_ms)
+    print("throttle_ms  eager_tps  lazy_tps  speedup  published")
+    for throttle_ms in [int(x) for x in args.throttle_ms.split(",") if x]:
+        eager, pub_eager = _bench(_EagerWorker, ticks, throttle_ms)
+        lazy, pub_lazy = _bench(TickPreviewWorker, ticks, throttle_ms)
+        print(
+            f"{throttle_ms:11d} {eager:10.0f} {lazy:9.0f} "
+            f"{lazy / eager if eager > 0 else 0.0:7.2f}x  {pub_eager}/{pub_lazy}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+# tools/bench_ws_broadcast.py
+"""Benchmark: вартість broadcast одного delta frame vs кількість підписників.
+
+Порівнює per-client json.dumps (старий шлях) із serialize-once шаблоном
+(_safe_broadcast). Відправка — no-op fake WS, тож міряється лише CPU на
+event loop (серіалізація + склейка seq).
+
+  python -m tools.bench_ws_broadcast --subs 1,10,50,200 --candles 1,300
+"""
+
+import argparse
+import asyncio
+import json
+import time
+
+# важливо: запуск з кореня репо, щоб імпорти працювали
+from runtime.ws.ws_server import (
+    BROADCAST_SEND_TIMEOUT_S,
+    SCHEMA_V,
+    WsSession,
+    _safe_broadcast,
+)
+
+
+class _NullWs:
+    async def send_str(self, payload: str) -> None:
+        return None
+
+    async def close(self) -> None:
+        return None
+
+
+def _frame(candles: int) -> dict:
+    return {
+        "type": "render_frame",
+        "frame_type": "delta",
+        "symbol": "XAU/USD",
+        "tf": "M5",
+        "candles": [
+            {
+                "t_ms": 1_700_000_000_000 + i * 300_000,
+                "o": 2350.25 + i,
+                "h": 2352.5 + i,
+                "l": 2349.75 + i,
+                "c": 2351.0 + i,
+                "v": 123,
+                "complete": True,
+                "src": "history",
+            }
+            for i in range(candles)
+        ],
+        "meta": {"schema_v": SCHEMA_V, "seq": 0, "server_ts_ms": 0, "boot_id": "x"},
+    }
+
+
+async def _legacy(frame: dict, recipients: tuple) -> None:
+    """Попередній _safe_broadcast: json.dumps на кожного клієнта."""
+
+    async def _guarded_send(s: WsSession) -> None:
+        frame["meta"]["seq"] = s.next_seq()
+        payload = json.dumps(frame)
+        await asyncio.wait_for(s.ws.send_str(payload), timeout=BROADCAST_SEND_TIMEOUT_S)
+
+    await asyncio.gather(*(_guarded_send(s) for s in recipients), return_exceptions=True)
+
+
+async def _bench(fn, frame: dict, subs: int, rounds: int) -> float:
+    recipients = tuple(WsSession(_NullWs()) for _ in range(subs))
+    sessions = {s.client_id: s for s in recipients}
+    t0 = time.perf_counter()
+    for _ in range(rounds):
+        if fn is _safe_broadcast:
+            await _safe_broadcast(frame, recipients, sessions)
+        else:
+            await fn(frame, recipients)
+    return (time.perf_counter() - t0) * 1000.0 / rounds
+
+
+async def _run(subs_list, candles_list, rounds: int) -> None:
+    print("candles  subs  legacy_ms  once_ms  speedup")
+    for candles in candles_list:
+        frame = _frame(candles)
+        for subs in subs_list:
+            legacy = await _bench(_legacy, frame, subs, rounds)
+            once = await _bench(_safe_broadcast, frame, subs, rounds)
+            print(
+                f"{candles:7d} {subs:5d} {legacy:10.3f} {once:8.3f} "
+                f"{legacy / once if once > 0 else 0.0:7.1f}x"
+            )
+
+
+def main() -> None:
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--subs", default="1,10,50,200", help="кількості підписників")
+    ap.add_argument("--candles", default="1,300", help="candles у frame")
+    ap.add_argument("--rounds", type=int, default=200)
+    args = ap.parse_args()
+    subs_list = [int(x) for x in args.subs.split(",") if x]
+    candles_list = [int(x) for x in args.candles.split(",") if x]
+    asyncio.run(_run(subs_list, candles_list, args.rounds))
+
+
+if __name__ == "__main__":
+    main()
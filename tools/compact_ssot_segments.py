@@ -0,0 +1,71 @@
+"""Компакція завершених днів SSOT JSONL у колонкові сегменти (part-*.seg).
+
+Разовий прохід по всій історії (M1 poller робить те саме бюджетовано щогодини,
+config.json:ssot_segments). JSONL не змінюється — сегменти лише похідні.
+
+Використання:
+  python -m tools.compact_ssot_segments
+  python -m tools.compact_ssot_segments --data-root ./data_v3 --grace-days 1
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from core.config_loader import load_system_config, pick_config_path
+from runtime.store.ssot_segment import seal_finished_days
+
+log = logging.getLogger("compact_ssot_segments")
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s | %(levelname)s | %(message)s",
+)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--data-root", type=str, default=None, help="data_v3 root")
+    parser.add_argument("--grace-days", type=int, default=None)
+    parser.add_argument("--max-parts", type=int, default=None)
+    args = parser.parse_args()
+
+    cfg = load_system_config(pick_config_path())
+    seg_cfg = cfg.get("ssot_segments", {})
+    if not isinstance(seg_cfg, dict):
+        seg_cfg = {}
+    data_root = args.data_root or str(cfg.get("data_root", "./data_v3"))
+    grace_days = (
+        args.grace_days
+        if args.grace_days is not None
+        else int(seg_cfg.get("grace_days", 1))
+    )
+
+    t0 = time.monotonic()
+    stats = seal_finished_days(
+        data_root,
+        now_ms=int(time.time() * 1000),
+        grace_days=grace_days,
+        max_parts=args.max_parts,
+    )
+    elapsed = time.monotonic() - t0
+    log.info(
+        "SEAL_DONE root=%s sealed=%d fresh=%d rows=%d skipped=%s elapsed_s=%.1f rows_per_s=%.0f",
+        data_root,
+        stats["sealed"],
+        stats["fresh"],
+        stats["rows"],
+        stats["skipped"],
+        elapsed,
+        stats["rows"] / elapsed if elapsed > 0 else 0.0,
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -12,6 +12,32 @@ import time
 import sys
 
 
+def _updates_backend() -> str:
+    """config.json:updates.backend ("list" | "stream"); default list."""
+    try:
+        from core.config_loader import load_system_config, pick_config_path
+
+        cfg = load_system_config(pick_config_path())
+        upd = cfg.get("updates") if isinstance(cfg.get("updates"), dict) else {}
+        return str(upd.get("backend", "list"))
+    except Exception as e:
+        print(f"  config read error: {e} (assume backend=list)")
+        return "list"
+
+
+def _bus_probe(r, ns, backend, sym, tf_s):
+    """(len, seq, last_event_raw) updates bus для (sym, tf_s) за backend."""
+    seq_val = r.get(f"{ns}:updates:seq:{sym}:{tf_s}")
+    if backend == "stream":
+        key = f"{ns}:updates:stream:{sym}:{tf_s}"
+        length = r.xlen(key)
+        last = r.xrevrange(key, count=1) if length else []
+        return length, seq_val, (last[0][1].get("e") if last else None)
+    key = f"{ns}:updates:list:{sym}:{tf_s}"
+    length = r.llen(key)
+    return length, seq_val, (r.lindex(key, -1) if length else None)
+
+
 def main():
     # 1. Check disk bar freshness for XAU/USD
     print("=" * 60)
@@ -58,13 +84,11 @@ def main():
         r = redis_mod.Redis(host="127.0.0.1", port=6379, db=1, decode_responses=True)
         r.ping()
         ns = "v3_local"
+        backend = _updates_backend()
+        print(f"  backend={backend}")
         for tf_s in [60, 180, 300, 900, 1800, 3600, 14400, 86400]:
-            list_key = f"{ns}:updates:list:XAU/USD:{tf_s}"
-            seq_key = f"{ns}:updates:seq:XAU/USD:{tf_s}"
-            list_len = r.llen(list_key)
-            seq_val = r.get(seq_key)
-            if list_len > 0:
-                last_raw = r.lindex(list_key, -1)
+            bus_len, seq_val, last_raw = _bus_probe(r, ns, backend, "XAU/USD", tf_s)
+            if bus_len > 0:
                 try:
                     last_ev = json.loads(last_raw)
                     last_seq = last_ev.get("seq", "?")
@@ -80,10 +104,10 @@ def main():
                     last_seq = "?"
                     last_dt = "?"
                 print(
-                    f"  tf={tf_s:>5}: list_len={list_len}  seq={seq_val}  last_seq={last_seq}  last_bar={last_dt}"
+                    f"  tf={tf_s:>5}: len={bus_len}  seq={seq_val}  last_seq={last_seq}  last_bar={last_dt}"
                 )
             else:
-                print(f"  tf={tf_s:>5}: EMPTY (list_len=0, seq={seq_val})")
+                print(f"  tf={tf_s:>5}: EMPTY (len=0, seq={seq_val})")
     except Exception as e:
         print(f"  Redis error: {e}")
 
@@ -94,11 +118,8 @@ def main():
     print("=" * 60)
     try:
         for tf_s in [300, 900, 3600, 14400]:
-            list_key = f"{ns}:updates:list:BTCUSDT:{tf_s}"
-            seq_key = f"{ns}:updates:seq:BTCUSDT:{tf_s}"
-            list_len = r.llen(list_key)
-            seq_val = r.get(seq_key)
-            print(f"  tf={tf_s:>5}: list_len={list_len}  seq={seq_val}")
+            bus_len, seq_val, _ = _bus_probe(r, ns, backend, "BTCUSDT", tf_s)
+            print(f"  tf={tf_s:>5}: len={bus_len}  seq={seq_val}")
     except Exception as e:
         print(f"  Redis error: {e}")
 
@@ -114,6 +135,8 @@ def main():
             if ktype == "list":
                 length = r.llen(k)
                 print(f"  {k} (list, len={length})")
+            elif ktype == "stream":
+                print(f"  {k} (stream, len={r.xlen(k)})")
             else:
                 val = r.get(k)
                 print(f"  {k} ({ktype}, val={val})")
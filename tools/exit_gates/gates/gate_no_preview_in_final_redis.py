@@ -56,12 +56,22 @@ def run_gate(inputs: Dict[str, Any]) -> Dict[str, Any]:
         return {"ok": False, "details": f"redis.ping_error:{type(exc).__name__}", "metrics": {}}
 
     ns = spec.namespace
-    list_key = f"{ns}:updates:list:{symbol}:{tf_s}"
+    updates_cfg = cfg.get("updates") if isinstance(cfg.get("updates"), dict) else {}
+    backend = str(updates_cfg.get("backend", "list")).lower()
 
-    try:
-        raw_list = client.lrange(list_key, -max(1, int(max_events)), -1)
-    except Exception as exc:
-        return {"ok": False, "details": f"redis.lrange_failed:{type(exc).__name__}", "metrics": {}}
+    if backend == "stream":
+        stream_key = f"{ns}:updates:stream:{symbol}:{tf_s}"
+        try:
+            entries = client.xrevrange(stream_key, count=max(1, int(max_events)))
+        except Exception as exc:
+            return {"ok": False, "details": f"redis.xrevrange_failed:{type(exc).__name__}", "metrics": {}}
+        raw_list = [fields.get("e") for _id, fields in reversed(entries or [])]
+    else:
+        list_key = f"{ns}:updates:list:{symbol}:{tf_s}"
+        try:
+            raw_list = client.lrange(list_key, -max(1, int(max_events)), -1)
+        except Exception as exc:
+            return {"ok": False, "details": f"redis.lrange_failed:{type(exc).__name__}", "metrics": {}}
 
     violations: List[str] = []
     scanned = 0
@@ -69,6 +79,8 @@ def run_gate(inputs: Dict[str, Any]) -> Dict[str, Any]:
         scanned += 1
         if isinstance(raw, bytes):
             raw = raw.decode("utf-8")
+        if raw is None:
+            continue
         try:
             ev = json.loads(raw)
         except Exception:
@@ -13,6 +13,7 @@
 
 from __future__ import annotations
 
+import ast
 import json
 import os
 import re
@@ -228,13 +229,80 @@ def _check_uds_hotpath(root: str) -> Tuple[bool, str, Dict[str, Any]]:
 
 # ---------------------------------------------------------------------------
 # Sub-gate 2b: preview_tail_live_shape (G2.1)
-# Перевіряє: publish_preview_bar оновлює tail на КОЖЕН publish,
-# а не лише на rollover. Має бути: replace-if-same-open / append-if-new.
+# Перевіряє: publish_preview_bar оновлює tail не лише на rollover.
+# Має бути: replace-if-same-open / append-if-new (ring upsert за open_ms).
 # ---------------------------------------------------------------------------
 
 
+def _find_function(tree: ast.AST, name: str) -> Optional[ast.FunctionDef]:
+    for node in ast.walk(tree):
+        if isinstance(node, ast.FunctionDef) and node.name == name:
+            return node
+    return None
+
+
+def _attr_calls(node: ast.AST, attr: str) -> List[ast.Call]:
+    return [
+        n
+        for n in ast.walk(node)
+        if isinstance(n, ast.Call)
+        and isinstance(n.func, ast.Attribute)
+        and n.func.attr == attr
+    ]
+
+
+def _guard_names(func: ast.FunctionDef, target: ast.AST) -> List[str]:
+    """Імена в умовах if, що огортають target (від зовнішнього до внутрішнього)."""
+    out: List[str] = []
+
+    def _visit(node: ast.AST, guards: List[str]) -> bool:
+        if node is target:
+            out.extend(guards)
+            return True
+        for child in ast.iter_child_nodes(node):
+            extra: List[str] = []
+            if isinstance(node, ast.If) and child in node.body:
+                extra = [n.id for n in ast.walk(node.test) if isinstance(n, ast.Name)]
+            if _visit(child, guards + extra):
+                return True
+        return False
+
+    _visit(func, [])
+    return out
+
+
+def _upsert_by_score(func: ast.FunctionDef) -> bool:
+    """У циклі: zremrangebyscore(key, s, s) і ПІСЛЯ нього zadd(key, {raw: s})."""
+    for loop in (n for n in ast.walk(func) if isinstance(n, (ast.For, ast.While))):
+        for rem in _attr_calls(loop, "zremrangebyscore"):
+            if len(rem.args) != 3:
+                continue
+            lo, hi = ast.dump(rem.args[1]), ast.dump(rem.args[2])
+            if lo != hi:
+                continue
+            for add in _attr_calls(loop, "zadd"):
+                if add.lineno <= rem.lineno or len(add.args) != 2:
+                    continue
+                mapping = add.args[1]
+                same_key = ast.dump(add.args[0]) == ast.dump(rem.args[0])
+                if (
+                    same_key
+                    and isinstance(mapping, ast.Dict)
+                    and len(mapping.values) == 1
+                    and ast.dump(mapping.values[0]) == lo
+                ):
+                    return True
+    return False
+
+
 def _check_preview_tail_live_shape(root: str) -> Tuple[bool, str, Dict[str, Any]]:
-    """publish_preview_bar оновлює preview:tail на кожен publish (не лише rollover)."""
+    """publish_preview_bar оновлює preview:tail не лише на rollover.
+
+    Flush батчований (rollover або раз на _TAIL_FLUSH_INTERVAL_S) і йде через
+    RedisLayer.write_preview_tail_bars — upsert за open_ms
+    (ZREMRANGEBYSCORE + ZADD з тим самим score), тож повторний flush того ж
+    forming бару замінює його, новий open_ms — додається.
+    """
     uds_path = _find_file("runtime/store/uds.py", root)
     if uds_path is None:
         return False, "uds.py_not_found", {}
@@ -244,71 +312,43 @@ def _check_preview_tail_live_shape(root: str) -> Tuple[bool, str, Dict[str, Any]
         return False, "uds.py_read_error", {}
 
     metrics: Dict[str, Any] = {}
+    try:
+        tree = ast.parse(src)
+    except SyntaxError:
+        return False, "uds.py_parse_error", metrics
 
-    # Витягуємо тіло publish_preview_bar
-    lines = src.split("\n")
-    in_method = False
-    method_body: List[str] = []
-    indent_level = 0
-    found = False
-    for line in lines:
-        if not found and "def publish_preview_bar" in line:
-            found = True
-            in_method = True
-            indent_level = len(line) - len(line.lstrip())
-            method_body.append(line)
-            continue
-        if in_method:
-            if line.strip() == "":
-                method_body.append(line)
-                continue
-            cur_indent = len(line) - len(line.lstrip())
-            if cur_indent <= indent_level and line.strip().startswith("def "):
-                break
-            method_body.append(line)
-
-    method_text = "\n".join(method_body)
-    metrics["publish_preview_bar_lines"] = len(method_body)
-
-    if not found:
+    method = _find_function(tree, "publish_preview_bar")
+    if method is None:
         return False, "publish_preview_bar_not_found", metrics
+    metrics["publish_preview_bar_lines"] = (method.end_lineno or method.lineno) - method.lineno + 1
 
     issues: List[str] = []
 
-    # 1. Tail update НЕ має бути огорнутий в 'if rollover:'
-    #    (P2X.6-U2 прибрав цей guard)
-    tail_section_start = method_text.find("read_preview_tail")
-    if tail_section_start < 0:
-        issues.append("no_read_preview_tail_call")
-    else:
-        # Перевіряємо: чи tail update не під if rollover
-        before = method_text[:tail_section_start]
-        last_lines = before.split("\n")[-5:]
-        for ln in last_lines:
-            stripped = ln.strip()
-            if stripped.startswith("if rollover") or stripped.startswith(
-                "if rollover:"
-            ):
-                issues.append("tail_update_guarded_by_rollover")
-                break
-    metrics["tail_update_guarded_by_rollover"] = (
-        "tail_update_guarded_by_rollover" in issues
-    )
-
-    # 2. Має бути логіка replace-if-same-open
-    has_replace_same_open = "open_ms" in method_text and (
-        "tail_bars[-1]" in method_text or "tail_bars[- 1]" in method_text
-    )
+    # 1. Flush викликає write_preview_tail_bars і не огорнутий лише в 'if rollover:'
+    #    (P2X.6-U2 прибрав цей guard; flush = rollover АБО інтервал)
+    calls = _attr_calls(method, "write_preview_tail_bars")
+    if not calls:
+        issues.append("no_write_preview_tail_bars_call")
+    guarded = any(_guard_names(method, call) == ["rollover"] for call in calls)
+    if guarded:
+        issues.append("tail_update_guarded_by_rollover")
+    metrics["tail_update_guarded_by_rollover"] = guarded
+    metrics["has_write_preview_tail_bars"] = bool(calls)
+
+    # 2. Replace-if-same-open: write_preview_tail_bars робить remove-then-add за score
+    layer_path = _find_file("runtime/store/layers/redis_layer.py", root)
+    layer_src = _read_text(layer_path) if layer_path else None
+    has_replace_same_open = False
+    if layer_src:
+        try:
+            upsert = _find_function(ast.parse(layer_src), "write_preview_tail_bars")
+        except SyntaxError:
+            upsert = None
+        has_replace_same_open = upsert is not None and _upsert_by_score(upsert)
     metrics["has_replace_if_same_open"] = has_replace_same_open
     if not has_replace_same_open:
         issues.append("no_replace_if_same_open_logic")
 
-    # 3. Має бути write_preview_tail
-    has_write_tail = "write_preview_tail" in method_text
-    metrics["has_write_preview_tail"] = has_write_tail
-    if not has_write_tail:
-        issues.append("no_write_preview_tail_call")
-
     if issues:
         return False, ";".join(issues), metrics
     return True, "ok", metrics
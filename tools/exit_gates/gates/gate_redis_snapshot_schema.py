@@ -77,6 +77,37 @@ def _read_json(client: Any, key: str) -> Tuple[Optional[dict], Optional[int], Op
     return payload, ttl_left, None
 
 
+def _read_tail_list(
+    client: Any, key: str, snap_payload: Optional[dict]
+) -> Tuple[Optional[dict], Optional[int], Optional[str]]:
+    """tail_list (per-bar JSON) → payload у форматі whole-JSON tail (метадані зі snap)."""
+    try:
+        raws = client.lrange(key, 0, -1)
+    except Exception as exc:
+        return None, None, f"redis_lrange_failed:{type(exc).__name__}"
+    if not raws:
+        return None, None, "redis_miss"
+    try:
+        bars = [json.loads(raw) for raw in raws]
+    except Exception:
+        return None, None, "redis_json_invalid"
+    meta = snap_payload if isinstance(snap_payload, dict) else {}
+    payload = {
+        "bars": bars,
+        "source": meta.get("source"),
+        "last_seq": meta.get("seq"),
+        "payload_ts_ms": meta.get("payload_ts_ms"),
+    }
+    ttl_left: Optional[int] = None
+    try:
+        ttl = client.ttl(key)
+        if isinstance(ttl, int) and ttl >= 0:
+            ttl_left = ttl
+    except Exception:
+        ttl_left = None
+    return payload, ttl_left, None
+
+
 def _violations_summary(violations: List[str], keys_checked: int, ttl_min: Optional[int]) -> str:
     ttl_txt = str(ttl_min) if ttl_min is not None else "n/a"
     if not violations:
@@ -172,7 +203,7 @@ def run_gate(inputs: Dict[str, Any]) -> Dict[str, Any]:
     assert target_tf_s is not None
 
     snap_key = f"{ns}:ohlcv:snap:{target_symbol}:{target_tf_s}"
-    tail_key = f"{ns}:ohlcv:tail:{target_symbol}:{target_tf_s}"
+    tail_key = f"{ns}:ohlcv:tail_list:{target_symbol}:{target_tf_s}"
     status_key = f"{ns}:status:snapshot"
 
     snap_payload, snap_ttl, snap_err = _read_json(client, snap_key)
@@ -217,7 +248,7 @@ def run_gate(inputs: Dict[str, Any]) -> Dict[str, Any]:
     if snap_ttl is not None:
         ttl_min_seen = snap_ttl if ttl_min_seen is None else min(ttl_min_seen, snap_ttl)
 
-    tail_payload, tail_ttl, tail_err = _read_json(client, tail_key)
+    tail_payload, tail_ttl, tail_err = _read_tail_list(client, tail_key, snap_payload)
     keys_checked += 1
     if tail_err is not None or tail_payload is None:
         violations.append(f"tail:{tail_err or 'empty'}")
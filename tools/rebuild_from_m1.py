@@ -8,6 +8,7 @@
 
 Запуск:
     python -m tools.rebuild_from_m1 [--dry-run] [--symbol XAU/USD] [--start 2025-01-01] [--end 2026-01-01]
+    python -m tools.rebuild_from_m1 --workers 8 [--shard-days 7]   # process pool, той самий результат
 """
 
 from __future__ import annotations
@@ -18,7 +19,7 @@ import json
 import logging
 import os
 import time
-from typing import Dict, Iterable, List, Optional
+from typing import Dict, Iterable, List, Optional, Tuple
 
 from core.buckets import bucket_start_ms
 from core.config_loader import load_system_config as load_config, pick_config_path
@@ -29,6 +30,7 @@ from core.derive import (
 )
 from core.model.bars import CandleBar
 from runtime.ingest.market_calendar import MarketCalendar
+from runtime.ingest.replay_offline import symbol_anchors
 from runtime.store.ssot_jsonl import (
     JsonlAppender,
     head_first_bar_time_ms,
@@ -239,16 +241,9 @@ def rebuild_one_symbol(
     Returns: stats dict {tf_s: written_count, ...}
     """
     calendar = _build_calendar(cfg, symbol)
-    is_trading_fn = calendar.is_trading_minute if calendar else None
+    is_trading_fn = calendar.compiled() if calendar else None
 
-    # Per-symbol anchor: Binance symbols use 0, FX symbols use global config
-    binance_symbols = set(cfg.get("binance", {}).get("symbols", []))
-    if symbol in binance_symbols:
-        anchor_offset_s = int(cfg.get("binance", {}).get("day_anchor_offset_s", 0))
-        d1_anchor_s = int(cfg.get("binance", {}).get("d1_anchor_offset_s", 0))
-    else:
-        anchor_offset_s = int(cfg.get("day_anchor_offset_s", 0))
-        d1_anchor_s = int(cfg.get("day_anchor_offset_s_d1", 0))
+    anchor_offset_s, d1_anchor_s = symbol_anchors(cfg, symbol)
 
     disk_cache: Dict[str, set] = {}
     stats: Dict[str, int] = {"m1_loaded": 0, "m1_flat_skipped": 0}
@@ -411,6 +406,263 @@ def rebuild_one_symbol(
     return stats
 
 
+# ─── Паралельний rebuild (process pool, шарди symbol × діапазон днів) ──
+
+DAY_MS = 86_400_000
+
+# (source_tf_s, target_tf_s) у порядку stage-ів rebuild_one_symbol
+_SHARD_STEPS = [
+    (60, 180),
+    (60, 300),
+    (60, 86400),
+    (300, 900),
+    (900, 1800),
+    (1800, 3600),
+    (3600, 14400),
+]
+
+
+def _shard_bounds(
+    start_ms: int, end_ms: int, shard_days: int
+) -> List[Tuple[Optional[int], Optional[int]]]:
+    """Межі шардів [(own_lo, own_hi)] по UTC-півночах; None = відкрита межа.
+
+    Шард володіє бакетами з open_time_ms у [own_lo, own_hi) — кожен бакет
+    рівно в одному шарді, незалежно від anchor (H4/D1 можуть перетинати північ).
+    """
+    step = max(1, int(shard_days)) * DAY_MS
+    cuts: List[int] = []
+    cut = start_ms - start_ms % DAY_MS + step
+    while cut < end_ms:
+        cuts.append(cut)
+        cut += step
+    los: List[Optional[int]] = [None] + list(cuts)
+    his: List[Optional[int]] = list(cuts) + [None]
+    return list(zip(los, his))
+
+
+def _rebuild_shard(task: dict) -> Tuple[Dict[str, int], Dict[int, List[CandleBar]]]:
+    """Worker: derived бари одного шарду in-memory (без запису на диск).
+
+    Відтворює семантику rebuild_one_symbol для бакетів шарду:
+      - M1 читається з [start, end] ∩ [own_lo, own_hi + 1 доба] — вистачає
+        на будь-який бакет (max TF = D1), що відкривається в шарді;
+      - каскадні stage-і бачать диск + щойно derived бари (last wins), як
+        послідовний режим бачить свої ж append-и (dry-run — лише диск);
+      - бакети за own_hi деривуються як джерела, але не повертаються.
+
+    Returns:
+        (stats, {tf_s: [CandleBar, ...]}) — бари шарду, sorted by open_time_ms.
+    """
+    data_root = task["data_root"]
+    symbol = task["symbol"]
+    cfg = task["cfg"]
+    start_ms = task["start_ms"]
+    end_ms = task["end_ms"]
+    own_lo = task["own_lo"]
+    own_hi = task["own_hi"]
+    dry_run = task["dry_run"]
+    force = task["force"]
+
+    read_lo = start_ms if own_lo is None else max(start_ms, own_lo)
+    read_hi = end_ms if own_hi is None else min(end_ms, own_hi + DAY_MS)
+
+    def _owns(open_ms: int) -> bool:
+        return (own_lo is None or open_ms >= own_lo) and (
+            own_hi is None or open_ms < own_hi
+        )
+
+    calendar = _build_calendar(cfg, symbol)
+    is_trading_fn = calendar.compiled() if calendar else None
+    anchor_offset_s, d1_anchor_s = symbol_anchors(cfg, symbol)
+
+    disk_cache: Dict[str, set] = {}
+    stats: Dict[str, int] = {"m1_loaded": 0, "m1_flat_skipped": 0}
+    for tf_s in DERIVE_ORDER:
+        stats[f"tf_{tf_s}_written"] = 0
+        stats[f"tf_{tf_s}_existed"] = 0
+
+    buffers: Dict[int, GenericBuffer] = {60: GenericBuffer(60, max_keep=100000)}
+    for bar in iter_m1_bars(data_root, symbol, read_lo, read_hi):
+        flat = bool((bar.extensions or {}).get("calendar_pause_flat"))
+        if _owns(bar.open_time_ms):
+            stats["m1_loaded"] += 1
+            stats["m1_flat_skipped"] += int(flat)
+        if not flat:
+            buffers[60].upsert(bar)
+
+    derived: Dict[int, List[CandleBar]] = {}
+    for source_tf_s, target_tf_s in _SHARD_STEPS:
+        source_buf = buffers.get(source_tf_s)
+        if source_buf is None:
+            # Cascade source: диск, поверх — derived цього ж прогону
+            source_buf = GenericBuffer(source_tf_s, max_keep=50000)
+            for bar in _iter_bars_from_disk(
+                data_root, symbol, source_tf_s, read_lo, read_hi
+            ):
+                source_buf.upsert(bar)
+            if not dry_run:
+                for bar in derived.get(source_tf_s, []):
+                    if read_lo <= bar.open_time_ms <= read_hi:
+                        source_buf.upsert(bar)
+            buffers[source_tf_s] = source_buf
+
+        if target_tf_s == 86400:
+            ao_ms = d1_anchor_s * 1000
+            derive_kw = {"anchor_offset_s": 0, "d1_anchor_offset_s": d1_anchor_s}
+        else:
+            ao_s = anchor_offset_s if target_tf_s >= 14400 else 0
+            ao_ms = ao_s * 1000
+            derive_kw = {"anchor_offset_s": ao_s}
+        target_tf_ms = target_tf_s * 1000
+        b0 = bucket_start_ms(start_ms, target_tf_ms, ao_ms)
+        if own_lo is not None and b0 < own_lo:
+            b0 += -(-(own_lo - b0) // target_tf_ms) * target_tf_ms
+
+        out = derived.setdefault(target_tf_s, [])
+        for bucket_open in range(b0, read_hi, target_tf_ms):
+            owned = _owns(bucket_open)
+            if not force and _has_on_disk(
+                disk_cache, data_root, symbol, target_tf_s, bucket_open
+            ):
+                if owned:
+                    stats[f"tf_{target_tf_s}_existed"] += 1
+                continue
+            result = derive_bar(
+                symbol=symbol,
+                target_tf_s=target_tf_s,
+                source_buffer=source_buf,
+                bucket_open_ms=bucket_open,
+                is_trading_fn=is_trading_fn,
+                filter_calendar_pause=True,
+                **derive_kw,
+            )
+            if result is None:
+                continue
+            out.append(result)
+            if owned:
+                stats[f"tf_{target_tf_s}_written"] += 1
+
+    owned_bars = {
+        tf_s: [b for b in bars if _owns(b.open_time_ms)]
+        for tf_s, bars in derived.items()
+    }
+    return stats, owned_bars
+
+
+def rebuild_parallel(
+    data_root: str,
+    ranges: Dict[str, Tuple[int, int]],
+    dry_run: bool,
+    cfg: dict,
+    writer: JsonlAppender,
+    force: bool = False,
+    workers: int = 2,
+    shard_days: int = 7,
+) -> Dict[str, Dict[str, int]]:
+    """Process-pool rebuild: шарди (symbol, діапазон днів) → детермінований merge.
+
+    Воркери лише деривують (read-only диск); запис робить цей процес щойно
+    завершені всі шарди символу, у порядку TF → open_time_ms, тому part-файли
+    (і .idx) байт-у-байт збігаються з послідовним rebuild_one_symbol, а пікова
+    пам'ять обмежена derived барами одного символу.
+
+    Args:
+        ranges: {symbol: (start_ms, end_ms)} — як у послідовному режимі.
+        workers: розмір пулу процесів.
+        shard_days: довжина шарду в UTC-добах.
+
+    Returns:
+        {symbol: stats} — ті самі ключі, що й у rebuild_one_symbol.
+    """
+    import multiprocessing as mp
+    from concurrent.futures import ProcessPoolExecutor
+
+    tasks: List[dict] = []
+    for symbol, (start_ms, end_ms) in ranges.items():
+        for own_lo, own_hi in _shard_bounds(start_ms, end_ms, shard_days):
+            tasks.append(
+                {
+                    "data_root": data_root,
+                    "symbol": symbol,
+                    "cfg": cfg,
+                    "start_ms": start_ms,
+                    "end_ms": end_ms,
+                    "own_lo": own_lo,
+                    "own_hi": own_hi,
+                    "dry_run": dry_run,
+                    "force": force,
+                }
+            )
+    logging.info(
+        "REBUILD_PARALLEL_START symbols=%d shards=%d workers=%d shard_days=%d",
+        len(ranges),
+        len(tasks),
+        workers,
+        shard_days,
+    )
+
+    t0 = time.time()
+    total_stats: Dict[str, Dict[str, int]] = {}
+    shards_left: Dict[str, int] = {}
+    for task in tasks:
+        shards_left[task["symbol"]] = shards_left.get(task["symbol"], 0) + 1
+    sym_bars: Dict[int, List[CandleBar]] = {}
+    write_s = 0.0
+    ctx = mp.get_context("spawn")  # однакова поведінка на Windows/Linux
+    with ProcessPoolExecutor(max_workers=max(1, workers), mp_context=ctx) as pool:
+        # map зберігає порядок задач (шарди символу поспіль) → merge не
+        # залежить від планувальника; у пам'яті лише бари поточного символу.
+        for task, (stats, bars) in zip(tasks, pool.map(_rebuild_shard, tasks)):
+            symbol = task["symbol"]
+            sym_stats = total_stats.setdefault(symbol, {})
+            for key, val in stats.items():
+                sym_stats[key] = sym_stats.get(key, 0) + val
+            for tf_s, tf_bars in bars.items():
+                sym_bars.setdefault(tf_s, []).extend(tf_bars)
+            shards_left[symbol] -= 1
+            if shards_left[symbol] > 0:
+                continue
+            # Усі шарди символу готові (воркери його файлів уже не читають)
+            if not dry_run:
+                t_write = time.time()
+                _append_symbol_bars(writer, sym_bars)
+                write_s += time.time() - t_write
+            sym_bars = {}
+    elapsed_derive = time.time() - t0 - write_s
+
+    elapsed = time.time() - t0
+    m1_total = sum(s.get("m1_loaded", 0) for s in total_stats.values())
+    written_total = sum(
+        v for s in total_stats.values() for k, v in s.items() if k.endswith("_written")
+    )
+    logging.info(
+        "REBUILD_PARALLEL_DONE shards=%d workers=%d m1=%d written=%d "
+        "derive=%.1fs total=%.1fs m1_per_s=%.0f",
+        len(tasks),
+        workers,
+        m1_total,
+        written_total,
+        elapsed_derive,
+        elapsed,
+        m1_total / elapsed if elapsed > 0 else 0.0,
+    )
+    return total_stats
+
+
+def _append_symbol_bars(
+    writer: JsonlAppender, sym_bars: Dict[int, List[CandleBar]]
+) -> None:
+    """Append derived барів символу у порядку TF → open_time_ms (як послідовний)."""
+    for tf_s in DERIVE_ORDER:
+        tf_bars = sym_bars.get(tf_s, [])
+        if not tf_bars:
+            continue
+        for err in writer.append_many(tf_bars):
+            if err is not None:
+                raise err
+
+
 def _iter_bars_from_disk(
     data_root: str,
     symbol: str,
@@ -523,6 +775,18 @@ def main() -> None:
         action="store_true",
         help="Перезаписати вже існуючі derived бари (після ремонту M1 gaps).",
     )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Процесів для паралельного rebuild (1 = послідовно, як раніше).",
+    )
+    parser.add_argument(
+        "--shard-days",
+        type=int,
+        default=7,
+        help="Довжина шарду (UTC-доби) для --workers > 1.",
+    )
     args = parser.parse_args()
 
     cfg = load_config(args.config or pick_config_path())
@@ -548,6 +812,7 @@ def main() -> None:
     )
 
     total_stats: Dict[str, Dict[str, int]] = {}
+    ranges: Dict[str, Tuple[int, int]] = {}
     try:
         for symbol in symbols:
             logging.info("═══ REBUILD START symbol=%s ═══", symbol)
@@ -578,6 +843,10 @@ def main() -> None:
                 dt.datetime.fromtimestamp(end_ms / 1000, dt.timezone.utc).isoformat(),
             )
 
+            if args.workers > 1:
+                ranges[symbol] = (start_ms, end_ms)
+                continue
+
             stats = rebuild_one_symbol(
                 data_root=data_root,
                 symbol=symbol,
@@ -589,6 +858,20 @@ def main() -> None:
                 force=args.force,
             )
             total_stats[symbol] = stats
+
+        if ranges:
+            total_stats.update(
+                rebuild_parallel(
+                    data_root=data_root,
+                    ranges=ranges,
+                    dry_run=args.dry_run,
+                    cfg=cfg,
+                    writer=writer,
+                    force=args.force,
+                    workers=args.workers,
+                    shard_days=args.shard_days,
+                )
+            )
     finally:
         writer.close()
 